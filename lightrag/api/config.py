@@ -267,6 +267,10 @@ def parse_args() -> argparse.Namespace:
     # Inject chunk configuration
     args.chunk_size = get_env_value("CHUNK_SIZE", 1200, int)
     args.chunk_overlap_size = get_env_value("CHUNK_OVERLAP_SIZE", 100, int)
+    # Files larger than this many bytes are ingested through the streaming path
+    args.stream_ingest_threshold = get_env_value(
+        "STREAM_INGEST_THRESHOLD", 50 * 1024 * 1024, int
+    )
 
     # Inject LLM cache configuration
     args.enable_llm_cache_for_extract = get_env_value(
@@ -274,6 +278,10 @@ def parse_args() -> argparse.Namespace:
     )
     args.enable_llm_cache = get_env_value("ENABLE_LLM_CACHE", True, bool)
 
+    # Inject storage loading configuration
+    args.lazy_storage_init = get_env_value("LAZY_STORAGE_INIT", False, bool)
+    args.storage_warmup = get_env_value("STORAGE_WARMUP", True, bool)
+
     # Inject LLM temperature configuration
     args.temperature = get_env_value("TEMPERATURE", 0.5, float)
 
@@ -10,7 +10,7 @@ import logging.config
 import uvicorn
 # import pipmaster as pm  # Removed unused import
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 from pathlib import Path
 import configparser
 # from ascii_colors import ASCIIColors  # Removed unused import
@@ -134,6 +134,13 @@ def create_app(args):
             # Initialize database connections
             await rag.initialize_storages()
 
+            if args.lazy_storage_init and args.storage_warmup:
+                # Load the storages in the background, the server accepts
+                # requests meanwhile and /ready reports the progress
+                task = asyncio.create_task(rag.warmup_storages())
+                app.state.background_tasks.add(task)
+                task.add_done_callback(app.state.background_tasks.discard)
+
             await initialize_pipeline_status()
             pipeline_status = await get_namespace_data("pipeline_status")
 
@@ -333,6 +340,7 @@ def create_app(args):
             enable_llm_cache_for_entity_extract=args.enable_llm_cache_for_extract,
             enable_llm_cache=args.enable_llm_cache,
             auto_manage_storages_states=False,
+            lazy_storage_init=args.lazy_storage_init,
             max_parallel_insert=args.max_parallel_insert,
             addon_params={"language": args.summary_language},
         )
@@ -359,6 +367,7 @@ def create_app(args):
             enable_llm_cache_for_entity_extract=args.enable_llm_cache_for_extract,
             enable_llm_cache=args.enable_llm_cache,
             auto_manage_storages_states=False,
+            lazy_storage_init=args.lazy_storage_init,
             max_parallel_insert=args.max_parallel_insert,
             addon_params={"language": args.summary_language},
         )
@@ -493,6 +502,28 @@ def create_app(args):
             logger.error(f"Error getting health status: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    @app.get("/ready", dependencies=[Depends(combined_auth)])
+    async def get_readiness():
+        """Report per-namespace storage load state, 503 until the storages are usable"""
+        storages = rag.get_storage_load_states()
+        states = {info["state"] for info in storages.values()}
+        if args.lazy_storage_init and not args.storage_warmup:
+            # Storages load on first access, pending ones are not an error
+            ready = not states & {"loading", "failed"}
+        else:
+            ready = states == {"ready"}
+        return JSONResponse(
+            status_code=status.HTTP_200_OK
+            if ready
+            else status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "status": "ready" if ready else "not_ready",
+                "lazy_storage_init": args.lazy_storage_init,
+                "storage_warmup": args.storage_warmup,
+                "storages": storages,
+            },
+        )
+
     # Custom StaticFiles class for smart caching
     class SmartStaticFiles(StaticFiles):  # Renamed from NoCacheStaticFiles
         async def get_response(self, path: str, scope):
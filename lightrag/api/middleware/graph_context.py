@@ -11,6 +11,8 @@ from fastapi import Request, HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 
+from lightrag.storage.graph_registry import get_graph_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,7 +22,7 @@ class GraphContextMiddleware(BaseHTTPMiddleware):
     def __init__(self, app, graphs_dir: str = "./graphs"):
         super().__init__(app)
         self.graphs_dir = Path(graphs_dir)
-        self.graphs_config_file = self.graphs_dir / "graphs_config.json"
+        self.registry = get_graph_registry(graphs_dir)
         
     async def dispatch(self, request: Request, call_next):
         """处理请求，注入图谱上下文"""
@@ -100,10 +102,7 @@ class GraphContextMiddleware(BaseHTTPMiddleware):
     async def _get_current_active_graph(self) -> Optional[str]:
         """获取当前活跃图谱ID"""
         try:
-            config = await self._load_graphs_config()
-            for graph_id, graph_info in config.items():
-                if graph_info.get("is_active", False):
-                    return graph_id
+            return await self.registry.get_active_graph_id()
         except Exception as e:
             logger.warning(f"获取活跃图谱失败: {e}")
         
@@ -112,30 +111,16 @@ class GraphContextMiddleware(BaseHTTPMiddleware):
     async def _graph_exists(self, graph_id: str) -> bool:
         """检查图谱是否存在"""
         try:
-            config = await self._load_graphs_config()
-            return graph_id in config
+            return await self.registry.contains(graph_id)
         except Exception:
             return False
     
     async def _get_graph_info(self, graph_id: str) -> Optional[Dict[str, Any]]:
         """获取图谱信息"""
         try:
-            config = await self._load_graphs_config()
-            return config.get(graph_id)
+            return await self.registry.get(graph_id)
         except Exception:
             return None
-    
-    async def _load_graphs_config(self) -> Dict[str, Any]:
-        """加载图谱配置"""
-        if not self.graphs_config_file.exists():
-            return {}
-        
-        try:
-            with open(self.graphs_config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"加载图谱配置失败: {e}")
-            return {}
 
 
 class BackwardCompatibilityHandler:
@@ -143,7 +128,7 @@ class BackwardCompatibilityHandler:
     
     def __init__(self, graphs_dir: str = "./graphs"):
         self.graphs_dir = Path(graphs_dir)
-        self.graphs_config_file = self.graphs_dir / "graphs_config.json"
+        self.registry = get_graph_registry(graphs_dir)
     
     async def handle_legacy_request(self, request: Request) -> str:
         """处理旧版本API请求"""
@@ -157,7 +142,7 @@ class BackwardCompatibilityHandler:
     
     async def get_or_create_default_graph(self) -> Dict[str, Any]:
         """获取或创建默认图谱"""
-        config = await self._load_graphs_config()
+        config = await self.registry.get_all()
         
         # 查找默认图谱
         for graph_id, graph_info in config.items():
@@ -202,36 +187,13 @@ class BackwardCompatibilityHandler:
             "metadata": {}
         }
         
-        # 保存配置
-        config = await self._load_graphs_config()
-        config[graph_id] = default_graph
-        await self._save_graphs_config(config)
+        # 保存配置（其他请求可能已并发创建，以注册表中的为准）
+        default_graph = await self.registry.update(
+            lambda config: dict(config.setdefault(graph_id, default_graph))
+        )
         
         logger.info(f"创建默认图谱: {graph_id}")
         return default_graph
-    
-    async def _load_graphs_config(self) -> Dict[str, Any]:
-        """加载图谱配置"""
-        if not self.graphs_config_file.exists():
-            return {}
-        
-        try:
-            with open(self.graphs_config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"加载图谱配置失败: {e}")
-            return {}
-    
-    async def _save_graphs_config(self, config: Dict[str, Any]):
-        """保存图谱配置"""
-        self.graphs_dir.mkdir(parents=True, exist_ok=True)
-        
-        try:
-            with open(self.graphs_config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"保存图谱配置失败: {e}")
-            raise
 
 
 def get_current_graph_id(request: Request) -> Optional[str]:
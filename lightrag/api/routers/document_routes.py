@@ -3,6 +3,7 @@ This module contains all document-related routes for the LightRAG API.
 """
 
 import asyncio
+import json
 from pyuca import Collator
 from lightrag.utils import logger
 import aiofiles
@@ -89,6 +90,24 @@ router = APIRouter(
 # Temporary file prefix
 temp_prefix = "__tmp__"
 
+# Plain-text file types eligible for streaming ingestion
+STREAMABLE_TEXT_EXTENSIONS = (
+    ".txt",
+    ".md",
+    ".csv",
+    ".json",
+    ".xml",
+    ".yaml",
+    ".yml",
+    ".log",
+    ".sql",
+)
+
+# Seconds between two reads of the pipeline event log by /pipeline_status/stream
+PIPELINE_STREAM_POLL_INTERVAL = 0.5
+# Idle polls before a keep-alive comment is sent (about 15 seconds)
+PIPELINE_STREAM_HEARTBEAT_POLLS = 30
+
 
 def sanitize_filename(filename: str, input_dir: Path) -> str:
     """
@@ -465,6 +484,101 @@ class DocsStatusesResponse(BaseModel):
         }
 
 
+class DocumentsRequest(BaseModel):
+    """Request model for paginated document listing
+
+    Attributes:
+        status_filter: Only list documents with this status, all statuses if None
+        page: 1-based page number
+        page_size: Number of documents per page
+        sort_field: Field to sort by
+        sort_direction: Sort direction
+        file_path_filter: Case-insensitive substring the file path must contain
+        include_content: Whether to load full document content from storage
+    """
+
+    status_filter: Optional[DocStatus] = Field(
+        default=None, description="Filter by document status, all statuses if None"
+    )
+    page: int = Field(default=1, ge=1, description="Page number (1-based)")
+    page_size: int = Field(
+        default=50, ge=10, le=200, description="Number of documents per page"
+    )
+    sort_field: Literal["created_at", "updated_at", "id", "file_path"] = Field(
+        default="updated_at", description="Field to sort by"
+    )
+    sort_direction: Literal["asc", "desc"] = Field(
+        default="desc", description="Sort direction"
+    )
+    file_path_filter: Optional[str] = Field(
+        default=None, description="Case-insensitive file path substring filter"
+    )
+    include_content: bool = Field(
+        default=False, description="Load full document content from storage"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "status_filter": "PROCESSED",
+                "page": 1,
+                "page_size": 50,
+                "sort_field": "updated_at",
+                "sort_direction": "desc",
+            }
+        }
+
+
+class PaginationInfo(BaseModel):
+    """Pagination information for a document listing page"""
+
+    page: int = Field(description="Current page number")
+    page_size: int = Field(description="Number of documents per page")
+    total_count: int = Field(description="Total number of matching documents")
+    total_pages: int = Field(description="Total number of pages")
+    has_next: bool = Field(description="Whether there is a next page")
+    has_prev: bool = Field(description="Whether there is a previous page")
+
+
+class PaginatedDocsResponse(BaseModel):
+    """Response model for paginated document listing
+
+    Attributes:
+        documents: Documents of the requested page
+        pagination: Pagination information
+        status_counts: Number of documents in each status across the whole storage
+    """
+
+    documents: List[DocStatusResponse] = Field(
+        description="Documents of the requested page"
+    )
+    pagination: PaginationInfo = Field(description="Pagination information")
+    status_counts: Dict[str, int] = Field(
+        description="Number of documents in each status"
+    )
+
+
+def _to_doc_status_response(
+    doc_id: str, doc_status: DocProcessingStatus
+) -> DocStatusResponse:
+    """Convert a storage DocProcessingStatus into the API response model"""
+    return DocStatusResponse(
+        id=doc_id,
+        content_summary=doc_status.content_summary,
+        content_length=doc_status.content_length,
+        status=doc_status.status,
+        created_at=format_datetime(doc_status.created_at),
+        updated_at=format_datetime(doc_status.updated_at),
+        chunks_count=doc_status.chunks_count,
+        error=doc_status.error,
+        metadata=doc_status.metadata,
+        file_path=doc_status.file_path,
+        # 获取文档的图谱信息（简化实现）
+        graph_id=getattr(doc_status, "graph_id", "default"),
+        graph_name=getattr(doc_status, "graph_name", "Default Graph"),
+    )
+
+
 class PipelineStatusResponse(BaseModel):
     """Response model for pipeline status
 
@@ -478,7 +592,8 @@ class PipelineStatusResponse(BaseModel):
         cur_batch: Current processing batch
         request_pending: Flag for pending request for processing
         latest_message: Latest message from pipeline processing
-        history_messages: List of history messages
+        history_messages: Messages of the events kept in the pipeline event log
+        last_event_seq: Sequence number of the latest event, the starting point for /pipeline_status/stream
         update_status: Status of update flags for all namespaces
     """
 
@@ -492,6 +607,7 @@ class PipelineStatusResponse(BaseModel):
     request_pending: bool = False
     latest_message: str = ""
     history_messages: Optional[List[str]] = None
+    last_event_seq: int = 0
     update_status: Optional[dict] = None
 
     @field_validator("job_start", mode="before")
@@ -586,6 +702,20 @@ async def pipeline_enqueue_file(rag: LightRAG, file_path: Path) -> bool:
         content = ""
         ext = file_path.suffix.lower()
 
+        # Large plain-text files are chunked while being read instead of being
+        # loaded into memory as a whole
+        if (
+            ext in STREAMABLE_TEXT_EXTENSIONS
+            and file_path.stat().st_size >= global_args.stream_ingest_threshold
+        ):
+            doc_id = await rag.apipeline_enqueue_file_stream(
+                file_path, file_name=file_path.name
+            )
+            if doc_id:
+                logger.info(f"Successfully streamed and enqueued file: {file_path.name}")
+                return True
+            return False
+
         file = None
         async with aiofiles.open(file_path, "rb") as f:
             file = await f.read()
@@ -927,8 +1057,11 @@ async def background_delete_documents(
 ):
     """Background task to delete multiple documents"""
     from lightrag.kg.shared_storage import (
+        add_pipeline_event,
+        flush_pipeline_events,
         get_namespace_data,
         get_pipeline_status_lock,
+        reset_pipeline_events,
     )
 
     pipeline_status = await get_namespace_data("pipeline_status")
@@ -948,21 +1081,18 @@ async def background_delete_documents(
                 "docs": total_docs,
                 "batchs": total_docs,
                 "cur_batch": 0,
-                "latest_message": "Starting document deletion process",
             }
         )
-        # Use slice assignment to clear the list in place
-        pipeline_status["history_messages"][:] = ["Starting document deletion process"]
+        reset_pipeline_events(pipeline_status, "Starting document deletion process")
 
     try:
         # Loop through each document ID and delete them one by one
         for i, doc_id in enumerate(doc_ids, 1):
+            start_msg = f"Deleting document {i}/{total_docs}: {doc_id}"
+            logger.info(start_msg)
+            add_pipeline_event(start_msg, stage="delete", doc_id=doc_id)
             async with pipeline_status_lock:
-                start_msg = f"Deleting document {i}/{total_docs}: {doc_id}"
-                logger.info(start_msg)
                 pipeline_status["cur_batch"] = i
-                pipeline_status["latest_message"] = start_msg
-                pipeline_status["history_messages"].append(start_msg)
 
             file_path = "#"
             try:
@@ -976,8 +1106,7 @@ async def background_delete_documents(
                         f"Deleted document {i}/{total_docs}: {doc_id}[{file_path}]"
                     )
                     logger.info(success_msg)
-                    async with pipeline_status_lock:
-                        pipeline_status["history_messages"].append(success_msg)
+                    add_pipeline_event(success_msg, stage="delete", doc_id=doc_id)
 
                     # Handle file deletion if requested and file_path is available
                     if (
@@ -993,67 +1122,61 @@ async def background_delete_documents(
                                     f"Successfully deleted file: {result.file_path}"
                                 )
                                 logger.info(file_delete_msg)
-                                async with pipeline_status_lock:
-                                    pipeline_status["latest_message"] = file_delete_msg
-                                    pipeline_status["history_messages"].append(
-                                        file_delete_msg
-                                    )
+                                add_pipeline_event(
+                                    file_delete_msg, stage="delete", doc_id=doc_id
+                                )
                             else:
                                 file_not_found_msg = (
                                     f"File not found for deletion: {result.file_path}"
                                 )
                                 logger.warning(file_not_found_msg)
-                                async with pipeline_status_lock:
-                                    pipeline_status["latest_message"] = (
-                                        file_not_found_msg
-                                    )
-                                    pipeline_status["history_messages"].append(
-                                        file_not_found_msg
-                                    )
+                                add_pipeline_event(
+                                    file_not_found_msg,
+                                    level="warning",
+                                    stage="delete",
+                                    doc_id=doc_id,
+                                )
                         except Exception as file_error:
                             file_error_msg = f"Failed to delete file {result.file_path}: {str(file_error)}"
                             logger.error(file_error_msg)
-                            async with pipeline_status_lock:
-                                pipeline_status["latest_message"] = file_error_msg
-                                pipeline_status["history_messages"].append(
-                                    file_error_msg
-                                )
+                            add_pipeline_event(
+                                file_error_msg, level="error", stage="delete", doc_id=doc_id
+                            )
                     elif delete_file:
                         no_file_msg = f"No valid file path found for document {doc_id}"
                         logger.warning(no_file_msg)
-                        async with pipeline_status_lock:
-                            pipeline_status["latest_message"] = no_file_msg
-                            pipeline_status["history_messages"].append(no_file_msg)
+                        add_pipeline_event(
+                            no_file_msg, level="warning", stage="delete", doc_id=doc_id
+                        )
                 else:
                     failed_deletions.append(doc_id)
                     error_msg = f"Failed to delete {i}/{total_docs}: {doc_id}[{file_path}] - {result.message}"
                     logger.error(error_msg)
-                    async with pipeline_status_lock:
-                        pipeline_status["latest_message"] = error_msg
-                        pipeline_status["history_messages"].append(error_msg)
+                    add_pipeline_event(
+                        error_msg, level="error", stage="delete", doc_id=doc_id
+                    )
 
             except Exception as e:
                 failed_deletions.append(doc_id)
                 error_msg = f"Error deleting document {i}/{total_docs}: {doc_id}[{file_path}] - {str(e)}"
                 logger.error(error_msg)
                 logger.error(traceback.format_exc())
-                async with pipeline_status_lock:
-                    pipeline_status["latest_message"] = error_msg
-                    pipeline_status["history_messages"].append(error_msg)
+                add_pipeline_event(
+                    error_msg, level="error", stage="delete", doc_id=doc_id
+                )
 
     except Exception as e:
         error_msg = f"Critical error during batch deletion: {str(e)}"
         logger.error(error_msg)
         logger.error(traceback.format_exc())
-        async with pipeline_status_lock:
-            pipeline_status["history_messages"].append(error_msg)
+        add_pipeline_event(error_msg, level="error", stage="delete")
     finally:
         # Final summary
+        completion_msg = f"Deletion completed: {len(successful_deletions)} successful, {len(failed_deletions)} failed"
+        add_pipeline_event(completion_msg, stage="delete")
+        await flush_pipeline_events()
         async with pipeline_status_lock:
             pipeline_status["busy"] = False
-            completion_msg = f"Deletion completed: {len(successful_deletions)} successful, {len(failed_deletions)} failed"
-            pipeline_status["latest_message"] = completion_msg
-            pipeline_status["history_messages"].append(completion_msg)
 
 
 def create_document_routes(
@@ -1253,8 +1376,12 @@ def create_document_routes(
                           with status code 500 and error details in the detail field.
         """
         from lightrag.kg.shared_storage import (
+            add_pipeline_event,
+            bump_graph_version,
+            flush_pipeline_events,
             get_namespace_data,
             get_pipeline_status_lock,
+            reset_pipeline_events,
         )
 
         # Get pipeline status and lock
@@ -1278,14 +1405,9 @@ def create_document_routes(
                     "batchs": 0,
                     "cur_batch": 0,
                     "request_pending": False,  # Clear any previous request
-                    "latest_message": "Starting document clearing process",
                 }
             )
-            # Cleaning history_messages without breaking it as a shared list object
-            del pipeline_status["history_messages"][:]
-            pipeline_status["history_messages"].append(
-                "Starting document clearing process"
-            )
+            reset_pipeline_events(pipeline_status, "Starting document clearing process")
 
         try:
             # Use drop method to clear all data
@@ -1301,10 +1423,7 @@ def create_document_routes(
             ]
 
             # Log storage drop start
-            if "history_messages" in pipeline_status:
-                pipeline_status["history_messages"].append(
-                    "Starting to drop storage components"
-                )
+            add_pipeline_event("Starting to drop storage components")
 
             for storage in storages:
                 if storage is not None:
@@ -1312,6 +1431,8 @@ def create_document_routes(
 
             # Wait for all drop tasks to complete
             drop_results = await asyncio.gather(*drop_tasks, return_exceptions=True)
+            # Cached query contexts of this graph are no longer valid
+            await bump_graph_version(rag.working_dir)
 
             # Check for errors and log results
             errors = []
@@ -1330,29 +1451,25 @@ def create_document_routes(
                     storage_success_count += 1
 
             # Log storage drop results
-            if "history_messages" in pipeline_status:
-                if storage_error_count > 0:
-                    pipeline_status["history_messages"].append(
-                        f"Dropped {storage_success_count} storage components with {storage_error_count} errors"
-                    )
-                else:
-                    pipeline_status["history_messages"].append(
-                        f"Successfully dropped all {storage_success_count} storage components"
-                    )
+            if storage_error_count > 0:
+                add_pipeline_event(
+                    f"Dropped {storage_success_count} storage components with {storage_error_count} errors",
+                    level="warning",
+                )
+            else:
+                add_pipeline_event(
+                    f"Successfully dropped all {storage_success_count} storage components"
+                )
 
             # If all storage operations failed, return error status and don't proceed with file deletion
             if storage_success_count == 0 and storage_error_count > 0:
                 error_message = "All storage drop operations failed. Aborting document clearing process."
                 logger.error(error_message)
-                if "history_messages" in pipeline_status:
-                    pipeline_status["history_messages"].append(error_message)
+                add_pipeline_event(error_message, level="error")
                 return ClearDocumentsResponse(status="fail", message=error_message)
 
             # Log file deletion start
-            if "history_messages" in pipeline_status:
-                pipeline_status["history_messages"].append(
-                    "Starting to delete files in input directory"
-                )
+            add_pipeline_event("Starting to delete files in input directory")
 
             # Delete all files in input_dir
             deleted_files_count = 0
@@ -1368,16 +1485,14 @@ def create_document_routes(
                         file_errors_count += 1
 
             # Log file deletion results
-            if "history_messages" in pipeline_status:
-                if file_errors_count > 0:
-                    pipeline_status["history_messages"].append(
-                        f"Deleted {deleted_files_count} files with {file_errors_count} errors"
-                    )
-                    errors.append(f"Failed to delete {file_errors_count} files")
-                else:
-                    pipeline_status["history_messages"].append(
-                        f"Successfully deleted {deleted_files_count} files"
-                    )
+            if file_errors_count > 0:
+                add_pipeline_event(
+                    f"Deleted {deleted_files_count} files with {file_errors_count} errors",
+                    level="warning",
+                )
+                errors.append(f"Failed to delete {file_errors_count} files")
+            else:
+                add_pipeline_event(f"Successfully deleted {deleted_files_count} files")
 
             # Prepare final result message
             final_message = ""
@@ -1389,8 +1504,7 @@ def create_document_routes(
                 status = "success"
 
             # Log final result
-            if "history_messages" in pipeline_status:
-                pipeline_status["history_messages"].append(final_message)
+            add_pipeline_event(final_message)
 
             # Return response based on results
             return ClearDocumentsResponse(status=status, message=final_message)
@@ -1398,17 +1512,14 @@ def create_document_routes(
             error_msg = f"Error clearing documents: {str(e)}"
             logger.error(error_msg)
             logger.error(traceback.format_exc())
-            if "history_messages" in pipeline_status:
-                pipeline_status["history_messages"].append(error_msg)
+            add_pipeline_event(error_msg, level="error")
             raise HTTPException(status_code=500, detail=str(e))
         finally:
+            add_pipeline_event("Document clearing process completed")
+            await flush_pipeline_events()
             # Reset busy status after completion
             async with pipeline_status_lock:
                 pipeline_status["busy"] = False
-                completion_msg = "Document clearing process completed"
-                pipeline_status["latest_message"] = completion_msg
-                if "history_messages" in pipeline_status:
-                    pipeline_status["history_messages"].append(completion_msg)
 
     @router.get(
         "/pipeline_status",
@@ -1433,7 +1544,8 @@ def create_document_routes(
                 - cur_batch (int): Current processing batch
                 - request_pending (bool): Flag for pending request for processing
                 - latest_message (str): Latest message from pipeline processing
-                - history_messages (List[str], optional): List of history messages
+                - history_messages (List[str], optional): Messages of the events kept in the event log
+                - last_event_seq (int): Sequence number of the latest event
 
         Raises:
             HTTPException: If an error occurs while retrieving pipeline status (500)
@@ -1467,9 +1579,13 @@ def create_document_routes(
             # Add processed update_status to the status dictionary
             status_dict["update_status"] = processed_update_status
 
-            # Convert history_messages to a regular list if it's a Manager.list
-            if "history_messages" in status_dict:
-                status_dict["history_messages"] = list(status_dict["history_messages"])
+            # Messages of the bounded event log, copied out of the Manager.list
+            events = status_dict.pop("events", None)
+            if events is not None:
+                status_dict["history_messages"] = [
+                    event["message"] for event in list(events)
+                ]
+            status_dict["last_event_seq"] = status_dict.pop("event_seq", 0)
 
             # Ensure job_start is properly formatted as a string with timezone information
             if "job_start" in status_dict and status_dict["job_start"]:
@@ -1482,6 +1598,83 @@ def create_document_routes(
             logger.error(traceback.format_exc())
             raise HTTPException(status_code=500, detail=str(e))
 
+    @router.get(
+        "/pipeline_status/stream",
+        dependencies=[Depends(combined_auth)],
+    )
+    async def stream_pipeline_status(request: Request, since: Optional[int] = None):
+        """
+        Stream pipeline events as Server-Sent Events.
+
+        Each event of the pipeline event log is sent once as an SSE message of type
+        `pipeline`, with the event sequence number as its id and the event as JSON data
+        (seq, time, level, message and optional fields such as stage, doc_id or file_path).
+        A `status` message carrying busy, job_name, docs, batchs, cur_batch and
+        latest_message is sent on connect and whenever one of them changes.
+
+        Args:
+            since (int, optional): Only send events with a larger sequence number.
+                Defaults to the Last-Event-ID header on reconnect, else to 0 which
+                replays the events still kept in the log.
+
+        Returns:
+            StreamingResponse: A text/event-stream response, kept open until the client disconnects.
+        """
+        from fastapi.responses import StreamingResponse
+        from lightrag.kg.shared_storage import get_namespace_data, get_pipeline_events
+
+        if since is None:
+            last_event_id = request.headers.get("last-event-id", "")
+            since = int(last_event_id) if last_event_id.isdigit() else 0
+
+        pipeline_status = await get_namespace_data("pipeline_status")
+
+        async def event_generator():
+            cursor = since
+            last_status = None
+            idle_polls = 0
+            while not await request.is_disconnected():
+                status = {
+                    key: pipeline_status.get(key)
+                    for key in (
+                        "busy",
+                        "job_name",
+                        "docs",
+                        "batchs",
+                        "cur_batch",
+                        "latest_message",
+                    )
+                }
+                if status != last_status:
+                    last_status = status
+                    yield f"event: status\ndata: {json.dumps(status, ensure_ascii=False)}\n\n"
+
+                events, cursor = await get_pipeline_events(cursor)
+                for event in events:
+                    yield (
+                        f"id: {event['seq']}\nevent: pipeline\n"
+                        f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+                    )
+
+                if events:
+                    idle_polls = 0
+                else:
+                    idle_polls += 1
+                    # Keep the connection open through proxies
+                    if idle_polls % PIPELINE_STREAM_HEARTBEAT_POLLS == 0:
+                        yield ": keep-alive\n\n"
+                await asyncio.sleep(PIPELINE_STREAM_POLL_INTERVAL)
+
+        return StreamingResponse(
+            event_generator(),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+                "X-Accel-Buffering": "no",  # Ensure proper handling of streaming response when proxied by Nginx
+            },
+        )
+
     @router.get(
         "", response_model=DocsStatusesResponse, dependencies=[Depends(combined_auth)]
     )
@@ -1518,25 +1711,8 @@ def create_document_routes(
                 for doc_id, doc_status in result.items():
                     if status not in response.statuses:
                         response.statuses[status] = []
-                    # 获取文档的图谱信息（简化实现）
-                    doc_graph_id = getattr(doc_status, 'graph_id', 'default')
-                    doc_graph_name = getattr(doc_status, 'graph_name', 'Default Graph')
-
                     response.statuses[status].append(
-                        DocStatusResponse(
-                            id=doc_id,
-                            content_summary=doc_status.content_summary,
-                            content_length=doc_status.content_length,
-                            status=doc_status.status,
-                            created_at=format_datetime(doc_status.created_at),
-                            updated_at=format_datetime(doc_status.updated_at),
-                            chunks_count=doc_status.chunks_count,
-                            error=doc_status.error,
-                            metadata=doc_status.metadata,
-                            file_path=doc_status.file_path,
-                            graph_id=doc_graph_id,
-                            graph_name=doc_graph_name,
-                        )
+                        _to_doc_status_response(doc_id, doc_status)
                     )
             return response
         except Exception as e:
@@ -1544,6 +1720,67 @@ def create_document_routes(
             logger.error(traceback.format_exc())
             raise HTTPException(status_code=500, detail=str(e))
 
+    @router.post(
+        "/paginated",
+        response_model=PaginatedDocsResponse,
+        dependencies=[Depends(combined_auth)],
+    )
+    async def get_documents_paginated(
+        request: DocumentsRequest,
+    ) -> PaginatedDocsResponse:
+        """
+        Get one page of documents with server-side filtering and sorting.
+
+        Unlike GET /documents, only the requested page is loaded from storage
+        and document content is not read unless include_content is set.
+
+        Args:
+            request (DocumentsRequest): Filter, sort and pagination parameters.
+
+        Returns:
+            PaginatedDocsResponse: The page of documents, pagination information
+                                   and per-status document counts.
+
+        Raises:
+            HTTPException: If an error occurs while retrieving documents (500).
+        """
+        try:
+            (documents, total_count), status_counts = await asyncio.gather(
+                rag.get_docs_paginated(
+                    status=request.status_filter,
+                    page=request.page,
+                    page_size=request.page_size,
+                    sort_field=request.sort_field,
+                    sort_direction=request.sort_direction,
+                    file_path_filter=request.file_path_filter,
+                    include_content=request.include_content,
+                ),
+                rag.doc_status.get_status_counts(),
+            )
+            total_pages = (total_count + request.page_size - 1) // request.page_size
+            return PaginatedDocsResponse(
+                documents=[
+                    _to_doc_status_response(doc_id, doc_status)
+                    for doc_id, doc_status in documents
+                ],
+                pagination=PaginationInfo(
+                    page=request.page,
+                    page_size=request.page_size,
+                    total_count=total_count,
+                    total_pages=total_pages,
+                    has_next=request.page < total_pages,
+                    has_prev=request.page > 1,
+                ),
+                status_counts={
+                    getattr(status, "value", status): count
+                    for status, count in status_counts.items()
+                },
+            )
+        except Exception as e:
+            logger.error(f"Error POST /documents/paginated: {str(e)}")
+            logger.error(traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(e))
+
     class DeleteDocByIdResponse(BaseModel):
         """Response model for single document deletion operation."""
 
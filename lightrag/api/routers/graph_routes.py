@@ -3,16 +3,19 @@ This module contains all graph-related routes for the LightRAG API.
 """
 
 from typing import Optional, Dict, Any, List
+import asyncio
 import traceback
 import shutil
 import json
 import os
 from pathlib import Path
-from datetime import datetime
-from fastapi import APIRouter, Depends, Query, HTTPException
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
 from pydantic import BaseModel, Field
 
-from lightrag.utils import logger
+from lightrag.utils import logger, load_graph_stats, save_graph_stats, get_dir_size
+from lightrag.kg.shared_storage import bump_graph_version, get_graph_registry_lock
+from lightrag.storage.graph_registry import get_graph_registry
 from ..utils_api import get_combined_auth_dependency
 
 # 导入多图谱支持的数据模型
@@ -195,11 +198,13 @@ class GraphManager:
     def __init__(self, base_dir: str = "./graphs"):
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
-        self.graphs_config_file = self.base_dir / "graphs_config.json"
+        # 图谱配置统一通过注册表读写（内存缓存 + 加锁原子落盘）
+        self.registry = get_graph_registry(str(self.base_dir))
         self.current_rag = None
         self.current_graph_id = None  # 使用graph_id而不是graph_name
 
-    def _generate_graph_id(self, name: str) -> str:
+    @staticmethod
+    def _generate_graph_id(name: str, config: Dict[str, Any]) -> str:
         """生成安全的图谱ID"""
         import re
         # 移除特殊字符，保留字母数字和下划线
@@ -214,7 +219,6 @@ class GraphManager:
             graph_id = "unnamed_graph"
 
         # 确保唯一性
-        config = self._load_graphs_config()
         original_id = graph_id
         counter = 1
         while graph_id in config:
@@ -223,142 +227,116 @@ class GraphManager:
 
         return graph_id
 
-    def _load_graphs_config(self) -> Dict[str, Any]:
-        """加载图谱配置"""
-        if self.graphs_config_file.exists():
-            import json
-            try:
-                with open(self.graphs_config_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.error(f"加载图谱配置失败: {e}")
-                return {}
-        return {}
-
-    def _save_graphs_config(self, config: Dict[str, Any]):
-        """保存图谱配置"""
-        import json
-        try:
-            with open(self.graphs_config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"保存图谱配置失败: {e}")
-            raise HTTPException(status_code=500, detail=f"保存图谱配置失败: {e}")
+    async def _load_graphs_config(self) -> Dict[str, Any]:
+        """加载图谱配置（内存副本）"""
+        return await self.registry.get_all()
 
     async def create_graph(self, name: str, description: str = "", metadata: Dict[str, Any] = None) -> Dict[str, Any]:
         """创建新的知识图谱"""
-        config = self._load_graphs_config()
-
-        # 生成图谱ID（使用名称的安全版本）
-        graph_id = self._generate_graph_id(name)
-
-        # 检查图谱是否已存在
-        if graph_id in config:
-            raise HTTPException(status_code=400, detail=f"图谱 '{name}' 已存在")
-
-        # 创建图谱工作目录
-        graph_dir = self.base_dir / graph_id
-        graph_dir.mkdir(parents=True, exist_ok=True)
-
-        # 创建图谱元数据
-        if MULTI_GRAPH_SUPPORT:
-            graph_metadata = GraphMetadata(
-                graph_id=graph_id,
-                name=name,
-                description=description,
-                working_dir=str(graph_dir),
-                status=GraphStatus.ACTIVE,
-                is_active=len(config) == 0,  # 第一个图谱设为活跃
-                metadata=metadata or {}
-            )
-            config[graph_id] = graph_metadata.to_dict()
-        else:
-            # 兼容旧格式
-            created_at = datetime.now().isoformat()
-            config[graph_id] = {
-                "name": name,
-                "description": description,
-                "working_dir": str(graph_dir),
-                "created_at": created_at,
-                "entity_count": 0,
-                "relation_count": 0,
-                "is_active": len(config) == 0
-            }
 
-        self._save_graphs_config(config)
+        def _create(config: Dict[str, Any]) -> Dict[str, Any]:
+            # 生成图谱ID（使用名称的安全版本），在注册表锁内完成以避免并发创建冲突
+            graph_id = self._generate_graph_id(name, config)
+
+            # 检查图谱是否已存在
+            if graph_id in config:
+                raise HTTPException(status_code=400, detail=f"图谱 '{name}' 已存在")
+
+            # 创建图谱工作目录
+            graph_dir = self.base_dir / graph_id
+            graph_dir.mkdir(parents=True, exist_ok=True)
+
+            # 创建图谱元数据
+            if MULTI_GRAPH_SUPPORT:
+                graph_metadata = GraphMetadata(
+                    graph_id=graph_id,
+                    name=name,
+                    description=description,
+                    working_dir=str(graph_dir),
+                    status=GraphStatus.ACTIVE,
+                    is_active=len(config) == 0,  # 第一个图谱设为活跃
+                    metadata=metadata or {}
+                )
+                config[graph_id] = graph_metadata.to_dict()
+            else:
+                # 兼容旧格式
+                created_at = datetime.now().isoformat()
+                config[graph_id] = {
+                    "name": name,
+                    "description": description,
+                    "working_dir": str(graph_dir),
+                    "created_at": created_at,
+                    "entity_count": 0,
+                    "relation_count": 0,
+                    "is_active": len(config) == 0
+                }
+            return dict(config[graph_id])
+
+        graph_info = await self.registry.update(_create)
 
         # 返回创建结果
-        if MULTI_GRAPH_SUPPORT:
-            return {
-                "status": "success",
-                "message": f"图谱 '{name}' 创建成功",
-                "graph_info": config[graph_id]
-            }
-        else:
-            return {
-                "status": "success",
-                "message": f"图谱 '{name}' 创建成功",
-                "graph_info": config[graph_id]
-            }
+        return {
+            "status": "success",
+            "message": f"图谱 '{name}' 创建成功",
+            "graph_info": graph_info
+        }
 
     async def get_current_graph(self) -> Optional[Dict[str, Any]]:
         """获取当前活跃图谱"""
-        config = self._load_graphs_config()
+        config = await self._load_graphs_config()
 
         # 查找活跃图谱
         for graph_id, graph_info in config.items():
             if graph_info.get("is_active", False):
                 # 更新统计信息
-                entity_count, relation_count = await self._count_graph_elements(graph_info["working_dir"])
-                graph_info["entity_count"] = entity_count
-                graph_info["relation_count"] = relation_count
+                graph_info.update(await self._load_graph_stats(graph_info))
                 return graph_info
 
         return None
 
     async def switch_graph(self, graph_id: str) -> Dict[str, Any]:
         """切换到指定图谱"""
-        config = self._load_graphs_config()
 
-        if graph_id not in config:
-            raise HTTPException(status_code=404, detail=f"图谱 '{graph_id}' 不存在")
+        def _activate(config: Dict[str, Any]) -> Dict[str, Any]:
+            if graph_id not in config:
+                raise HTTPException(status_code=404, detail=f"图谱 '{graph_id}' 不存在")
 
-        # 取消所有图谱的活跃状态
-        for gid, graph_info in config.items():
-            graph_info["is_active"] = False
+            # 取消所有图谱的活跃状态
+            for gid, graph_info in config.items():
+                graph_info["is_active"] = False
 
-        # 设置目标图谱为活跃
-        config[graph_id]["is_active"] = True
-        config[graph_id]["updated_at"] = datetime.now().isoformat()
+            # 设置目标图谱为活跃
+            config[graph_id]["is_active"] = True
+            config[graph_id]["updated_at"] = datetime.now().isoformat()
+            return dict(config[graph_id])
 
         # 保存配置
-        self._save_graphs_config(config)
+        target_info = await self.registry.update(_activate)
 
         # 更新当前图谱
         self.current_graph_id = graph_id
         # 注意：不要设置 current_rag = None，因为重新初始化需要用到它
 
         # 重新初始化RAG实例指向新的工作目录
-        await self._reinitialize_rag_for_graph(graph_id, config[graph_id])
+        await self._reinitialize_rag_for_graph(graph_id, target_info)
 
         return {
             "status": "success",
-            "message": f"已切换到图谱 '{config[graph_id].get('name', graph_id)}'",
+            "message": f"已切换到图谱 '{target_info.get('name', graph_id)}'",
             "current_graph": graph_id
         }
 
     async def list_graphs(self) -> List[Dict[str, Any]]:
         """列出所有图谱"""
-        config = self._load_graphs_config()
+        config = await self._load_graphs_config()
         graphs = []
 
         for graph_id, info in config.items():
-            # 统计实体和关系数量
-            entity_count, relation_count = await self._count_graph_elements(info["working_dir"])
-
-            # 更新统计信息
-            info["entity_count"] = entity_count
-            info["relation_count"] = relation_count
+            # 读取存储层维护的统计信息，不再解析存储文件
+            stats = await self._load_graph_stats(info)
+            info.update(stats)
+            entity_count = info.get("entity_count", 0)
+            relation_count = info.get("relation_count", 0)
 
             if MULTI_GRAPH_SUPPORT:
                 # 使用新的数据模型
@@ -374,6 +352,8 @@ class GraphManager:
                     "entity_count": entity_count,
                     "relation_count": relation_count,
                     "document_count": info.get("document_count", 0),
+                    "chunk_count": info.get("chunk_count", 0),
+                    "bytes_on_disk": info.get("bytes_on_disk", 0),
                     "metadata": info.get("metadata", {})
                 }
             else:
@@ -392,8 +372,51 @@ class GraphManager:
 
         return graphs
 
+    async def _load_graph_stats(self, graph_info: Dict[str, Any]) -> Dict[str, Any]:
+        """读取存储层在图谱工作目录中维护的统计信息（实体、关系、文档、分块、磁盘占用）
+
+        统计文件缺失或无法读取时（如统计文件引入前创建的图谱），解析存储文件回填一次并保存
+        """
+        working_dir = graph_info["working_dir"]
+        stats = await asyncio.to_thread(load_graph_stats, working_dir)
+        if "entity_count" not in stats and os.path.isdir(working_dir):
+            entity_count, relation_count = await self._count_graph_elements(working_dir)
+            stats = await self._save_counted_stats(
+                working_dir, entity_count, relation_count, backfill=True
+            )
+        return {
+            key: stats[key]
+            for key in (
+                "entity_count",
+                "relation_count",
+                "document_count",
+                "chunk_count",
+                "bytes_on_disk",
+            )
+            if key in stats
+        }
+
+    @staticmethod
+    async def _save_counted_stats(
+        working_dir: str, entity_count: int, relation_count: int, backfill: bool = False
+    ) -> Dict[str, Any]:
+        """在注册表锁内把解析存储文件得到的实体、关系数量写入统计文件
+
+        backfill 为 True 时，若其他进程已经写入了统计信息则保持不变
+        """
+        async with get_graph_registry_lock():
+            stats = await asyncio.to_thread(load_graph_stats, working_dir)
+            if backfill and "entity_count" in stats:
+                return stats
+            stats["entity_count"] = entity_count
+            stats["relation_count"] = relation_count
+            stats["bytes_on_disk"] = await asyncio.to_thread(get_dir_size, working_dir)
+            stats["updated_at"] = datetime.now(timezone.utc).isoformat()
+            await asyncio.to_thread(save_graph_stats, working_dir, stats)
+        return stats
+
     async def _count_graph_elements(self, working_dir: str) -> tuple[int, int]:
-        """统计图谱中的实体和关系数量"""
+        """解析存储文件统计图谱中的实体和关系数量（仅用于迁移等没有统计信息的场景）"""
         try:
             import os
             import json
@@ -529,13 +552,13 @@ class GraphManager:
             import shutil
             from pathlib import Path
 
-            config = self._load_graphs_config()
+            target_info = await self.registry.get(target_graph_id)
 
-            if target_graph_id not in config:
+            if target_info is None:
                 raise HTTPException(status_code=404, detail=f"目标图谱 '{target_graph_id}' 不存在")
 
             source_path = Path(source_dir)
-            target_path = Path(config[target_graph_id]["working_dir"])
+            target_path = Path(target_info["working_dir"])
 
             if not source_path.exists():
                 raise HTTPException(status_code=404, detail=f"源目录 '{source_dir}' 不存在")
@@ -578,12 +601,16 @@ class GraphManager:
 
             # 更新图谱统计信息
             entity_count, relation_count = await self._count_graph_elements(str(target_path))
-            config[target_graph_id]["entity_count"] = entity_count
-            config[target_graph_id]["relation_count"] = relation_count
-            config[target_graph_id]["updated_at"] = datetime.now().isoformat()
+            await self._save_counted_stats(str(target_path), entity_count, relation_count)
+
+            def _update_counts(config: Dict[str, Any]) -> None:
+                if target_graph_id in config:
+                    config[target_graph_id]["entity_count"] = entity_count
+                    config[target_graph_id]["relation_count"] = relation_count
+                    config[target_graph_id]["updated_at"] = datetime.now().isoformat()
 
             # 保存配置
-            self._save_graphs_config(config)
+            await self.registry.update(_update_counts)
 
             return {
                 "status": "success",
@@ -601,12 +628,14 @@ class GraphManager:
 
     async def delete_graph(self, graph_id: str) -> Dict[str, Any]:
         """删除指定的知识图谱"""
-        config = self._load_graphs_config()
 
-        if graph_id not in config:
-            raise HTTPException(status_code=404, detail=f"图谱 '{graph_id}' 不存在")
+        def _remove(config: Dict[str, Any]) -> Dict[str, Any]:
+            if graph_id not in config:
+                raise HTTPException(status_code=404, detail=f"图谱 '{graph_id}' 不存在")
+            return config.pop(graph_id)
 
-        graph_info = config[graph_id]
+        # 先从配置中移除，并发请求不会再看到该图谱
+        graph_info = await self.registry.update(_remove)
         graph_name = graph_info.get("name", graph_id)
 
         # 如果是当前活跃图谱，需要先切换
@@ -618,10 +647,8 @@ class GraphManager:
         graph_dir = Path(graph_info["working_dir"])
         if graph_dir.exists():
             shutil.rmtree(graph_dir)
-
-        # 从配置中移除
-        del config[graph_id]
-        self._save_graphs_config(config)
+        # 使缓存的查询上下文失效，同名图谱重建后不会命中旧数据
+        await bump_graph_version(graph_info["working_dir"])
 
         return {
             "status": "success",
@@ -630,28 +657,29 @@ class GraphManager:
 
     async def update_graph(self, graph_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
         """更新图谱信息"""
-        config = self._load_graphs_config()
 
-        if graph_id not in config:
-            raise HTTPException(status_code=404, detail=f"图谱 '{graph_id}' 不存在")
+        def _update(config: Dict[str, Any]) -> Dict[str, Any]:
+            if graph_id not in config:
+                raise HTTPException(status_code=404, detail=f"图谱 '{graph_id}' 不存在")
 
-        graph_info = config[graph_id]
+            graph_info = config[graph_id]
 
-        # 更新允许的字段
-        if "name" in update_data:
-            graph_info["name"] = update_data["name"]
-        if "description" in update_data:
-            graph_info["description"] = update_data["description"]
-        if "status" in update_data:
-            graph_info["status"] = update_data["status"]
-        if "metadata" in update_data:
-            graph_info["metadata"] = update_data["metadata"]
+            # 更新允许的字段
+            if "name" in update_data:
+                graph_info["name"] = update_data["name"]
+            if "description" in update_data:
+                graph_info["description"] = update_data["description"]
+            if "status" in update_data:
+                graph_info["status"] = update_data["status"]
+            if "metadata" in update_data:
+                graph_info["metadata"] = update_data["metadata"]
 
-        # 更新时间戳
-        graph_info["updated_at"] = datetime.now().isoformat()
+            # 更新时间戳
+            graph_info["updated_at"] = datetime.now().isoformat()
+            return dict(graph_info)
 
         # 保存配置
-        self._save_graphs_config(config)
+        graph_info = await self.registry.update(_update)
 
         return {
             "status": "success",
@@ -660,6 +688,35 @@ class GraphManager:
         }
 
 
+_MAX_IMPORT_PARSE_ERRORS = 100
+
+
+def _parse_import_line(line: bytes, line_no: int, parse_failures: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """解析 NDJSON 导入的一行，空行返回 None，解析失败时记录错误并返回 None"""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError("每行必须是一个 JSON 对象")
+    except ValueError as e:
+        parse_failures["count"] += 1
+        if len(parse_failures["errors"]) < _MAX_IMPORT_PARSE_ERRORS:
+            parse_failures["errors"].append({"line": line_no, "error": str(e)})
+        return None
+
+    # 兼容手动创建关系接口的字段名
+    if "source_entity" in record and "src_id" not in record:
+        record["src_id"] = record.pop("source_entity")
+    if "target_entity" in record and "tgt_id" not in record:
+        record["tgt_id"] = record.pop("target_entity")
+    if record.get("type", "relationship" if "src_id" in record else None) in ("relationship", "relation"):
+        record.setdefault("description", "")
+        record.setdefault("keywords", "")
+    return record
+
+
 def create_graph_routes(rag, api_key: Optional[str] = None):
     combined_auth = get_combined_auth_dependency(api_key)
 
@@ -853,8 +910,7 @@ def create_graph_routes(rag, api_key: Optional[str] = None):
                     "message": "当前没有活跃的图谱"
                 }
 
-            config = _graph_manager._load_graphs_config()
-            graph_info = config.get(_graph_manager.current_graph_id)
+            graph_info = await _graph_manager.registry.get(_graph_manager.current_graph_id)
 
             if graph_info is None:
                 return {
@@ -863,9 +919,11 @@ def create_graph_routes(rag, api_key: Optional[str] = None):
                     "message": "当前图谱配置不存在"
                 }
 
-            # 统计实体和关系数量
-            entity_count, relation_count = await _graph_manager._count_graph_elements(
-                graph_info["working_dir"]
+            # 读取存储层维护的统计信息
+            stats = await _graph_manager._load_graph_stats(graph_info)
+            entity_count = stats.get("entity_count", graph_info.get("entity_count", 0))
+            relation_count = stats.get(
+                "relation_count", graph_info.get("relation_count", 0)
             )
 
             return {
@@ -1251,6 +1309,65 @@ def create_graph_routes(rag, api_key: Optional[str] = None):
                 status_code=500, detail=f"批量创建关系失败: {str(e)}"
             )
 
+    @router.post("/graphs/import", dependencies=[Depends(combined_auth)])
+    async def import_graph_records(
+        request: Request,
+        batch_size: Optional[int] = Query(
+            None, ge=1, le=100000, description="每批写入的记录数，默认使用 CUSTOM_KG_BATCH_SIZE"
+        ),
+    ):
+        """
+        以 NDJSON 流式批量导入节点、关系和文本块
+
+        请求体每行一个 JSON 对象，type 为 entity、relationship 或 chunk，
+        字段与 ainsert_custom_kg 一致；关系也可使用 source_entity/target_entity。
+        请求体边读取边解析，按批校验后批量写入图谱和向量库，不会整体加载到内存。
+
+        Returns:
+            Dict: 导入结果统计
+        """
+        parse_failures = {"count": 0, "errors": []}
+
+        async def iter_records():
+            buffer = b""
+            line_no = 0
+            async for data in request.stream():
+                buffer += data
+                lines = buffer.split(b"\n")
+                buffer = lines.pop()
+                for line in lines:
+                    line_no += 1
+                    record = _parse_import_line(line, line_no, parse_failures)
+                    if record is not None:
+                        yield record
+            if buffer:
+                record = _parse_import_line(buffer, line_no + 1, parse_failures)
+                if record is not None:
+                    yield record
+
+        try:
+            result = await rag.ainsert_custom_kg_stream(
+                iter_records(), batch_size=batch_size
+            )
+            failed_count = result["failed"] + parse_failures["count"]
+            return {
+                "status": "completed",
+                "message": f"导入完成，实体: {result['entities']}, 关系: {result['relationships']}, "
+                f"文本块: {result['chunks']}, 失败: {failed_count}",
+                "entity_count": result["entities"],
+                "relation_count": result["relationships"],
+                "chunk_count": result["chunks"],
+                "failed_count": failed_count,
+                "errors": result["errors"],
+                "parse_errors": parse_failures["errors"],
+            }
+        except Exception as e:
+            logger.error(f"批量导入失败: {str(e)}")
+            logger.error(traceback.format_exc())
+            raise HTTPException(
+                status_code=500, detail=f"批量导入失败: {str(e)}"
+            )
+
     @router.delete("/graphs/relations/{source_entity}/{target_entity}", dependencies=[Depends(combined_auth)])
     async def delete_relation(source_entity: str, target_entity: str):
         """
@@ -1393,6 +1510,49 @@ def create_graph_routes(rag, api_key: Optional[str] = None):
                 status_code=500, detail=f"Error getting graph labels: {str(e)}"
             )
 
+    @router.get("/graph/label/search", dependencies=[Depends(combined_auth)])
+    async def search_graph_labels(
+        q: str = Query("", description="Label prefix, or substring when fuzzy"),
+        limit: int = Query(50, description="Maximum labels to return", ge=1, le=1000),
+        offset: int = Query(0, description="Number of matching labels to skip", ge=0),
+        fuzzy: bool = Query(False, description="Case-insensitive substring match"),
+    ):
+        """
+        Search graph labels with pagination
+
+        Returns:
+            List[str]: Matching graph labels, sorted alphabetically
+        """
+        try:
+            return await rag.search_graph_labels(
+                q, limit=limit, offset=offset, fuzzy=fuzzy
+            )
+        except Exception as e:
+            logger.error(f"Error searching graph labels: {str(e)}")
+            logger.error(traceback.format_exc())
+            raise HTTPException(
+                status_code=500, detail=f"Error searching graph labels: {str(e)}"
+            )
+
+    @router.get("/graph/label/popular", dependencies=[Depends(combined_auth)])
+    async def get_popular_graph_labels(
+        limit: int = Query(50, description="Maximum labels to return", ge=1, le=1000),
+    ):
+        """
+        Get the labels of the most connected nodes
+
+        Returns:
+            List[str]: Graph labels ordered by node degree, highest first
+        """
+        try:
+            return await rag.get_popular_graph_labels(limit)
+        except Exception as e:
+            logger.error(f"Error getting popular graph labels: {str(e)}")
+            logger.error(traceback.format_exc())
+            raise HTTPException(
+                status_code=500, detail=f"Error getting popular graph labels: {str(e)}"
+            )
+
     @router.get("/graphs", dependencies=[Depends(combined_auth)])
     async def get_knowledge_graph(
         label: str = Query(..., description="Label to get knowledge graph for"),
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional, Type
-from lightrag.utils import logger
+from lightrag.utils import logger, get_env_value, Tokenizer
+from functools import lru_cache
 import time
 import json
 import re
@@ -162,12 +163,88 @@ async def parse_request_body(
         )
 
 
-def estimate_tokens(text: str) -> int:
-    """Estimate the number of tokens in text using tiktoken"""
-    tokens = TiktokenTokenizer().encode(text)
+@lru_cache(maxsize=1)
+def _default_tokenizer() -> Tokenizer:
+    """Shared tiktoken tokenizer, built once per process"""
+    return TiktokenTokenizer()
+
+
+def estimate_tokens(text: str, tokenizer: Optional[Tokenizer] = None) -> int:
+    """Estimate the number of tokens in text, using tiktoken unless a tokenizer is given"""
+    tokens = (tokenizer or _default_tokenizer()).encode(text)
     return len(tokens)
 
 
+class StreamTokenCounter:
+    """Count completion tokens of a streamed response as chunks arrive
+
+    Chunks are buffered and encoded in segments cut before the last non-word
+    character (whitespace or punctuation, also in CJK text), so every character
+    is encoded exactly once and token merges rarely straddle a cut. Text without
+    any such character is cut once the buffer reaches MAX_PENDING_SIZE, keeping
+    the last FORCED_CUT_OVERLAP characters for the next segment. With
+    offload=True segments are encoded in a worker thread while streaming
+    continues.
+    """
+
+    SEGMENT_SIZE = 2048
+    MAX_PENDING_SIZE = 4 * SEGMENT_SIZE
+    FORCED_CUT_OVERLAP = 16
+    # Greedy match up to the last non-word character
+    _LAST_BREAK = re.compile(r".*\W", re.S)
+
+    def __init__(self, tokenizer: Optional[Tokenizer] = None, offload: bool = False):
+        self.tokenizer = tokenizer or _default_tokenizer()
+        self.offload = offload
+        self._count = 0
+        self._pending: list[str] = []
+        self._pending_size = 0
+        # Buffer size at which the next cut is attempted
+        self._cut_at = self.SEGMENT_SIZE
+        self._tasks: list[asyncio.Task] = []
+
+    def _encode(self, text: str) -> int:
+        return len(self.tokenizer.encode(text))
+
+    def _submit(self, text: str) -> None:
+        if self.offload:
+            self._tasks.append(asyncio.create_task(asyncio.to_thread(self._encode, text)))
+        else:
+            self._count += self._encode(text)
+
+    def add(self, chunk: str) -> None:
+        self._pending.append(chunk)
+        self._pending_size += len(chunk)
+        if self._pending_size < self._cut_at:
+            return
+        text = "".join(self._pending)
+        match = self._LAST_BREAK.match(text)
+        cut = match.end() - 1 if match else 0
+        if cut <= 0:
+            if len(text) < self.MAX_PENDING_SIZE:
+                # Scan again only after another segment has arrived
+                self._pending = [text]
+                self._cut_at = len(text) + self.SEGMENT_SIZE
+                return
+            cut = len(text) - self.FORCED_CUT_OVERLAP
+        self._submit(text[:cut])
+        self._pending = [text[cut:]]
+        self._pending_size = len(text) - cut
+        self._cut_at = self.SEGMENT_SIZE
+
+    async def total(self) -> int:
+        """Encode the remaining text and return the completion token count"""
+        if self._pending:
+            self._submit("".join(self._pending))
+            self._pending = []
+            self._pending_size = 0
+            self._cut_at = self.SEGMENT_SIZE
+        if self._tasks:
+            self._count += sum(await asyncio.gather(*self._tasks))
+            self._tasks = []
+        return self._count
+
+
 def parse_query_mode(query: str) -> tuple[str, SearchMode, bool, Optional[str]]:
     """Parse query prefix to determine search mode
     Returns tuple of (cleaned_query, search_mode, only_need_context, user_prompt)
@@ -229,6 +306,11 @@ class OllamaAPI:
         self.ollama_server_infos = ollama_server_infos
         self.top_k = top_k
         self.api_key = api_key
+        # Reuse the tokenizer configured for the server instead of building one per request
+        self.tokenizer = getattr(rag, "tokenizer", None) or _default_tokenizer()
+        self.count_tokens_in_thread = get_env_value(
+            "OLLAMA_TOKEN_COUNT_IN_THREAD", False, bool
+        )
         self.router = APIRouter(tags=["ollama"])
         self.setup_routes()
 
@@ -303,7 +385,7 @@ class OllamaAPI:
 
                 query = request.prompt
                 start_time = time.time_ns()
-                prompt_tokens = estimate_tokens(query)
+                prompt_tokens = estimate_tokens(query, self.tokenizer)
 
                 if request.system:
                     self.rag.llm_model_kwargs["system_prompt"] = request.system
@@ -334,7 +416,7 @@ class OllamaAPI:
                                 }
                                 yield f"{json.dumps(data, ensure_ascii=False)}\n"
 
-                                completion_tokens = estimate_tokens(total_response)
+                                completion_tokens = estimate_tokens(total_response, self.tokenizer)
                                 total_time = last_chunk_time - start_time
                                 prompt_eval_time = first_chunk_time - start_time
                                 eval_time = last_chunk_time - first_chunk_time
@@ -352,6 +434,9 @@ class OllamaAPI:
                                 }
                                 yield f"{json.dumps(data, ensure_ascii=False)}\n"
                             else:
+                                token_counter = StreamTokenCounter(
+                                    self.tokenizer, offload=self.count_tokens_in_thread
+                                )
                                 try:
                                     async for chunk in response:
                                         if chunk:
@@ -360,7 +445,7 @@ class OllamaAPI:
 
                                             last_chunk_time = time.time_ns()
 
-                                            total_response += chunk
+                                            token_counter.add(chunk)
                                             data = {
                                                 "model": self.ollama_server_infos.LIGHTRAG_MODEL,
                                                 "created_at": self.ollama_server_infos.LIGHTRAG_CREATED_AT,
@@ -396,7 +481,7 @@ class OllamaAPI:
                                     return
                                 if first_chunk_time is None:
                                     first_chunk_time = start_time
-                                completion_tokens = estimate_tokens(total_response)
+                                completion_tokens = await token_counter.total()
                                 total_time = last_chunk_time - start_time
                                 prompt_eval_time = first_chunk_time - start_time
                                 eval_time = last_chunk_time - first_chunk_time
@@ -439,7 +524,7 @@ class OllamaAPI:
                     if not response_text:
                         response_text = "No response generated"
 
-                    completion_tokens = estimate_tokens(str(response_text))
+                    completion_tokens = estimate_tokens(str(response_text), self.tokenizer)
                     total_time = last_chunk_time - start_time
                     prompt_eval_time = first_chunk_time - start_time
                     eval_time = last_chunk_time - first_chunk_time
@@ -491,7 +576,7 @@ class OllamaAPI:
                 )
 
                 start_time = time.time_ns()
-                prompt_tokens = estimate_tokens(cleaned_query)
+                prompt_tokens = estimate_tokens(cleaned_query, self.tokenizer)
 
                 param_dict = {
                     "mode": mode,
@@ -554,7 +639,7 @@ class OllamaAPI:
                                 }
                                 yield f"{json.dumps(data, ensure_ascii=False)}\n"
 
-                                completion_tokens = estimate_tokens(total_response)
+                                completion_tokens = estimate_tokens(total_response, self.tokenizer)
                                 total_time = last_chunk_time - start_time
                                 prompt_eval_time = first_chunk_time - start_time
                                 eval_time = last_chunk_time - first_chunk_time
@@ -572,6 +657,9 @@ class OllamaAPI:
                                 }
                                 yield f"{json.dumps(data, ensure_ascii=False)}\n"
                             else:
+                                token_counter = StreamTokenCounter(
+                                    self.tokenizer, offload=self.count_tokens_in_thread
+                                )
                                 try:
                                     async for chunk in response:
                                         if chunk:
@@ -580,7 +668,7 @@ class OllamaAPI:
 
                                             last_chunk_time = time.time_ns()
 
-                                            total_response += chunk
+                                            token_counter.add(chunk)
                                             data = {
                                                 "model": self.ollama_server_infos.LIGHTRAG_MODEL,
                                                 "created_at": self.ollama_server_infos.LIGHTRAG_CREATED_AT,
@@ -625,7 +713,7 @@ class OllamaAPI:
 
                                 if first_chunk_time is None:
                                     first_chunk_time = start_time
-                                completion_tokens = estimate_tokens(total_response)
+                                completion_tokens = await token_counter.total()
                                 total_time = last_chunk_time - start_time
                                 prompt_eval_time = first_chunk_time - start_time
                                 eval_time = last_chunk_time - first_chunk_time
@@ -689,7 +777,7 @@ class OllamaAPI:
                     if not response_text:
                         response_text = "No response generated"
 
-                    completion_tokens = estimate_tokens(str(response_text))
+                    completion_tokens = estimate_tokens(str(response_text), self.tokenizer)
                     total_time = last_chunk_time - start_time
                     prompt_eval_time = first_chunk_time - start_time
                     eval_time = last_chunk_time - first_chunk_time
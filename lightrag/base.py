@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from enum import Enum
+import heapq
 import os
 from dotenv import load_dotenv
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import (
     Any,
+    AsyncIterator,
     Literal,
     TypedDict,
     TypeVar,
@@ -551,6 +553,34 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             edge_data: A dictionary of edge properties
         """
 
+    async def upsert_nodes_batch(self, nodes: dict[str, dict[str, str]]) -> None:
+        """Insert or update multiple nodes in one call
+
+        Default implementation upserts nodes one by one.
+        Override this method for better performance in storage backends
+        that support batch operations.
+
+        Args:
+            nodes: Mapping of node ID to node properties
+        """
+        for node_id, node_data in nodes.items():
+            await self.upsert_node(node_id, node_data)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """Insert or update multiple edges in one call
+
+        Default implementation upserts edges one by one.
+        Override this method for better performance in storage backends
+        that support batch operations.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        for source_node_id, target_node_id, edge_data in edges:
+            await self.upsert_edge(source_node_id, target_node_id, edge_data)
+
     @abstractmethod
     async def delete_node(self, node_id: str) -> None:
         """Delete a node from the graph.
@@ -598,6 +628,141 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             A list of all node labels in the graph, sorted alphabetically
         """
 
+    async def get_graph_counts(self) -> tuple[int, int] | None:
+        """Get the number of nodes and edges in the graph.
+
+        Returns None when the backend cannot count them cheaply, callers then
+        count the labels and edges with a scan. Override this method in storage
+        backends that keep or can query the counts in constant time.
+        """
+        return None
+
+    # Set by backends whose upserts and deletes call record_count_changes
+    tracks_count_changes = False
+
+    def record_count_changes(self, nodes: int = 0, edges: int = 0) -> None:
+        """Add node and edge count changes made by this instance
+
+        Backends that track their counts call this from their upsert and delete
+        methods, once the write succeeded, with the number of nodes and edges
+        created (positive) or deleted (negative).
+        """
+        pending = getattr(self, "_pending_count_changes", (0, 0))
+        if pending is not None:
+            self._pending_count_changes = (pending[0] + nodes, pending[1] + edges)
+
+    def invalidate_count_changes(self) -> None:
+        """Make the next pop_count_changes ask for a full count, e.g. after a drop"""
+        self._pending_count_changes = None
+
+    def pop_count_changes(self) -> tuple[int, int] | None:
+        """Take the node and edge count changes recorded since the last call
+
+        Returns:
+            The (nodes, edges) changes, or None when the backend does not track
+            them or they were invalidated, in which case the graph must be counted
+        """
+        pending = getattr(self, "_pending_count_changes", (0, 0))
+        self._pending_count_changes = (0, 0)
+        return pending if self.tracks_count_changes else None
+
+    async def iter_nodes(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[list[tuple[str, dict[str, str]]]]:
+        """Stream all nodes of the graph in batches.
+
+        Default implementation pages through get_all_labels with get_nodes_batch.
+        Override this method in storage backends that can scan nodes directly.
+
+        Args:
+            batch_size: Maximum number of nodes per yielded batch
+
+        Yields:
+            Lists of (node_id, node_data) tuples
+        """
+        labels = await self.get_all_labels()
+        for start in range(0, len(labels), batch_size):
+            node_ids = labels[start : start + batch_size]
+            nodes = await self.get_nodes_batch(node_ids)
+            batch = [
+                (node_id, nodes[node_id]) for node_id in node_ids if node_id in nodes
+            ]
+            if batch:
+                yield batch
+
+    async def iter_edges(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[list[tuple[str, str, dict[str, str]]]]:
+        """Stream all edges of the graph in batches, each undirected edge once.
+
+        Default implementation pages through get_all_labels with
+        get_nodes_edges_batch and get_edges_batch, emitting an edge only from
+        its lexicographically smaller endpoint so no seen-set is needed.
+        Override this method in storage backends that can scan edges directly.
+
+        Args:
+            batch_size: Number of nodes whose edges are fetched per round
+
+        Yields:
+            Lists of (source_node_id, target_node_id, edge_data) tuples
+        """
+        labels = await self.get_all_labels()
+        for start in range(0, len(labels), batch_size):
+            node_edges = await self.get_nodes_edges_batch(
+                labels[start : start + batch_size]
+            )
+            pairs = []
+            for node_id, edges in node_edges.items():
+                for src_id, tgt_id in edges:
+                    other = tgt_id if src_id == node_id else src_id
+                    if node_id <= other:
+                        pairs.append({"src": node_id, "tgt": other})
+            if not pairs:
+                continue
+            edges_data = await self.get_edges_batch(pairs)
+            batch = [
+                (pair["src"], pair["tgt"], edges_data[(pair["src"], pair["tgt"])])
+                for pair in pairs
+                if (pair["src"], pair["tgt"]) in edges_data
+            ]
+            if batch:
+                yield batch
+
+    async def search_labels(
+        self, query: str = "", limit: int = 50, offset: int = 0, fuzzy: bool = False
+    ) -> list[str]:
+        """Search node labels, sorted alphabetically and paginated.
+
+        Default implementation filters the result of get_all_labels.
+        Override this method in storage backends that can search labels natively.
+
+        Args:
+            query: Label prefix to match, or any substring (case-insensitive) when fuzzy is True
+            limit: Maximum number of labels to return
+            offset: Number of matching labels to skip
+
+        Returns:
+            A page of matching labels
+        """
+        labels = await self.get_all_labels()
+        if query:
+            if fuzzy:
+                needle = query.casefold()
+                labels = [label for label in labels if needle in label.casefold()]
+            else:
+                labels = [label for label in labels if label.startswith(query)]
+        return labels[offset : offset + limit]
+
+    async def get_popular_labels(self, limit: int = 50) -> list[str]:
+        """Get the labels of the nodes with the highest degree, highest first.
+
+        Default implementation ranks all labels with node_degrees_batch.
+        Override this method in storage backends that can rank nodes natively.
+        """
+        labels = await self.get_all_labels()
+        degrees = await self.node_degrees_batch(labels)
+        return heapq.nlargest(limit, labels, key=lambda label: degrees.get(label, 0))
+
     @abstractmethod
     async def get_knowledge_graph(
         self, node_label: str, max_depth: int = 3, max_nodes: int = 1000
@@ -665,6 +830,75 @@ class DocStatusStorage(BaseKVStorage, ABC):
     ) -> dict[str, DocProcessingStatus]:
         """Get all documents with a specific status"""
 
+    async def get_docs_by_statuses(
+        self, statuses: list[DocStatus]
+    ) -> dict[str, DocProcessingStatus]:
+        """Get all documents in any of the given statuses, grouped in the given order
+
+        Default implementation calls get_docs_by_status per status. Override this
+        method in storage backends that can select several statuses at once.
+        """
+        result: dict[str, DocProcessingStatus] = {}
+        for status in statuses:
+            result.update(await self.get_docs_by_status(status))
+        return result
+
+    async def get_docs_paginated(
+        self,
+        status: DocStatus | None = None,
+        page: int = 1,
+        page_size: int = 50,
+        sort_field: Literal[
+            "created_at", "updated_at", "id", "file_path"
+        ] = "updated_at",
+        sort_direction: Literal["asc", "desc"] = "desc",
+        file_path_filter: str | None = None,
+        include_content: bool = False,
+    ) -> tuple[list[tuple[str, DocProcessingStatus]], int]:
+        """Get one page of documents, optionally filtered by status and file path
+
+        Default implementation loads the matching statuses through
+        get_docs_by_status and sorts them in memory. Override this method in
+        storage backends that can filter, sort and page natively.
+
+        Args:
+            status: Only return documents with this status, all statuses if None
+            page: 1-based page number
+            page_size: Number of documents per page
+            sort_field: Field to sort by
+            sort_direction: "asc" or "desc"
+            file_path_filter: Case-insensitive substring the file path must contain
+            include_content: Keep the full document content, otherwise content is ""
+
+        Returns:
+            Tuple of (list of (doc_id, DocProcessingStatus) for the page, total
+            number of matching documents)
+        """
+        statuses = [status] if status is not None else list(DocStatus)
+        docs: dict[str, DocProcessingStatus] = {}
+        for doc_status in statuses:
+            docs.update(await self.get_docs_by_status(doc_status))
+
+        items = list(docs.items())
+        if file_path_filter:
+            needle = file_path_filter.casefold()
+            items = [
+                item for item in items if needle in (item[1].file_path or "").casefold()
+            ]
+
+        def sort_key(item: tuple[str, DocProcessingStatus]):
+            value = item[0] if sort_field == "id" else getattr(item[1], sort_field)
+            return str(value or ""), item[0]
+
+        items.sort(key=sort_key, reverse=sort_direction == "desc")
+        start = (max(page, 1) - 1) * page_size
+        page_items = items[start : start + page_size]
+        if not include_content:
+            page_items = [
+                (doc_id, replace(doc, content="")) for doc_id, doc in page_items
+            ]
+        return page_items, len(items)
+
     async def drop_cache_by_modes(self, modes: list[str] | None = None) -> bool:
         """Drop cache is not supported for Doc Status storage"""
         return False
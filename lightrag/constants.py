@@ -15,6 +15,13 @@ DEFAULT_TIMEOUT = 150
 # Separator for graph fields
 GRAPH_FIELD_SEP = "<SEP>"
 
+# Per-chunk processing stages checkpointed in doc status metadata
+CHUNK_STAGE_VECTORIZED = "vectorized"
+# LLM cache mode prefix of the extraction result batches of unfinished documents
+EXTRACTION_CHECKPOINT_MODE_PREFIX = "ckpt-"
+# Per-graph counters kept in the working directory
+GRAPH_STATS_FILE = "graph_stats.json"
+
 # Logging configuration defaults
 DEFAULT_LOG_MAX_BYTES = 10485760  # Default 10MB
 DEFAULT_LOG_BACKUP_COUNT = 5  # Default 5 backups
@@ -1,11 +1,12 @@
 import asyncio
 import os
 from dataclasses import dataclass
+from functools import partial
 from typing import Any, final
 import numpy as np
 
 from lightrag.base import BaseVectorStorage
-from lightrag.utils import logger
+from lightrag.utils import logger, get_env_value, BlockingIOExecutor
 import pipmaster as pm
 
 if not pm.is_installed("chromadb"):
@@ -14,6 +15,13 @@ if not pm.is_installed("chromadb"):
 from chromadb import HttpClient, PersistentClient  # type: ignore
 from chromadb.config import Settings  # type: ignore
 
+# Chroma clients are blocking, run them off the event loop
+_executor = BlockingIOExecutor(
+    get_env_value("VECTOR_DB_MAX_WORKERS", 8, int),
+    get_env_value("VECTOR_DB_TIMEOUT", 60, float),
+    thread_name_prefix="chroma",
+)
+
 
 @final
 @dataclass
@@ -57,7 +65,8 @@ class ChromaVectorDBStorage(BaseVectorStorage):
 
             local_path = config.get("local_path", None)
             if local_path:
-                self._client = PersistentClient(
+                self._client_factory = partial(
+                    PersistentClient,
                     path=local_path,
                     settings=Settings(
                         allow_reset=True,
@@ -80,7 +89,8 @@ class ChromaVectorDBStorage(BaseVectorStorage):
                 elif "basic_authn" in auth_provider:
                     auth_credentials = config.get("auth_credentials", "admin:admin")
 
-                self._client = HttpClient(
+                self._client_factory = partial(
+                    HttpClient,
                     host=config.get("host", "localhost"),
                     port=config.get("port", 8000),
                     headers=headers,
@@ -93,13 +103,12 @@ class ChromaVectorDBStorage(BaseVectorStorage):
                     ),
                 )
 
-            self._collection = self._client.get_or_create_collection(
-                name=self.namespace,
-                metadata={
-                    **collection_settings,
-                    "dimension": self.embedding_func.embedding_dim,
-                },
-            )
+            self._collection_metadata = {
+                **collection_settings,
+                "dimension": self.embedding_func.embedding_dim,
+            }
+            self._client = None
+            self._collection = None
             # Use batch size from collection settings if specified
             self._max_batch_size = self.global_config.get(
                 "embedding_batch_num", collection_settings.get("hnsw:batch_size", 32)
@@ -108,6 +117,21 @@ class ChromaVectorDBStorage(BaseVectorStorage):
             logger.error(f"ChromaDB initialization failed: {str(e)}")
             raise
 
+    async def initialize(self):
+        """Create the client and collection off the event loop"""
+        if self._collection is not None:
+            return
+        try:
+            self._client = await _executor.run(self._client_factory)
+            self._collection = await _executor.run(
+                self._client.get_or_create_collection,
+                name=self.namespace,
+                metadata=self._collection_metadata,
+            )
+        except Exception as e:
+            logger.error(f"ChromaDB initialization failed: {str(e)}")
+            raise
+
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         logger.info(f"Inserting {len(data)} to {self.namespace}")
         if not data:
@@ -151,7 +175,8 @@ class ChromaVectorDBStorage(BaseVectorStorage):
             for i in range(0, len(ids), self._max_batch_size):
                 batch_slice = slice(i, i + self._max_batch_size)
 
-                self._collection.upsert(
+                await _executor.run(
+                    self._collection.upsert,
                     ids=ids[batch_slice],
                     embeddings=embeddings[batch_slice].tolist(),
                     documents=documents[batch_slice],
@@ -172,7 +197,8 @@ class ChromaVectorDBStorage(BaseVectorStorage):
                 [query], _priority=5
             )  # higher priority for query
 
-            results = self._collection.query(
+            results = await _executor.run(
+                self._collection.query,
                 query_embeddings=embedding.tolist()
                 if not isinstance(embedding, list)
                 else embedding,
@@ -213,7 +239,7 @@ class ChromaVectorDBStorage(BaseVectorStorage):
         """
         try:
             logger.info(f"Deleting entity with ID {entity_name} from {self.namespace}")
-            self._collection.delete(ids=[entity_name])
+            await _executor.run(self._collection.delete, ids=[entity_name])
         except Exception as e:
             logger.error(f"Error during entity deletion: {str(e)}")
             raise
@@ -235,7 +261,7 @@ class ChromaVectorDBStorage(BaseVectorStorage):
         """
         try:
             logger.info(f"Deleting {len(ids)} vectors from {self.namespace}")
-            self._collection.delete(ids=ids)
+            await _executor.run(self._collection.delete, ids=ids)
             logger.debug(
                 f"Successfully deleted {len(ids)} vectors from {self.namespace}"
             )
@@ -258,8 +284,10 @@ class ChromaVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Query the collection for a single vector by ID
-            result = self._collection.get(
-                ids=[id], include=["metadatas", "embeddings", "documents"]
+            result = await _executor.run(
+                self._collection.get,
+                ids=[id],
+                include=["metadatas", "embeddings", "documents"],
             )
 
             if not result or not result["ids"] or len(result["ids"]) == 0:
@@ -291,8 +319,10 @@ class ChromaVectorDBStorage(BaseVectorStorage):
 
         try:
             # Query the collection for multiple vectors by IDs
-            result = self._collection.get(
-                ids=ids, include=["metadatas", "embeddings", "documents"]
+            result = await _executor.run(
+                self._collection.get,
+                ids=ids,
+                include=["metadatas", "embeddings", "documents"],
             )
 
             if not result or not result["ids"] or len(result["ids"]) == 0:
@@ -325,10 +355,10 @@ class ChromaVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Get all IDs in the collection
-            result = self._collection.get(include=[])
+            result = await _executor.run(self._collection.get, include=[])
             if result and result["ids"] and len(result["ids"]) > 0:
                 # Delete all documents
-                self._collection.delete(ids=result["ids"])
+                await _executor.run(self._collection.delete, ids=result["ids"])
 
             logger.info(
                 f"Process {os.getpid()} drop ChromaDB collection {self.namespace}"
@@ -16,6 +16,12 @@ from .shared_storage import (
     get_update_flag,
     set_all_update_flags,
 )
+from .vector_index import (
+    DocRowIndex,
+    doc_filter_keys,
+    register_chunk_store,
+    resolve_doc_filter,
+)
 
 import faiss  # type: ignore
 
@@ -54,15 +60,30 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # Embedding dimension (e.g. 768) must match your embedding function
         self._dim = self.embedding_func.embedding_dim
 
+        # float32 vectors by default, float16 codes to halve the index memory
+        self._precision = kwargs.get("vector_precision", "float32")
+        if self._precision == "int8":
+            logger.warning(
+                "FAISS: int8 vector precision is not supported, using float16 instead"
+            )
+            self._precision = "float16"
+
         # Create an empty Faiss index for inner product (useful for normalized vectors = cosine similarity).
         # If you have a large number of vectors, you might want IVF or other indexes.
-        # For demonstration, we use a simple IndexFlatIP.
-        self._index = faiss.IndexFlatIP(self._dim)
+        self._index = self._new_index()
         # Keep a local store for metadata, IDs, etc.
         # Maps <int faiss_id> → metadata (including your original ID).
         self._id_to_meta = {}
-
-        self._load_faiss_index()
+        # Faiss ids by doc/chunk id, for queries filtered by ids
+        self._filter_index = DocRowIndex(doc_filter_keys(self.namespace))
+
+    def _new_index(self):
+        """Create an empty exhaustive inner product index in the configured precision"""
+        if self._precision == "float16":
+            return faiss.IndexScalarQuantizer(
+                self._dim, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT
+            )
+        return faiss.IndexFlatIP(self._dim)
 
     async def initialize(self):
         """Initialize storage data"""
@@ -70,6 +91,10 @@ class FaissVectorDBStorage(BaseVectorStorage):
         self.storage_updated = await get_update_flag(self.namespace)
         # Get the storage lock for use in other methods
         self._storage_lock = get_storage_lock()
+        # Index files are read here rather than in the constructor, so the
+        # storage is only loaded when it is initialized
+        await asyncio.to_thread(self._load_faiss_index)
+        register_chunk_store(self.global_config["working_dir"], self.namespace, self)
 
     async def _get_index(self):
         """Check if the shtorage should be reloaded"""
@@ -81,12 +106,19 @@ class FaissVectorDBStorage(BaseVectorStorage):
                     f"Process {os.getpid()} FAISS reloading {self.namespace} due to update by another process"
                 )
                 # Reload data
-                self._index = faiss.IndexFlatIP(self._dim)
+                self._index = self._new_index()
                 self._id_to_meta = {}
                 self._load_faiss_index()
+                self._filter_index.invalidate()
                 self.storage_updated.value = False
             return self._index
 
+    async def get_ids_by_filter_keys(self, keys: list[str]) -> set[str]:
+        """Ids of the vectors whose doc id (chunks) or source chunk ids match `keys`"""
+        await self._get_index()
+        self._filter_index.build(self._id_to_meta.items())
+        return self._filter_index.ids_for(keys)
+
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         """
         Insert or update vectors in the Faiss index.
@@ -159,12 +191,11 @@ class FaissVectorDBStorage(BaseVectorStorage):
         start_idx = index.ntotal
         index.add(embeddings)
 
-        # Step 3: Store metadata + vector for each new ID
+        # Step 3: Store metadata for each new ID
         for i, meta in enumerate(list_data):
             fid = start_idx + i
-            # Store the raw vector so we can rebuild if something is removed
-            meta["__vector__"] = embeddings[i].tolist()
             self._id_to_meta.update({fid: meta})
+        self._filter_index.invalidate()
 
         logger.info(f"Upserted {len(list_data)} vectors into Faiss index.")
         return [m["__id__"] for m in list_data]
@@ -186,9 +217,28 @@ class FaissVectorDBStorage(BaseVectorStorage):
             f"Query: {query}, top_k: {top_k}, threshold: {self.cosine_better_than_threshold}"
         )
 
+        filter_keys = None
+        if ids is not None:
+            filter_keys = await resolve_doc_filter(
+                self.global_config["working_dir"], self.namespace, ids
+            )
+
         # Perform the similarity search
         index = await self._get_index()
-        distances, indices = index.search(embedding, top_k)
+        if filter_keys is None:
+            distances, indices = index.search(embedding, top_k)
+        else:
+            # Restrict the search to the vectors of the requested documents
+            self._filter_index.build(self._id_to_meta.items())
+            rows = self._filter_index.rows_for(filter_keys)
+            if len(rows) == 0:
+                return []
+            selector = faiss.IDSelectorBatch(rows)
+            distances, indices = index.search(
+                embedding,
+                min(top_k, len(rows)),
+                params=faiss.SearchParameters(sel=selector),
+            )
 
         distances = distances[0]
         indices = indices[0]
@@ -287,27 +337,21 @@ class FaissVectorDBStorage(BaseVectorStorage):
     async def _remove_faiss_ids(self, fid_list):
         """
         Remove a list of internal Faiss IDs from the index.
-        Because IndexFlatIP doesn't support 'removals',
-        we rebuild the index excluding those vectors.
+        The index compacts the remaining vectors in order, so the metadata
+        is renumbered the same way.
         """
-        keep_fids = [fid for fid in self._id_to_meta if fid not in fid_list]
-
-        # Rebuild the index
-        vectors_to_keep = []
-        new_id_to_meta = {}
-        for new_fid, old_fid in enumerate(keep_fids):
-            vec_meta = self._id_to_meta[old_fid]
-            vectors_to_keep.append(vec_meta["__vector__"])  # stored as list
-            new_id_to_meta[new_fid] = vec_meta
+        remove_fids = set(fid_list)
+        keep_fids = [fid for fid in sorted(self._id_to_meta) if fid not in remove_fids]
 
         async with self._storage_lock:
-            # Re-init index
-            self._index = faiss.IndexFlatIP(self._dim)
-            if vectors_to_keep:
-                arr = np.array(vectors_to_keep, dtype=np.float32)
-                self._index.add(arr)
-
-            self._id_to_meta = new_id_to_meta
+            self._index.remove_ids(
+                faiss.IDSelectorBatch(np.asarray(sorted(remove_fids), dtype=np.int64))
+            )
+            self._id_to_meta = {
+                new_fid: self._id_to_meta[old_fid]
+                for new_fid, old_fid in enumerate(keep_fids)
+            }
+            self._filter_index.invalidate()
 
     def _save_faiss_index(self):
         """
@@ -316,7 +360,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
         faiss.write_index(self._index, self._faiss_index_file)
 
         # Save metadata dict to JSON. Convert all keys to strings for JSON storage.
-        # _id_to_meta is { int: { '__id__': doc_id, '__vector__': [float,...], ... } }
+        # _id_to_meta is { int: { '__id__': doc_id, ... } }
         # We'll keep the int -> dict, but JSON requires string keys.
         serializable_dict = {}
         for fid, meta in self._id_to_meta.items():
@@ -345,15 +389,24 @@ class FaissVectorDBStorage(BaseVectorStorage):
             self._id_to_meta = {}
             for fid_str, meta in stored_dict.items():
                 fid = int(fid_str)
+                # Vectors are read back from the index, drop copies saved by older versions
+                meta.pop("__vector__", None)
                 self._id_to_meta[fid] = meta
 
+            # Re-encode an index saved with another precision
+            new_index = self._new_index()
+            if self._index.code_size != new_index.code_size:
+                if self._index.ntotal:
+                    new_index.add(self._index.reconstruct_n(0, self._index.ntotal))
+                self._index = new_index
+
             logger.info(
                 f"Faiss index loaded with {self._index.ntotal} vectors from {self._faiss_index_file}"
             )
         except Exception as e:
             logger.error(f"Failed to load Faiss index or metadata: {e}")
             logger.warning("Starting with an empty Faiss index.")
-            self._index = faiss.IndexFlatIP(self._dim)
+            self._index = self._new_index()
             self._id_to_meta = {}
 
     async def index_done_callback(self) -> None:
@@ -364,9 +417,10 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 logger.warning(
                     f"Storage for FAISS {self.namespace} was updated by another process, reloading..."
                 )
-                self._index = faiss.IndexFlatIP(self._dim)
+                self._index = self._new_index()
                 self._id_to_meta = {}
                 self._load_faiss_index()
+                self._filter_index.invalidate()
                 self.storage_updated.value = False
                 return False  # Return error
 
@@ -457,7 +511,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
         try:
             async with self._storage_lock:
                 # Reset the index
-                self._index = faiss.IndexFlatIP(self._dim)
+                self._index = self._new_index()
                 self._id_to_meta = {}
 
                 # Remove storage files if they exist
@@ -468,6 +522,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
                 self._id_to_meta = {}
                 self._load_faiss_index()
+                self._filter_index.invalidate()
 
                 # Notify other processes
                 await set_all_update_flags(self.namespace)
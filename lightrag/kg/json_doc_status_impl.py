@@ -1,6 +1,7 @@
 from dataclasses import dataclass
+import heapq
 import os
-from typing import Any, Union, final
+from typing import Any, Literal, Union, final
 
 from lightrag.base import (
     DocProcessingStatus,
@@ -14,7 +15,7 @@ from lightrag.utils import (
 )
 from .shared_storage import (
     get_namespace_data,
-    get_storage_lock,
+    get_storage_rw_lock,
     get_data_init_lock,
     get_update_flag,
     set_all_update_flags,
@@ -34,11 +35,19 @@ class JsonDocStatusStorage(DocStatusStorage):
         self._data = None
         self._storage_lock = None
         self.storage_updated = None
+        # status -> doc ids (dict as an insertion-ordered set), kept in sync by
+        # upsert/delete of this process; its sizes are the per-status counters
+        self._status_index: dict[str, dict[str, None]] | None = None
+        self._status_index_updated = None
 
     async def initialize(self):
         """Initialize storage data"""
-        self._storage_lock = get_storage_lock()
+        self._storage_lock = get_storage_rw_lock(self.namespace)
         self.storage_updated = await get_update_flag(self.namespace)
+        # Raised by other processes when they change statuses, so the index is rebuilt
+        self._status_index_updated = await get_update_flag(
+            self._status_index_namespace
+        )
 
         # 重新计算文件路径（支持工作目录变更）
         new_file_path = os.path.join(
@@ -56,7 +65,7 @@ class JsonDocStatusStorage(DocStatusStorage):
             self._data = await get_namespace_data(self.namespace)
             if need_init:
                 loaded_data = load_json(self._file_name) or {}
-                async with self._storage_lock:
+                async with self._storage_lock.write():
                     self._data.update(loaded_data)
                     logger.info(
                         f"Process {os.getpid()} doc status load {self.namespace} with {len(loaded_data)} records"
@@ -76,57 +85,159 @@ class JsonDocStatusStorage(DocStatusStorage):
                 # 清空当前数据并重新加载
                 self._data.clear()
                 self._data.update(loaded_data)
+                self._status_index = None
                 logger.info(f"Doc status reloaded {len(loaded_data)} records from {new_file_path}")
             else:
                 logger.info(f"No doc status data found at {new_file_path}")
 
     async def filter_keys(self, keys: set[str]) -> set[str]:
         """Return keys that should be processed (not in storage or not successfully processed)"""
-        async with self._storage_lock:
+        async with self._storage_lock.read():
             return set(keys) - set(self._data.keys())
 
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
         result: list[dict[str, Any]] = []
-        async with self._storage_lock:
+        async with self._storage_lock.read():
             for id in ids:
                 data = self._data.get(id, None)
                 if data:
                     result.append(data)
         return result
 
+    @property
+    def _status_index_namespace(self) -> str:
+        return f"{self.namespace}_status_index"
+
+    @staticmethod
+    def _status_key(status: Any) -> str:
+        return getattr(status, "value", status)
+
+    def _get_status_index(self) -> dict[str, dict[str, None]]:
+        """Per-status doc id index, rebuilt when missing or changed by another process
+
+        Must be called with the storage lock held.
+        """
+        if self._status_index is None or (
+            self._status_index_updated is not None
+            and self._status_index_updated.value
+        ):
+            index: dict[str, dict[str, None]] = {
+                status.value: {} for status in DocStatus
+            }
+            for doc_id, doc in self._data.items():
+                index.setdefault(self._status_key(doc.get("status")), {})[doc_id] = None
+            self._status_index = index
+            if self._status_index_updated is not None:
+                self._status_index_updated.value = False
+        return self._status_index
+
+    async def _notify_status_index_changed(self) -> None:
+        """Tell other processes to rebuild their index; must hold the storage lock"""
+        await set_all_update_flags(self._status_index_namespace)
+        if self._status_index_updated is not None:
+            self._status_index_updated.value = False
+
+    @staticmethod
+    def _to_doc_status(
+        data: dict[str, Any], include_content: bool = True
+    ) -> DocProcessingStatus:
+        # Make a copy of the data to avoid modifying the original
+        data = data.copy()
+        if not include_content:
+            data["content"] = ""
+        # If content is missing, use content_summary as content
+        elif "content" not in data and "content_summary" in data:
+            data["content"] = data["content_summary"]
+        # If file_path is not in data, use document id as file path
+        if "file_path" not in data:
+            data["file_path"] = "no-file-path"
+        return DocProcessingStatus(**data)
+
+    async def get_docs_paginated(
+        self,
+        status: DocStatus | None = None,
+        page: int = 1,
+        page_size: int = 50,
+        sort_field: Literal["created_at", "updated_at", "id", "file_path"] = "updated_at",
+        sort_direction: Literal["asc", "desc"] = "desc",
+        file_path_filter: str | None = None,
+        include_content: bool = False,
+    ) -> tuple[list[tuple[str, DocProcessingStatus]], int]:
+        """Page through documents using the per-status index
+
+        Only documents of the requested status are visited, and only the first
+        page * page_size of them are kept in sorted order (heap selection), so
+        a page costs O(n log(page * page_size)) for n documents in that status.
+        """
+        page = max(page, 1)
+        needle = file_path_filter.casefold() if file_path_filter else None
+        limit = page * page_size
+        async with self._storage_lock.read():
+            index = self._get_status_index()
+            if status is not None:
+                doc_ids = list(index.get(status.value, ()))
+            else:
+                doc_ids = [doc_id for ids in index.values() for doc_id in ids]
+
+            candidates = []
+            for doc_id in doc_ids:
+                doc = self._data.get(doc_id)
+                if doc is None:
+                    continue
+                if needle and needle not in str(doc.get("file_path", "")).casefold():
+                    continue
+                value = doc_id if sort_field == "id" else doc.get(sort_field)
+                candidates.append((str(value or ""), doc_id, doc))
+
+            select = heapq.nlargest if sort_direction == "desc" else heapq.nsmallest
+            selected = select(limit, candidates, key=lambda c: (c[0], c[1]))
+            page_items = []
+            for _, doc_id, doc in selected[limit - page_size :]:
+                try:
+                    page_items.append(
+                        (doc_id, self._to_doc_status(doc, include_content))
+                    )
+                except (KeyError, TypeError) as e:
+                    logger.error(f"Missing required field for document {doc_id}: {e}")
+            return page_items, len(candidates)
+
     async def get_status_counts(self) -> dict[str, int]:
-        """Get counts of documents in each status"""
-        counts = {status.value: 0 for status in DocStatus}
-        async with self._storage_lock:
-            for doc in self._data.values():
-                counts[doc["status"]] += 1
-        return counts
+        """Get counts of documents in each status, read from the status index"""
+        async with self._storage_lock.read():
+            index = self._get_status_index()
+            return {status: len(doc_ids) for status, doc_ids in index.items()}
 
     async def get_docs_by_status(
         self, status: DocStatus
     ) -> dict[str, DocProcessingStatus]:
         """Get all documents with a specific status"""
+        return await self.get_docs_by_statuses([status])
+
+    async def get_docs_by_statuses(
+        self, statuses: list[DocStatus]
+    ) -> dict[str, DocProcessingStatus]:
+        """Get all documents in any of the given statuses
+
+        Only the indexed documents of those statuses are visited, under a single
+        acquisition of the storage lock.
+        """
         result = {}
-        async with self._storage_lock:
-            for k, v in self._data.items():
-                if v["status"] == status.value:
+        async with self._storage_lock.read():
+            index = self._get_status_index()
+            for status in statuses:
+                for k in index.get(status.value, ()):
+                    v = self._data.get(k)
+                    if v is None:
+                        continue
                     try:
-                        # Make a copy of the data to avoid modifying the original
-                        data = v.copy()
-                        # If content is missing, use content_summary as content
-                        if "content" not in data and "content_summary" in data:
-                            data["content"] = data["content_summary"]
-                        # If file_path is not in data, use document id as file path
-                        if "file_path" not in data:
-                            data["file_path"] = "no-file-path"
-                        result[k] = DocProcessingStatus(**data)
+                        result[k] = self._to_doc_status(v)
                     except KeyError as e:
                         logger.error(f"Missing required field for document {k}: {e}")
                         continue
         return result
 
     async def index_done_callback(self) -> None:
-        async with self._storage_lock:
+        async with self._storage_lock.write():
             if self.storage_updated.value:
                 data_dict = (
                     dict(self._data) if hasattr(self._data, "_getvalue") else self._data
@@ -146,14 +257,23 @@ class JsonDocStatusStorage(DocStatusStorage):
         if not data:
             return
         logger.debug(f"Inserting {len(data)} records to {self.namespace}")
-        async with self._storage_lock:
+        async with self._storage_lock.write():
+            index = self._get_status_index()
+            for doc_id, doc in data.items():
+                old_doc = self._data.get(doc_id)
+                if old_doc is not None:
+                    index.get(self._status_key(old_doc.get("status")), {}).pop(
+                        doc_id, None
+                    )
+                index.setdefault(self._status_key(doc.get("status")), {})[doc_id] = None
             self._data.update(data)
             await set_all_update_flags(self.namespace)
+            await self._notify_status_index_changed()
 
         await self.index_done_callback()
 
     async def get_by_id(self, id: str) -> Union[dict[str, Any], None]:
-        async with self._storage_lock:
+        async with self._storage_lock.read():
             return self._data.get(id)
 
     async def delete(self, doc_ids: list[str]) -> None:
@@ -169,15 +289,20 @@ class JsonDocStatusStorage(DocStatusStorage):
         Returns:
             None
         """
-        async with self._storage_lock:
+        async with self._storage_lock.write():
+            index = self._get_status_index()
             any_deleted = False
             for doc_id in doc_ids:
                 result = self._data.pop(doc_id, None)
                 if result is not None:
                     any_deleted = True
+                    index.get(self._status_key(result.get("status")), {}).pop(
+                        doc_id, None
+                    )
 
             if any_deleted:
                 await set_all_update_flags(self.namespace)
+                await self._notify_status_index_changed()
 
     async def drop(self) -> dict[str, str]:
         """Drop all document status data from storage and clean up resources
@@ -193,9 +318,11 @@ class JsonDocStatusStorage(DocStatusStorage):
             - On failure: {"status": "error", "message": "<error details>"}
         """
         try:
-            async with self._storage_lock:
+            async with self._storage_lock.write():
                 self._data.clear()
+                self._status_index = None
                 await set_all_update_flags(self.namespace)
+                await self._notify_status_index_changed()
 
             await self.index_done_callback()
             logger.info(f"Process {os.getpid()} drop {self.namespace}")
@@ -12,7 +12,7 @@ from lightrag.utils import (
 )
 from .shared_storage import (
     get_namespace_data,
-    get_storage_lock,
+    get_storage_rw_lock,
     get_data_init_lock,
     get_update_flag,
     set_all_update_flags,
@@ -33,7 +33,7 @@ class JsonKVStorage(BaseKVStorage):
 
     async def initialize(self):
         """Initialize storage data"""
-        self._storage_lock = get_storage_lock()
+        self._storage_lock = get_storage_rw_lock(self.namespace)
         self.storage_updated = await get_update_flag(self.namespace)
         async with get_data_init_lock():
             # check need_init must before get_namespace_data
@@ -41,7 +41,7 @@ class JsonKVStorage(BaseKVStorage):
             self._data = await get_namespace_data(self.namespace)
             if need_init:
                 loaded_data = load_json(self._file_name) or {}
-                async with self._storage_lock:
+                async with self._storage_lock.write():
                     self._data.update(loaded_data)
 
                     # Calculate data count based on namespace
@@ -61,7 +61,7 @@ class JsonKVStorage(BaseKVStorage):
                     )
 
     async def index_done_callback(self) -> None:
-        async with self._storage_lock:
+        async with self._storage_lock.write():
             if self.storage_updated.value:
                 data_dict = (
                     dict(self._data) if hasattr(self._data, "_getvalue") else self._data
@@ -91,15 +91,15 @@ class JsonKVStorage(BaseKVStorage):
         Returns:
             Dictionary containing all stored data
         """
-        async with self._storage_lock:
+        async with self._storage_lock.read():
             return dict(self._data)
 
     async def get_by_id(self, id: str) -> dict[str, Any] | None:
-        async with self._storage_lock:
+        async with self._storage_lock.read():
             return self._data.get(id)
 
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
-        async with self._storage_lock:
+        async with self._storage_lock.read():
             return [
                 (
                     {k: v for k, v in self._data[id].items()}
@@ -110,7 +110,7 @@ class JsonKVStorage(BaseKVStorage):
             ]
 
     async def filter_keys(self, keys: set[str]) -> set[str]:
-        async with self._storage_lock:
+        async with self._storage_lock.read():
             return set(keys) - set(self._data.keys())
 
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
@@ -122,7 +122,7 @@ class JsonKVStorage(BaseKVStorage):
         if not data:
             return
         logger.debug(f"Inserting {len(data)} records to {self.namespace}")
-        async with self._storage_lock:
+        async with self._storage_lock.write():
             self._data.update(data)
             await set_all_update_flags(self.namespace)
 
@@ -139,7 +139,7 @@ class JsonKVStorage(BaseKVStorage):
         Returns:
             None
         """
-        async with self._storage_lock:
+        async with self._storage_lock.write():
             any_deleted = False
             for doc_id in ids:
                 result = self._data.pop(doc_id, None)
@@ -234,7 +234,7 @@ class JsonKVStorage(BaseKVStorage):
             - On failure: {"status": "error", "message": "<error details>"}
         """
         try:
-            async with self._storage_lock:
+            async with self._storage_lock.write():
                 self._data.clear()
                 await set_all_update_flags(self.namespace)
 
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from heapq import merge
+from typing import Iterable
+
+
+class LabelIndex:
+    """Sorted index of graph node labels for label listing and search.
+
+    Additions and removals are buffered and folded into the sorted list on the
+    next read, so bulk upserts cost O(1) each and a read after k changes costs
+    O(n + k log k) once. Reads on an unchanged index are binary searches.
+    """
+
+    def __init__(self, labels: Iterable[str] = ()):
+        self._labels: list[str] = sorted(set(labels))
+        self._pending_add: set[str] = set()
+        self._pending_remove: set[str] = set()
+
+    def __len__(self) -> int:
+        self._flush()
+        return len(self._labels)
+
+    def add(self, label: str) -> None:
+        self._pending_remove.discard(label)
+        self._pending_add.add(label)
+
+    def remove(self, label: str) -> None:
+        self._pending_add.discard(label)
+        self._pending_remove.add(label)
+
+    def _flush(self) -> None:
+        if not self._pending_add and not self._pending_remove:
+            return
+        labels = self._labels
+        if self._pending_remove:
+            removed = self._pending_remove
+            labels = [label for label in labels if label not in removed]
+        if self._pending_add:
+            existing = set(labels)
+            added = sorted(
+                label for label in self._pending_add if label not in existing
+            )
+            labels = list(merge(labels, added))
+        self._labels = labels
+        self._pending_add = set()
+        self._pending_remove = set()
+
+    def all(self) -> list[str]:
+        """All labels, sorted alphabetically"""
+        self._flush()
+        return list(self._labels)
+
+    def search(
+        self, query: str = "", limit: int = 50, offset: int = 0, fuzzy: bool = False
+    ) -> list[str]:
+        """Labels matching `query`, sorted alphabetically
+
+        Prefix search is a binary search over the sorted labels. Fuzzy search
+        matches the query case-insensitively anywhere in the label and stops
+        scanning as soon as the requested page is filled.
+        """
+        self._flush()
+        labels = self._labels
+        end = offset + limit
+        if not query:
+            return labels[offset:end]
+
+        if not fuzzy:
+            start = bisect_left(labels, query)
+            stop = bisect_left(labels, query + "\U0010ffff", lo=start)
+            return labels[start:stop][offset:end]
+
+        needle = query.casefold()
+        matches = []
+        for label in labels:
+            if needle in label.casefold():
+                matches.append(label)
+                if len(matches) >= end:
+                    break
+        return matches[offset:end]
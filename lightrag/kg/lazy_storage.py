@@ -0,0 +1,128 @@
+import asyncio
+import inspect
+import time
+from functools import wraps
+from typing import Any
+
+from lightrag.utils import logger
+
+
+class LazyStorage:
+    """Proxy that initializes the wrapped storage on first access.
+
+    Coroutine (and async generator) methods of the wrapped storage await
+    ``initialize`` before they run, so a namespace is only loaded from disk or
+    connected when something actually uses it. Plain attributes are forwarded
+    untouched. The proxy also records the load state and timing of its
+    namespace for readiness reporting.
+    """
+
+    STATE_PENDING = "pending"
+    STATE_LOADING = "loading"
+    STATE_READY = "ready"
+    STATE_FAILED = "failed"
+
+    def __init__(self, storage: Any, name: str):
+        object.__setattr__(self, "_lazy_storage", storage)
+        object.__setattr__(self, "_lazy_name", name)
+        object.__setattr__(self, "_lazy_state", self.STATE_PENDING)
+        object.__setattr__(self, "_lazy_error", None)
+        object.__setattr__(self, "_lazy_load_time", None)
+        object.__setattr__(self, "_lazy_loaded_at", None)
+        object.__setattr__(self, "_lazy_lock", None)
+
+    @property
+    def __class__(self):
+        # Keep isinstance checks against the storage classes working
+        return type(self._lazy_storage)
+
+    @property
+    def storage(self) -> Any:
+        """The wrapped storage instance"""
+        return self._lazy_storage
+
+    @property
+    def is_ready(self) -> bool:
+        return self._lazy_state == self.STATE_READY
+
+    def load_state(self) -> dict[str, Any]:
+        """Load state of the namespace: state, load time in seconds and error"""
+        return {
+            "state": self._lazy_state,
+            "storage": type(self._lazy_storage).__name__,
+            "load_time": self._lazy_load_time,
+            "loaded_at": self._lazy_loaded_at,
+            "error": self._lazy_error,
+        }
+
+    async def initialize(self) -> None:
+        if self._lazy_state == self.STATE_READY:
+            return
+        if self._lazy_lock is None:
+            object.__setattr__(self, "_lazy_lock", asyncio.Lock())
+        async with self._lazy_lock:
+            if self._lazy_state == self.STATE_READY:
+                return
+            object.__setattr__(self, "_lazy_state", self.STATE_LOADING)
+            start = time.perf_counter()
+            try:
+                await self._lazy_storage.initialize()
+            except Exception as e:
+                object.__setattr__(self, "_lazy_state", self.STATE_FAILED)
+                object.__setattr__(self, "_lazy_error", str(e))
+                logger.error(f"Failed to initialize storage {self._lazy_name}: {e}")
+                raise
+            load_time = round(time.perf_counter() - start, 3)
+            object.__setattr__(self, "_lazy_load_time", load_time)
+            object.__setattr__(self, "_lazy_loaded_at", time.time())
+            object.__setattr__(self, "_lazy_error", None)
+            object.__setattr__(self, "_lazy_state", self.STATE_READY)
+            logger.debug(f"Storage {self._lazy_name} initialized in {load_time}s")
+
+    async def finalize(self) -> None:
+        # Storages that were never loaded have nothing to release
+        if self._lazy_state != self.STATE_READY:
+            return
+        await self._lazy_storage.finalize()
+        object.__setattr__(self, "_lazy_state", self.STATE_PENDING)
+
+    def __getattr__(self, item: str) -> Any:
+        attr = getattr(self._lazy_storage, item)
+        if self._lazy_state == self.STATE_READY or not callable(attr):
+            return attr
+
+        if item == "update_working_dir":
+            # A storage that is not loaded yet reads the working directory from
+            # its config when it initializes, so only the config is updated
+            @wraps(attr)
+            def update_pending_working_dir(new_working_dir: str) -> None:
+                self._lazy_storage.global_config["working_dir"] = new_working_dir
+
+            return update_pending_working_dir
+
+        if inspect.isasyncgenfunction(attr):
+
+            @wraps(attr)
+            async def gen_wrapper(*args, **kwargs):
+                await self.initialize()
+                async for value in attr(*args, **kwargs):
+                    yield value
+
+            return gen_wrapper
+
+        if inspect.iscoroutinefunction(attr):
+
+            @wraps(attr)
+            async def wrapper(*args, **kwargs):
+                await self.initialize()
+                return await attr(*args, **kwargs)
+
+            return wrapper
+
+        return attr
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        setattr(self._lazy_storage, key, value)
+
+    def __repr__(self) -> str:
+        return f"LazyStorage({self._lazy_name}, {self._lazy_state}, {self._lazy_storage!r})"
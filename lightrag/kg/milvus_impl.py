@@ -1,9 +1,9 @@
 import asyncio
 import os
-from typing import Any, final
+from typing import Any, ClassVar, final
 from dataclasses import dataclass
 import numpy as np
-from lightrag.utils import logger, compute_mdhash_id
+from lightrag.utils import logger, compute_mdhash_id, get_env_value
 from ..base import BaseVectorStorage
 import pipmaster as pm
 
@@ -15,7 +15,7 @@ if not pm.is_installed("pymilvus"):
     pm.install("pymilvus")
 
 import configparser
-from pymilvus import MilvusClient  # type: ignore
+from pymilvus import AsyncMilvusClient  # type: ignore
 
 config = configparser.ConfigParser()
 config.read("config.ini", "utf-8")
@@ -25,15 +25,18 @@ config.read("config.ini", "utf-8")
 @dataclass
 class MilvusVectorDBStorage(BaseVectorStorage):
     @staticmethod
-    def create_collection_if_not_exist(
-        client: MilvusClient, collection_name: str, **kwargs
+    async def create_collection_if_not_exist(
+        client: AsyncMilvusClient, collection_name: str, **kwargs
     ):
-        if client.has_collection(collection_name):
+        if await client.has_collection(collection_name):
             return
-        client.create_collection(
+        await client.create_collection(
             collection_name, max_length=64, id_type="string", **kwargs
         )
 
+    # Clients shared by all namespaces using the same connection settings
+    _clients: ClassVar[dict[tuple, AsyncMilvusClient]] = {}
+
     def __post_init__(self):
         kwargs = self.global_config.get("vector_db_storage_cls_kwargs", {})
         cosine_threshold = kwargs.get("cosine_better_than_threshold")
@@ -43,7 +46,7 @@ class MilvusVectorDBStorage(BaseVectorStorage):
             )
         self.cosine_better_than_threshold = cosine_threshold
 
-        self._client = MilvusClient(
+        self._client_params = dict(
             uri=os.environ.get(
                 "MILVUS_URI",
                 config.get(
@@ -66,13 +69,26 @@ class MilvusVectorDBStorage(BaseVectorStorage):
             db_name=os.environ.get(
                 "MILVUS_DB_NAME", config.get("milvus", "db_name", fallback=None)
             ),
+            timeout=get_env_value("VECTOR_DB_TIMEOUT", 60, float),
         )
+        self._client = None
         self._max_batch_size = self.global_config["embedding_batch_num"]
-        MilvusVectorDBStorage.create_collection_if_not_exist(
-            self._client,
+
+    async def initialize(self):
+        """Connect and create the collection"""
+        if self._client is not None:
+            return
+        client_key = tuple(sorted(self._client_params.items()))
+        client = MilvusVectorDBStorage._clients.get(client_key)
+        if client is None:
+            client = AsyncMilvusClient(**self._client_params)
+            MilvusVectorDBStorage._clients[client_key] = client
+        await MilvusVectorDBStorage.create_collection_if_not_exist(
+            client,
             self.namespace,
             dimension=self.embedding_func.embedding_dim,
         )
+        self._client = client
 
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         logger.info(f"Inserting {len(data)} to {self.namespace}")
@@ -103,7 +119,9 @@ class MilvusVectorDBStorage(BaseVectorStorage):
         embeddings = np.concatenate(embeddings_list)
         for i, d in enumerate(list_data):
             d["vector"] = embeddings[i]
-        results = self._client.upsert(collection_name=self.namespace, data=list_data)
+        results = await self._client.upsert(
+            collection_name=self.namespace, data=list_data
+        )
         return results
 
     async def query(
@@ -112,7 +130,7 @@ class MilvusVectorDBStorage(BaseVectorStorage):
         embedding = await self.embedding_func(
             [query], _priority=5
         )  # higher priority for query
-        results = self._client.search(
+        results = await self._client.search(
             collection_name=self.namespace,
             data=embedding,
             limit=top_k,
@@ -122,7 +140,6 @@ class MilvusVectorDBStorage(BaseVectorStorage):
                 "params": {"radius": self.cosine_better_than_threshold},
             },
         )
-        print(results)
         return [
             {
                 **dp["entity"],
@@ -152,7 +169,7 @@ class MilvusVectorDBStorage(BaseVectorStorage):
             )
 
             # Delete the entity from Milvus collection
-            result = self._client.delete(
+            result = await self._client.delete(
                 collection_name=self.namespace, pks=[entity_id]
             )
 
@@ -175,8 +192,10 @@ class MilvusVectorDBStorage(BaseVectorStorage):
             expr = f'src_id == "{entity_name}" or tgt_id == "{entity_name}"'
 
             # Find all relations involving this entity
-            results = self._client.query(
-                collection_name=self.namespace, filter=expr, output_fields=["id"]
+            results = await self._client.query(
+                collection_name=self.namespace,
+                filter=expr,
+                output_fields=["id"],
             )
 
             if not results or len(results) == 0:
@@ -191,8 +210,9 @@ class MilvusVectorDBStorage(BaseVectorStorage):
 
             # Delete the relations
             if relation_ids:
-                delete_result = self._client.delete(
-                    collection_name=self.namespace, pks=relation_ids
+                delete_result = await self._client.delete(
+                    collection_name=self.namespace,
+                    pks=relation_ids,
                 )
 
                 logger.debug(
@@ -210,7 +230,7 @@ class MilvusVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Delete vectors by IDs
-            result = self._client.delete(collection_name=self.namespace, pks=ids)
+            result = await self._client.delete(collection_name=self.namespace, pks=ids)
 
             if result and result.get("delete_count", 0) > 0:
                 logger.debug(
@@ -233,7 +253,7 @@ class MilvusVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Query Milvus for a specific ID
-            result = self._client.query(
+            result = await self._client.query(
                 collection_name=self.namespace,
                 filter=f'id == "{id}"',
                 output_fields=list(self.meta_fields) + ["id", "created_at"],
@@ -269,7 +289,7 @@ class MilvusVectorDBStorage(BaseVectorStorage):
             filter_expr = f'id in ["{id_list}"]'
 
             # Query Milvus with the filter
-            result = self._client.query(
+            result = await self._client.query(
                 collection_name=self.namespace,
                 filter=filter_expr,
                 output_fields=list(self.meta_fields) + ["id", "created_at"],
@@ -297,11 +317,11 @@ class MilvusVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Drop the collection and recreate it
-            if self._client.has_collection(self.namespace):
-                self._client.drop_collection(self.namespace)
+            if await self._client.has_collection(self.namespace):
+                await self._client.drop_collection(self.namespace)
 
             # Recreate the collection
-            MilvusVectorDBStorage.create_collection_if_not_exist(
+            await MilvusVectorDBStorage.create_collection_if_not_exist(
                 self._client,
                 self.namespace,
                 dimension=self.embedding_func.embedding_dim,
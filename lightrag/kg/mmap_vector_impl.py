@@ -0,0 +1,464 @@
+import asyncio
+import glob
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, final
+
+import numpy as np
+
+from lightrag.base import BaseVectorStorage
+from lightrag.utils import compute_mdhash_id, load_json, logger, write_json
+
+from .shared_storage import (
+    get_storage_lock,
+    get_update_flag,
+    set_all_update_flags,
+)
+from .vector_index import (
+    VECTOR_PRECISIONS,
+    DocRowIndex,
+    QuantizedMatrix,
+    cosine_top_k,
+    doc_filter_keys,
+    register_chunk_store,
+    resolve_doc_filter,
+)
+
+
+@final
+@dataclass
+class MmapVectorDBStorage(BaseVectorStorage):
+    """
+    In-process vector storage keeping normalized float32 vectors in a
+    memory-mapped .npy file and their metadata in a JSON file.
+
+    Each save writes the matrix to a new versioned file and then replaces the
+    metadata file, which names its matrix file. Replacing the metadata is the
+    only commit step, so a crash at any point leaves a consistent pair.
+
+    Loading maps the matrix instead of decoding it, so start-up is quick and
+    the worker processes of a server share the pages of a single copy. The
+    matrix is copied into memory on the first change and written back on
+    index_done_callback.
+
+    With vector_precision float16 or int8, queries score a reduced-precision
+    copy held in memory and re-score the best candidates against the mapped
+    float32 file, so only the copy counts against the memory of each worker.
+    """
+
+    def __post_init__(self):
+        self._storage_lock = None
+        self.storage_updated = None
+
+        kwargs = self.global_config.get("vector_db_storage_cls_kwargs", {})
+        cosine_threshold = kwargs.get("cosine_better_than_threshold")
+        if cosine_threshold is None:
+            raise ValueError(
+                "cosine_better_than_threshold must be specified in vector_db_storage_cls_kwargs"
+            )
+        self.cosine_better_than_threshold = cosine_threshold
+        self._precision = kwargs.get("vector_precision", "float32")
+        if self._precision not in VECTOR_PRECISIONS:
+            raise ValueError(
+                f"vector_precision must be one of {', '.join(VECTOR_PRECISIONS)}, got {self._precision}"
+            )
+        self._rerank_factor = kwargs.get("vector_rerank_factor", 0)
+
+        working_dir = self.global_config["working_dir"]
+        self._working_dir = working_dir
+        # Matrix file of the loaded version, and of files saved before versioning
+        self._matrix_file = os.path.join(working_dir, f"vdb_{self.namespace}.npy")
+        self._legacy_matrix_file = self._matrix_file
+        self._meta_file = os.path.join(working_dir, f"vdb_{self.namespace}.meta.json")
+        self._version = 0
+        self._max_batch_size = self.global_config["embedding_batch_num"]
+        self._dim = self.embedding_func.embedding_dim
+
+        # Row i of the matrix is the vector of self._data[i]
+        self._matrix = np.empty((0, self._dim), dtype=np.float32)
+        self._data: list[dict[str, Any]] = []
+        self._row_of: dict[str, int] = {}
+        # Reduced-precision copy of the matrix, rebuilt on the first query after a change
+        self._codes: QuantizedMatrix | None = None
+        # Rows of the matrix by doc/chunk id, for queries filtered by ids
+        self._filter_index = DocRowIndex(doc_filter_keys(self.namespace))
+
+    async def initialize(self):
+        """Initialize storage data"""
+        # Get the update flag for cross-process update notification
+        self.storage_updated = await get_update_flag(self.namespace)
+        # Get the storage lock for use in other methods
+        self._storage_lock = get_storage_lock(enable_logging=False)
+        await asyncio.to_thread(self._load)
+        register_chunk_store(self.global_config["working_dir"], self.namespace, self)
+
+    def _load(self):
+        """Map the matrix file and read the metadata, empty if not saved yet"""
+        meta = load_json(self._meta_file) or []
+        if isinstance(meta, dict):
+            self._version = meta.get("version", 0)
+            self._matrix_file = os.path.join(self._working_dir, meta["matrix_file"])
+            data = meta.get("data") or []
+        else:
+            # Metadata saved before versioning is a bare list
+            self._version = 0
+            self._matrix_file = self._legacy_matrix_file
+            data = meta
+        if data and os.path.exists(self._matrix_file):
+            matrix = np.load(self._matrix_file, mmap_mode="r")
+            if matrix.ndim != 2 or matrix.shape[1] != self._dim:
+                raise ValueError(
+                    f"Vector file {self._matrix_file} has shape {matrix.shape}, "
+                    f"expected embedding dim {self._dim}"
+                )
+            if len(matrix) != len(data):
+                raise ValueError(
+                    f"Vector file {self._matrix_file} has {len(matrix)} rows "
+                    f"but {self._meta_file} has {len(data)} entries"
+                )
+        else:
+            data = []
+            matrix = np.empty((0, self._dim), dtype=np.float32)
+
+        self._matrix = matrix
+        self._data = data
+        self._row_of = {dp["__id__"]: i for i, dp in enumerate(data)}
+        self._codes = None
+        self._filter_index.invalidate()
+        logger.info(f"Loaded {len(data)} vectors from {self._matrix_file}")
+
+    def _matrix_files(self) -> list[str]:
+        """All matrix files of the namespace, versioned or not"""
+        prefix = os.path.join(glob.escape(self._working_dir), f"vdb_{self.namespace}")
+        return glob.glob(f"{prefix}.*.npy") + glob.glob(f"{prefix}.npy")
+
+    def _save(self):
+        """Write a new matrix version, then commit it by replacing the metadata"""
+        version = self._version + 1
+        matrix_name = f"vdb_{self.namespace}.{version}.npy"
+        matrix_file = os.path.join(self._working_dir, matrix_name)
+        # Not referenced until the metadata is replaced, so written in place
+        np.save(matrix_file, np.ascontiguousarray(self._matrix))
+        tmp_meta_file = f"{self._meta_file}.tmp"
+        write_json(
+            {"version": version, "matrix_file": matrix_name, "data": self._data},
+            tmp_meta_file,
+        )
+        os.replace(tmp_meta_file, self._meta_file)
+        self._version = version
+        self._matrix_file = matrix_file
+        # Map the saved file so the in-memory copy can be released
+        self._matrix = np.load(self._matrix_file, mmap_mode="r")
+
+        # Older versions and files left by an interrupted save are unreferenced
+        for file_name in self._matrix_files():
+            if file_name != matrix_file:
+                try:
+                    os.remove(file_name)
+                except OSError as e:
+                    logger.debug(f"Could not remove old vector file {file_name}: {e}")
+
+    def _writable_matrix(self) -> np.ndarray:
+        """Copy a memory-mapped matrix into memory before changing it"""
+        if isinstance(self._matrix, np.memmap):
+            self._matrix = np.array(self._matrix)
+        return self._matrix
+
+    def _remove_rows(self, rows: list[int]):
+        if not rows:
+            return
+        rows_set = set(rows)
+        self._matrix = np.delete(self._writable_matrix(), rows, axis=0)
+        self._data = [dp for i, dp in enumerate(self._data) if i not in rows_set]
+        self._row_of = {dp["__id__"]: i for i, dp in enumerate(self._data)}
+        self._codes = None
+        self._filter_index.invalidate()
+
+    def _search_matrix(self) -> np.ndarray | QuantizedMatrix:
+        """The matrix scored by queries, in the configured precision"""
+        if self._precision == "float32":
+            return self._matrix
+        if self._codes is None:
+            self._codes = QuantizedMatrix.from_float(self._matrix, self._precision)
+        return self._codes
+
+    async def _get_storage(self):
+        """Check if the storage should be reloaded"""
+        # Acquire lock to prevent concurrent read and write
+        async with self._storage_lock:
+            # Check if data needs to be reloaded
+            if self.storage_updated.value:
+                logger.info(
+                    f"Process {os.getpid()} reloading {self.namespace} due to update by another process"
+                )
+                self._load()
+                # Reset update flag
+                self.storage_updated.value = False
+
+    async def get_ids_by_filter_keys(self, keys: list[str]) -> set[str]:
+        """Ids of the vectors whose doc id (chunks) or source chunk ids match `keys`"""
+        await self._get_storage()
+        self._filter_index.build(enumerate(self._data))
+        return self._filter_index.ids_for(keys)
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+
+        logger.debug(f"Inserting {len(data)} to {self.namespace}")
+        if not data:
+            return
+
+        current_time = int(time.time())
+        list_data = [
+            {
+                "__id__": k,
+                "__created_at__": current_time,
+                **{k1: v1 for k1, v1 in v.items() if k1 in self.meta_fields},
+            }
+            for k, v in data.items()
+        ]
+        contents = [v["content"] for v in data.values()]
+        batches = [
+            contents[i : i + self._max_batch_size]
+            for i in range(0, len(contents), self._max_batch_size)
+        ]
+
+        # Execute embedding outside of lock to avoid long lock times
+        embedding_tasks = [self.embedding_func(batch) for batch in batches]
+        embeddings_list = await asyncio.gather(*embedding_tasks)
+
+        embeddings = np.concatenate(embeddings_list).astype(np.float32)
+        if len(embeddings) != len(list_data):
+            # sometimes the embedding is not returned correctly. just log it.
+            logger.error(
+                f"embedding is not 1-1 with data, {len(embeddings)} != {len(list_data)}"
+            )
+            return
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.where(norms > 0, norms, 1)
+
+        await self._get_storage()
+        matrix = self._writable_matrix()
+        new_rows = []
+        for i, dp in enumerate(list_data):
+            row = self._row_of.get(dp["__id__"])
+            if row is None:
+                new_rows.append(i)
+            else:
+                matrix[row] = embeddings[i]
+                self._data[row] = dp
+        if new_rows:
+            for i in new_rows:
+                self._row_of[list_data[i]["__id__"]] = len(self._data)
+                self._data.append(list_data[i])
+            self._matrix = np.vstack([matrix, embeddings[new_rows]])
+        self._codes = None
+        self._filter_index.invalidate()
+
+    async def query(
+        self, query: str, top_k: int, ids: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        # Execute embedding outside of lock to avoid improve cocurrent
+        embedding = await self.embedding_func(
+            [query], _priority=5
+        )  # higher priority for query
+        embedding = embedding[0]
+
+        filter_keys = None
+        if ids is not None:
+            filter_keys = await resolve_doc_filter(
+                self.global_config["working_dir"], self.namespace, ids
+            )
+
+        await self._get_storage()
+        rows = None
+        if filter_keys is not None:
+            # Score only the rows of the requested documents in a single pass
+            self._filter_index.build(enumerate(self._data))
+            rows = self._filter_index.rows_for(filter_keys)
+        search_matrix = self._search_matrix()
+        row_numbers, scores = cosine_top_k(
+            search_matrix,
+            embedding,
+            top_k,
+            threshold=self.cosine_better_than_threshold,
+            rows=rows,
+            exact=None if search_matrix is self._matrix else self._matrix,
+            rerank_factor=self._rerank_factor,
+        )
+        results = []
+        for row, score in zip(row_numbers, scores):
+            dp = self._data[row]
+            results.append(
+                {
+                    **dp,
+                    "id": dp["__id__"],
+                    "distance": float(score),
+                    "created_at": dp.get("__created_at__"),
+                }
+            )
+        return results
+
+    @property
+    async def client_storage(self):
+        await self._get_storage()
+        return {"data": self._data, "matrix": self._matrix}
+
+    async def delete(self, ids: list[str]):
+        """Delete vectors with specified IDs
+
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+
+        Args:
+            ids: List of vector IDs to be deleted
+        """
+        await self._get_storage()
+        rows = [self._row_of[id] for id in ids if id in self._row_of]
+        self._remove_rows(rows)
+        logger.debug(f"Successfully deleted {len(rows)} vectors from {self.namespace}")
+
+    async def delete_entity(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        entity_id = compute_mdhash_id(entity_name, prefix="ent-")
+        logger.debug(f"Attempting to delete entity {entity_name} with ID {entity_id}")
+        await self.delete([entity_id])
+
+    async def delete_entity_relation(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        await self._get_storage()
+        rows = [
+            i
+            for i, dp in enumerate(self._data)
+            if dp.get("src_id") == entity_name or dp.get("tgt_id") == entity_name
+        ]
+        logger.debug(f"Found {len(rows)} relations for entity {entity_name}")
+        self._remove_rows(rows)
+
+    async def index_done_callback(self) -> bool:
+        """Save data to disk"""
+        async with self._storage_lock:
+            # Check if storage was updated by another process
+            if self.storage_updated.value:
+                # Storage was updated by another process, reload data instead of saving
+                logger.warning(
+                    f"Storage for {self.namespace} was updated by another process, reloading..."
+                )
+                self._load()
+                # Reset update flag
+                self.storage_updated.value = False
+                return False  # Return error
+
+        # Acquire lock and perform persistence
+        async with self._storage_lock:
+            try:
+                # Save data to disk
+                self._save()
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.namespace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+                return True  # Return success
+            except Exception as e:
+                logger.error(f"Error saving data for {self.namespace}: {e}")
+                return False  # Return error
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        """Get vector data by its ID
+
+        Args:
+            id: The unique identifier of the vector
+
+        Returns:
+            The vector data if found, or None if not found
+        """
+        await self._get_storage()
+        row = self._row_of.get(id)
+        if row is None:
+            return None
+        dp = self._data[row]
+        return {
+            **dp,
+            "id": dp.get("__id__"),
+            "created_at": dp.get("__created_at__"),
+        }
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        """Get multiple vector data by their IDs
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            List of vector data objects that were found
+        """
+        if not ids:
+            return []
+
+        await self._get_storage()
+        results = []
+        for id in ids:
+            row = self._row_of.get(id)
+            if row is not None:
+                dp = self._data[row]
+                results.append(
+                    {
+                        **dp,
+                        "id": dp.get("__id__"),
+                        "created_at": dp.get("__created_at__"),
+                    }
+                )
+        return results
+
+    async def drop(self) -> dict[str, str]:
+        """Drop all vector data from storage and clean up resources
+
+        This method will:
+        1. Remove the matrix and metadata files if they exist
+        2. Reset the in-memory vectors and metadata
+        3. Update flags to notify other processes
+        4. Changes is persisted to disk immediately
+
+        Returns:
+            dict[str, str]: Operation status and message
+            - On success: {"status": "success", "message": "data dropped"}
+            - On failure: {"status": "error", "message": "<error details>"}
+        """
+        try:
+            async with self._storage_lock:
+                for file_name in [self._meta_file, *self._matrix_files()]:
+                    if os.path.exists(file_name):
+                        os.remove(file_name)
+                self._load()
+
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.namespace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+
+                logger.info(
+                    f"Process {os.getpid()} drop {self.namespace}(file:{self._matrix_file})"
+                )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(f"Error dropping {self.namespace}: {e}")
+            return {"status": "error", "message": str(e)}
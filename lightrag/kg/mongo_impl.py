@@ -4,8 +4,9 @@ from dataclasses import dataclass, field
 import numpy as np
 import configparser
 import asyncio
+import re
 
-from typing import Any, Union, final
+from typing import Any, Literal, Union, final
 
 from ..base import (
     BaseGraphStorage,
@@ -253,6 +254,10 @@ class MongoDocStatusStorage(DocStatusStorage):
         if self.db is None:
             self.db = await ClientManager.get_client()
             self._data = await get_or_create_collection(self.db, self._collection_name)
+            # Secondary indexes backing status queries and document listing
+            await self._data.create_index("status")
+            await self._data.create_index("updated_at")
+            await self._data.create_index("created_at")
             logger.debug(f"Use MongoDB as DocStatus {self._collection_name}")
 
     async def finalize(self):
@@ -315,6 +320,79 @@ class MongoDocStatusStorage(DocStatusStorage):
             for doc in result
         }
 
+    async def get_docs_by_statuses(
+        self, statuses: list[DocStatus]
+    ) -> dict[str, DocProcessingStatus]:
+        """All documents in any of the given statuses, fetched in one query"""
+        cursor = self._data.find({"status": {"$in": [s.value for s in statuses]}})
+        result = await cursor.to_list()
+        order = {status.value: i for i, status in enumerate(statuses)}
+        result.sort(key=lambda doc: order.get(doc["status"], len(order)))
+        return {
+            doc["_id"]: DocProcessingStatus(
+                content=doc["content"],
+                content_summary=doc.get("content_summary"),
+                content_length=doc["content_length"],
+                status=doc["status"],
+                created_at=doc.get("created_at"),
+                updated_at=doc.get("updated_at"),
+                chunks_count=doc.get("chunks_count", -1),
+                file_path=doc.get("file_path", doc["_id"]),
+            )
+            for doc in result
+        }
+
+    async def get_docs_paginated(
+        self,
+        status: DocStatus | None = None,
+        page: int = 1,
+        page_size: int = 50,
+        sort_field: Literal[
+            "created_at", "updated_at", "id", "file_path"
+        ] = "updated_at",
+        sort_direction: Literal["asc", "desc"] = "desc",
+        file_path_filter: str | None = None,
+        include_content: bool = False,
+    ) -> tuple[list[tuple[str, DocProcessingStatus]], int]:
+        """Filter, sort and page documents on the server, projecting out content by default"""
+        query: dict[str, Any] = {}
+        if status is not None:
+            query["status"] = status.value
+        if file_path_filter:
+            query["file_path"] = {
+                "$regex": re.escape(file_path_filter),
+                "$options": "i",
+            }
+        sort_key = "_id" if sort_field == "id" else sort_field
+        direction = -1 if sort_direction == "desc" else 1
+        projection = None if include_content else {"content": 0}
+
+        total = await self._data.count_documents(query)
+        cursor = (
+            self._data.find(query, projection)
+            .sort([(sort_key, direction), ("_id", direction)])
+            .skip((max(page, 1) - 1) * page_size)
+            .limit(page_size)
+        )
+        result = await cursor.to_list()
+        docs = [
+            (
+                doc["_id"],
+                DocProcessingStatus(
+                    content=doc.get("content", ""),
+                    content_summary=doc.get("content_summary"),
+                    content_length=doc["content_length"],
+                    status=doc["status"],
+                    created_at=doc.get("created_at"),
+                    updated_at=doc.get("updated_at"),
+                    chunks_count=doc.get("chunks_count", -1),
+                    file_path=doc.get("file_path", doc["_id"]),
+                ),
+            )
+            for doc in result
+        ]
+        return docs, total
+
     async def index_done_callback(self) -> None:
         # Mongo handles persistence automatically
         pass
@@ -357,6 +435,8 @@ class MongoGraphStorage(BaseGraphStorage):
     # edge collection storing source_node_id, target_node_id, and edge_properties
     edgeCollection: AsyncCollection = field(default=None)
 
+    tracks_count_changes = True
+
     def __init__(self, namespace, global_config, embedding_func):
         super().__init__(
             namespace=namespace,
@@ -667,7 +747,11 @@ class MongoGraphStorage(BaseGraphStorage):
                 GRAPH_FIELD_SEP
             )
 
-        await self.collection.update_one({"_id": node_id}, update_doc, upsert=True)
+        result = await self.collection.update_one(
+            {"_id": node_id}, update_doc, upsert=True
+        )
+        if result.upserted_id is not None:
+            self.record_count_changes(nodes=1)
 
     async def upsert_edge(
         self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
@@ -688,7 +772,7 @@ class MongoGraphStorage(BaseGraphStorage):
         edge_data["source_node_id"] = source_node_id
         edge_data["target_node_id"] = target_node_id
 
-        await self.edge_collection.update_one(
+        result = await self.edge_collection.update_one(
             {
                 "$or": [
                     {
@@ -704,6 +788,8 @@ class MongoGraphStorage(BaseGraphStorage):
             update_doc,
             upsert=True,
         )
+        if result.upserted_id is not None:
+            self.record_count_changes(edges=1)
 
     #
     # -------------------------------------------------------------------------
@@ -717,12 +803,14 @@ class MongoGraphStorage(BaseGraphStorage):
         2) Remove inbound & outbound edges from any doc that references node_id.
         """
         # Remove all edges
-        await self.edge_collection.delete_many(
+        edges_result = await self.edge_collection.delete_many(
             {"$or": [{"source_node_id": node_id}, {"target_node_id": node_id}]}
         )
+        self.record_count_changes(edges=-edges_result.deleted_count)
 
         # Remove the node doc
-        await self.collection.delete_one({"_id": node_id})
+        node_result = await self.collection.delete_one({"_id": node_id})
+        self.record_count_changes(nodes=-node_result.deleted_count)
 
     #
     # -------------------------------------------------------------------------
@@ -745,6 +833,53 @@ class MongoGraphStorage(BaseGraphStorage):
             labels.append(doc["_id"])
         return labels
 
+    async def search_labels(
+        self, query: str = "", limit: int = 50, offset: int = 0, fuzzy: bool = False
+    ) -> list[str]:
+        """
+        Search node _id with a $regex filter, sorted and paginated on the server.
+
+        A prefix search uses an anchored, case-sensitive regex, which MongoDB
+        answers from the _id index.
+        """
+        filter_query: dict[str, Any] = {}
+        if query:
+            if fuzzy:
+                filter_query = {"_id": {"$regex": re.escape(query), "$options": "i"}}
+            else:
+                filter_query = {"_id": {"$regex": "^" + re.escape(query)}}
+        cursor = (
+            self.collection.find(filter_query, {"_id": 1})
+            .sort("_id", 1)
+            .skip(int(offset))
+            .limit(int(limit))
+        )
+        return [doc["_id"] async for doc in cursor]
+
+    async def get_graph_counts(self) -> tuple[int, int]:
+        """Number of nodes and edges, from the collection metadata"""
+        return (
+            await self.collection.estimated_document_count(),
+            await self.edge_collection.estimated_document_count(),
+        )
+
+    async def get_popular_labels(self, limit: int = 50) -> list[str]:
+        """
+        Get the node _id of the nodes with the highest degree, highest first.
+
+        Degrees are counted from both endpoints of every edge on the server, and
+        $sort followed by $limit only keeps the top entries in memory.
+        """
+        pipeline = [
+            {"$project": {"_id": 0, "node_id": ["$source_node_id", "$target_node_id"]}},
+            {"$unwind": "$node_id"},
+            {"$group": {"_id": "$node_id", "degree": {"$sum": 1}}},
+            {"$sort": {"degree": -1, "_id": 1}},
+            {"$limit": int(limit)},
+        ]
+        cursor = await self.edge_collection.aggregate(pipeline, allowDiskUse=True)
+        return [doc["_id"] async for doc in cursor]
+
     def _construct_graph_node(
         self, node_id, node_data: dict[str, str]
     ) -> KnowledgeGraphNode:
@@ -1149,7 +1284,7 @@ class MongoGraphStorage(BaseGraphStorage):
             return
 
         # 1. Remove all edges referencing these nodes
-        await self.edge_collection.delete_many(
+        edges_result = await self.edge_collection.delete_many(
             {
                 "$or": [
                     {"source_node_id": {"$in": nodes}},
@@ -1157,9 +1292,11 @@ class MongoGraphStorage(BaseGraphStorage):
                 ]
             }
         )
+        self.record_count_changes(edges=-edges_result.deleted_count)
 
         # 2. Delete the node documents
-        await self.collection.delete_many({"_id": {"$in": nodes}})
+        nodes_result = await self.collection.delete_many({"_id": {"$in": nodes}})
+        self.record_count_changes(nodes=-nodes_result.deleted_count)
 
         logger.debug(f"Successfully deleted nodes: {nodes}")
 
@@ -1182,7 +1319,8 @@ class MongoGraphStorage(BaseGraphStorage):
                 {"source_node_id": target_id, "target_node_id": source_id}
             )
 
-        await self.edge_collection.delete_many({"$or": all_edge_pairs})
+        result = await self.edge_collection.delete_many({"$or": all_edge_pairs})
+        self.record_count_changes(edges=-result.deleted_count)
 
         logger.debug(f"Successfully deleted edges: {edges}")
 
@@ -1205,6 +1343,7 @@ class MongoGraphStorage(BaseGraphStorage):
             logger.info(
                 f"Dropped {edge_count} edges from graph {self._edge_collection_name}"
             )
+            self.invalidate_count_changes()
 
             return {
                 "status": "success",
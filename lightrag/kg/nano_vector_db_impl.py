@@ -1,4 +1,5 @@
 import asyncio
+import json
 import os
 from typing import Any, final
 from dataclasses import dataclass
@@ -16,11 +17,127 @@ if not pm.is_installed("nano-vectordb"):
     pm.install("nano-vectordb")
 
 from nano_vectordb import NanoVectorDB
+from nano_vectordb.dbs import (
+    Float,
+    array_to_buffer_string,
+    f_ID,
+    f_VECTOR,
+    hash_ndarray,
+    load_storage,
+    normalize,
+)
 from .shared_storage import (
     get_storage_lock,
     get_update_flag,
     set_all_update_flags,
 )
+from .vector_index import (
+    VECTOR_PRECISIONS,
+    DocRowIndex,
+    QuantizedMatrix,
+    cosine_top_k,
+    doc_filter_keys,
+    register_chunk_store,
+    resolve_doc_filter,
+)
+
+
+@dataclass
+class QuantizedNanoVectorDB(NanoVectorDB):
+    """NanoVectorDB holding its matrix as a float16 or int8 QuantizedMatrix
+
+    The storage file keeps float32 vectors. They are quantized when loaded,
+    the float32 vectors of upserted rows are kept only until the next save,
+    and save merges them with the unchanged rows read back from the file.
+    """
+
+    precision: str = "int8"
+
+    def __post_init__(self):
+        # float32 vectors of the rows changed since the last save, by id
+        self._unsaved: dict[str, np.ndarray] = {}
+        super().__post_init__()
+
+    @property
+    def _storage(self) -> dict[str, Any]:
+        return getattr(self, "_NanoVectorDB__storage")
+
+    def pre_process(self):
+        super().pre_process()
+        storage = self._storage
+        storage["matrix"] = QuantizedMatrix.from_float(
+            storage["matrix"], self.precision
+        )
+
+    def upsert(self, datas: list[dict[str, Any]]):
+        storage = self._storage
+        new_datas = {
+            data.get(f_ID, hash_ndarray(data[f_VECTOR])): data for data in datas
+        }
+        vectors = {
+            key: normalize(np.asarray(data.pop(f_VECTOR), dtype=Float))
+            for key, data in new_datas.items()
+        }
+        report_return = {"update": [], "insert": []}
+        update_rows = []
+        for i, already_data in enumerate(storage["data"]):
+            if already_data[f_ID] in new_datas:
+                storage["data"][i] = new_datas.pop(already_data[f_ID])
+                update_rows.append(i)
+                report_return["update"].append(already_data[f_ID])
+        if update_rows:
+            storage["matrix"][np.asarray(update_rows)] = QuantizedMatrix.from_float(
+                np.stack([vectors[key] for key in report_return["update"]]),
+                self.precision,
+            )
+        if new_datas:
+            for key, data in new_datas.items():
+                data[f_ID] = key
+            storage["data"].extend(new_datas.values())
+            storage["matrix"] = storage["matrix"].append(
+                QuantizedMatrix.from_float(
+                    np.stack([vectors[key] for key in new_datas]), self.precision
+                )
+            )
+            report_return["insert"].extend(new_datas)
+        self._unsaved.update(vectors)
+        return report_return
+
+    def delete(self, ids: list[str]):
+        ids = set(ids)
+        storage = self._storage
+        keep_rows = [
+            i for i, data in enumerate(storage["data"]) if data[f_ID] not in ids
+        ]
+        storage["data"] = [storage["data"][i] for i in keep_rows]
+        storage["matrix"] = storage["matrix"][np.asarray(keep_rows, dtype=np.int64)]
+        for key in ids:
+            self._unsaved.pop(key, None)
+
+    def save(self):
+        storage = self._storage
+        saved = load_storage(self.storage_file)
+        saved_rows = {}
+        if saved is not None:
+            saved_rows = {data[f_ID]: i for i, data in enumerate(saved["data"])}
+        matrix = np.empty((len(storage["data"]), self.embedding_dim), dtype=Float)
+        for i, data in enumerate(storage["data"]):
+            key = data[f_ID]
+            if key in self._unsaved:
+                matrix[i] = self._unsaved[key]
+            elif key in saved_rows:
+                matrix[i] = saved["matrix"][saved_rows[key]]
+            else:
+                # Not in the file any more, keep the best approximation
+                matrix[i] = storage["matrix"][i : i + 1].to_float()[0]
+        del saved
+        with open(self.storage_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {**storage, "matrix": array_to_buffer_string(matrix)},
+                f,
+                ensure_ascii=False,
+            )
+        self._unsaved = {}
 
 
 @final
@@ -45,11 +162,13 @@ class NanoVectorDBStorage(BaseVectorStorage):
             self.global_config["working_dir"], f"vdb_{self.namespace}.json"
         )
         self._max_batch_size = self.global_config["embedding_batch_num"]
-
-        self._client = NanoVectorDB(
-            self.embedding_func.embedding_dim,
-            storage_file=self._client_file_name,
-        )
+        self._precision = kwargs.get("vector_precision", "float32")
+        if self._precision not in VECTOR_PRECISIONS:
+            raise ValueError(
+                f"vector_precision must be one of {', '.join(VECTOR_PRECISIONS)}, got {self._precision}"
+            )
+        # Rows of the client matrix by doc/chunk id, for queries filtered by ids
+        self._filter_index = DocRowIndex(doc_filter_keys(self.namespace))
 
     async def initialize(self):
         """Initialize storage data"""
@@ -57,6 +176,24 @@ class NanoVectorDBStorage(BaseVectorStorage):
         self.storage_updated = await get_update_flag(self.namespace)
         # Get the storage lock for use in other methods
         self._storage_lock = get_storage_lock(enable_logging=False)
+        # The vector file is read here rather than in the constructor, so the
+        # storage is only loaded when it is initialized
+        if self._client is None:
+            self._client = await asyncio.to_thread(self._new_client)
+        register_chunk_store(self.global_config["working_dir"], self.namespace, self)
+
+    def _new_client(self) -> NanoVectorDB:
+        """Load the vector file into a client holding the configured precision"""
+        if self._precision == "float32":
+            return NanoVectorDB(
+                self.embedding_func.embedding_dim,
+                storage_file=self._client_file_name,
+            )
+        return QuantizedNanoVectorDB(
+            self.embedding_func.embedding_dim,
+            storage_file=self._client_file_name,
+            precision=self._precision,
+        )
 
     async def _get_client(self):
         """Check if the storage should be reloaded"""
@@ -68,15 +205,23 @@ class NanoVectorDBStorage(BaseVectorStorage):
                     f"Process {os.getpid()} reloading {self.namespace} due to update by another process"
                 )
                 # Reload data
-                self._client = NanoVectorDB(
-                    self.embedding_func.embedding_dim,
-                    storage_file=self._client_file_name,
-                )
+                self._client = self._new_client()
+                self._filter_index.invalidate()
                 # Reset update flag
                 self.storage_updated.value = False
 
             return self._client
 
+    def _build_filter_index(self, client) -> None:
+        storage = getattr(client, "_NanoVectorDB__storage")
+        self._filter_index.build(enumerate(storage["data"]))
+
+    async def get_ids_by_filter_keys(self, keys: list[str]) -> set[str]:
+        """Ids of the vectors whose doc id (chunks) or source chunk ids match `keys`"""
+        client = await self._get_client()
+        self._build_filter_index(client)
+        return self._filter_index.ids_for(keys)
+
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         """
         Importance notes:
@@ -114,6 +259,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
                 d["__vector__"] = embeddings[i]
             client = await self._get_client()
             results = client.upsert(datas=list_data)
+            self._filter_index.invalidate()
             return results
         else:
             # sometimes the embedding is not returned correctly. just log it.
@@ -130,21 +276,38 @@ class NanoVectorDBStorage(BaseVectorStorage):
         )  # higher priority for query
         embedding = embedding[0]
 
+        filter_keys = None
+        if ids is not None:
+            filter_keys = await resolve_doc_filter(
+                self.global_config["working_dir"], self.namespace, ids
+            )
+
         client = await self._get_client()
-        results = client.query(
-            query=embedding,
-            top_k=top_k,
-            better_than_threshold=self.cosine_better_than_threshold,
+        storage = getattr(client, "_NanoVectorDB__storage")
+        rows = None
+        if filter_keys is not None:
+            # Score only the rows of the requested documents in a single pass
+            self._build_filter_index(client)
+            rows = self._filter_index.rows_for(filter_keys)
+        row_numbers, scores = cosine_top_k(
+            storage["matrix"],
+            embedding,
+            top_k,
+            threshold=self.cosine_better_than_threshold,
+            rows=rows,
         )
-        results = [
-            {
-                **dp,
-                "id": dp["__id__"],
-                "distance": dp["__metrics__"],
-                "created_at": dp.get("__created_at__"),
-            }
-            for dp in results
-        ]
+        results = []
+        for row, score in zip(row_numbers, scores):
+            dp = storage["data"][row]
+            results.append(
+                {
+                    **dp,
+                    "__metrics__": float(score),
+                    "id": dp["__id__"],
+                    "distance": float(score),
+                    "created_at": dp.get("__created_at__"),
+                }
+            )
         return results
 
     @property
@@ -166,6 +329,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
         try:
             client = await self._get_client()
             client.delete(ids)
+            self._filter_index.invalidate()
             logger.debug(
                 f"Successfully deleted {len(ids)} vectors from {self.namespace}"
             )
@@ -190,6 +354,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
             client = await self._get_client()
             if client.get([entity_id]):
                 client.delete([entity_id])
+                self._filter_index.invalidate()
                 logger.debug(f"Successfully deleted entity {entity_name}")
             else:
                 logger.debug(f"Entity {entity_name} not found in storage")
@@ -218,6 +383,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
             if ids_to_delete:
                 client = await self._get_client()
                 client.delete(ids_to_delete)
+                self._filter_index.invalidate()
                 logger.debug(
                     f"Deleted {len(ids_to_delete)} relations for {entity_name}"
                 )
@@ -235,10 +401,8 @@ class NanoVectorDBStorage(BaseVectorStorage):
                 logger.warning(
                     f"Storage for {self.namespace} was updated by another process, reloading..."
                 )
-                self._client = NanoVectorDB(
-                    self.embedding_func.embedding_dim,
-                    storage_file=self._client_file_name,
-                )
+                self._client = self._new_client()
+                self._filter_index.invalidate()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -292,7 +456,8 @@ class NanoVectorDBStorage(BaseVectorStorage):
             return []
 
         client = await self._get_client()
-        results = client.get(ids)
+        # NanoVectorDB.get scans all records testing membership, so pass a set
+        results = client.get(set(ids))
         return [
             {
                 **dp,
@@ -324,10 +489,8 @@ class NanoVectorDBStorage(BaseVectorStorage):
                 if os.path.exists(self._client_file_name):
                     os.remove(self._client_file_name)
 
-                self._client = NanoVectorDB(
-                    self.embedding_func.embedding_dim,
-                    storage_file=self._client_file_name,
-                )
+                self._client = self._new_client()
+                self._filter_index.invalidate()
 
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace)
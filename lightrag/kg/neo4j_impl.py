@@ -1,7 +1,7 @@
 import os
 import re
 from dataclasses import dataclass
-from typing import final
+from typing import AsyncIterator, final
 import configparser
 
 
@@ -50,6 +50,8 @@ logging.getLogger("neo4j").setLevel(logging.ERROR)
 @final
 @dataclass
 class Neo4JStorage(BaseGraphStorage):
+    tracks_count_changes = True
+
     def __init__(self, namespace, global_config, embedding_func):
         super().__init__(
             namespace=namespace,
@@ -807,9 +809,10 @@ class Neo4JStorage(BaseGraphStorage):
                     result = await tx.run(
                         query, entity_id=node_id, properties=properties
                     )
-                    await result.consume()  # Ensure result is fully consumed
+                    return await result.consume()  # Ensure result is fully consumed
 
-                await session.execute_write(execute_upsert)
+                summary = await session.execute_write(execute_upsert)
+            self.record_count_changes(nodes=summary.counters.nodes_created)
         except Exception as e:
             logger.error(f"Error during upsert: {str(e)}")
             raise
@@ -864,13 +867,118 @@ class Neo4JStorage(BaseGraphStorage):
                     try:
                         await result.fetch(2)
                     finally:
-                        await result.consume()  # Ensure result is consumed
+                        summary = await result.consume()  # Ensure result is consumed
+                    return summary
 
-                await session.execute_write(execute_upsert)
+                summary = await session.execute_write(execute_upsert)
+            self.record_count_changes(edges=summary.counters.relationships_created)
         except Exception as e:
             logger.error(f"Error during edge upsert: {str(e)}")
             raise
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+            )
+        ),
+    )
+    async def upsert_nodes_batch(self, nodes: dict[str, dict[str, str]]) -> None:
+        """
+        Upsert multiple nodes in one transaction using UNWIND.
+
+        Nodes are grouped by entity_type because the type is stored as a label,
+        which cannot be parameterized; each group is written with one query.
+
+        Args:
+            nodes: Mapping of node entity IDs to node properties
+        """
+        nodes_by_type: dict[str, list[dict]] = {}
+        for node_id, properties in nodes.items():
+            if "entity_id" not in properties:
+                raise ValueError(
+                    "Neo4j: node properties must contain an 'entity_id' field"
+                )
+            nodes_by_type.setdefault(properties["entity_type"], []).append(
+                {"entity_id": node_id, "properties": properties}
+            )
+
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+
+                async def execute_upsert(tx: AsyncManagedTransaction):
+                    nodes_created = 0
+                    for entity_type, rows in nodes_by_type.items():
+                        query = (
+                            """
+                        UNWIND $rows AS row
+                        MERGE (n:base {entity_id: row.entity_id})
+                        SET n += row.properties
+                        SET n:`%s`
+                        """
+                            % entity_type
+                        )
+                        result = await tx.run(query, rows=rows)
+                        summary = await result.consume()
+                        nodes_created += summary.counters.nodes_created
+                    return nodes_created
+
+                nodes_created = await session.execute_write(execute_upsert)
+            self.record_count_changes(nodes=nodes_created)
+        except Exception as e:
+            logger.error(f"Error during batch node upsert: {str(e)}")
+            raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+            )
+        ),
+    )
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert multiple edges in one query using UNWIND.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        rows = [
+            {"source": source, "target": target, "properties": properties}
+            for source, target, properties in edges
+        ]
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+
+                async def execute_upsert(tx: AsyncManagedTransaction):
+                    query = """
+                    UNWIND $rows AS row
+                    MATCH (source:base {entity_id: row.source})
+                    MATCH (target:base {entity_id: row.target})
+                    MERGE (source)-[r:DIRECTED]-(target)
+                    SET r += row.properties
+                    """
+                    result = await tx.run(query, rows=rows)
+                    return await result.consume()
+
+                summary = await session.execute_write(execute_upsert)
+            self.record_count_changes(edges=summary.counters.relationships_created)
+        except Exception as e:
+            logger.error(f"Error during batch edge upsert: {str(e)}")
+            raise
+
     async def get_knowledge_graph(
         self,
         node_label: str,
@@ -1265,6 +1373,155 @@ class Neo4JStorage(BaseGraphStorage):
                 )  # Ensure results are consumed even if processing fails
             return labels
 
+    async def iter_nodes(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[list[tuple[str, dict[str, str]]]]:
+        """Stream nodes ordered by entity_id using keyset pagination
+
+        Pages after the first one seek past the last entity_id with a plain range
+        predicate, so each page is served from the entity_id index.
+        """
+        query = """
+        MATCH (n:base)
+        WHERE {condition}
+        RETURN n.entity_id AS entity_id, n
+        ORDER BY entity_id
+        LIMIT $limit
+        """
+        first_query = query.format(condition="n.entity_id IS NOT NULL")
+        next_query = query.format(condition="n.entity_id > $last")
+        last = None
+        while True:
+            async with self._driver.session(
+                database=self._DATABASE, default_access_mode="READ"
+            ) as session:
+                if last is None:
+                    result = await session.run(first_query, limit=batch_size)
+                else:
+                    result = await session.run(next_query, last=last, limit=batch_size)
+                try:
+                    batch = [
+                        (record["entity_id"], dict(record["n"]))
+                        async for record in result
+                    ]
+                finally:
+                    await result.consume()
+            if not batch:
+                return
+            yield batch
+            if len(batch) < batch_size:
+                return
+            last = batch[-1][0]
+
+    async def iter_edges(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[list[tuple[str, str, dict[str, str]]]]:
+        """Stream edges ordered by (source, target) entity_id
+
+        Pages over source nodes with keyset pagination on the entity_id index and
+        only expands the relationships of the nodes of the current page. Each
+        relationship is returned once, from its lexicographically smaller endpoint.
+
+        Args:
+            batch_size: Number of source nodes whose edges are fetched per round
+        """
+        query = """
+        MATCH (a:base)
+        WHERE {condition}
+        WITH a ORDER BY a.entity_id LIMIT $limit
+        OPTIONAL MATCH (a)-[r]-(b:base)
+        WHERE b.entity_id >= a.entity_id
+        RETURN DISTINCT a.entity_id AS source, b.entity_id AS target, r,
+               properties(r) AS properties
+        ORDER BY source, target
+        """
+        first_query = query.format(condition="a.entity_id IS NOT NULL")
+        next_query = query.format(condition="a.entity_id > $last")
+        last = None
+        while True:
+            async with self._driver.session(
+                database=self._DATABASE, default_access_mode="READ"
+            ) as session:
+                if last is None:
+                    result = await session.run(first_query, limit=batch_size)
+                else:
+                    result = await session.run(next_query, last=last, limit=batch_size)
+                try:
+                    records = [
+                        (record["source"], record["target"], record["properties"])
+                        async for record in result
+                    ]
+                finally:
+                    await result.consume()
+            if not records:
+                return
+            # Nodes without edges of their own still advance the page
+            batch = [record for record in records if record[1] is not None]
+            if batch:
+                yield batch
+            if len({record[0] for record in records}) < batch_size:
+                return
+            last = records[-1][0]
+
+    async def get_graph_counts(self) -> tuple[int, int]:
+        """Node and relationship counts, answered from the Neo4j count store"""
+        async with self._driver.session(
+            database=self._DATABASE, default_access_mode="READ"
+        ) as session:
+            result = await session.run("MATCH (n:base) RETURN count(n) AS nodes")
+            node_record = await result.single()
+            await result.consume()
+            result = await session.run("MATCH ()-[r]->() RETURN count(r) AS edges")
+            edge_record = await result.single()
+            await result.consume()
+            return node_record["nodes"], edge_record["edges"]
+
+    async def search_labels(
+        self, query: str = "", limit: int = 50, offset: int = 0, fuzzy: bool = False
+    ) -> list[str]:
+        """Search entity labels in the database with SKIP/LIMIT pagination"""
+        if not query:
+            condition = ""
+        elif fuzzy:
+            condition = "AND toLower(n.entity_id) CONTAINS toLower($query)"
+        else:
+            condition = "AND n.entity_id STARTS WITH $query"
+        async with self._driver.session(
+            database=self._DATABASE, default_access_mode="READ"
+        ) as session:
+            cypher = f"""
+            MATCH (n:base)
+            WHERE n.entity_id IS NOT NULL {condition}
+            RETURN DISTINCT n.entity_id AS label
+            ORDER BY label
+            SKIP $offset LIMIT $limit
+            """
+            result = await session.run(
+                cypher, query=query, offset=int(offset), limit=int(limit)
+            )
+            try:
+                return [record["label"] async for record in result]
+            finally:
+                await result.consume()
+
+    async def get_popular_labels(self, limit: int = 50) -> list[str]:
+        """Entity labels ordered by node degree, highest first"""
+        async with self._driver.session(
+            database=self._DATABASE, default_access_mode="READ"
+        ) as session:
+            cypher = """
+            MATCH (n:base)
+            WHERE n.entity_id IS NOT NULL
+            RETURN n.entity_id AS label, count { (n)--() } AS degree
+            ORDER BY degree DESC, label
+            LIMIT $limit
+            """
+            result = await session.run(cypher, limit=int(limit))
+            try:
+                return [record["label"] async for record in result]
+            finally:
+                await result.consume()
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -1291,11 +1548,15 @@ class Neo4JStorage(BaseGraphStorage):
             """
             result = await tx.run(query, entity_id=node_id)
             logger.debug(f"Deleted node with label '{node_id}'")
-            await result.consume()  # Ensure result is fully consumed
+            return await result.consume()  # Ensure result is fully consumed
 
         try:
             async with self._driver.session(database=self._DATABASE) as session:
-                await session.execute_write(_do_delete)
+                summary = await session.execute_write(_do_delete)
+            self.record_count_changes(
+                nodes=-summary.counters.nodes_deleted,
+                edges=-summary.counters.relationships_deleted,
+            )
         except Exception as e:
             logger.error(f"Error during node deletion: {str(e)}")
             raise
@@ -1350,11 +1611,12 @@ class Neo4JStorage(BaseGraphStorage):
                     query, source_entity_id=source, target_entity_id=target
                 )
                 logger.debug(f"Deleted edge from '{source}' to '{target}'")
-                await result.consume()  # Ensure result is fully consumed
+                return await result.consume()  # Ensure result is fully consumed
 
             try:
                 async with self._driver.session(database=self._DATABASE) as session:
-                    await session.execute_write(_do_delete_edge)
+                    summary = await session.execute_write(_do_delete_edge)
+                self.record_count_changes(edges=-summary.counters.relationships_deleted)
             except Exception as e:
                 logger.error(f"Error during edge deletion: {str(e)}")
                 raise
@@ -1375,6 +1637,7 @@ class Neo4JStorage(BaseGraphStorage):
                 query = "MATCH (n) DETACH DELETE n"
                 result = await session.run(query)
                 await result.consume()  # Ensure result is fully consumed
+                self.invalidate_count_changes()
 
                 logger.info(
                     f"Process {os.getpid()} drop Neo4j database {self._DATABASE}"
@@ -1,11 +1,14 @@
+import asyncio
+import heapq
 import os
 from dataclasses import dataclass
-from typing import final
+from typing import AsyncIterator, Iterable, final
 
 from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
 from lightrag.utils import logger
 from lightrag.base import BaseGraphStorage
 from lightrag.constants import GRAPH_FIELD_SEP
+from .label_index import LabelIndex
 
 import pipmaster as pm
 
@@ -14,7 +17,7 @@ if not pm.is_installed("networkx"):
 
 import networkx as nx
 from .shared_storage import (
-    get_storage_lock,
+    get_storage_rw_lock,
     get_update_flag,
     set_all_update_flags,
 )
@@ -32,6 +35,8 @@ MAX_GRAPH_NODES = int(os.getenv("MAX_GRAPH_NODES", 1000))
 @final
 @dataclass
 class NetworkXStorage(BaseGraphStorage):
+    tracks_count_changes = True
+
     @staticmethod
     def load_nx_graph(file_name) -> nx.Graph:
         if os.path.exists(file_name):
@@ -52,23 +57,19 @@ class NetworkXStorage(BaseGraphStorage):
         self._storage_lock = None
         self.storage_updated = None
         self._graph = None
-
-        # Load initial graph
-        preloaded_graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
-        if preloaded_graph is not None:
-            logger.info(
-                f"Loaded graph from {self._graphml_xml_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
-            )
-        else:
-            logger.info("Created new empty graph")
-        self._graph = preloaded_graph or nx.Graph()
+        # Bumped on every mutation to invalidate derived indexes
+        self._graph_version = 0
+        self._degree_index = None
+        # Sorted label index, rebuilt whenever the graph object is replaced
+        self._label_index = None
+        self._label_index_graph = None
 
     async def initialize(self):
         """Initialize storage data"""
         # Get the update flag for cross-process update notification
         self.storage_updated = await get_update_flag(self.namespace)
         # Get the storage lock for use in other methods
-        self._storage_lock = get_storage_lock()
+        self._storage_lock = get_storage_rw_lock(self.namespace)
 
         # 重新计算图谱文件路径（支持工作目录变更）
         new_graphml_file = os.path.join(
@@ -77,11 +78,28 @@ class NetworkXStorage(BaseGraphStorage):
 
         logger.info(f"NetworkX initialize: current file path: {self._graphml_xml_file}")
         logger.info(f"NetworkX initialize: new file path: {new_graphml_file}")
-        logger.info(f"NetworkX initialize: working_dir: {self.global_config['working_dir']}")
+        logger.info(
+            f"NetworkX initialize: working_dir: {self.global_config['working_dir']}"
+        )
 
+        if self._graph is None:
+            # Load initial graph, deferred from the constructor until the storage is initialized
+            self._graphml_xml_file = new_graphml_file
+            preloaded_graph = await asyncio.to_thread(
+                NetworkXStorage.load_nx_graph, self._graphml_xml_file
+            )
+            if preloaded_graph is not None:
+                logger.info(
+                    f"Loaded graph from {self._graphml_xml_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
+                )
+            else:
+                logger.info("Created new empty graph")
+            self._graph = preloaded_graph or nx.Graph()
         # 如果文件路径发生变化，重新加载图谱
-        if new_graphml_file != self._graphml_xml_file:
-            logger.info(f"Working directory changed, reloading graph from {new_graphml_file}")
+        elif new_graphml_file != self._graphml_xml_file:
+            logger.info(
+                f"Working directory changed, reloading graph from {new_graphml_file}"
+            )
             self._graphml_xml_file = new_graphml_file
 
             # 重新加载图谱文件
@@ -100,7 +118,7 @@ class NetworkXStorage(BaseGraphStorage):
     async def _get_graph(self):
         """Check if the storage should be reloaded"""
         # Acquire lock to prevent concurrent read and write
-        async with self._storage_lock:
+        async with self._storage_lock.read():
             # Check if data needs to be reloaded
             if self.storage_updated.value:
                 logger.info(
@@ -127,6 +145,11 @@ class NetworkXStorage(BaseGraphStorage):
         graph = await self._get_graph()
         return graph.nodes.get(node_id)
 
+    async def get_nodes_batch(self, node_ids: list[str]) -> dict[str, dict]:
+        graph = await self._get_graph()
+        nodes = graph.nodes
+        return {node_id: nodes[node_id] for node_id in node_ids if node_id in nodes}
+
     async def node_degree(self, node_id: str) -> int:
         graph = await self._get_graph()
         return graph.degree(node_id)
@@ -157,7 +180,9 @@ class NetworkXStorage(BaseGraphStorage):
            KG-storage-log should be used to avoid data corruption
         """
         graph = await self._get_graph()
+        counts = self._graph_counts(graph)
         graph.add_node(node_id, **node_data)
+        self._mark_graph_changed(added=(node_id,), counts=counts)
 
     async def upsert_edge(
         self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
@@ -169,7 +194,26 @@ class NetworkXStorage(BaseGraphStorage):
            KG-storage-log should be used to avoid data corruption
         """
         graph = await self._get_graph()
+        counts = self._graph_counts(graph)
         graph.add_edge(source_node_id, target_node_id, **edge_data)
+        self._mark_graph_changed(added=(source_node_id, target_node_id), counts=counts)
+
+    async def upsert_nodes_batch(self, nodes: dict[str, dict[str, str]]) -> None:
+        graph = await self._get_graph()
+        counts = self._graph_counts(graph)
+        graph.add_nodes_from(nodes.items())
+        self._mark_graph_changed(added=nodes.keys(), counts=counts)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        graph = await self._get_graph()
+        counts = self._graph_counts(graph)
+        graph.add_edges_from(edges)
+        self._mark_graph_changed(
+            added=(node_id for src, tgt, _ in edges for node_id in (src, tgt)),
+            counts=counts,
+        )
 
     async def delete_node(self, node_id: str) -> None:
         """
@@ -180,7 +224,9 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         if graph.has_node(node_id):
+            counts = self._graph_counts(graph)
             graph.remove_node(node_id)
+            self._mark_graph_changed(removed=(node_id,), counts=counts)
             logger.debug(f"Node {node_id} deleted from the graph.")
         else:
             logger.warning(f"Node {node_id} not found in the graph for deletion.")
@@ -197,9 +243,13 @@ class NetworkXStorage(BaseGraphStorage):
             nodes: List of node IDs to be deleted
         """
         graph = await self._get_graph()
+        counts = self._graph_counts(graph)
+        removed = []
         for node in nodes:
             if graph.has_node(node):
                 graph.remove_node(node)
+                removed.append(node)
+        self._mark_graph_changed(removed=removed, counts=counts)
 
     async def remove_edges(self, edges: list[tuple[str, str]]):
         """Delete multiple edges
@@ -213,9 +263,11 @@ class NetworkXStorage(BaseGraphStorage):
             edges: List of edges to be deleted, each edge is a (source, target) tuple
         """
         graph = await self._get_graph()
+        counts = self._graph_counts(graph)
         for source, target in edges:
             if graph.has_edge(source, target):
                 graph.remove_edge(source, target)
+        self._mark_graph_changed(counts=counts)
 
     async def get_all_labels(self) -> list[str]:
         """
@@ -224,12 +276,207 @@ class NetworkXStorage(BaseGraphStorage):
             [label1, label2, ...]  # Alphabetically sorted label list
         """
         graph = await self._get_graph()
-        labels = set()
-        for node in graph.nodes():
-            labels.add(str(node))  # Add node id as a label
+        return self._get_label_index(graph).all()
 
-        # Return sorted list
-        return sorted(list(labels))
+    async def iter_nodes(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[list[tuple[str, dict[str, str]]]]:
+        graph = await self._get_graph()
+        # Snapshot the node ids only; attributes are read batch by batch
+        node_ids = list(graph.nodes)
+        for start in range(0, len(node_ids), batch_size):
+            nodes = graph.nodes
+            batch = [
+                (node_id, dict(nodes[node_id]))
+                for node_id in node_ids[start : start + batch_size]
+                if node_id in nodes
+            ]
+            if batch:
+                yield batch
+
+    async def iter_edges(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[list[tuple[str, str, dict[str, str]]]]:
+        graph = await self._get_graph()
+        node_ids = list(graph.nodes)
+        # Node positions in the snapshot decide which endpoint emits an edge
+        position = {node_id: i for i, node_id in enumerate(node_ids)}
+        batch = []
+        for i, node_id in enumerate(node_ids):
+            if node_id not in graph:
+                continue
+            for neighbor, edge_data in graph.adj[node_id].items():
+                if position.get(neighbor, -1) >= i:
+                    batch.append((node_id, neighbor, dict(edge_data)))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def get_graph_counts(self) -> tuple[int, int]:
+        graph = await self._get_graph()
+        return graph.number_of_nodes(), graph.number_of_edges()
+
+    async def search_labels(
+        self, query: str = "", limit: int = 50, offset: int = 0, fuzzy: bool = False
+    ) -> list[str]:
+        graph = await self._get_graph()
+        return self._get_label_index(graph).search(query, limit, offset, fuzzy)
+
+    async def get_popular_labels(self, limit: int = 50) -> list[str]:
+        graph = await self._get_graph()
+        return [str(node) for node in self._top_degree_nodes(graph, limit)]
+
+    @staticmethod
+    def _graph_counts(graph: nx.Graph) -> tuple[int, int]:
+        return graph.number_of_nodes(), graph.number_of_edges()
+
+    def _mark_graph_changed(
+        self,
+        added: Iterable[str] = (),
+        removed: Iterable[str] = (),
+        counts: tuple[int, int] | None = None,
+    ) -> None:
+        """Invalidate derived indexes and apply label changes to the label index
+
+        `counts` are the node and edge counts read before the change, the
+        difference to the current counts is recorded for the graph stats.
+        """
+        self._graph_version += 1
+        if counts is not None:
+            nodes, edges = self._graph_counts(self._graph)
+            self.record_count_changes(nodes - counts[0], edges - counts[1])
+        if self._label_index is None or self._label_index_graph is not self._graph:
+            return
+        for node_id in added:
+            self._label_index.add(node_id)
+        for node_id in removed:
+            self._label_index.remove(node_id)
+
+    def _get_label_index(self, graph: nx.Graph) -> LabelIndex:
+        if self._label_index is None or self._label_index_graph is not graph:
+            self._label_index = LabelIndex(str(node) for node in graph.nodes())
+            self._label_index_graph = graph
+        return self._label_index
+
+    def _ensure_graph_file(self) -> None:
+        """Reload the graph if the working directory changed since it was loaded"""
+        # 检查图谱文件路径（支持工作目录变更）
+        current_expected_file = os.path.join(
+            self.global_config["working_dir"], f"graph_{self.namespace}.graphml"
+        )
+        if current_expected_file == self._graphml_xml_file and (
+            self._graph is not None
+            and (
+                self._graph.number_of_nodes() > 0
+                or not os.path.exists(current_expected_file)
+            )
+        ):
+            return
+
+        logger.info(f"Reloading graph from {current_expected_file}")
+        self._graphml_xml_file = current_expected_file
+        preloaded_graph = NetworkXStorage.load_nx_graph(current_expected_file)
+        if preloaded_graph is not None:
+            logger.info(
+                f"Successfully loaded graph with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
+            )
+            self._graph = preloaded_graph
+        else:
+            logger.warning(f"Graph file does not exist: {current_expected_file}")
+            self._graph = nx.Graph()
+        # Changes recorded so far belong to the stats of the previous directory
+        self.invalidate_count_changes()
+        self._mark_graph_changed()
+
+    def _top_degree_nodes(self, graph: nx.Graph, limit: int) -> list[str]:
+        """Return up to `limit` nodes with the highest degree, highest first
+
+        The selection is cached per graph version, so repeated requests for the
+        same graph only pay the O(V log limit) heap scan once.
+        """
+        cache = self._degree_index
+        if (
+            cache is None
+            or cache[0] is not graph
+            or cache[1] != self._graph_version
+            or (len(cache[2]) < limit and len(cache[2]) < graph.number_of_nodes())
+        ):
+            top_nodes = [
+                node
+                for node, _ in heapq.nlargest(
+                    limit, graph.degree(), key=lambda item: item[1]
+                )
+            ]
+            self._degree_index = cache = (graph, self._graph_version, top_nodes)
+        return cache[2][:limit]
+
+    def _bfs_nodes(
+        self, graph: nx.Graph, start: str, max_depth: int, max_nodes: int
+    ) -> tuple[list[str], bool]:
+        """Breadth-first node selection that visits high-degree nodes first
+
+        Nodes are popped from a heap ordered by (depth, -degree), which keeps the
+        level-by-level order of BFS while preferring well connected nodes within a
+        level. Returns the selected nodes and whether max_nodes cut the search short.
+        """
+        selected = []
+        visited = set()
+        counter = 0
+        heap = [(0, -graph.degree(start), counter, start)]
+
+        while heap and len(selected) < max_nodes:
+            depth, _, _, node = heapq.heappop(heap)
+            if node in visited:
+                continue
+            visited.add(node)
+            selected.append(node)
+
+            if depth < max_depth:
+                for neighbor in graph.adj[node]:
+                    if neighbor not in visited:
+                        counter += 1
+                        heapq.heappush(
+                            heap,
+                            (depth + 1, -graph.degree(neighbor), counter, neighbor),
+                        )
+
+        # Truncated if max_nodes was reached while unvisited nodes were still queued
+        is_truncated = any(entry[3] not in visited for entry in heap)
+        return selected, is_truncated
+
+    @staticmethod
+    def _iter_kg_nodes(graph: nx.Graph, nodes: list[str]):
+        for node in nodes:
+            yield KnowledgeGraphNode(
+                id=str(node), labels=[str(node)], properties=dict(graph.nodes[node])
+            )
+
+    @staticmethod
+    def _iter_kg_edges(graph: nx.Graph, nodes: list[str]):
+        """Yield every edge between the given nodes once, without building a subgraph"""
+        node_set = set(nodes)
+        emitted = set()
+        for node in nodes:
+            for neighbor, edge_data in graph.adj[node].items():
+                if neighbor not in node_set:
+                    continue
+                source, target = str(node), str(neighbor)
+                # Esure unique edge_id for undirect graph
+                if source > target:
+                    source, target = target, source
+                edge_id = f"{source}-{target}"
+                if edge_id in emitted:
+                    continue
+                emitted.add(edge_id)
+                yield KnowledgeGraphEdge(
+                    id=edge_id,
+                    type="DIRECTED",
+                    source=source,
+                    target=target,
+                    properties=dict(edge_data),
+                )
 
     async def get_knowledge_graph(
         self,
@@ -249,170 +496,36 @@ class NetworkXStorage(BaseGraphStorage):
             KnowledgeGraph object containing nodes and edges, with an is_truncated flag
             indicating whether the graph was truncated due to max_nodes limit
         """
-        # 强制重新检查和加载图谱文件（确保使用最新的工作目录）
-        current_expected_file = os.path.join(
-            self.global_config["working_dir"], f"graph_{self.namespace}.graphml"
-        )
-
-        logger.info(f"NetworkX get_knowledge_graph: working_dir = {self.global_config['working_dir']}")
-        logger.info(f"NetworkX get_knowledge_graph: expected file = {current_expected_file}")
-        logger.info(f"NetworkX get_knowledge_graph: current file = {self._graphml_xml_file}")
-
-        # 如果文件路径不同，或者当前图谱为空，强制重新加载
-        if (current_expected_file != self._graphml_xml_file or
-            self._graph is None or
-            self._graph.number_of_nodes() == 0):
-
-            logger.info(f"Reloading graph from {current_expected_file}")
-            self._graphml_xml_file = current_expected_file
-
-            # 重新加载图谱文件
-            if os.path.exists(current_expected_file):
-                preloaded_graph = NetworkXStorage.load_nx_graph(current_expected_file)
-                if preloaded_graph is not None:
-                    logger.info(
-                        f"Successfully loaded graph with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
-                    )
-                    self._graph = preloaded_graph
-                else:
-                    logger.warning(f"Failed to load graph from {current_expected_file}")
-                    self._graph = nx.Graph()
-            else:
-                logger.warning(f"Graph file does not exist: {current_expected_file}")
-                self._graph = nx.Graph()
-        else:
-            logger.info(f"Using existing graph with {self._graph.number_of_nodes()} nodes, {self._graph.number_of_edges()} edges")
-
+        self._ensure_graph_file()
         graph = await self._get_graph()
 
-        result = KnowledgeGraph()
-
         # Handle special case for "*" label
         if node_label == "*":
-            # Get degrees of all nodes
-            degrees = dict(graph.degree())
-            # Sort nodes by degree in descending order and take top max_nodes
-            sorted_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)
-
-            # Check if graph is truncated
-            if len(sorted_nodes) > max_nodes:
-                result.is_truncated = True
+            selected_nodes = self._top_degree_nodes(graph, max_nodes)
+            is_truncated = graph.number_of_nodes() > max_nodes
+            if is_truncated:
                 logger.info(
-                    f"Graph truncated: {len(sorted_nodes)} nodes found, limited to {max_nodes}"
+                    f"Graph truncated: {graph.number_of_nodes()} nodes found, limited to {max_nodes}"
                 )
-
-            limited_nodes = [node for node, _ in sorted_nodes[:max_nodes]]
-            # Create subgraph with the highest degree nodes
-            subgraph = graph.subgraph(limited_nodes)
         else:
             # Check if node exists
             if node_label not in graph:
                 logger.warning(f"Node {node_label} not found in the graph")
                 return KnowledgeGraph()  # Return empty graph
 
-            # Use modified BFS to get nodes, prioritizing high-degree nodes at the same depth
-            bfs_nodes = []
-            visited = set()
-            # Store (node, depth, degree) in the queue
-            queue = [(node_label, 0, graph.degree(node_label))]
-
-            # Modified breadth-first search with degree-based prioritization
-            while queue and len(bfs_nodes) < max_nodes:
-                # Get the current depth from the first node in queue
-                current_depth = queue[0][1]
-
-                # Collect all nodes at the current depth
-                current_level_nodes = []
-                while queue and queue[0][1] == current_depth:
-                    current_level_nodes.append(queue.pop(0))
-
-                # Sort nodes at current depth by degree (highest first)
-                current_level_nodes.sort(key=lambda x: x[2], reverse=True)
-
-                # Process all nodes at current depth in order of degree
-                for current_node, depth, degree in current_level_nodes:
-                    if current_node not in visited:
-                        visited.add(current_node)
-                        bfs_nodes.append(current_node)
-
-                        # Only explore neighbors if we haven't reached max_depth
-                        if depth < max_depth:
-                            # Add neighbor nodes to queue with incremented depth
-                            neighbors = list(graph.neighbors(current_node))
-                            # Filter out already visited neighbors
-                            unvisited_neighbors = [
-                                n for n in neighbors if n not in visited
-                            ]
-                            # Add neighbors to the queue with their degrees
-                            for neighbor in unvisited_neighbors:
-                                neighbor_degree = graph.degree(neighbor)
-                                queue.append((neighbor, depth + 1, neighbor_degree))
-
-                    # Check if we've reached max_nodes
-                    if len(bfs_nodes) >= max_nodes:
-                        break
-
-            # Check if graph is truncated - if we still have nodes in the queue
-            # and we've reached max_nodes, then the graph is truncated
-            if queue and len(bfs_nodes) >= max_nodes:
-                result.is_truncated = True
+            selected_nodes, is_truncated = self._bfs_nodes(
+                graph, node_label, max_depth, max_nodes
+            )
+            if is_truncated:
                 logger.info(
                     f"Graph truncated: breadth-first search limited to {max_nodes} nodes"
                 )
 
-            # Create subgraph with BFS discovered nodes
-            subgraph = graph.subgraph(bfs_nodes)
-
-        # Add nodes to result
-        seen_nodes = set()
-        seen_edges = set()
-        for node in subgraph.nodes():
-            if str(node) in seen_nodes:
-                continue
-
-            node_data = dict(subgraph.nodes[node])
-            # Get entity_type as labels
-            labels = []
-            if "entity_type" in node_data:
-                if isinstance(node_data["entity_type"], list):
-                    labels.extend(node_data["entity_type"])
-                else:
-                    labels.append(node_data["entity_type"])
-
-            # Create node with properties
-            node_properties = {k: v for k, v in node_data.items()}
-
-            result.nodes.append(
-                KnowledgeGraphNode(
-                    id=str(node), labels=[str(node)], properties=node_properties
-                )
-            )
-            seen_nodes.add(str(node))
-
-        # Add edges to result
-        for edge in subgraph.edges():
-            source, target = edge
-            # Esure unique edge_id for undirect graph
-            if str(source) > str(target):
-                source, target = target, source
-            edge_id = f"{source}-{target}"
-            if edge_id in seen_edges:
-                continue
-
-            edge_data = dict(subgraph.edges[edge])
-
-            # Create edge with complete information
-            result.edges.append(
-                KnowledgeGraphEdge(
-                    id=edge_id,
-                    type="DIRECTED",
-                    source=str(source),
-                    target=str(target),
-                    properties=edge_data,
-                )
-            )
-            seen_edges.add(edge_id)
-
+        result = KnowledgeGraph(
+            nodes=list(self._iter_kg_nodes(graph, selected_nodes)),
+            edges=list(self._iter_kg_edges(graph, selected_nodes)),
+            is_truncated=is_truncated,
+        )
         logger.info(
             f"Subgraph query successful | Node count: {len(result.nodes)} | Edge count: {len(result.edges)}"
         )
@@ -447,7 +560,7 @@ class NetworkXStorage(BaseGraphStorage):
 
     async def index_done_callback(self) -> bool:
         """Save data to disk"""
-        async with self._storage_lock:
+        async with self._storage_lock.write():
             # Check if storage was updated by another process
             if self.storage_updated.value:
                 # Storage was updated by another process, reload data instead of saving
@@ -462,7 +575,7 @@ class NetworkXStorage(BaseGraphStorage):
                 return False  # Return error
 
         # Acquire lock and perform persistence
-        async with self._storage_lock:
+        async with self._storage_lock.write():
             try:
                 # Save data to disk
                 NetworkXStorage.write_nx_graph(self._graph, self._graphml_xml_file)
@@ -492,11 +605,12 @@ class NetworkXStorage(BaseGraphStorage):
             - On failure: {"status": "error", "message": "<error details>"}
         """
         try:
-            async with self._storage_lock:
+            async with self._storage_lock.write():
                 # delete _client_file_name
                 if os.path.exists(self._graphml_xml_file):
                     os.remove(self._graphml_xml_file)
                 self._graph = nx.Graph()
+                self.invalidate_count_changes()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace)
                 # Reset own update flag to avoid self-reloading
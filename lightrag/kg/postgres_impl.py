@@ -1,10 +1,11 @@
 import asyncio
 import json
 import os
+import struct
 import datetime
 from datetime import timezone
 from dataclasses import dataclass, field
-from typing import Any, Union, final
+from typing import Any, Literal, Union, final
 import numpy as np
 import configparser
 
@@ -48,6 +49,18 @@ load_dotenv(dotenv_path=".env", override=False)
 MAX_GRAPH_NODES = int(os.getenv("MAX_GRAPH_NODES", 1000))
 
 
+def _encode_vector(value: Any) -> bytes:
+    """Encode an embedding in the pgvector binary format: dim, unused, float4[]"""
+    vector = np.asarray(value, dtype=">f4").ravel()
+    return struct.pack(">HH", vector.shape[0], 0) + vector.tobytes()
+
+
+def _decode_vector(data: bytes) -> list[float]:
+    """Decode a pgvector binary value to a list, so rows stay JSON serializable"""
+    dim, _ = struct.unpack_from(">HH", data)
+    return np.frombuffer(data, dtype=">f4", count=dim, offset=4).tolist()
+
+
 class PostgreSQLDB:
     def __init__(self, config: dict[str, Any], **kwargs: Any):
         self.host = config["host"]
@@ -57,6 +70,7 @@ class PostgreSQLDB:
         self.database = config["database"]
         self.workspace = config["workspace"]
         self.max = int(config["max_connections"])
+        self.upsert_batch_size = max(1, int(config.get("upsert_batch_size", 500)))
         self.increment = 1
         self.pool: Pool | None = None
 
@@ -73,6 +87,7 @@ class PostgreSQLDB:
                 port=self.port,
                 min_size=1,
                 max_size=self.max,
+                init=self._init_connection,
             )
 
             logger.info(
@@ -84,6 +99,25 @@ class PostgreSQLDB:
             )
             raise
 
+    @staticmethod
+    async def _init_connection(connection: asyncpg.Connection) -> None:
+        """Bind pgvector values as binary on every new pooled connection"""
+        vector_schema = await connection.fetchval(
+            """SELECT n.nspname FROM pg_type t
+               JOIN pg_namespace n ON n.oid = t.typnamespace
+               WHERE t.typname = 'vector' LIMIT 1"""
+        )
+        if vector_schema is None:
+            # pgvector is not installed, only non vector storages can be used
+            return
+        await connection.set_type_codec(
+            "vector",
+            schema=vector_schema,
+            encoder=_encode_vector,
+            decoder=_decode_vector,
+            format="binary",
+        )
+
     @staticmethod
     async def configure_age(connection: asyncpg.Connection, graph_name: str) -> None:
         """Set the Apache AGE environment and creates a graph if it does not exist.
@@ -284,6 +318,12 @@ class PostgreSQLDB:
                     f"PostgreSQL, Failed to create index on table {k}, Got: {e}"
                 )
 
+        # Secondary indexes backing status queries and document listing
+        try:
+            await self._create_doc_status_indexes()
+        except Exception as e:
+            logger.error(f"PostgreSQL, Failed to create doc status indexes: {e}")
+
         # After all tables are created, attempt to migrate timestamp fields
         try:
             await self._migrate_timestamp_columns()
@@ -304,6 +344,18 @@ class PostgreSQLDB:
         except Exception as e:
             logger.error(f"PostgreSQL, Failed to migrate doc_chunks to vdb_chunks: {e}")
 
+    async def _create_doc_status_indexes(self):
+        """Index doc status rows by status and timestamps within a workspace"""
+        indexes = {
+            "idx_lightrag_doc_status_status": "(workspace, status)",
+            "idx_lightrag_doc_status_updated_at": "(workspace, updated_at)",
+            "idx_lightrag_doc_status_created_at": "(workspace, created_at)",
+        }
+        for index_name, columns in indexes.items():
+            await self.execute(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON LIGHTRAG_DOC_STATUS {columns}"
+            )
+
     async def query(
         self,
         sql: str,
@@ -386,6 +438,33 @@ class PostgreSQLDB:
             logger.error(f"PostgreSQL database,\nsql:{sql},\ndata:{data},\nerror:{e}")
             raise
 
+    async def executemany(
+        self,
+        sql: str,
+        rows: list[dict[str, Any]],
+        batch_size: int | None = None,
+    ) -> None:
+        """Run one statement for many rows over a single connection
+
+        Rows are sent in batches of `upsert_batch_size` with asyncpg's
+        pipelined executemany, each batch in its own transaction, so a bulk
+        upsert costs one round trip per batch instead of one per row.
+        """
+        if not rows:
+            return
+        batch_size = batch_size or self.upsert_batch_size
+        try:
+            async with self.pool.acquire() as connection:  # type: ignore
+                for i in range(0, len(rows), batch_size):
+                    args = [tuple(row.values()) for row in rows[i : i + batch_size]]
+                    async with connection.transaction():
+                        await connection.executemany(sql, args)
+        except Exception as e:
+            logger.error(
+                f"PostgreSQL database,\nsql:{sql},\nrows:{len(rows)},\nerror:{e}"
+            )
+            raise
+
 
 class ClientManager:
     _instances: dict[str, Any] = {"db": None, "ref_count": 0}
@@ -423,6 +502,10 @@ class ClientManager:
                 "POSTGRES_MAX_CONNECTIONS",
                 config.get("postgres", "max_connections", fallback=20),
             ),
+            "upsert_batch_size": os.environ.get(
+                "POSTGRES_UPSERT_BATCH_SIZE",
+                config.get("postgres", "upsert_batch_size", fallback=500),
+            ),
         }
 
     @classmethod
@@ -593,9 +676,8 @@ class PGKVStorage(BaseKVStorage):
 
         if is_namespace(self.namespace, NameSpace.KV_STORE_TEXT_CHUNKS):
             current_time = datetime.datetime.now(timezone.utc)
-            for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_text_chunk"]
-                _data = {
+            rows = [
+                {
                     "workspace": self.db.workspace,
                     "id": k,
                     "tokens": v["tokens"],
@@ -606,30 +688,33 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                for k, v in data.items()
+            ]
+            await self.db.executemany(SQL_TEMPLATES["upsert_text_chunk"], rows)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_FULL_DOCS):
-            for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_doc_full"]
-                _data = {
+            rows = [
+                {
                     "id": k,
                     "content": v["content"],
                     "workspace": self.db.workspace,
                 }
-                await self.db.execute(upsert_sql, _data)
+                for k, v in data.items()
+            ]
+            await self.db.executemany(SQL_TEMPLATES["upsert_doc_full"], rows)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE):
-            for mode, items in data.items():
-                for k, v in items.items():
-                    upsert_sql = SQL_TEMPLATES["upsert_llm_response_cache"]
-                    _data = {
-                        "workspace": self.db.workspace,
-                        "id": k,
-                        "original_prompt": v["original_prompt"],
-                        "return_value": v["return"],
-                        "mode": mode,
-                        "chunk_id": v.get("chunk_id"),
-                    }
-
-                    await self.db.execute(upsert_sql, _data)
+            rows = [
+                {
+                    "workspace": self.db.workspace,
+                    "id": k,
+                    "original_prompt": v["original_prompt"],
+                    "return_value": v["return"],
+                    "mode": mode,
+                    "chunk_id": v.get("chunk_id"),
+                }
+                for mode, items in data.items()
+                for k, v in items.items()
+            ]
+            await self.db.executemany(SQL_TEMPLATES["upsert_llm_response_cache"], rows)
 
     async def index_done_callback(self) -> None:
         # PG handles persistence automatically
@@ -752,7 +837,7 @@ class PGVectorStorage(BaseVectorStorage):
                 "chunk_order_index": item["chunk_order_index"],
                 "full_doc_id": item["full_doc_id"],
                 "content": item["content"],
-                "content_vector": json.dumps(item["__vector__"].tolist()),
+                "content_vector": item["__vector__"],
                 "file_path": item["file_path"],
                 "create_time": current_time,
                 "update_time": current_time,
@@ -778,7 +863,7 @@ class PGVectorStorage(BaseVectorStorage):
             "id": item["__id__"],
             "entity_name": item["entity_name"],
             "content": item["content"],
-            "content_vector": json.dumps(item["__vector__"].tolist()),
+            "content_vector": item["__vector__"],
             "chunk_ids": chunk_ids,
             "file_path": item.get("file_path", None),
             "create_time": current_time,
@@ -802,7 +887,7 @@ class PGVectorStorage(BaseVectorStorage):
             "source_id": item["src_id"],
             "target_id": item["tgt_id"],
             "content": item["content"],
-            "content_vector": json.dumps(item["__vector__"].tolist()),
+            "content_vector": item["__vector__"],
             "chunk_ids": chunk_ids,
             "file_path": item.get("file_path", None),
             "create_time": current_time,
@@ -836,17 +921,22 @@ class PGVectorStorage(BaseVectorStorage):
         embeddings = np.concatenate(embeddings_list)
         for i, d in enumerate(list_data):
             d["__vector__"] = embeddings[i]
-        for item in list_data:
-            if is_namespace(self.namespace, NameSpace.VECTOR_STORE_CHUNKS):
-                upsert_sql, data = self._upsert_chunks(item, current_time)
-            elif is_namespace(self.namespace, NameSpace.VECTOR_STORE_ENTITIES):
-                upsert_sql, data = self._upsert_entities(item, current_time)
-            elif is_namespace(self.namespace, NameSpace.VECTOR_STORE_RELATIONSHIPS):
-                upsert_sql, data = self._upsert_relationships(item, current_time)
-            else:
-                raise ValueError(f"{self.namespace} is not supported")
 
-            await self.db.execute(upsert_sql, data)
+        if is_namespace(self.namespace, NameSpace.VECTOR_STORE_CHUNKS):
+            prepare_row = self._upsert_chunks
+        elif is_namespace(self.namespace, NameSpace.VECTOR_STORE_ENTITIES):
+            prepare_row = self._upsert_entities
+        elif is_namespace(self.namespace, NameSpace.VECTOR_STORE_RELATIONSHIPS):
+            prepare_row = self._upsert_relationships
+        else:
+            raise ValueError(f"{self.namespace} is not supported")
+
+        upsert_sql = None
+        rows = []
+        for item in list_data:
+            upsert_sql, row = prepare_row(item, current_time)
+            rows.append(row)
+        await self.db.executemany(upsert_sql, rows)
 
     #################### query method ###############
     async def query(
@@ -856,14 +946,16 @@ class PGVectorStorage(BaseVectorStorage):
             [query], _priority=5
         )  # higher priority for query
         embedding = embeddings[0]
-        embedding_string = ",".join(map(str, embedding))
+        # The embedding is bound as a binary vector parameter, so the statement
+        # text stays the same and asyncpg reuses its prepared statement
         # Use parameterized document IDs (None means search across all documents)
-        sql = SQL_TEMPLATES[self.namespace].format(embedding_string=embedding_string)
+        sql = SQL_TEMPLATES[self.namespace]
         params = {
             "workspace": self.db.workspace,
             "doc_ids": ids,
             "better_than_threshold": self.cosine_better_than_threshold,
             "top_k": top_k,
+            "embedding": embedding,
         }
         results = await self.db.query(sql, params=params, multirows=True)
         return results
@@ -1122,6 +1214,108 @@ class PGDocStatusStorage(DocStatusStorage):
         }
         return docs_by_status
 
+    async def get_docs_by_statuses(
+        self, statuses: list[DocStatus]
+    ) -> dict[str, DocProcessingStatus]:
+        """All documents in any of the given statuses, fetched in one query"""
+        sql = (
+            "select * from LIGHTRAG_DOC_STATUS where workspace=$1 and status = ANY($2)"
+        )
+        params = {
+            "workspace": self.db.workspace,
+            "statuses": [status.value for status in statuses],
+        }
+        result = await self.db.query(sql, params, True) or []
+        order = {status.value: i for i, status in enumerate(statuses)}
+        result.sort(key=lambda element: order.get(element["status"], len(order)))
+        return {
+            element["id"]: DocProcessingStatus(
+                content=element["content"],
+                content_summary=element["content_summary"],
+                content_length=element["content_length"],
+                status=element["status"],
+                created_at=element["created_at"],
+                updated_at=element["updated_at"],
+                chunks_count=element["chunks_count"],
+                file_path=element["file_path"],
+            )
+            for element in result
+        }
+
+    async def get_docs_paginated(
+        self,
+        status: DocStatus | None = None,
+        page: int = 1,
+        page_size: int = 50,
+        sort_field: Literal[
+            "created_at", "updated_at", "id", "file_path"
+        ] = "updated_at",
+        sort_direction: Literal["asc", "desc"] = "desc",
+        file_path_filter: str | None = None,
+        include_content: bool = False,
+    ) -> tuple[list[tuple[str, DocProcessingStatus]], int]:
+        """Filter, sort and page documents in SQL, skipping content unless requested"""
+        if sort_field not in ("created_at", "updated_at", "id", "file_path"):
+            raise ValueError(f"Unsupported sort field: {sort_field}")
+        direction = "DESC" if sort_direction == "desc" else "ASC"
+        params: dict[str, Any] = {"workspace": self.db.workspace}
+        conditions = ["workspace=$1"]
+        if status is not None:
+            params["status"] = status.value
+            conditions.append(f"status=${len(params)}")
+        if file_path_filter:
+            escaped = (
+                file_path_filter.replace("\\", "\\\\")
+                .replace("%", "\\%")
+                .replace("_", "\\_")
+            )
+            params["file_path"] = f"%{escaped}%"
+            conditions.append(f"file_path ILIKE ${len(params)}")
+        where = " AND ".join(conditions)
+
+        params["limit"] = page_size
+        params["offset"] = (max(page, 1) - 1) * page_size
+        content_column = "content" if include_content else "'' AS content"
+        sql = f"""SELECT id, {content_column}, content_summary, content_length,
+                         chunks_count, status, file_path, created_at, updated_at,
+                         COUNT(*) OVER() AS total_count
+                    FROM LIGHTRAG_DOC_STATUS
+                   WHERE {where}
+                   ORDER BY {sort_field} {direction}, id {direction}
+                   LIMIT ${len(params) - 1} OFFSET ${len(params)}"""
+        result = await self.db.query(sql, params, True) or []
+
+        if result:
+            total = result[0]["total_count"]
+        else:
+            # The window count is only available when the page has rows
+            count_params = {
+                k: v for k, v in params.items() if k not in ("limit", "offset")
+            }
+            count_sql = (
+                f"SELECT COUNT(1) AS total_count FROM LIGHTRAG_DOC_STATUS WHERE {where}"
+            )
+            count_result = await self.db.query(count_sql, count_params)
+            total = count_result["total_count"] if count_result else 0
+
+        docs = [
+            (
+                element["id"],
+                DocProcessingStatus(
+                    content=element["content"] or "",
+                    content_summary=element["content_summary"],
+                    content_length=element["content_length"],
+                    status=element["status"],
+                    created_at=element["created_at"],
+                    updated_at=element["updated_at"],
+                    chunks_count=element["chunks_count"],
+                    file_path=element["file_path"],
+                ),
+            )
+            for element in result
+        ]
+        return docs, total
+
     async def index_done_callback(self) -> None:
         # PG handles persistence automatically
         pass
@@ -1196,14 +1390,14 @@ class PGDocStatusStorage(DocStatusStorage):
                   file_path = EXCLUDED.file_path,
                   created_at = EXCLUDED.created_at,
                   updated_at = EXCLUDED.updated_at"""
+        rows = []
         for k, v in data.items():
             # Remove timezone information, store utc time in db
             created_at = parse_datetime(v.get("created_at"))
             updated_at = parse_datetime(v.get("updated_at"))
 
             # chunks_count is optional
-            await self.db.execute(
-                sql,
+            rows.append(
                 {
                     "workspace": self.db.workspace,
                     "id": k,
@@ -1215,8 +1409,9 @@ class PGDocStatusStorage(DocStatusStorage):
                     "file_path": v["file_path"],
                     "created_at": created_at,  # Use the converted datetime object
                     "updated_at": updated_at,  # Use the converted datetime object
-                },
+                }
             )
+        await self.db.executemany(sql, rows)
 
     async def drop(self) -> dict[str, str]:
         """Drop the storage"""
@@ -1258,6 +1453,9 @@ class PGGraphQueryException(Exception):
 @final
 @dataclass
 class PGGraphStorage(BaseGraphStorage):
+    # AGE reports no write counters, so writes check existence with a read first
+    tracks_count_changes = True
+
     def __post_init__(self):
         self.graph_name = self.namespace or os.environ.get("AGE_GRAPH_NAME", "lightrag")
         self.db: PostgreSQLDB | None = None
@@ -1629,7 +1827,10 @@ class PGGraphStorage(BaseGraphStorage):
         )
 
         try:
+            existed = await self.has_node(node_id)
             await self._query(query, readonly=False, upsert=True)
+            if not existed:
+                self.record_count_changes(nodes=1)
 
         except Exception:
             logger.error(f"POSTGRES, upsert_node error on node_id: `{node_id}`")
@@ -1672,7 +1873,10 @@ class PGGraphStorage(BaseGraphStorage):
         )
 
         try:
+            existed = await self.has_edge(source_node_id, target_node_id)
             await self._query(query, readonly=False, upsert=True)
+            if not existed:
+                self.record_count_changes(edges=1)
 
         except Exception:
             logger.error(
@@ -1695,7 +1899,11 @@ class PGGraphStorage(BaseGraphStorage):
                    $$) AS (n agtype)""" % (self.graph_name, label)
 
         try:
+            if not await self.has_node(node_id):
+                return
+            edge_count = await self.node_degree(node_id) or 0
             await self._query(query, readonly=False)
+            self.record_count_changes(nodes=-1, edges=-edge_count)
         except Exception as e:
             logger.error("Error during node deletion: {%s}", e)
             raise
@@ -1707,6 +1915,11 @@ class PGGraphStorage(BaseGraphStorage):
         Args:
             node_ids (list[str]): A list of node IDs to remove.
         """
+        existing = await self.get_nodes_batch(node_ids)
+        node_edges = await self.get_nodes_edges_batch(list(existing))
+        removed_edges = {
+            frozenset(edge) for edges in node_edges.values() for edge in edges
+        }
         node_ids = [self._normalize_node_id(node_id) for node_id in node_ids]
         node_id_list = ", ".join([f'"{node_id}"' for node_id in node_ids])
 
@@ -1718,6 +1931,7 @@ class PGGraphStorage(BaseGraphStorage):
 
         try:
             await self._query(query, readonly=False)
+            self.record_count_changes(nodes=-len(existing), edges=-len(removed_edges))
         except Exception as e:
             logger.error("Error during node removal: {%s}", e)
             raise
@@ -1739,7 +1953,10 @@ class PGGraphStorage(BaseGraphStorage):
                        $$) AS (r agtype)""" % (self.graph_name, src_label, tgt_label)
 
             try:
+                existed = await self.has_edge(source, target)
                 await self._query(query, readonly=False)
+                if existed:
+                    self.record_count_changes(edges=-1)
                 logger.debug(f"Deleted edge from '{source}' to '{target}'")
             except Exception as e:
                 logger.error(f"Error during edge deletion: {str(e)}")
@@ -2053,6 +2270,104 @@ class PGGraphStorage(BaseGraphStorage):
                 labels.append(result["label"])
         return labels
 
+    async def search_labels(
+        self, query: str = "", limit: int = 50, offset: int = 0, fuzzy: bool = False
+    ) -> list[str]:
+        """
+        Search entity labels, sorted alphabetically and paginated.
+
+        Labels are matched with LIKE (prefix) or ILIKE (substring) and paged
+        with OFFSET/LIMIT in SQL, so only the requested page leaves the database.
+        """
+        params = None
+        condition = ""
+        if query:
+            pattern = (
+                query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            )
+            if fuzzy:
+                condition = "WHERE label ILIKE '%' || $1 || '%' ESCAPE '\\'"
+            else:
+                condition = "WHERE label LIKE $1 || '%' ESCAPE '\\'"
+            params = {"pattern": pattern}
+
+        sql = """SELECT label FROM cypher('%s', $$
+                     MATCH (n:base)
+                     WHERE n.entity_id IS NOT NULL
+                     RETURN DISTINCT n.entity_id AS label
+                   $$) AS (label text)
+                   %s
+                   ORDER BY label
+                   OFFSET %d LIMIT %d""" % (
+            self.graph_name,
+            condition,
+            int(offset),
+            int(limit),
+        )
+
+        try:
+            results = await self.db.query(
+                sql,
+                params,
+                multirows=True,
+                with_age=True,
+                graph_name=self.graph_name,
+            )
+        except Exception as e:
+            raise PGGraphQueryException(
+                {
+                    "message": f"Error executing graph query: {sql}",
+                    "wrapped": sql,
+                    "detail": str(e),
+                }
+            ) from e
+        return [result["label"] for result in results or [] if result.get("label")]
+
+    async def get_graph_counts(self) -> tuple[int, int]:
+        """Get the number of nodes and edges in the graph."""
+        node_query = (
+            """SELECT * FROM cypher('%s', $$
+                     MATCH (n:base)
+                     RETURN count(n) AS nodes
+                   $$) AS (nodes bigint)"""
+            % self.graph_name
+        )
+        edge_query = (
+            """SELECT * FROM cypher('%s', $$
+                     MATCH ()-[r]->()
+                     RETURN count(r) AS edges
+                   $$) AS (edges bigint)"""
+            % self.graph_name
+        )
+        node_result = await self._query(node_query)
+        edge_result = await self._query(edge_query)
+        return (
+            int(node_result[0]["nodes"]) if node_result else 0,
+            int(edge_result[0]["edges"]) if edge_result else 0,
+        )
+
+    async def get_popular_labels(self, limit: int = 50) -> list[str]:
+        """
+        Get the labels of the nodes with the highest degree, highest first.
+
+        Degrees are counted in one cypher query, ranked and limited in SQL.
+        """
+        query = """SELECT label FROM cypher('%s', $$
+                     MATCH (n:base)
+                     WHERE n.entity_id IS NOT NULL
+                     OPTIONAL MATCH (n)-[r]-()
+                     RETURN n.entity_id AS label, count(r) AS degree
+                   $$) AS (label text, degree bigint)
+                   ORDER BY degree DESC, label
+                   LIMIT %d""" % (self.graph_name, int(limit))
+
+        results = await self._query(query)
+        return [
+            result["label"]
+            for result in results
+            if result and isinstance(result, dict) and "label" in result
+        ]
+
     async def get_nodes_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
         """
         Retrieves nodes from the graph that are associated with a given list of chunk IDs.
@@ -2149,13 +2464,81 @@ class PGGraphStorage(BaseGraphStorage):
                     edges.append(edge_properties)
         return edges
 
+    async def _fetch_subgraph(
+        self, node_ids: list[str], is_truncated: bool = False
+    ) -> KnowledgeGraph:
+        """
+        Fetch the nodes with the given internal ids and all edges between them
+        in a single query.
+
+        Args:
+            node_ids: Internal AGE ids of the nodes to return
+            is_truncated: Truncation flag to set on the returned graph
+
+        Returns:
+            KnowledgeGraph object containing the induced subgraph
+        """
+        if not node_ids:
+            return KnowledgeGraph(is_truncated=is_truncated)
+
+        formatted_ids = ", ".join(node_ids)
+        query = f"""SELECT * FROM cypher('{self.graph_name}', $$
+                WITH [{formatted_ids}] AS node_ids
+                MATCH (a)
+                WHERE id(a) IN node_ids
+                OPTIONAL MATCH (a)-[r]->(b)
+                    WHERE id(b) IN node_ids
+                RETURN a, r, b
+            $$) AS (a AGTYPE, r AGTYPE, b AGTYPE)"""
+        results = await self._query(query)
+
+        # Process query results, deduplicate nodes and edges
+        nodes_dict = {}
+        edges_dict = {}
+        for result in results:
+            # Process node a and node b
+            for key in ("a", "b"):
+                node = result.get(key)
+                if not node or not isinstance(node, dict):
+                    continue
+                node_id = str(node["id"])
+                if node_id not in nodes_dict and "properties" in node:
+                    nodes_dict[node_id] = KnowledgeGraphNode(
+                        id=node_id,
+                        labels=[node["properties"]["entity_id"]],
+                        properties=node["properties"],
+                    )
+
+            # Process edge r
+            if result.get("r") and isinstance(result["r"], dict):
+                edge = result["r"]
+                edge_id = str(edge["id"])
+                if edge_id not in edges_dict:
+                    edges_dict[edge_id] = KnowledgeGraphEdge(
+                        id=edge_id,
+                        type=edge["label"],
+                        source=str(edge["start_id"]),
+                        target=str(edge["end_id"]),
+                        properties=edge["properties"],
+                    )
+
+        return KnowledgeGraph(
+            nodes=list(nodes_dict.values()),
+            edges=list(edges_dict.values()),
+            is_truncated=is_truncated,
+        )
+
     async def _bfs_subgraph(
         self, node_label: str, max_depth: int, max_nodes: int
     ) -> KnowledgeGraph:
         """
-        Implements a true breadth-first search algorithm for subgraph retrieval.
-        This method is used as a fallback when the standard Cypher query is too slow
-        or when we need to guarantee BFS ordering.
+        Breadth-first subgraph retrieval that expands a whole frontier per query.
+
+        Each level is a single query that collects the unvisited neighbours of
+        every frontier node, ranks them by degree and keeps only as many as still
+        fit in max_nodes, so the truncation happens in SQL. The selected nodes and
+        all edges between them are fetched in one final query. A subgraph costs
+        max_depth + 2 round trips regardless of its size.
 
         Args:
             node_label: Label of the starting node
@@ -2165,198 +2548,52 @@ class PGGraphStorage(BaseGraphStorage):
         Returns:
             KnowledgeGraph object containing nodes and edges
         """
-        from collections import deque
-
-        result = KnowledgeGraph()
-        visited_nodes = set()
-        visited_node_ids = set()
-        visited_edges = set()
-        visited_edge_pairs = set()
-
-        # Get starting node data
         label = self._normalize_node_id(node_label)
         query = """SELECT * FROM cypher('%s', $$
                     MATCH (n:base {entity_id: "%s"})
-                    RETURN id(n) as node_id, n
-                  $$) AS (node_id bigint, n agtype)""" % (self.graph_name, label)
-
-        node_result = await self._query(query)
-        if not node_result or not node_result[0].get("n"):
-            return result
-
-        # Create initial KnowledgeGraphNode
-        start_node_data = node_result[0]["n"]
-        entity_id = start_node_data["properties"]["entity_id"]
-        internal_id = str(start_node_data["id"])
-
-        start_node = KnowledgeGraphNode(
-            id=internal_id,
-            labels=[entity_id],
-            properties=start_node_data["properties"],
-        )
-
-        # Initialize BFS queue, each element is a tuple of (node, depth)
-        queue = deque([(start_node, 0)])
-
-        visited_nodes.add(entity_id)
-        visited_node_ids.add(internal_id)
-        result.nodes.append(start_node)
-
-        result.is_truncated = False
-
-        # BFS search main loop
-        while queue:
-            # Get all nodes at the current depth
-            current_level_nodes = []
-            current_depth = None
-
-            # Determine current depth
-            if queue:
-                current_depth = queue[0][1]
-
-            # Extract all nodes at current depth from the queue
-            while queue and queue[0][1] == current_depth:
-                node, depth = queue.popleft()
-                if depth > max_depth:
-                    continue
-                current_level_nodes.append(node)
-
-            if not current_level_nodes:
-                continue
-
-            # Check depth limit
-            if current_depth > max_depth:
-                continue
-
-            # Prepare node IDs list
-            node_ids = [node.labels[0] for node in current_level_nodes]
-            formatted_ids = ", ".join(
-                [f'"{self._normalize_node_id(node_id)}"' for node_id in node_ids]
-            )
-
-            # Construct batch query for outgoing edges
-            outgoing_query = f"""SELECT * FROM cypher('{self.graph_name}', $$
-                UNWIND [{formatted_ids}] AS node_id
-                MATCH (n:base {{entity_id: node_id}})
-                OPTIONAL MATCH (n)-[r]->(neighbor:base)
-                RETURN node_id AS current_id,
-                       id(n) AS current_internal_id,
-                       id(neighbor) AS neighbor_internal_id,
-                       neighbor.entity_id AS neighbor_id,
-                       id(r) AS edge_id,
-                       r,
-                       neighbor,
-                       true AS is_outgoing
-              $$) AS (current_id text, current_internal_id bigint, neighbor_internal_id bigint,
-                      neighbor_id text, edge_id bigint, r agtype, neighbor agtype, is_outgoing bool)"""
-
-            # Construct batch query for incoming edges
-            incoming_query = f"""SELECT * FROM cypher('{self.graph_name}', $$
-                UNWIND [{formatted_ids}] AS node_id
-                MATCH (n:base {{entity_id: node_id}})
-                OPTIONAL MATCH (n)<-[r]-(neighbor:base)
-                RETURN node_id AS current_id,
-                       id(n) AS current_internal_id,
-                       id(neighbor) AS neighbor_internal_id,
-                       neighbor.entity_id AS neighbor_id,
-                       id(r) AS edge_id,
-                       r,
-                       neighbor,
-                       false AS is_outgoing
-              $$) AS (current_id text, current_internal_id bigint, neighbor_internal_id bigint,
-                      neighbor_id text, edge_id bigint, r agtype, neighbor agtype, is_outgoing bool)"""
-
-            # Execute queries
-            outgoing_results = await self._query(outgoing_query)
-            incoming_results = await self._query(incoming_query)
-
-            # Combine results
-            neighbors = outgoing_results + incoming_results
-
-            # Create mapping from node ID to node object
-            node_map = {node.labels[0]: node for node in current_level_nodes}
-
-            # Process all results in a single loop
-            for record in neighbors:
-                if not record.get("neighbor") or not record.get("r"):
-                    continue
-
-                # Get current node information
-                current_entity_id = record["current_id"]
-                current_node = node_map[current_entity_id]
-
-                # Get neighbor node information
-                neighbor_entity_id = record["neighbor_id"]
-                neighbor_internal_id = str(record["neighbor_internal_id"])
-                is_outgoing = record["is_outgoing"]
-
-                # Determine edge direction
-                if is_outgoing:
-                    source_id = current_node.id
-                    target_id = neighbor_internal_id
-                else:
-                    source_id = neighbor_internal_id
-                    target_id = current_node.id
-
-                if not neighbor_entity_id:
-                    continue
-
-                # Get edge and node information
-                b_node = record["neighbor"]
-                rel = record["r"]
-                edge_id = str(record["edge_id"])
-
-                # Create neighbor node object
-                neighbor_node = KnowledgeGraphNode(
-                    id=neighbor_internal_id,
-                    labels=[neighbor_entity_id],
-                    properties=b_node["properties"],
-                )
-
-                # Sort entity_ids to ensure (A,B) and (B,A) are treated as the same edge
-                sorted_pair = tuple(sorted([current_entity_id, neighbor_entity_id]))
-
-                # Create edge object
-                edge = KnowledgeGraphEdge(
-                    id=edge_id,
-                    type=rel["label"],
-                    source=source_id,
-                    target=target_id,
-                    properties=rel["properties"],
-                )
-
-                if neighbor_internal_id in visited_node_ids:
-                    # Add backward edge if neighbor node is already visited
-                    if (
-                        edge_id not in visited_edges
-                        and sorted_pair not in visited_edge_pairs
-                    ):
-                        result.edges.append(edge)
-                        visited_edges.add(edge_id)
-                        visited_edge_pairs.add(sorted_pair)
-                else:
-                    if len(visited_node_ids) < max_nodes and current_depth < max_depth:
-                        # Add new node to result and queue
-                        result.nodes.append(neighbor_node)
-                        visited_nodes.add(neighbor_entity_id)
-                        visited_node_ids.add(neighbor_internal_id)
-
-                        # Add node to queue with incremented depth
-                        queue.append((neighbor_node, current_depth + 1))
-
-                        # Add forward edge
-                        if (
-                            edge_id not in visited_edges
-                            and sorted_pair not in visited_edge_pairs
-                        ):
-                            result.edges.append(edge)
-                            visited_edges.add(edge_id)
-                            visited_edge_pairs.add(sorted_pair)
-                    else:
-                        if current_depth < max_depth:
-                            result.is_truncated = True
-
-        return result
+                    RETURN id(n) as node_id
+                  $$) AS (node_id bigint)""" % (self.graph_name, label)
+
+        start_result = await self._query(query)
+        if not start_result or start_result[0].get("node_id") is None:
+            return KnowledgeGraph()
+
+        start_id = str(start_result[0]["node_id"])
+        visited = [start_id]
+        frontier = [start_id]
+        is_truncated = False
+
+        for _ in range(max_depth):
+            if not frontier:
+                break
+            remaining = max_nodes - len(visited)
+            if remaining <= 0:
+                # Node limit reached while the frontier still has to be expanded
+                is_truncated = True
+                break
+
+            frontier_ids = ", ".join(frontier)
+            visited_ids = ", ".join(visited)
+            level_query = f"""SELECT node_id, count(*) OVER () AS total
+                FROM cypher('{self.graph_name}', $$
+                    MATCH (n:base)-[]-(m:base)
+                    WHERE id(n) IN [{frontier_ids}] AND NOT id(m) IN [{visited_ids}]
+                    WITH DISTINCT m
+                    OPTIONAL MATCH (m)-[r]-()
+                    RETURN id(m) AS node_id, count(r) AS degree
+                $$) AS (node_id bigint, degree bigint)
+                ORDER BY degree DESC, node_id
+                LIMIT {remaining}"""
+            level_results = await self._query(level_query)
+            if not level_results:
+                break
+
+            if level_results[0]["total"] > len(level_results):
+                is_truncated = True
+            frontier = [str(record["node_id"]) for record in level_results]
+            visited.extend(frontier)
+
+        return await self._fetch_subgraph(visited, is_truncated)
 
     async def get_knowledge_graph(
         self,
@@ -2405,62 +2642,7 @@ class PGGraphStorage(BaseGraphStorage):
             logger.info(f"Total nodes: {total_nodes}, Selected nodes: {len(node_ids)}")
 
             if node_ids:
-                formatted_ids = ", ".join(node_ids)
-                # Construct batch query for subgraph within max_nodes
-                query = f"""SELECT * FROM cypher('{self.graph_name}', $$
-                        WITH [{formatted_ids}] AS node_ids
-                        MATCH (a)
-                        WHERE id(a) IN node_ids
-                        OPTIONAL MATCH (a)-[r]->(b)
-                            WHERE id(b) IN node_ids
-                        RETURN a, r, b
-                    $$) AS (a AGTYPE, r AGTYPE, b AGTYPE)"""
-                results = await self._query(query)
-
-                # Process query results, deduplicate nodes and edges
-                nodes_dict = {}
-                edges_dict = {}
-                for result in results:
-                    # Process node a
-                    if result.get("a") and isinstance(result["a"], dict):
-                        node_a = result["a"]
-                        node_id = str(node_a["id"])
-                        if node_id not in nodes_dict and "properties" in node_a:
-                            nodes_dict[node_id] = KnowledgeGraphNode(
-                                id=node_id,
-                                labels=[node_a["properties"]["entity_id"]],
-                                properties=node_a["properties"],
-                            )
-
-                    # Process node b
-                    if result.get("b") and isinstance(result["b"], dict):
-                        node_b = result["b"]
-                        node_id = str(node_b["id"])
-                        if node_id not in nodes_dict and "properties" in node_b:
-                            nodes_dict[node_id] = KnowledgeGraphNode(
-                                id=node_id,
-                                labels=[node_b["properties"]["entity_id"]],
-                                properties=node_b["properties"],
-                            )
-
-                    # Process edge r
-                    if result.get("r") and isinstance(result["r"], dict):
-                        edge = result["r"]
-                        edge_id = str(edge["id"])
-                        if edge_id not in edges_dict:
-                            edges_dict[edge_id] = KnowledgeGraphEdge(
-                                id=edge_id,
-                                type=edge["label"],
-                                source=str(edge["start_id"]),
-                                target=str(edge["end_id"]),
-                                properties=edge["properties"],
-                            )
-
-                kg = KnowledgeGraph(
-                    nodes=list(nodes_dict.values()),
-                    edges=list(edges_dict.values()),
-                    is_truncated=is_truncated,
-                )
+                kg = await self._fetch_subgraph(node_ids, is_truncated)
             else:
                 # For single node query, use BFS algorithm
                 kg = await self._bfs_subgraph(node_label, max_depth, max_nodes)
@@ -2486,6 +2668,7 @@ class PGGraphStorage(BaseGraphStorage):
                             $$) AS (result agtype)"""
 
             await self._query(drop_query, readonly=False)
+            self.invalidate_count_changes()
             return {"status": "success", "message": "graph data dropped"}
         except Exception as e:
             logger.error(f"Error dropping graph: {e}")
@@ -2708,7 +2891,7 @@ SQL_TEMPLATES = {
     )
     SELECT source_id as src_id, target_id as tgt_id, EXTRACT(EPOCH FROM create_time)::BIGINT as created_at
     FROM (
-        SELECT r.id, r.source_id, r.target_id, r.create_time, 1 - (r.content_vector <=> '[{embedding_string}]'::vector) as distance
+        SELECT r.id, r.source_id, r.target_id, r.create_time, 1 - (r.content_vector <=> $5::vector) as distance
         FROM LIGHTRAG_VDB_RELATION r
         JOIN relevant_chunks c ON c.chunk_id = ANY(r.chunk_ids)
         WHERE r.workspace=$1
@@ -2725,7 +2908,7 @@ SQL_TEMPLATES = {
         )
         SELECT entity_name, EXTRACT(EPOCH FROM create_time)::BIGINT as created_at FROM
             (
-                SELECT e.id, e.entity_name, e.create_time, 1 - (e.content_vector <=> '[{embedding_string}]'::vector) as distance
+                SELECT e.id, e.entity_name, e.create_time, 1 - (e.content_vector <=> $5::vector) as distance
                 FROM LIGHTRAG_VDB_ENTITY e
                 JOIN relevant_chunks c ON c.chunk_id = ANY(e.chunk_ids)
                 WHERE e.workspace=$1
@@ -2742,7 +2925,7 @@ SQL_TEMPLATES = {
         )
         SELECT id, content, file_path, EXTRACT(EPOCH FROM create_time)::BIGINT as created_at FROM
             (
-                SELECT id, content, file_path, create_time, 1 - (content_vector <=> '[{embedding_string}]'::vector) as distance
+                SELECT id, content, file_path, create_time, 1 - (content_vector <=> $5::vector) as distance
                 FROM LIGHTRAG_VDB_CHUNKS
                 WHERE workspace=$1
                 AND id IN (SELECT chunk_id FROM relevant_chunks)
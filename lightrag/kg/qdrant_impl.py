@@ -1,11 +1,11 @@
 import asyncio
 import os
-from typing import Any, final, List
+from typing import Any, ClassVar, final, List
 from dataclasses import dataclass
 import numpy as np
 import hashlib
 import uuid
-from ..utils import logger
+from ..utils import logger, get_env_value
 from ..base import BaseVectorStorage
 import configparser
 import pipmaster as pm
@@ -13,7 +13,7 @@ import pipmaster as pm
 if not pm.is_installed("qdrant-client"):
     pm.install("qdrant-client")
 
-from qdrant_client import QdrantClient, models  # type: ignore
+from qdrant_client import AsyncQdrantClient, models  # type: ignore
 
 config = configparser.ConfigParser()
 config.read("config.ini", "utf-8")
@@ -51,12 +51,15 @@ def compute_mdhash_id_for_qdrant(
 @dataclass
 class QdrantVectorDBStorage(BaseVectorStorage):
     @staticmethod
-    def create_collection_if_not_exist(
-        client: QdrantClient, collection_name: str, **kwargs
+    async def create_collection_if_not_exist(
+        client: AsyncQdrantClient, collection_name: str, **kwargs
     ):
-        if client.collection_exists(collection_name):
+        if await client.collection_exists(collection_name):
             return
-        client.create_collection(collection_name, **kwargs)
+        await client.create_collection(collection_name, **kwargs)
+
+    # Clients shared by all namespaces using the same connection settings
+    _clients: ClassVar[dict[tuple, AsyncQdrantClient]] = {}
 
     def __post_init__(self):
         kwargs = self.global_config.get("vector_db_storage_cls_kwargs", {})
@@ -67,22 +70,35 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             )
         self.cosine_better_than_threshold = cosine_threshold
 
-        self._client = QdrantClient(
+        self._client_params = dict(
             url=os.environ.get(
                 "QDRANT_URL", config.get("qdrant", "uri", fallback=None)
             ),
             api_key=os.environ.get(
                 "QDRANT_API_KEY", config.get("qdrant", "apikey", fallback=None)
             ),
+            timeout=get_env_value("VECTOR_DB_TIMEOUT", 60, int),
         )
+        self._client = None
         self._max_batch_size = self.global_config["embedding_batch_num"]
-        QdrantVectorDBStorage.create_collection_if_not_exist(
-            self._client,
+
+    async def initialize(self):
+        """Connect and create the collection"""
+        if self._client is not None:
+            return
+        client_key = tuple(sorted(self._client_params.items()))
+        client = QdrantVectorDBStorage._clients.get(client_key)
+        if client is None:
+            client = AsyncQdrantClient(**self._client_params)
+            QdrantVectorDBStorage._clients[client_key] = client
+        await QdrantVectorDBStorage.create_collection_if_not_exist(
+            client,
             self.namespace,
             vectors_config=models.VectorParams(
                 size=self.embedding_func.embedding_dim, distance=models.Distance.COSINE
             ),
         )
+        self._client = client
 
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         logger.info(f"Inserting {len(data)} to {self.namespace}")
@@ -122,8 +138,10 @@ class QdrantVectorDBStorage(BaseVectorStorage):
                 )
             )
 
-        results = self._client.upsert(
-            collection_name=self.namespace, points=list_points, wait=True
+        results = await self._client.upsert(
+            collection_name=self.namespace,
+            points=list_points,
+            wait=True,
         )
         return results
 
@@ -133,13 +151,15 @@ class QdrantVectorDBStorage(BaseVectorStorage):
         embedding = await self.embedding_func(
             [query], _priority=5
         )  # higher priority for query
-        results = self._client.search(
-            collection_name=self.namespace,
-            query_vector=embedding[0],
-            limit=top_k,
-            with_payload=True,
-            score_threshold=self.cosine_better_than_threshold,
-        )
+        results = (
+            await self._client.query_points(
+                collection_name=self.namespace,
+                query=embedding[0],
+                limit=top_k,
+                with_payload=True,
+                score_threshold=self.cosine_better_than_threshold,
+            )
+        ).points
 
         logger.debug(f"query result: {results}")
 
@@ -166,7 +186,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             # Convert regular ids to Qdrant compatible ids
             qdrant_ids = [compute_mdhash_id_for_qdrant(id) for id in ids]
             # Delete points from the collection
-            self._client.delete(
+            await self._client.delete(
                 collection_name=self.namespace,
                 points_selector=models.PointIdsList(
                     points=qdrant_ids,
@@ -193,7 +213,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             )
 
             # Delete the entity point from the collection
-            self._client.delete(
+            await self._client.delete(
                 collection_name=self.namespace,
                 points_selector=models.PointIdsList(
                     points=[entity_id],
@@ -212,7 +232,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Find relations where the entity is either source or target
-            results = self._client.scroll(
+            results = await self._client.scroll(
                 collection_name=self.namespace,
                 scroll_filter=models.Filter(
                     should=[
@@ -234,7 +254,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
 
             if ids_to_delete:
                 # Delete the relations
-                self._client.delete(
+                await self._client.delete(
                     collection_name=self.namespace,
                     points_selector=models.PointIdsList(
                         points=ids_to_delete,
@@ -263,7 +283,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             qdrant_id = compute_mdhash_id_for_qdrant(id)
 
             # Retrieve the point by ID
-            result = self._client.retrieve(
+            result = await self._client.retrieve(
                 collection_name=self.namespace,
                 ids=[qdrant_id],
                 with_payload=True,
@@ -299,7 +319,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             qdrant_ids = [compute_mdhash_id_for_qdrant(id) for id in ids]
 
             # Retrieve the points by IDs
-            results = self._client.retrieve(
+            results = await self._client.retrieve(
                 collection_name=self.namespace,
                 ids=qdrant_ids,
                 with_payload=True,
@@ -330,11 +350,11 @@ class QdrantVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Delete the collection and recreate it
-            if self._client.collection_exists(self.namespace):
-                self._client.delete_collection(self.namespace)
+            if await self._client.collection_exists(self.namespace):
+                await self._client.delete_collection(self.namespace)
 
             # Recreate the collection
-            QdrantVectorDBStorage.create_collection_if_not_exist(
+            await QdrantVectorDBStorage.create_collection_if_not_exist(
                 self._client,
                 self.namespace,
                 vectors_config=models.VectorParams(
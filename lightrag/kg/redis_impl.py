@@ -14,6 +14,7 @@ from redis.exceptions import RedisError, ConnectionError  # type: ignore
 from lightrag.utils import logger
 
 from lightrag.base import BaseKVStorage
+from lightrag.namespace import NameSpace, is_namespace
 import json
 
 
@@ -42,10 +43,24 @@ class RedisKVStorage(BaseKVStorage):
             socket_connect_timeout=SOCKET_CONNECT_TIMEOUT,
         )
         self._redis = Redis(connection_pool=self._pool)
+        # LLM cache entries live in one hash per mode plus a chunk id index,
+        # instead of one JSON document per mode
+        self._is_llm_cache = is_namespace(
+            self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE
+        )
         logger.info(
             f"Initialized Redis connection pool for {self.namespace} with max {MAX_CONNECTIONS} connections"
         )
 
+    def _mode_key(self, mode: str) -> str:
+        return f"{self.namespace}:cache:{mode}"
+
+    def _modes_key(self) -> str:
+        return f"{self.namespace}:cache_modes"
+
+    def _chunk_index_key(self, chunk_id: str) -> str:
+        return f"{self.namespace}:chunk_cache:{chunk_id}"
+
     @asynccontextmanager
     async def _get_redis_connection(self):
         """Safe context manager for Redis operations."""
@@ -78,62 +93,122 @@ class RedisKVStorage(BaseKVStorage):
         """Ensure Redis resources are cleaned up when exiting context."""
         await self.close()
 
-    async def get_by_id(self, id: str) -> dict[str, Any] | None:
-        if id == "default":
-            # Find all cache entries with cache_type == "extract"
-            async with self._get_redis_connection() as redis:
+    async def _get_mode_cache(self, mode: str) -> dict[str, Any] | None:
+        """Read all entries of a cache mode from its hash"""
+        async with self._get_redis_connection() as redis:
+            raw = await redis.hgetall(self._mode_key(mode))
+            if not raw:
+                return await self._migrate_legacy_mode(mode)
+            result = {}
+            for cache_key, value in raw.items():
                 try:
-                    result = {}
-                    pattern = f"{self.namespace}:*"
-                    cursor = 0
+                    result[cache_key] = json.loads(value)
+                except json.JSONDecodeError:
+                    logger.warning(f"JSON decode error for cache {mode}:{cache_key}")
+            return result or None
 
-                    while True:
-                        cursor, keys = await redis.scan(
-                            cursor, match=pattern, count=100
-                        )
+    async def _migrate_legacy_mode(self, mode: str) -> dict[str, Any] | None:
+        """Move a mode stored as a single JSON document into the hash layout"""
+        async with self._get_redis_connection() as redis:
+            legacy = await redis.get(f"{self.namespace}:{mode}")
+            if not legacy:
+                return None
+            try:
+                mode_cache = json.loads(legacy)
+            except json.JSONDecodeError as e:
+                logger.error(f"JSON decode error for legacy cache mode {mode}: {e}")
+                return None
+            if not isinstance(mode_cache, dict) or not mode_cache:
+                return None
+            await self.upsert({mode: mode_cache})
+            await redis.delete(f"{self.namespace}:{mode}")
+            logger.info(
+                f"Migrated {len(mode_cache)} cache entries of mode {mode} to hash layout"
+            )
+            return mode_cache
+
+    async def get_by_mode_and_id(self, mode: str, id: str) -> dict[str, Any] | None:
+        """Specifically for llm_response_cache, read a single entry of a mode"""
+        if not self._is_llm_cache:
+            return None
+        async with self._get_redis_connection() as redis:
+            value = await redis.hget(self._mode_key(mode), id)
+            if value is None:
+                # Entries written with the old layout are only read here once
+                mode_cache = await self._migrate_legacy_mode(mode)
+                if mode_cache and id in mode_cache:
+                    return {id: mode_cache[id]}
+                return None
+            try:
+                return {id: json.loads(value)}
+            except json.JSONDecodeError as e:
+                logger.error(f"JSON decode error for cache {mode}:{id}: {e}")
+                return None
+
+    async def get_by_chunk_ids(
+        self, chunk_ids: list[str], cache_type: str | None = None
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Specifically for llm_response_cache, collect cache entries per chunk id
+
+        Entries are located through the chunk id index and fetched with one
+        HMGET per mode, so the cost is proportional to the requested chunks.
+        The index is an unordered set, so the entries of a chunk are sorted by
+        their `create_time`, then by mode and cache key: oldest first.
+        """
+        if not self._is_llm_cache or not chunk_ids:
+            return {}
+        async with self._get_redis_connection() as redis:
+            pipe = redis.pipeline()
+            for chunk_id in chunk_ids:
+                pipe.smembers(self._chunk_index_key(chunk_id))
+            members_list = await pipe.execute()
+
+            # mode -> [(chunk_id, cache_key)]
+            by_mode: dict[str, list[tuple[str, str]]] = {}
+            for chunk_id, members in zip(chunk_ids, members_list):
+                for member in members:
+                    mode, _, cache_key = member.partition(":")
+                    by_mode.setdefault(mode, []).append((chunk_id, cache_key))
+            if not by_mode:
+                return {}
 
-                        if keys:
-                            # Batch get values for these keys
-                            pipe = redis.pipeline()
-                            for key in keys:
-                                pipe.get(key)
-                            values = await pipe.execute()
-
-                            # Check each value for cache_type == "extract"
-                            for key, value in zip(keys, values):
-                                if value:
-                                    try:
-                                        data = json.loads(value)
-                                        if (
-                                            isinstance(data, dict)
-                                            and data.get("cache_type") == "extract"
-                                        ):
-                                            # Extract cache key (remove namespace prefix)
-                                            cache_key = key.replace(
-                                                f"{self.namespace}:", ""
-                                            )
-                                            result[cache_key] = data
-                                    except json.JSONDecodeError:
-                                        continue
-
-                        if cursor == 0:
-                            break
-
-                    return result if result else None
-                except Exception as e:
-                    logger.error(f"Error scanning Redis for extract cache entries: {e}")
-                    return None
-        else:
-            # Original behavior for non-"default" ids
-            async with self._get_redis_connection() as redis:
+            pipe = redis.pipeline()
+            for mode, refs in by_mode.items():
+                pipe.hmget(self._mode_key(mode), [cache_key for _, cache_key in refs])
+            values_list = await pipe.execute()
+
+        found: dict[str, list[tuple[float, str, str, dict[str, Any]]]] = {}
+        for (mode, refs), values in zip(by_mode.items(), values_list):
+            for (chunk_id, cache_key), value in zip(refs, values):
+                if value is None:
+                    continue
                 try:
-                    data = await redis.get(f"{self.namespace}:{id}")
-                    return json.loads(data) if data else None
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON decode error for id {id}: {e}")
-                    return None
+                    entry = json.loads(value)
+                except json.JSONDecodeError:
+                    continue
+                if cache_type is None or entry.get("cache_type") == cache_type:
+                    found.setdefault(chunk_id, []).append(
+                        (entry.get("create_time") or 0, mode, cache_key, entry)
+                    )
+        return {
+            chunk_id: [item[3] for item in sorted(items, key=lambda x: x[:3])]
+            for chunk_id, items in found.items()
+        }
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        if self._is_llm_cache:
+            return await self._get_mode_cache(id)
+        async with self._get_redis_connection() as redis:
+            try:
+                data = await redis.get(f"{self.namespace}:{id}")
+                return json.loads(data) if data else None
+            except json.JSONDecodeError as e:
+                logger.error(f"JSON decode error for id {id}: {e}")
+                return None
 
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        if self._is_llm_cache:
+            return [await self._get_mode_cache(mode) for mode in ids]
         async with self._get_redis_connection() as redis:
             try:
                 pipe = redis.pipeline()
@@ -146,10 +221,14 @@ class RedisKVStorage(BaseKVStorage):
                 return [None] * len(ids)
 
     async def filter_keys(self, keys: set[str]) -> set[str]:
+        keys = list(keys)
         async with self._get_redis_connection() as redis:
             pipe = redis.pipeline()
             for key in keys:
-                pipe.exists(f"{self.namespace}:{key}")
+                if self._is_llm_cache:
+                    pipe.exists(self._mode_key(key), f"{self.namespace}:{key}")
+                else:
+                    pipe.exists(f"{self.namespace}:{key}")
             results = await pipe.execute()
 
             existing_ids = {keys[i] for i, exists in enumerate(results) if exists}
@@ -160,6 +239,10 @@ class RedisKVStorage(BaseKVStorage):
             return
 
         logger.info(f"Inserting {len(data)} items to {self.namespace}")
+        if self._is_llm_cache:
+            await self._upsert_cache(data)
+            return
+
         async with self._get_redis_connection() as redis:
             try:
                 pipe = redis.pipeline()
@@ -173,6 +256,54 @@ class RedisKVStorage(BaseKVStorage):
                 logger.error(f"JSON encode error during upsert: {e}")
                 raise
 
+    async def _upsert_cache(self, data: dict[str, dict[str, Any]]) -> None:
+        """Merge cache entries into their mode hashes and the chunk id index"""
+        async with self._get_redis_connection() as redis:
+            pipe = redis.pipeline()
+            for mode, entries in data.items():
+                if not entries:
+                    continue
+                pipe.hset(
+                    self._mode_key(mode),
+                    mapping={
+                        cache_key: json.dumps(entry)
+                        for cache_key, entry in entries.items()
+                    },
+                )
+                pipe.sadd(self._modes_key(), mode)
+                for cache_key, entry in entries.items():
+                    chunk_id = (
+                        entry.get("chunk_id") if isinstance(entry, dict) else None
+                    )
+                    if chunk_id:
+                        pipe.sadd(
+                            self._chunk_index_key(chunk_id), f"{mode}:{cache_key}"
+                        )
+            await pipe.execute()
+
+    async def _delete_cache_modes(self, modes: list[str]) -> None:
+        async with self._get_redis_connection() as redis:
+            pipe = redis.pipeline()
+            for mode in modes:
+                pipe.hgetall(self._mode_key(mode))
+            mode_entries = await pipe.execute()
+
+            pipe = redis.pipeline()
+            for mode, entries in zip(modes, mode_entries):
+                for cache_key, value in entries.items():
+                    try:
+                        chunk_id = json.loads(value).get("chunk_id")
+                    except (json.JSONDecodeError, AttributeError):
+                        continue
+                    if chunk_id:
+                        pipe.srem(
+                            self._chunk_index_key(chunk_id), f"{mode}:{cache_key}"
+                        )
+                pipe.delete(self._mode_key(mode), f"{self.namespace}:{mode}")
+                pipe.srem(self._modes_key(), mode)
+            await pipe.execute()
+            logger.info(f"Deleted {len(modes)} cache modes from {self.namespace}")
+
     async def index_done_callback(self) -> None:
         # Redis handles persistence automatically
         pass
@@ -182,6 +313,10 @@ class RedisKVStorage(BaseKVStorage):
         if not ids:
             return
 
+        if self._is_llm_cache:
+            await self._delete_cache_modes(ids)
+            return
+
         async with self._get_redis_connection() as redis:
             pipe = redis.pipeline()
             for id in ids:
@@ -1,9 +1,14 @@
 import os
 import sys
+import time
 import asyncio
+import multiprocessing
+from collections.abc import MutableMapping
+from contextlib import asynccontextmanager
 from multiprocessing.synchronize import Lock as ProcessLock
 from multiprocessing import Manager
-from typing import Any, Dict, Optional, Union, TypeVar, Generic
+from multiprocessing.sharedctypes import RawArray
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Union, TypeVar, Generic
 
 
 # Define a direct print function for critical logs that must be visible in all processes
@@ -40,10 +45,34 @@ _internal_lock: Optional[LockType] = None
 _pipeline_status_lock: Optional[LockType] = None
 _graph_db_lock: Optional[LockType] = None
 _data_init_lock: Optional[LockType] = None
+_graph_registry_lock: Optional[LockType] = None
 
 # async locks for coroutine synchronization in multiprocess mode
 _async_locks: Optional[Dict[str, asyncio.Lock]] = None
 
+# Shared memory for multiprocess mode, allocated before the workers are forked
+# Number of namespaces whose reads are served from a process-local snapshot
+SHARED_NAMESPACE_SLOTS = int(os.getenv("SHARED_NAMESPACE_SLOTS", 1024))
+# Number of update flags kept in shared memory
+SHARED_FLAG_SLOTS = int(os.getenv("SHARED_FLAG_SLOTS", 8192))
+# Changed-key entries kept per namespace for processes catching up with changes
+SHARED_CHANGELOG_SIZE = int(os.getenv("SHARED_CHANGELOG_SIZE", 1024))
+# Changed keys a lagging process reads one by one before copying the whole dict
+SHARED_CATCH_UP_KEYS = 256
+
+_namespace_versions = None  # namespace slot -> number of writes so far
+_changelog_bases = None  # namespace slot -> version of the oldest kept changelog entry
+_flag_values = None  # flag slot -> update flag value
+_slot_counters = None  # [namespace slots, flag slots, rw lock slots in use]
+_rw_lock_states = (
+    None  # rw lock slot * 3 -> [reading processes, writer, waiting writers]
+)
+_shared_state_lock: Optional[ProcessLock] = None  # orders writes with their changelog
+_namespace_changelogs: Optional[Dict[str, Any]] = None  # namespace -> (slot, changelog)
+_rw_lock_slots: Optional[Dict[str, int]] = None  # namespace -> rw lock slot
+_namespace_views: Dict[str, "SharedNamespaceDict"] = {}  # per process
+_rw_locks: Dict[str, "NamespaceRWLock"] = {}  # per process
+
 
 class UnifiedLock(Generic[T]):
     """Provide a unified lock interface type for asyncio.Lock and multiprocessing.Lock"""
@@ -211,6 +240,421 @@ class UnifiedLock(Generic[T]):
             raise
 
 
+class SharedFlag:
+    """Update flag stored in shared memory, read and set without IPC
+
+    Instances are picklable, so they can be kept in the manager's update flag
+    lists; unpickling refers to the same slot in the shared array.
+    """
+
+    __slots__ = ("slot",)
+
+    def __init__(self, slot: int):
+        self.slot = slot
+
+    def __reduce__(self):
+        return (SharedFlag, (self.slot,))
+
+    @property
+    def value(self) -> bool:
+        return bool(_flag_values[self.slot])
+
+    @value.setter
+    def value(self, value: bool) -> None:
+        _flag_values[self.slot] = 1 if value else 0
+
+
+class SharedNamespaceDict(MutableMapping):
+    """Process-local view of a shared namespace dict in multiprocess mode
+
+    Reads are served from a local snapshot as long as the namespace version in
+    shared memory has not moved, so reading unchanged data needs no IPC. Writes
+    go to the manager dict, record the changed keys (not the values) in a
+    bounded changelog, and bump the version. A process whose snapshot is behind
+    reads the current values of the keys changed since from the manager dict,
+    or copies the whole dict once if the entries it missed have been trimmed or
+    too many keys changed.
+
+    Like the plain dicts of single process mode, returned values are the
+    snapshot's own objects, and nested containers are not tracked: write a
+    changed value back with item assignment or update().
+    """
+
+    def __init__(self, proxy, changelog, slot: int):
+        self._proxy = proxy
+        self._changelog = changelog
+        self._slot = slot
+        self._data: Dict[str, Any] = {}
+        self._version = -1
+
+    def _sync(self) -> Dict[str, Any]:
+        if _namespace_versions[self._slot] != self._version:
+            with _shared_state_lock:
+                self._catch_up()
+        return self._data
+
+    def _catch_up(self) -> None:
+        # Called with _shared_state_lock held
+        version = _namespace_versions[self._slot]
+        if version == self._version:
+            return
+        base = _changelog_bases[self._slot]
+        if self._version < base:
+            self._data = self._proxy.copy()
+            self._version = version
+            return
+
+        changed = set()
+        cleared = False
+        for entry in self._changelog[self._version - base : version - base]:
+            if entry is None:
+                cleared = True
+                changed.clear()
+            else:
+                changed.update(entry)
+        if len(changed) > SHARED_CATCH_UP_KEYS:
+            self._data = self._proxy.copy()
+        else:
+            if cleared:
+                self._data = {}
+            for key in changed:
+                try:
+                    self._data[key] = self._proxy[key]
+                except KeyError:
+                    self._data.pop(key, None)
+        self._version = version
+
+    def _commit(self, op: tuple) -> None:
+        # Called with _shared_state_lock held, after _catch_up
+        kind = op[0]
+        if kind == "update":
+            self._proxy.update(op[1])
+            self._data.update(op[1])
+            entry = tuple(op[1])
+        elif kind == "set":
+            self._proxy[op[1]] = op[2]
+            self._data[op[1]] = op[2]
+            entry = (op[1],)
+        elif kind == "pop":
+            self._proxy.pop(op[1], None)
+            self._data.pop(op[1], None)
+            entry = (op[1],)
+        else:
+            self._proxy.clear()
+            self._data.clear()
+            entry = None
+        # Only keys are logged, lagging processes read the values themselves
+        self._changelog.append(entry)
+        version = self._version + 1
+        overflow = version - _changelog_bases[self._slot] - SHARED_CHANGELOG_SIZE
+        if overflow > 0:
+            del self._changelog[:overflow]
+            _changelog_bases[self._slot] += overflow
+        _namespace_versions[self._slot] = version
+        self._version = version
+
+    def _write(self, op: tuple) -> None:
+        with _shared_state_lock:
+            self._catch_up()
+            self._commit(op)
+
+    def __getitem__(self, key):
+        return self._sync()[key]
+
+    def __setitem__(self, key, value) -> None:
+        self._write(("set", key, value))
+
+    def __delitem__(self, key) -> None:
+        with _shared_state_lock:
+            self._catch_up()
+            if key not in self._data:
+                raise KeyError(key)
+            self._commit(("pop", key))
+
+    def __contains__(self, key) -> bool:
+        return key in self._sync()
+
+    def __iter__(self) -> Iterator:
+        return iter(self._sync())
+
+    def __len__(self) -> int:
+        return len(self._sync())
+
+    def __repr__(self) -> str:
+        return f"SharedNamespaceDict({self._sync()!r})"
+
+    def get(self, key, default=None):
+        return self._sync().get(key, default)
+
+    def keys(self):
+        return self._sync().keys()
+
+    def items(self):
+        return self._sync().items()
+
+    def values(self):
+        return self._sync().values()
+
+    def update(self, other=(), /, **kwargs) -> None:
+        data = dict(other, **kwargs)
+        if data:
+            self._write(("update", data))
+
+    def pop(self, key, *default):
+        with _shared_state_lock:
+            self._catch_up()
+            if key not in self._data:
+                if default:
+                    return default[0]
+                raise KeyError(key)
+            value = self._data[key]
+            self._commit(("pop", key))
+        return value
+
+    def setdefault(self, key, default=None):
+        with _shared_state_lock:
+            self._catch_up()
+            if key not in self._data:
+                self._commit(("set", key, default))
+            return self._data[key]
+
+    def clear(self) -> None:
+        self._write(("clear",))
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self._sync())
+
+    # Same name as on manager proxies, checked by callers that copy shared data
+    _getvalue = copy
+
+
+def _get_namespace_view(namespace: str):
+    """Return this process's snapshot view of a shared namespace (internal lock held)
+
+    Falls back to the manager dict itself when all namespace slots are in use.
+    """
+    view = _namespace_views.get(namespace)
+    if view is not None:
+        return view
+    entry = _namespace_changelogs.get(namespace)
+    if entry is None:
+        slot = _slot_counters[0]
+        if slot >= SHARED_NAMESPACE_SLOTS:
+            direct_log(
+                f"Process {os.getpid()} no shared namespace slot left for [{namespace}], "
+                "reads will go through the manager",
+                level="WARNING",
+            )
+            return _shared_dicts[namespace]
+        _slot_counters[0] = slot + 1
+        entry = (slot, _manager.list())
+        _namespace_changelogs[namespace] = entry
+    slot, changelog = entry
+    view = SharedNamespaceDict(_shared_dicts[namespace], changelog, slot)
+    _namespace_views[namespace] = view
+    return view
+
+
+# Bounds of the polling delay while waiting for a lock held by another process
+_RW_LOCK_MIN_DELAY = 0.001
+_RW_LOCK_MAX_DELAY = 0.05
+
+
+async def _acquire_shared_read(slot: int) -> None:
+    state = slot * 3
+    delay = _RW_LOCK_MIN_DELAY
+    while True:
+        with _shared_state_lock:
+            # Waiting writers block new readers so writers are not starved
+            if _rw_lock_states[state + 1] == 0 and _rw_lock_states[state + 2] == 0:
+                _rw_lock_states[state] += 1
+                return
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, _RW_LOCK_MAX_DELAY)
+
+
+def _shared_writers_waiting(slot: int) -> bool:
+    return _rw_lock_states[slot * 3 + 2] > 0
+
+
+def _release_shared_read(slot: int) -> None:
+    with _shared_state_lock:
+        _rw_lock_states[slot * 3] -= 1
+
+
+async def _acquire_shared_write(slot: int) -> None:
+    state = slot * 3
+    with _shared_state_lock:
+        _rw_lock_states[state + 2] += 1
+    try:
+        delay = _RW_LOCK_MIN_DELAY
+        while True:
+            with _shared_state_lock:
+                if _rw_lock_states[state] == 0 and _rw_lock_states[state + 1] == 0:
+                    _rw_lock_states[state + 1] = 1
+                    return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _RW_LOCK_MAX_DELAY)
+    finally:
+        with _shared_state_lock:
+            _rw_lock_states[state + 2] -= 1
+
+
+def _release_shared_write(slot: int) -> None:
+    with _shared_state_lock:
+        _rw_lock_states[slot * 3 + 1] = 0
+
+
+class NamespaceRWLock:
+    """Reader-writer lock of one storage namespace
+
+    Any number of coroutines may hold the read lock at once, the write lock is
+    exclusive and waiting writers take precedence over new readers. Within a
+    process the lock is coordinated with futures; in multiprocess mode the
+    process as a whole additionally holds a shared read or write lock, whose
+    reader count and writer state live in shared memory. While a writer of
+    another process waits, new local readers queue until the process has
+    released its shared read lock, so a steady stream of overlapping readers
+    cannot starve writers in other workers. Waiting for another process polls
+    with a short backoff instead of blocking the event loop.
+    """
+
+    def __init__(self, name: str, slot: Optional[int] = None):
+        self._name = name
+        self._slot = slot  # None: lock is local to this process
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+        self._acquiring_shared_read = False
+        self._waiters: list[asyncio.Future] = []
+
+    def _wake_waiters(self) -> None:
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def _wait(self) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        await waiter
+
+    async def acquire_read(self) -> None:
+        while (
+            self._writer
+            or self._waiting_writers
+            or self._acquiring_shared_read
+            # Let the shared read lock drain for a writer of another process
+            or (
+                self._readers
+                and self._slot is not None
+                and _shared_writers_waiting(self._slot)
+            )
+        ):
+            await self._wait()
+        self._readers += 1
+        if self._readers == 1 and self._slot is not None:
+            # The first local reader takes the shared read lock for the process
+            self._acquiring_shared_read = True
+            try:
+                await _acquire_shared_read(self._slot)
+            except BaseException:
+                self._readers -= 1
+                raise
+            finally:
+                self._acquiring_shared_read = False
+                self._wake_waiters()
+
+    def release_read(self) -> None:
+        self._readers -= 1
+        if self._readers == 0:
+            if self._slot is not None:
+                _release_shared_read(self._slot)
+            self._wake_waiters()
+
+    async def acquire_write(self) -> None:
+        self._waiting_writers += 1
+        try:
+            while self._writer or self._readers:
+                await self._wait()
+        finally:
+            self._waiting_writers -= 1
+            self._wake_waiters()
+        self._writer = True
+        if self._slot is not None:
+            try:
+                await _acquire_shared_write(self._slot)
+            except BaseException:
+                self._writer = False
+                self._wake_waiters()
+                raise
+
+    def release_write(self) -> None:
+        if self._slot is not None:
+            _release_shared_write(self._slot)
+        self._writer = False
+        self._wake_waiters()
+
+    @asynccontextmanager
+    async def read(self) -> AsyncIterator[None]:
+        await self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @asynccontextmanager
+    async def write(self) -> AsyncIterator[None]:
+        await self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class _ExclusiveRWLock:
+    """Read/write interface over an exclusive lock, used when no rw lock slot is left"""
+
+    def __init__(self, lock: UnifiedLock):
+        self._lock = lock
+
+    def read(self) -> UnifiedLock:
+        return self._lock
+
+    def write(self) -> UnifiedLock:
+        return self._lock
+
+
+def get_storage_rw_lock(namespace: str):
+    """return the reader-writer lock of a storage namespace
+
+    Reads of different namespaces, and concurrent reads of the same namespace,
+    no longer serialize on the global storage lock.
+    """
+    lock = _rw_locks.get(namespace)
+    if lock is not None:
+        return lock
+    if not _is_multiprocess:
+        lock = NamespaceRWLock(namespace)
+    else:
+        with _shared_state_lock:
+            slot = _rw_lock_slots.get(namespace)
+            if slot is None and _slot_counters[2] < SHARED_NAMESPACE_SLOTS:
+                slot = _slot_counters[2]
+                _slot_counters[2] = slot + 1
+                _rw_lock_slots[namespace] = slot
+        if slot is None:
+            direct_log(
+                f"Process {os.getpid()} no rw lock slot left for [{namespace}], "
+                "using the storage lock",
+                level="WARNING",
+            )
+            return _ExclusiveRWLock(get_storage_lock())
+        lock = NamespaceRWLock(namespace, slot)
+    _rw_locks[namespace] = lock
+    return lock
+
+
 def get_internal_lock(enable_logging: bool = False) -> UnifiedLock:
     """return unified storage lock for data consistency"""
     async_lock = _async_locks.get("internal_lock") if _is_multiprocess else None
@@ -271,6 +715,23 @@ def get_data_init_lock(enable_logging: bool = False) -> UnifiedLock:
     )
 
 
+def get_graph_registry_lock(enable_logging: bool = False) -> UnifiedLock:
+    """return unified lock serializing updates of the graph registry file"""
+    async_lock = _async_locks.get("graph_registry_lock") if _is_multiprocess else None
+    return UnifiedLock(
+        lock=_graph_registry_lock,
+        is_async=not _is_multiprocess,
+        name="graph_registry_lock",
+        enable_logging=enable_logging,
+        async_lock=async_lock,
+    )
+
+
+def is_share_data_initialized() -> bool:
+    """Whether initialize_share_data has been called in this process"""
+    return bool(_initialized)
+
+
 def initialize_share_data(workers: int = 1):
     """
     Initialize shared storage data for single or multi-process mode.
@@ -298,11 +759,20 @@ def initialize_share_data(workers: int = 1):
         _pipeline_status_lock, \
         _graph_db_lock, \
         _data_init_lock, \
+        _graph_registry_lock, \
         _shared_dicts, \
         _init_flags, \
         _initialized, \
         _update_flags, \
-        _async_locks
+        _async_locks, \
+        _namespace_versions, \
+        _changelog_bases, \
+        _flag_values, \
+        _slot_counters, \
+        _shared_state_lock, \
+        _namespace_changelogs, \
+        _rw_lock_states, \
+        _rw_lock_slots
 
     # Check if already initialized
     if _initialized:
@@ -316,14 +786,25 @@ def initialize_share_data(workers: int = 1):
     if workers > 1:
         _is_multiprocess = True
         _manager = Manager()
-        _internal_lock = _manager.Lock()
-        _storage_lock = _manager.Lock()
-        _pipeline_status_lock = _manager.Lock()
-        _graph_db_lock = _manager.Lock()
-        _data_init_lock = _manager.Lock()
+        # OS semaphores inherited by the forked workers, acquiring them is not
+        # a round trip to the manager process
+        _internal_lock = multiprocessing.Lock()
+        _storage_lock = multiprocessing.Lock()
+        _pipeline_status_lock = multiprocessing.Lock()
+        _graph_db_lock = multiprocessing.Lock()
+        _data_init_lock = multiprocessing.Lock()
+        _graph_registry_lock = multiprocessing.Lock()
+        _shared_state_lock = multiprocessing.Lock()
         _shared_dicts = _manager.dict()
         _init_flags = _manager.dict()
         _update_flags = _manager.dict()
+        _namespace_changelogs = _manager.dict()
+        _namespace_versions = RawArray("q", SHARED_NAMESPACE_SLOTS)
+        _changelog_bases = RawArray("q", SHARED_NAMESPACE_SLOTS)
+        _flag_values = RawArray("b", SHARED_FLAG_SLOTS)
+        _slot_counters = RawArray("i", 3)
+        _rw_lock_states = RawArray("i", SHARED_NAMESPACE_SLOTS * 3)
+        _rw_lock_slots = _manager.dict()
 
         # Initialize async locks for multiprocess mode
         _async_locks = {
@@ -332,6 +813,7 @@ def initialize_share_data(workers: int = 1):
             "pipeline_status_lock": asyncio.Lock(),
             "graph_db_lock": asyncio.Lock(),
             "data_init_lock": asyncio.Lock(),
+            "graph_registry_lock": asyncio.Lock(),
         }
 
         direct_log(
@@ -344,6 +826,7 @@ def initialize_share_data(workers: int = 1):
         _pipeline_status_lock = asyncio.Lock()
         _graph_db_lock = asyncio.Lock()
         _data_init_lock = asyncio.Lock()
+        _graph_registry_lock = asyncio.Lock()
         _shared_dicts = {}
         _init_flags = {}
         _update_flags = {}
@@ -366,8 +849,8 @@ async def initialize_pipeline_status():
         if "busy" in pipeline_namespace:
             return
 
-        # Create a shared list object for history_messages
-        history_messages = _manager.list() if _is_multiprocess else []
+        # Create a shared list object for the pipeline event log
+        events = _manager.list() if _is_multiprocess else []
         pipeline_namespace.update(
             {
                 "autoscanned": False,  # Auto-scan started
@@ -379,12 +862,138 @@ async def initialize_pipeline_status():
                 "cur_batch": 0,  # Current processing batch
                 "request_pending": False,  # Flag for pending request for processing
                 "latest_message": "",  # Latest message from pipeline processing
-                "history_messages": history_messages,  # 使用共享列表对象
+                "events": events,  # Bounded pipeline event log (shared list)
+                "event_seq": 0,  # Sequence number of the last logged event
             }
         )
         direct_log(f"Process {os.getpid()} Pipeline namespace initialized")
 
 
+# Maximum number of events kept in the shared pipeline event log
+PIPELINE_EVENT_LOG_SIZE = int(os.getenv("PIPELINE_EVENT_LOG_SIZE", 1000))
+# Seconds events are buffered by a worker before being flushed to the shared log
+PIPELINE_EVENT_FLUSH_INTERVAL = float(os.getenv("PIPELINE_EVENT_FLUSH_INTERVAL", 0.5))
+
+
+class PipelineEventBuffer:
+    """Per-process buffer in front of the shared pipeline event log
+
+    Adding an event is synchronous and never touches shared state, so it is safe
+    to call from hot paths and while holding other locks. Buffered events are
+    written to ``pipeline_status["events"]`` in one batch per flush interval:
+    one lock acquisition and a handful of IPC calls regardless of the number of
+    events. The shared log is trimmed to PIPELINE_EVENT_LOG_SIZE entries on each
+    flush, while ``event_seq`` keeps increasing so readers can resume from the
+    last sequence number they have seen.
+    """
+
+    def __init__(self):
+        self._pending: list[Dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def add(self, message: str, level: str = "info", **fields: Any) -> None:
+        event = {"time": time.time(), "level": level, "message": message}
+        event.update(fields)
+        self._pending.append(event)
+        if self._flush_task is None or self._flush_task.done():
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # flushed by the next event added from an event loop
+            self._flush_task = loop.create_task(self._flush_later())
+
+    def discard(self) -> None:
+        """Drop events buffered by this process that have not been flushed yet"""
+        self._pending.clear()
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(PIPELINE_EVENT_FLUSH_INTERVAL)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Append buffered events to the shared log (must not hold pipeline_status_lock)"""
+        if not self._pending or not _initialized:
+            return
+        pipeline_status = await get_namespace_data("pipeline_status")
+        async with get_pipeline_status_lock():
+            events, self._pending = self._pending, []
+            if "events" not in pipeline_status:
+                return  # pipeline status not initialized, nobody is listening
+            seq = pipeline_status.get("event_seq", 0)
+            for event in events:
+                seq += 1
+                event["seq"] = seq
+            event_log = pipeline_status["events"]
+            # Events that would be trimmed right away are not sent to the shared list
+            event_log.extend(events[-PIPELINE_EVENT_LOG_SIZE:])
+            overflow = len(event_log) - PIPELINE_EVENT_LOG_SIZE
+            if overflow > 0:
+                del event_log[:overflow]
+            pipeline_status["event_seq"] = seq
+            pipeline_status["latest_message"] = events[-1]["message"]
+
+
+_pipeline_event_buffer = PipelineEventBuffer()
+
+
+def add_pipeline_event(message: str, level: str = "info", **fields: Any) -> None:
+    """Record a pipeline progress event without blocking on shared state
+
+    Extra keyword arguments (doc_id, file_path, stage, ...) are stored with the
+    event. The event reaches the shared log at the next flush.
+    """
+    _pipeline_event_buffer.add(message, level, **fields)
+
+
+async def flush_pipeline_events() -> None:
+    """Write this worker's buffered events to the shared pipeline event log
+
+    Must not be called while holding the pipeline status lock.
+    """
+    await _pipeline_event_buffer.flush()
+
+
+def reset_pipeline_events(pipeline_status: Dict[str, Any], message: str = "") -> None:
+    """Clear the pipeline event log at the start of a new job
+
+    Must be called while holding the pipeline status lock. Sequence numbers are
+    not reset, so readers following the log just continue with the new job.
+    """
+    _pipeline_event_buffer.discard()
+    if "events" not in pipeline_status:
+        return
+    seq = pipeline_status.get("event_seq", 0)
+    if message:
+        seq += 1
+        pipeline_status["events"][:] = [
+            {"seq": seq, "time": time.time(), "level": "info", "message": message}
+        ]
+        pipeline_status["event_seq"] = seq
+        pipeline_status["latest_message"] = message
+    else:
+        pipeline_status["events"][:] = []
+
+
+async def get_pipeline_events(since: int = 0) -> tuple[list[Dict[str, Any]], int]:
+    """Return events of the shared log with a sequence number above ``since``
+
+    Returns the events and the sequence number to pass as ``since`` next time.
+    Only the tail of the log is copied, and the lock is taken only if there are
+    new events. Events trimmed from the log before being read are skipped.
+    """
+    pipeline_status = await get_namespace_data("pipeline_status")
+    last_seq = pipeline_status.get("event_seq", 0)
+    if last_seq <= since:
+        return [], last_seq
+    async with get_pipeline_status_lock():
+        last_seq = pipeline_status.get("event_seq", 0)
+        event_log = pipeline_status.get("events")
+        if event_log is None:
+            return [], last_seq
+        events = event_log[-(last_seq - since) :]
+    return [event for event in events if event["seq"] > since], last_seq
+
+
 async def get_update_flag(namespace: str):
     """
     Create a namespace's update flag for a workers.
@@ -405,7 +1014,13 @@ async def get_update_flag(namespace: str):
             )
 
         if _is_multiprocess and _manager is not None:
-            new_update_flag = _manager.Value("b", False)
+            flag_slot = _slot_counters[1]
+            if flag_slot < SHARED_FLAG_SLOTS:
+                _slot_counters[1] = flag_slot + 1
+                new_update_flag = SharedFlag(flag_slot)
+                new_update_flag.value = False
+            else:
+                new_update_flag = _manager.Value("b", False)
         else:
             # Create a simple mutable object to store boolean value for compatibility with mutiprocess
             class MutableBoolean:
@@ -427,9 +1042,9 @@ async def set_all_update_flags(namespace: str):
     async with get_internal_lock():
         if namespace not in _update_flags:
             raise ValueError(f"Namespace {namespace} not found in update flags")
-        # Update flags for both modes
-        for i in range(len(_update_flags[namespace])):
-            _update_flags[namespace][i].value = True
+        # Update flags for both modes, one copy of the flag list in multiprocess mode
+        for flag in list(_update_flags[namespace]):
+            flag.value = True
 
 
 async def clear_all_update_flags(namespace: str):
@@ -441,9 +1056,9 @@ async def clear_all_update_flags(namespace: str):
     async with get_internal_lock():
         if namespace not in _update_flags:
             raise ValueError(f"Namespace {namespace} not found in update flags")
-        # Update flags for both modes
-        for i in range(len(_update_flags[namespace])):
-            _update_flags[namespace][i].value = False
+        # Update flags for both modes, one copy of the flag list in multiprocess mode
+        for flag in list(_update_flags[namespace]):
+            flag.value = False
 
 
 async def get_all_update_flags_status() -> Dict[str, list]:
@@ -509,10 +1124,31 @@ async def get_namespace_data(namespace: str) -> Dict[str, Any]:
                 _shared_dicts[namespace] = _manager.dict()
             else:
                 _shared_dicts[namespace] = {}
+        if _is_multiprocess and _manager is not None:
+            return _get_namespace_view(namespace)
 
     return _shared_dicts[namespace]
 
 
+async def get_graph_version(working_dir: str) -> int:
+    """Number of committed writes to the graph stored in `working_dir`
+
+    Query results derived from the graph can be cached under this version:
+    any write bumps it in every process, so stale entries are never hit.
+    """
+    versions = await get_namespace_data("graph_versions")
+    return versions.get(working_dir, 0)
+
+
+async def bump_graph_version(working_dir: str) -> int:
+    """Record a committed write to the graph stored in `working_dir`"""
+    versions = await get_namespace_data("graph_versions")
+    async with get_internal_lock():
+        version = versions.get(working_dir, 0) + 1
+        versions[working_dir] = version
+    return version
+
+
 def finalize_share_data():
     """
     Release shared resources and clean up.
@@ -531,11 +1167,20 @@ def finalize_share_data():
         _pipeline_status_lock, \
         _graph_db_lock, \
         _data_init_lock, \
+        _graph_registry_lock, \
         _shared_dicts, \
         _init_flags, \
         _initialized, \
         _update_flags, \
-        _async_locks
+        _async_locks, \
+        _namespace_versions, \
+        _changelog_bases, \
+        _flag_values, \
+        _slot_counters, \
+        _shared_state_lock, \
+        _namespace_changelogs, \
+        _rw_lock_states, \
+        _rw_lock_slots
 
     # Check if already initialized
     if not _initialized:
@@ -553,13 +1198,13 @@ def finalize_share_data():
         try:
             # Clear shared resources before shutting down Manager
             if _shared_dicts is not None:
-                # Clear pipeline status history messages first if exists
+                # Clear pipeline event log first if exists
                 try:
                     pipeline_status = _shared_dicts.get("pipeline_status", {})
-                    if "history_messages" in pipeline_status:
-                        pipeline_status["history_messages"].clear()
+                    if "events" in pipeline_status:
+                        pipeline_status["events"][:] = []
                 except Exception:
-                    pass  # Ignore any errors during history messages cleanup
+                    pass  # Ignore any errors during event log cleanup
                 _shared_dicts.clear()
             if _init_flags is not None:
                 _init_flags.clear()
@@ -579,6 +1224,8 @@ def finalize_share_data():
                 except Exception:
                     pass  # Ignore any errors during update flags cleanup
                 _update_flags.clear()
+            if _namespace_changelogs is not None:
+                _namespace_changelogs.clear()
 
             # Shut down the Manager - this will automatically clean up all shared resources
             _manager.shutdown()
@@ -599,7 +1246,18 @@ def finalize_share_data():
     _pipeline_status_lock = None
     _graph_db_lock = None
     _data_init_lock = None
+    _graph_registry_lock = None
     _update_flags = None
     _async_locks = None
+    _namespace_versions = None
+    _changelog_bases = None
+    _flag_values = None
+    _slot_counters = None
+    _shared_state_lock = None
+    _namespace_changelogs = None
+    _rw_lock_states = None
+    _rw_lock_slots = None
+    _namespace_views.clear()
+    _rw_locks.clear()
 
     direct_log(f"Process {os.getpid()} storage data finalization complete")
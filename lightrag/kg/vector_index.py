@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import weakref
+from typing import Any, Callable, Iterable
+
+import numpy as np
+
+from ..constants import GRAPH_FIELD_SEP
+from ..namespace import NameSpace, is_namespace
+
+# Chunk vector stores of each working directory, used by the entity and
+# relationship stores of the same directory to map document ids to chunk ids
+_chunk_stores: weakref.WeakValueDictionary[str, Any] = weakref.WeakValueDictionary()
+
+
+def doc_filter_keys(namespace: str) -> Callable[[dict[str, Any]], Iterable[str]]:
+    """Return the function listing the filter keys of a row of `namespace`
+
+    Chunk rows are keyed by the document they belong to, entity and relation
+    rows by the chunks they were extracted from.
+    """
+    if is_namespace(namespace, NameSpace.VECTOR_STORE_CHUNKS):
+        return lambda meta: (meta["full_doc_id"],) if meta.get("full_doc_id") else ()
+    return lambda meta: (meta.get("source_id") or "").split(GRAPH_FIELD_SEP)
+
+
+def register_chunk_store(working_dir: str, namespace: str, store: Any) -> None:
+    """Make an in-process chunk vector store available for doc id resolution"""
+    if is_namespace(namespace, NameSpace.VECTOR_STORE_CHUNKS):
+        _chunk_stores[working_dir] = store
+
+
+async def resolve_doc_filter(
+    working_dir: str, namespace: str, ids: list[str]
+) -> set[str]:
+    """Translate the document ids of `QueryParam.ids` into filter keys
+
+    Chunk stores filter on document ids directly. Entity and relation stores
+    filter on the ids of the chunks of those documents, looked up in the chunk
+    store of the same working directory; the given ids are kept as keys too,
+    so chunk ids can be passed directly when no such store is in-process.
+    """
+    keys = set(ids)
+    if is_namespace(namespace, NameSpace.VECTOR_STORE_CHUNKS):
+        return keys
+    chunk_store = _chunk_stores.get(working_dir)
+    if chunk_store is not None:
+        keys.update(await chunk_store.get_ids_by_filter_keys(ids))
+    return keys
+
+
+class DocRowIndex:
+    """Inverted index from filter keys (doc or chunk ids) to vector matrix rows
+
+    The index is built with one pass over the row metadata on the first
+    filtered query after a change, and serves later queries with dict lookups.
+    """
+
+    def __init__(self, key_func: Callable[[dict[str, Any]], Iterable[str]]):
+        self._key_func = key_func
+        self._rows: dict[str, np.ndarray] | None = None
+        self._row_ids: list[str] = []
+
+    def invalidate(self) -> None:
+        self._rows = None
+        self._row_ids = []
+
+    def build(self, rows: Iterable[tuple[int, dict[str, Any]]]) -> None:
+        """Index `(row, metadata)` pairs unless the index is still valid"""
+        if self._rows is not None:
+            return
+        key_rows: dict[str, list[int]] = {}
+        row_ids: list[str] = []
+        for row, meta in rows:
+            if row >= len(row_ids):
+                row_ids.extend([""] * (row + 1 - len(row_ids)))
+            row_ids[row] = meta.get("__id__", "")
+            for key in self._key_func(meta):
+                if key:
+                    key_rows.setdefault(key, []).append(row)
+        self._rows = {
+            key: np.asarray(rows, dtype=np.int64) for key, rows in key_rows.items()
+        }
+        self._row_ids = row_ids
+
+    def rows_for(self, keys: Iterable[str]) -> np.ndarray:
+        """Sorted, unique rows matching any of `keys`"""
+        matched = [self._rows[key] for key in keys if key in self._rows]
+        if not matched:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(matched))
+
+    def ids_for(self, keys: Iterable[str]) -> set[str]:
+        """Ids of the rows matching any of `keys`"""
+        return {self._row_ids[row] for row in self.rows_for(keys)}
+
+
+VECTOR_PRECISIONS = ("float32", "float16", "int8")
+
+
+class QuantizedMatrix:
+    """Normalized vectors stored as float16, or as int8 with a scale per row
+
+    Supports the row selection and matrix-vector product used by
+    cosine_top_k. Rows are converted back to float32 block by block while
+    scoring, so the temporary memory is bounded by the block size.
+    """
+
+    BLOCK_ROWS = 1024
+
+    def __init__(self, codes: np.ndarray, scales: np.ndarray | None = None):
+        self.codes = codes
+        self.scales = scales
+
+    @classmethod
+    def from_float(cls, matrix: np.ndarray, precision: str) -> QuantizedMatrix:
+        if precision not in ("float16", "int8"):
+            raise ValueError(f"Unsupported vector precision: {precision}")
+        dtype = np.float16 if precision == "float16" else np.int8
+        codes = np.empty(matrix.shape, dtype=dtype)
+        scales = None if precision == "float16" else np.empty(len(matrix), np.float32)
+        for start in range(0, len(matrix), cls.BLOCK_ROWS):
+            block = np.asarray(matrix[start : start + cls.BLOCK_ROWS], dtype=np.float32)
+            end = start + len(block)
+            if scales is None:
+                codes[start:end] = block
+                continue
+            # Symmetric scale per row: the largest component maps to +-127
+            block_scales = np.abs(block).max(axis=1) / 127
+            block_scales[block_scales == 0] = 1
+            codes[start:end] = np.round(block / block_scales[:, None])
+            scales[start:end] = block_scales
+        return cls(codes, scales)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + (0 if self.scales is None else self.scales.nbytes)
+
+    def __getitem__(self, rows) -> QuantizedMatrix:
+        scales = None if self.scales is None else self.scales[rows]
+        return QuantizedMatrix(self.codes[rows], scales)
+
+    def __setitem__(self, rows, other: QuantizedMatrix) -> None:
+        self.codes[rows] = other.codes
+        if self.scales is not None:
+            self.scales[rows] = other.scales
+
+    def append(self, other: QuantizedMatrix) -> QuantizedMatrix:
+        """A new matrix with the rows of `other` after those of this one"""
+        scales = None
+        if self.scales is not None:
+            scales = np.concatenate([self.scales, other.scales])
+        return QuantizedMatrix(np.concatenate([self.codes, other.codes]), scales)
+
+    def to_float(self) -> np.ndarray:
+        """Approximate float32 vectors of the rows"""
+        matrix = self.codes.astype(np.float32)
+        if self.scales is not None:
+            matrix *= self.scales[:, None]
+        return matrix
+
+    def __matmul__(self, query: np.ndarray) -> np.ndarray:
+        scores = np.empty(len(self.codes), dtype=np.float32)
+        for start in range(0, len(self.codes), self.BLOCK_ROWS):
+            block = self.codes[start : start + self.BLOCK_ROWS]
+            scores[start : start + len(block)] = block.astype(np.float32) @ query
+        if self.scales is not None:
+            scores *= self.scales
+        return scores
+
+
+def cosine_top_k(
+    matrix: np.ndarray | QuantizedMatrix,
+    query: np.ndarray,
+    top_k: int,
+    threshold: float | None = None,
+    rows: np.ndarray | None = None,
+    exact: np.ndarray | None = None,
+    rerank_factor: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Top-k rows of a normalized `matrix` by cosine similarity to `query`
+
+    Only `rows` are scored when given, so a filtered query costs one
+    matrix-vector product over the selected rows instead of over all of them.
+    Selection uses argpartition, so only the k best scores are sorted.
+
+    With a reduced-precision `matrix`, `exact` float32 vectors and a positive
+    `rerank_factor`, the best `top_k * rerank_factor` rows by approximate
+    score are scored again against `exact` before the final selection.
+
+    Returns:
+        The matching row numbers and their scores, best first.
+    """
+    if rows is not None and rows.dtype == np.bool_:
+        rows = np.flatnonzero(rows)
+    if exact is not None and rerank_factor > 0:
+        candidates, _ = cosine_top_k(matrix, query, top_k * rerank_factor, rows=rows)
+        return cosine_top_k(exact, query, top_k, threshold, rows=np.sort(candidates))
+    candidates = matrix if rows is None else matrix[rows]
+    if top_k <= 0 or len(candidates) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+    query = np.asarray(query, dtype=np.float32)
+    norm = np.linalg.norm(query)
+    if norm > 0:
+        query = query / norm
+    scores = candidates @ query
+
+    selected = np.arange(len(scores))
+    if threshold is not None:
+        selected = np.flatnonzero(scores >= threshold)
+    if len(selected) > top_k:
+        best = np.argpartition(scores[selected], -top_k)[-top_k:]
+        selected = selected[best]
+    selected = selected[np.argsort(scores[selected])[::-1]]
+
+    row_numbers = selected if rows is None else rows[selected]
+    return row_numbers, scores[selected]
@@ -3,16 +3,20 @@ from __future__ import annotations
 import traceback
 import asyncio
 import configparser
+import json
 import os
 import time
 import warnings
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from functools import partial
+from hashlib import md5
 from typing import (
     Any,
+    AsyncIterable,
     AsyncIterator,
     Callable,
+    Iterable,
     Iterator,
     cast,
     final,
@@ -24,6 +28,8 @@ from typing import (
 from lightrag.constants import (
     DEFAULT_MAX_TOKEN_SUMMARY,
     DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE,
+    CHUNK_STAGE_VECTORIZED,
+    EXTRACTION_CHECKPOINT_MODE_PREFIX,
 )
 from lightrag.utils import get_env_value
 
@@ -32,10 +38,15 @@ from lightrag.kg import (
     verify_storage_implementation,
 )
 
+from lightrag.kg.lazy_storage import LazyStorage
 from lightrag.kg.shared_storage import (
+    add_pipeline_event,
+    bump_graph_version,
+    flush_pipeline_events,
     get_namespace_data,
     get_pipeline_status_lock,
     get_graph_db_lock,
+    reset_pipeline_events,
 )
 
 from .base import (
@@ -53,6 +64,7 @@ from .base import (
 from .namespace import NameSpace, make_namespace
 from .operate import (
     chunking_by_token_size,
+    chunking_by_token_size_stream,
     extract_entities,
     merge_nodes_and_edges,
     kg_query,
@@ -70,6 +82,7 @@ from .utils import (
     convert_response_to_json,
     lazy_external_import,
     priority_limit_async_func_call,
+    ChunkTaskScheduler,
     get_content_summary,
     clean_text,
     check_storage_env_vars,
@@ -158,6 +171,11 @@ class LightRAG:
     tiktoken_model_name: str = field(default="gpt-4o-mini")
     """Model name used for tokenization when chunking text with tiktoken. Defaults to `gpt-4o-mini`."""
 
+    stream_ingest_block_size: int = field(
+        default=int(os.getenv("STREAM_INGEST_BLOCK_SIZE", 1024 * 1024))
+    )
+    """Number of characters read per block by the streaming file ingest path."""
+
     chunking_func: Callable[
         [
             Tokenizer,
@@ -254,6 +272,16 @@ class LightRAG:
     max_parallel_insert: int = field(default=int(os.getenv("MAX_PARALLEL_INSERT", 2)))
     """Maximum number of parallel insert operations."""
 
+    chunk_checkpoint_interval: int = field(
+        default=int(os.getenv("CHUNK_CHECKPOINT_INTERVAL", 32))
+    )
+    """Number of extracted chunks buffered before their results are checkpointed to the LLM cache and flushed to disk."""
+
+    custom_kg_batch_size: int = field(
+        default=int(os.getenv("CUSTOM_KG_BATCH_SIZE", 1000))
+    )
+    """Number of custom KG records staged before they are written to the graph and vector storages."""
+
     addon_params: dict[str, Any] = field(
         default_factory=lambda: {
             "language": get_env_value("SUMMARY_LANGUAGE", "English", str)
@@ -266,6 +294,11 @@ class LightRAG:
     auto_manage_storages_states: bool = field(default=True)
     """If True, lightrag will automatically calls initialize_storages and finalize_storages at the appropriate times."""
 
+    lazy_storage_init: bool = field(
+        default=get_env_value("LAZY_STORAGE_INIT", False, bool)
+    )
+    """If True, initialize_storages does not load the storages, each namespace is loaded on first access instead."""
+
     # Storages Management
     # ---
 
@@ -282,8 +315,21 @@ class LightRAG:
         default=float(os.getenv("COSINE_THRESHOLD", 0.2))
     )
 
+    vector_precision: str = field(
+        default=get_env_value("VECTOR_PRECISION", "float32", str)
+    )
+    """Precision of the vectors held in memory by in-process vector storages: float32, float16 or int8."""
+
+    vector_rerank_factor: int = field(
+        default=get_env_value("VECTOR_RERANK_FACTOR", 4, int)
+    )
+    """With reduced precision, top_k * factor candidates are re-scored against float32 vectors; 0 disables re-scoring."""
+
     _storages_status: StoragesStatus = field(default=StoragesStatus.NOT_CREATED)
 
+    _graph_stats_chunk_delta: int = field(default=0, repr=False)
+    """Chunks added (or removed, if negative) since the graph stats were last saved."""
+
     def __post_init__(self):
         from lightrag.kg.shared_storage import (
             initialize_share_data,
@@ -332,6 +378,8 @@ class LightRAG:
         # Ensure vector_db_storage_cls_kwargs has required fields
         self.vector_db_storage_cls_kwargs = {
             "cosine_better_than_threshold": self.cosine_better_than_threshold,
+            "vector_precision": self.vector_precision,
+            "vector_rerank_factor": self.vector_rerank_factor,
             **self.vector_db_storage_cls_kwargs,
         }
 
@@ -436,6 +484,13 @@ class LightRAG:
             embedding_func=None,
         )
 
+        # Every storage is loaded through a proxy that tracks its load state
+        # and, in lazy mode, initializes it on first access
+        for storage_attr in self._storage_attrs():
+            storage = getattr(self, storage_attr)
+            if not isinstance(storage, LazyStorage):
+                setattr(self, storage_attr, LazyStorage(storage, storage_attr))
+
         # Directly use llm_response_cache, don't create a new object
         hashing_kv = self.llm_response_cache
 
@@ -475,9 +530,28 @@ class LightRAG:
             loop.run_until_complete(async_func())
             loop.close()
 
+    @staticmethod
+    def _storage_attrs() -> tuple[str, ...]:
+        return (
+            "full_docs",
+            "text_chunks",
+            "entities_vdb",
+            "relationships_vdb",
+            "chunks_vdb",
+            "chunk_entity_relation_graph",
+            "llm_response_cache",
+            "doc_status",
+        )
+
     async def initialize_storages(self):
         """Asynchronously initialize the storages"""
         if self._storages_status == StoragesStatus.CREATED:
+            if self.lazy_storage_init:
+                # Each namespace is loaded on first access or by warmup_storages
+                self._storages_status = StoragesStatus.INITIALIZED
+                logger.debug("Storages will be initialized on first access")
+                return
+
             tasks = []
 
             for storage in (
@@ -498,6 +572,36 @@ class LightRAG:
             self._storages_status = StoragesStatus.INITIALIZED
             logger.debug("Initialized Storages")
 
+    async def warmup_storages(self) -> None:
+        """Load all storages that have not been accessed yet
+
+        Meant to run in the background when `lazy_storage_init` is enabled, a
+        namespace that fails to load is reported by `get_storage_load_states`.
+        """
+        results = await asyncio.gather(
+            *(
+                getattr(self, storage_attr).initialize()
+                for storage_attr in self._storage_attrs()
+            ),
+            return_exceptions=True,
+        )
+        failed = [
+            storage_attr
+            for storage_attr, result in zip(self._storage_attrs(), results)
+            if isinstance(result, Exception)
+        ]
+        if failed:
+            logger.warning(f"Storage warm-up failed for: {', '.join(failed)}")
+        else:
+            logger.info("Storage warm-up completed")
+
+    def get_storage_load_states(self) -> dict[str, dict[str, Any]]:
+        """Load state and timing of every storage namespace"""
+        return {
+            storage_attr: getattr(self, storage_attr).load_state()
+            for storage_attr in self._storage_attrs()
+        }
+
     async def finalize_storages(self):
         """Asynchronously finalize the storages"""
         if self._storages_status == StoragesStatus.INITIALIZED:
@@ -525,6 +629,16 @@ class LightRAG:
         text = await self.chunk_entity_relation_graph.get_all_labels()
         return text
 
+    async def search_graph_labels(
+        self, query: str = "", limit: int = 50, offset: int = 0, fuzzy: bool = False
+    ) -> list[str]:
+        return await self.chunk_entity_relation_graph.search_labels(
+            query, limit=limit, offset=offset, fuzzy=fuzzy
+        )
+
+    async def get_popular_graph_labels(self, limit: int = 50) -> list[str]:
+        return await self.chunk_entity_relation_graph.get_popular_labels(limit)
+
     async def get_knowledge_graph(
         self,
         node_label: str,
@@ -810,6 +924,141 @@ class LightRAG:
         await self.doc_status.upsert(new_docs)
         logger.info(f"Stored {len(new_docs)} new unique documents")
 
+    async def apipeline_enqueue_file_stream(
+        self,
+        file_path: str | os.PathLike,
+        file_name: str | None = None,
+        encoding: str = "utf-8",
+        chunk_batch_size: int = 256,
+    ) -> str | None:
+        """
+        Enqueue a large text file without loading it into memory
+
+        The file is read in blocks of `stream_ingest_block_size` characters and
+        chunked by token window while it is being read. Chunks are written to
+        `text_chunks` in batches as they are produced, so memory use is bounded by
+        the block size and the batch size rather than by the file size.
+
+        Instead of the full content, the document status only keeps a content
+        summary and an offset index (`metadata["chunk_offsets"]`, a list of
+        `[chunk_id, char_start, char_end]`). The processing pipeline reads the
+        chunks back from `text_chunks` rather than re-chunking the content.
+
+        Args:
+            file_path: Path of the text file to ingest
+            file_name: File path recorded for citation, defaults to the base name
+            encoding: Text encoding of the file
+            chunk_batch_size: Number of chunks written to `text_chunks` at once
+
+        Returns:
+            The document ID, or None if the document is already enqueued
+        """
+        file_path = os.fspath(file_path)
+        file_name = file_name or os.path.basename(file_path)
+        block_size = self.stream_ingest_block_size
+
+        # The document ID is computed in a separate pass so duplicates are
+        # detected before any chunk is written. It hashes the cleaned text block
+        # by block, giving the same ID as `compute_mdhash_id(clean_text(content))`
+        # on the regular insert path. Files are opened with `newline=""` so line
+        # endings are kept as they are in the raw content, as on that path.
+        def _hash_file() -> str:
+            hasher = md5()
+            started = False
+            # Trailing whitespace is only hashed once more text follows it
+            pending = ""
+            with open(file_path, "r", encoding=encoding, newline="") as f:
+                for block in iter(partial(f.read, block_size), ""):
+                    if not started:
+                        block = block.lstrip()
+                        if not block:
+                            continue
+                        started = True
+                    body = block.rstrip()
+                    if body:
+                        hasher.update((pending + body).replace("\x00", "").encode())
+                        pending = block[len(body) :]
+                    else:
+                        pending += block
+            return "doc-" + hasher.hexdigest()
+
+        doc_id = await asyncio.to_thread(_hash_file)
+        if not await self.doc_status.filter_keys({doc_id}):
+            logger.info(f"Document {doc_id} ({file_name}) is already enqueued")
+            return None
+
+        summary_head = ""
+        content_length = 0
+
+        async def _read_blocks() -> AsyncIterator[str]:
+            nonlocal summary_head, content_length
+            f = await asyncio.to_thread(
+                open, file_path, "r", encoding=encoding, newline=""
+            )
+            try:
+                while True:
+                    block = await asyncio.to_thread(f.read, block_size)
+                    if not block:
+                        break
+                    block = block.replace("\x00", "")
+                    if len(summary_head) < 1024:
+                        summary_head += block[:1024]
+                    content_length += len(block)
+                    yield block
+            finally:
+                f.close()
+
+        chunk_offsets: list[list[Any]] = []
+        pending_chunks: dict[str, Any] = {}
+        async for dp in chunking_by_token_size_stream(
+            self.tokenizer,
+            _read_blocks(),
+            self.chunk_overlap_token_size,
+            self.chunk_token_size,
+        ):
+            chunk_id = compute_mdhash_id(dp["content"], prefix="chunk-")
+            chunk_offsets.append([chunk_id, dp["char_start"], dp["char_end"]])
+            pending_chunks[chunk_id] = {
+                **dp,
+                "full_doc_id": doc_id,
+                "file_path": file_name,
+            }
+            if len(pending_chunks) >= chunk_batch_size:
+                await self.text_chunks.upsert(pending_chunks)
+                pending_chunks = {}
+        if pending_chunks:
+            await self.text_chunks.upsert(pending_chunks)
+
+        if not chunk_offsets:
+            logger.warning(f"No content could be extracted from file: {file_name}")
+            return None
+        await self.text_chunks.index_done_callback()
+
+        # Only enqueue the document once all of its chunks are stored
+        now = datetime.now(timezone.utc).isoformat()
+        await self.doc_status.upsert(
+            {
+                doc_id: {
+                    "status": DocStatus.PENDING,
+                    "content": "",
+                    "content_summary": get_content_summary(summary_head),
+                    "content_length": content_length,
+                    "chunks_count": len(chunk_offsets),
+                    "created_at": now,
+                    "updated_at": now,
+                    "file_path": file_name,
+                    "metadata": {
+                        "ingest_mode": "stream",
+                        "chunk_offsets": chunk_offsets,
+                    },
+                }
+            }
+        )
+        logger.info(
+            f"Stream enqueued {file_name} as {doc_id} with {len(chunk_offsets)} chunks"
+        )
+        return doc_id
+
     async def apipeline_process_enqueue_documents(
         self,
         split_by_character: str | None = None,
@@ -834,17 +1083,10 @@ class LightRAG:
         async with pipeline_status_lock:
             # Ensure only one worker is processing documents
             if not pipeline_status.get("busy", False):
-                processing_docs, failed_docs, pending_docs = await asyncio.gather(
-                    self.doc_status.get_docs_by_status(DocStatus.PROCESSING),
-                    self.doc_status.get_docs_by_status(DocStatus.FAILED),
-                    self.doc_status.get_docs_by_status(DocStatus.PENDING),
+                to_process_docs = await self.doc_status.get_docs_by_statuses(
+                    [DocStatus.PROCESSING, DocStatus.FAILED, DocStatus.PENDING]
                 )
 
-                to_process_docs: dict[str, DocProcessingStatus] = {}
-                to_process_docs.update(processing_docs)
-                to_process_docs.update(failed_docs)
-                to_process_docs.update(pending_docs)
-
                 if not to_process_docs:
                     logger.info("No documents to process")
                     return
@@ -861,8 +1103,7 @@ class LightRAG:
                         "latest_message": "",
                     }
                 )
-                # Cleaning history_messages without breaking it as a shared list object
-                del pipeline_status["history_messages"][:]
+                reset_pipeline_events(pipeline_status)
             else:
                 # Another process is busy, just set request flag and return
                 pipeline_status["request_pending"] = True
@@ -877,8 +1118,7 @@ class LightRAG:
                 if not to_process_docs:
                     log_message = "All documents have been processed or are duplicates"
                     logger.info(log_message)
-                    pipeline_status["latest_message"] = log_message
-                    pipeline_status["history_messages"].append(log_message)
+                    add_pipeline_event(log_message)
                     break
 
                 log_message = f"Processing {len(to_process_docs)} document(s)"
@@ -888,8 +1128,7 @@ class LightRAG:
                 pipeline_status["docs"] = len(to_process_docs)
                 pipeline_status["batchs"] = len(to_process_docs)
                 pipeline_status["cur_batch"] = 0
-                pipeline_status["latest_message"] = log_message
-                pipeline_status["history_messages"].append(log_message)
+                add_pipeline_event(log_message)
 
                 # Get first document's file path and total count for job name
                 first_doc_id, first_doc = next(iter(to_process_docs.items()))
@@ -903,8 +1142,11 @@ class LightRAG:
 
                 # Create a counter to track the number of processed files
                 processed_count = 0
-                # Create a semaphore to limit the number of concurrent file processing
-                semaphore = asyncio.Semaphore(self.max_parallel_insert)
+                # Chunks of all documents in this batch share one pool of LLM
+                # slots; it also limits the number of concurrent file processing
+                chunk_scheduler = ChunkTaskScheduler(
+                    self.llm_model_max_async, self.max_parallel_insert
+                )
 
                 async def process_document(
                     doc_id: str,
@@ -913,11 +1155,132 @@ class LightRAG:
                     split_by_character_only: bool,
                     pipeline_status: dict,
                     pipeline_status_lock: asyncio.Lock,
-                    semaphore: asyncio.Semaphore,
+                    chunk_scheduler: ChunkTaskScheduler,
                 ) -> None:
                     """Process single document"""
                     file_extraction_stage_ok = False
-                    async with semaphore:
+                    is_streamed = status_doc.metadata.get("ingest_mode") == "stream"
+                    stage_tasks: list[asyncio.Task] = []
+                    # Per-chunk stages finished by previous runs of this document
+                    chunk_progress: dict[str, list[str]] = (
+                        status_doc.metadata.setdefault("chunk_progress", {})
+                    )
+                    extracted_results: dict[str, tuple[dict, dict]] = {}
+                    # Results extracted since the last checkpoint batch was written
+                    extracted_buffer: dict[str, tuple[dict, dict]] = {}
+                    next_checkpoint_batch = 0
+                    checkpoint_lock = asyncio.Lock()
+                    checkpoint_wakeup = asyncio.Event()
+                    chunks: dict[str, Any] = {}
+
+                    async def save_chunk_progress(
+                        chunk_ids: list[str], stage: str | None = None
+                    ) -> None:
+                        """Record a finished stage for chunks, caller holds checkpoint_lock"""
+                        for chunk_id in chunk_ids if stage else ():
+                            stages = chunk_progress.setdefault(chunk_id, [])
+                            if stage not in stages:
+                                stages.append(stage)
+                        await self.doc_status.upsert(
+                            {
+                                doc_id: {
+                                    "status": DocStatus.PROCESSING,
+                                    "chunks_count": len(chunks),
+                                    "content": status_doc.content,
+                                    "content_summary": status_doc.content_summary,
+                                    "content_length": status_doc.content_length,
+                                    "created_at": status_doc.created_at,
+                                    "updated_at": datetime.now(
+                                        timezone.utc
+                                    ).isoformat(),
+                                    "file_path": file_path,
+                                    "metadata": status_doc.metadata,
+                                }
+                            }
+                        )
+                        # Persist now, a killed worker resumes from this record
+                        await self.doc_status.index_done_callback()
+
+                    async def flush_extraction_checkpoints() -> None:
+                        """Write the buffered extraction results as a new checkpoint batch"""
+                        nonlocal next_checkpoint_batch
+                        async with checkpoint_lock:
+                            if not extracted_buffer:
+                                return
+                            batch = dict(extracted_buffer)
+                            extracted_buffer.clear()
+                            try:
+                                await self._save_extraction_checkpoints(
+                                    doc_id, next_checkpoint_batch, batch
+                                )
+                            except BaseException:
+                                # Keep the results for the next flush
+                                for chunk_id, result in batch.items():
+                                    extracted_buffer.setdefault(chunk_id, result)
+                                raise
+                            next_checkpoint_batch += 1
+
+                    async def checkpoint_flusher(stop: asyncio.Event) -> None:
+                        """Flush checkpoints in the background, outside the LLM slots"""
+                        while not stop.is_set():
+                            await checkpoint_wakeup.wait()
+                            checkpoint_wakeup.clear()
+                            try:
+                                await flush_extraction_checkpoints()
+                            except Exception as e:
+                                logger.warning(
+                                    f"Failed to checkpoint extracted chunks of {doc_id}: {e}"
+                                )
+
+                    async def on_chunk_extracted(
+                        chunk_id: str, maybe_nodes: dict, maybe_edges: dict
+                    ) -> None:
+                        extracted_results[chunk_id] = (maybe_nodes, maybe_edges)
+                        extracted_buffer[chunk_id] = (maybe_nodes, maybe_edges)
+                        if len(extracted_buffer) >= max(
+                            1, self.chunk_checkpoint_interval
+                        ):
+                            checkpoint_wakeup.set()
+
+                    async def vectorize_chunks(pending: dict[str, Any]) -> None:
+                        if not pending:
+                            return
+                        await self.chunks_vdb.upsert(pending)
+                        # Vectors must be durable before the stage is recorded
+                        await self.chunks_vdb.index_done_callback()
+                        await bump_graph_version(self.working_dir)
+                        async with checkpoint_lock:
+                            await save_chunk_progress(
+                                list(pending), CHUNK_STAGE_VECTORIZED
+                            )
+
+                    async def extract_chunks(pending: dict[str, Any]) -> list:
+                        if pending:
+                            stop_flusher = asyncio.Event()
+                            flusher = asyncio.create_task(
+                                checkpoint_flusher(stop_flusher)
+                            )
+                            try:
+                                await self._process_entity_relation_graph(
+                                    pending,
+                                    pipeline_status,
+                                    pipeline_status_lock,
+                                    chunk_scheduler,
+                                    on_chunk_extracted,
+                                )
+                            finally:
+                                stop_flusher.set()
+                                checkpoint_wakeup.set()
+                                await flusher
+                        await flush_extraction_checkpoints()
+                        # Results of resumed and new chunks, in chunk order
+                        return [
+                            extracted_results[chunk_id]
+                            for chunk_id in chunks
+                            if chunk_id in extracted_results
+                        ]
+
+                    async with chunk_scheduler.document_slot(doc_id):
                         nonlocal processed_count
                         current_file_number = 0
                         try:
@@ -934,75 +1297,114 @@ class LightRAG:
                                 )
                                 pipeline_status["cur_batch"] = processed_count
 
-                                log_message = f"Extracting stage {current_file_number}/{total_files}: {file_path}"
-                                logger.info(log_message)
-                                pipeline_status["history_messages"].append(log_message)
-                                log_message = f"Processing d-id: {doc_id}"
-                                logger.info(log_message)
-                                pipeline_status["latest_message"] = log_message
-                                pipeline_status["history_messages"].append(log_message)
-
-                            # Generate chunks from document
-                            chunks: dict[str, Any] = {
-                                compute_mdhash_id(dp["content"], prefix="chunk-"): {
-                                    **dp,
-                                    "full_doc_id": doc_id,
-                                    "file_path": file_path,  # Add file path to each chunk
-                                }
-                                for dp in self.chunking_func(
-                                    self.tokenizer,
-                                    status_doc.content,
-                                    split_by_character,
-                                    split_by_character_only,
-                                    self.chunk_overlap_token_size,
-                                    self.chunk_token_size,
+                            log_message = f"Extracting stage {current_file_number}/{total_files}: {file_path}"
+                            logger.info(log_message)
+                            add_pipeline_event(
+                                log_message,
+                                stage="extract",
+                                doc_id=doc_id,
+                                file_path=file_path,
+                            )
+                            log_message = f"Processing d-id: {doc_id}"
+                            logger.info(log_message)
+                            add_pipeline_event(log_message, doc_id=doc_id)
+
+                            if is_streamed:
+                                # Chunks were written to text_chunks while the file
+                                # was streamed in, read them back by the offset index
+                                chunk_ids = list(
+                                    dict.fromkeys(
+                                        entry[0]
+                                        for entry in status_doc.metadata.get(
+                                            "chunk_offsets", []
+                                        )
+                                    )
                                 )
+                                stored_chunks = await self.text_chunks.get_by_ids(
+                                    chunk_ids
+                                )
+                                chunks = {
+                                    chunk_id: chunk_data
+                                    for chunk_id, chunk_data in zip(
+                                        chunk_ids, stored_chunks
+                                    )
+                                    if chunk_data is not None
+                                }
+                            else:
+                                # Generate chunks from document
+                                chunks = {
+                                    compute_mdhash_id(dp["content"], prefix="chunk-"): {
+                                        **dp,
+                                        "full_doc_id": doc_id,
+                                        "file_path": file_path,  # Add file path to each chunk
+                                    }
+                                    for dp in self.chunking_func(
+                                        self.tokenizer,
+                                        status_doc.content,
+                                        split_by_character,
+                                        split_by_character_only,
+                                        self.chunk_overlap_token_size,
+                                        self.chunk_token_size,
+                                    )
+                                }
+
+                            # Skip the stages that a previous run finished for each chunk
+                            pending_vdb_chunks = {
+                                chunk_id: chunk_data
+                                for chunk_id, chunk_data in chunks.items()
+                                if CHUNK_STAGE_VECTORIZED
+                                not in chunk_progress.get(chunk_id, ())
                             }
+                            (
+                                checkpointed_results,
+                                next_checkpoint_batch,
+                            ) = await self._load_extraction_checkpoints(doc_id)
+                            extracted_results.update(
+                                (chunk_id, result)
+                                for chunk_id, result in checkpointed_results.items()
+                                if chunk_id in chunks
+                            )
+                            pending_extract_chunks = {
+                                chunk_id: chunk_data
+                                for chunk_id, chunk_data in chunks.items()
+                                if chunk_id not in extracted_results
+                            }
+                            if len(pending_vdb_chunks) < len(chunks) or len(
+                                pending_extract_chunks
+                            ) < len(chunks):
+                                log_message = (
+                                    f"Resuming d-id: {doc_id}, "
+                                    f"{len(chunks) - len(pending_extract_chunks)}/{len(chunks)} chunks already extracted, "
+                                    f"{len(chunks) - len(pending_vdb_chunks)}/{len(chunks)} already vectorized"
+                                )
+                                logger.info(log_message)
+                                add_pipeline_event(log_message, doc_id=doc_id)
 
                             # Process document (text chunks and full docs) in parallel
                             # Create tasks with references for potential cancellation
-                            doc_status_task = asyncio.create_task(
-                                self.doc_status.upsert(
-                                    {
-                                        doc_id: {
-                                            "status": DocStatus.PROCESSING,
-                                            "chunks_count": len(chunks),
-                                            "content": status_doc.content,
-                                            "content_summary": status_doc.content_summary,
-                                            "content_length": status_doc.content_length,
-                                            "created_at": status_doc.created_at,
-                                            "updated_at": datetime.now(
-                                                timezone.utc
-                                            ).isoformat(),
-                                            "file_path": file_path,
-                                        }
-                                    }
-                                )
-                            )
+                            async def mark_processing() -> None:
+                                async with checkpoint_lock:
+                                    await save_chunk_progress([])
+
+                            doc_status_task = asyncio.create_task(mark_processing())
                             chunks_vdb_task = asyncio.create_task(
-                                self.chunks_vdb.upsert(chunks)
+                                vectorize_chunks(pending_vdb_chunks)
                             )
                             entity_relation_task = asyncio.create_task(
-                                self._process_entity_relation_graph(
-                                    chunks, pipeline_status, pipeline_status_lock
-                                )
+                                extract_chunks(pending_extract_chunks)
                             )
-                            full_docs_task = asyncio.create_task(
-                                self.full_docs.upsert(
-                                    {doc_id: {"content": status_doc.content}}
+                            stage_tasks = [chunks_vdb_task, entity_relation_task]
+                            if not is_streamed:
+                                full_docs_task = asyncio.create_task(
+                                    self.full_docs.upsert(
+                                        {doc_id: {"content": status_doc.content}}
+                                    )
                                 )
-                            )
-                            text_chunks_task = asyncio.create_task(
-                                self.text_chunks.upsert(chunks)
-                            )
-                            tasks = [
-                                doc_status_task,
-                                chunks_vdb_task,
-                                entity_relation_task,
-                                full_docs_task,
-                                text_chunks_task,
-                            ]
-                            await asyncio.gather(*tasks)
+                                text_chunks_task = asyncio.create_task(
+                                    self.text_chunks.upsert(chunks)
+                                )
+                                stage_tasks += [full_docs_task, text_chunks_task]
+                            await asyncio.gather(doc_status_task, *stage_tasks)
                             file_extraction_stage_ok = True
 
                         except Exception as e:
@@ -1010,22 +1412,27 @@ class LightRAG:
                             logger.error(traceback.format_exc())
                             error_msg = f"Failed to extract document {current_file_number}/{total_files}: {file_path}"
                             logger.error(error_msg)
-                            async with pipeline_status_lock:
-                                pipeline_status["latest_message"] = error_msg
-                                pipeline_status["history_messages"].append(
-                                    traceback.format_exc()
+                            add_pipeline_event(
+                                error_msg,
+                                level="error",
+                                stage="extract",
+                                doc_id=doc_id,
+                                file_path=file_path,
+                                traceback=traceback.format_exc(),
+                            )
+
+                            # Cancel other tasks as they are no longer meaningful
+                            for task in stage_tasks:
+                                if not task.done():
+                                    task.cancel()
+
+                            # Keep the chunks that were extracted before the failure
+                            try:
+                                await flush_extraction_checkpoints()
+                            except Exception as checkpoint_error:
+                                logger.error(
+                                    f"Failed to checkpoint extracted chunks of {doc_id}: {checkpoint_error}"
                                 )
-                                pipeline_status["history_messages"].append(error_msg)
-
-                                # Cancel other tasks as they are no longer meaningful
-                                for task in [
-                                    chunks_vdb_task,
-                                    entity_relation_task,
-                                    full_docs_task,
-                                    text_chunks_task,
-                                ]:
-                                    if not task.done():
-                                        task.cancel()
 
                             # Persistent llm cache
                             if self.llm_response_cache:
@@ -1045,6 +1452,7 @@ class LightRAG:
                                             timezone.utc
                                         ).isoformat(),
                                         "file_path": file_path,
+                                        "metadata": status_doc.metadata,
                                     }
                                 }
                             )
@@ -1069,6 +1477,11 @@ class LightRAG:
                                 file_path=file_path,
                             )
 
+                            # Persist the graph before the document is marked processed
+                            await self._insert_done(update_graph_stats=False)
+
+                            # Stages are only needed to resume unfinished documents
+                            status_doc.metadata.pop("chunk_progress", None)
                             await self.doc_status.upsert(
                                 {
                                     doc_id: {
@@ -1082,30 +1495,41 @@ class LightRAG:
                                             timezone.utc
                                         ).isoformat(),
                                         "file_path": file_path,
+                                        "metadata": status_doc.metadata,
                                     }
                                 }
                             )
 
-                            # Call _insert_done after processing each file
-                            await self._insert_done()
+                            await self.doc_status.index_done_callback()
+                            # Extraction results are only kept until the merge is done
+                            await self._drop_extraction_checkpoints(
+                                doc_id, next_checkpoint_batch
+                            )
+                            self._graph_stats_chunk_delta += len(chunks)
+                            await self._update_graph_stats()
 
-                            async with pipeline_status_lock:
-                                log_message = f"Completed processing file {current_file_number}/{total_files}: {file_path}"
-                                logger.info(log_message)
-                                pipeline_status["latest_message"] = log_message
-                                pipeline_status["history_messages"].append(log_message)
+                            log_message = f"Completed processing file {current_file_number}/{total_files}: {file_path}"
+                            logger.info(log_message)
+                            add_pipeline_event(
+                                log_message,
+                                stage="completed",
+                                doc_id=doc_id,
+                                file_path=file_path,
+                            )
 
                         except Exception as e:
                             # Log error and update pipeline status
                             logger.error(traceback.format_exc())
                             error_msg = f"Merging stage failed in document {current_file_number}/{total_files}: {file_path}"
                             logger.error(error_msg)
-                            async with pipeline_status_lock:
-                                pipeline_status["latest_message"] = error_msg
-                                pipeline_status["history_messages"].append(
-                                    traceback.format_exc()
-                                )
-                                pipeline_status["history_messages"].append(error_msg)
+                            add_pipeline_event(
+                                error_msg,
+                                level="error",
+                                stage="merge",
+                                doc_id=doc_id,
+                                file_path=file_path,
+                                traceback=traceback.format_exc(),
+                            )
 
                             # Persistent llm cache
                             if self.llm_response_cache:
@@ -1123,6 +1547,7 @@ class LightRAG:
                                         "created_at": status_doc.created_at,
                                         "updated_at": datetime.now().isoformat(),
                                         "file_path": file_path,
+                                        "metadata": status_doc.metadata,
                                     }
                                 }
                             )
@@ -1138,7 +1563,7 @@ class LightRAG:
                             split_by_character_only,
                             pipeline_status,
                             pipeline_status_lock,
-                            semaphore,
+                            chunk_scheduler,
                         )
                     )
 
@@ -1158,32 +1583,29 @@ class LightRAG:
 
                 log_message = "Processing additional documents due to pending request"
                 logger.info(log_message)
-                pipeline_status["latest_message"] = log_message
-                pipeline_status["history_messages"].append(log_message)
+                add_pipeline_event(log_message)
 
                 # Check for pending documents again
-                processing_docs, failed_docs, pending_docs = await asyncio.gather(
-                    self.doc_status.get_docs_by_status(DocStatus.PROCESSING),
-                    self.doc_status.get_docs_by_status(DocStatus.FAILED),
-                    self.doc_status.get_docs_by_status(DocStatus.PENDING),
+                to_process_docs = await self.doc_status.get_docs_by_statuses(
+                    [DocStatus.PROCESSING, DocStatus.FAILED, DocStatus.PENDING]
                 )
 
-                to_process_docs = {}
-                to_process_docs.update(processing_docs)
-                to_process_docs.update(failed_docs)
-                to_process_docs.update(pending_docs)
-
         finally:
             log_message = "Document processing pipeline completed"
             logger.info(log_message)
+            add_pipeline_event(log_message)
+            await flush_pipeline_events()
             # Always reset busy status when done or if an exception occurs (with lock)
             async with pipeline_status_lock:
                 pipeline_status["busy"] = False
-                pipeline_status["latest_message"] = log_message
-                pipeline_status["history_messages"].append(log_message)
 
     async def _process_entity_relation_graph(
-        self, chunk: dict[str, Any], pipeline_status=None, pipeline_status_lock=None
+        self,
+        chunk: dict[str, Any],
+        pipeline_status=None,
+        pipeline_status_lock=None,
+        chunk_scheduler: ChunkTaskScheduler | None = None,
+        chunk_done_callback: Callable | None = None,
     ) -> list:
         try:
             chunk_results = await extract_entities(
@@ -1192,18 +1614,123 @@ class LightRAG:
                 pipeline_status=pipeline_status,
                 pipeline_status_lock=pipeline_status_lock,
                 llm_response_cache=self.llm_response_cache,
+                chunk_scheduler=chunk_scheduler,
+                chunk_done_callback=chunk_done_callback,
             )
             return chunk_results
         except Exception as e:
             error_msg = f"Failed to extract entities and relationships: {str(e)}"
             logger.error(error_msg)
-            async with pipeline_status_lock:
-                pipeline_status["latest_message"] = error_msg
-                pipeline_status["history_messages"].append(error_msg)
+            add_pipeline_event(error_msg, level="error", stage="extract")
             raise e
 
+    @staticmethod
+    def _extraction_checkpoint_mode(doc_id: str, batch: int) -> str:
+        # Hashed to fit the mode column of SQL backed caches
+        digest = md5(doc_id.encode("utf-8")).hexdigest()[:20]
+        return f"{EXTRACTION_CHECKPOINT_MODE_PREFIX}{digest}-{batch:x}"
+
+    async def _load_extraction_checkpoint_batches(self, doc_id: str) -> list[dict]:
+        """Read the checkpoint batches of a document, numbered from 0 without gaps"""
+        batches = []
+        while True:
+            batch = await self.llm_response_cache.get_by_id(
+                self._extraction_checkpoint_mode(doc_id, len(batches))
+            )
+            if not batch:
+                return batches
+            batches.append(batch)
+
+    async def _load_extraction_checkpoints(
+        self, doc_id: str
+    ) -> tuple[dict[str, tuple[dict, dict]], int]:
+        """Load checkpointed extraction results of a document
+
+        Returns:
+            The results keyed by chunk id, and the number of the next batch
+        """
+        if self.llm_response_cache is None:
+            return {}, 0
+        try:
+            batches = await self._load_extraction_checkpoint_batches(doc_id)
+        except Exception as e:
+            logger.warning(f"Failed to load extraction checkpoints of {doc_id}: {e}")
+            return {}, 0
+
+        results = {}
+        for batch in batches:
+            for chunk_id, entry in batch.items():
+                if not isinstance(entry, dict) or not entry.get("return"):
+                    continue
+                try:
+                    data = json.loads(entry["return"])
+                except (TypeError, ValueError):
+                    continue
+                maybe_edges = {
+                    (src, tgt): edges for src, tgt, edges in data.get("edges", [])
+                }
+                results[chunk_id] = (data.get("nodes", {}), maybe_edges)
+        return results, len(batches)
+
+    async def _save_extraction_checkpoints(
+        self, doc_id: str, batch: int, results: dict[str, tuple[dict, dict]]
+    ) -> None:
+        """Write extraction results as checkpoint batch `batch` of a document
+
+        Each batch is a separate cache mode holding only the results extracted
+        since the previous batch. The cache is flushed after each batch, so the
+        checkpoint survives a worker killed before the document finishes.
+        """
+        if self.llm_response_cache is None:
+            return
+        mode_data = {}
+        for chunk_id, (maybe_nodes, maybe_edges) in results.items():
+            mode_data[chunk_id] = {
+                "return": json.dumps(
+                    {
+                        "nodes": maybe_nodes,
+                        "edges": [
+                            [src, tgt, edges]
+                            for (src, tgt), edges in maybe_edges.items()
+                        ],
+                    },
+                    ensure_ascii=False,
+                ),
+                "cache_type": "extract_checkpoint",
+                "chunk_id": chunk_id,
+                "original_prompt": "",
+            }
+        await self.llm_response_cache.upsert(
+            {self._extraction_checkpoint_mode(doc_id, batch): mode_data}
+        )
+        await self.llm_response_cache.index_done_callback()
+
+    async def _drop_extraction_checkpoints(
+        self, doc_id: str, batch_count: int | None = None
+    ) -> None:
+        """Drop the checkpoint batches of a document, counting them if not given"""
+        if self.llm_response_cache is None:
+            return
+        try:
+            if batch_count is None:
+                batch_count = len(
+                    await self._load_extraction_checkpoint_batches(doc_id)
+                )
+            if batch_count:
+                await self.llm_response_cache.drop_cache_by_modes(
+                    [
+                        self._extraction_checkpoint_mode(doc_id, batch)
+                        for batch in range(batch_count)
+                    ]
+                )
+        except Exception as e:
+            logger.warning(f"Failed to drop extraction checkpoints of {doc_id}: {e}")
+
     async def _insert_done(
-        self, pipeline_status=None, pipeline_status_lock=None
+        self,
+        pipeline_status=None,
+        pipeline_status_lock=None,
+        update_graph_stats: bool = True,
     ) -> None:
         tasks = [
             cast(StorageNameSpace, storage_inst).index_done_callback()
@@ -1220,14 +1747,50 @@ class LightRAG:
             if storage_inst is not None
         ]
         await asyncio.gather(*tasks)
+        # Invalidate the query contexts cached for this graph in every process
+        await bump_graph_version(self.working_dir)
+
+        if update_graph_stats:
+            await self._update_graph_stats()
 
         log_message = "In memory DB persist to disk"
         logger.info(log_message)
 
-        if pipeline_status is not None and pipeline_status_lock is not None:
-            async with pipeline_status_lock:
-                pipeline_status["latest_message"] = log_message
-                pipeline_status["history_messages"].append(log_message)
+        if pipeline_status is not None:
+            add_pipeline_event(log_message)
+
+    async def _update_graph_stats(self, refresh: bool = False) -> bool:
+        """Update the counters of this graph saved in the working directory.
+
+        Entity, relation and chunk counts are kept incrementally from the changes
+        recorded by the storages, so listing graphs never has to parse the
+        storage files. With `refresh` the graph is counted in full.
+        """
+        from .utils_graph import update_graph_stats
+
+        chunk_delta = self._graph_stats_chunk_delta
+        self._graph_stats_chunk_delta = 0
+        if not await update_graph_stats(
+            self.chunk_entity_relation_graph,
+            self.doc_status,
+            chunk_delta,
+            refresh=refresh,
+        ):
+            # Keep the chunk delta for the next update
+            self._graph_stats_chunk_delta += chunk_delta
+            return False
+        return True
+
+    async def arefresh_graph_stats(self) -> bool:
+        """Recount the entities, relations and documents of the saved graph stats.
+
+        Only needed to repair counters, e.g. after the storages were changed
+        outside LightRAG; they are otherwise kept up to date incrementally.
+
+        Returns:
+            False if the counters could not be updated
+        """
+        return await self._update_graph_stats(refresh=True)
 
     def insert_custom_kg(
         self, custom_kg: dict[str, Any], full_doc_id: str = None
@@ -1240,175 +1803,291 @@ class LightRAG:
         custom_kg: dict[str, Any],
         full_doc_id: str = None,
     ) -> None:
+        def iter_records():
+            for chunk_data in custom_kg.get("chunks", []):
+                yield {"type": "chunk", **chunk_data}
+            for entity_data in custom_kg.get("entities", []):
+                yield {"type": "entity", **entity_data}
+            for relationship_data in custom_kg.get("relationships", []):
+                yield {"type": "relationship", **relationship_data}
+
+        try:
+            await self.ainsert_custom_kg_stream(
+                iter_records(), full_doc_id=full_doc_id, strict=True
+            )
+        except Exception as e:
+            logger.error(f"Error in ainsert_custom_kg: {e}")
+            raise
+
+    async def ainsert_custom_kg_stream(
+        self,
+        records: AsyncIterable[dict[str, Any]] | Iterable[dict[str, Any]],
+        full_doc_id: str | None = None,
+        batch_size: int | None = None,
+        strict: bool = False,
+    ) -> dict[str, Any]:
+        """Import chunks, entities and relationships from a stream of records.
+
+        Each record is a dict with a "type" of "chunk", "entity" or
+        "relationship" and the same fields as the corresponding item of
+        `ainsert_custom_kg`. Records are validated and staged in batches of
+        `batch_size` (default `custom_kg_batch_size`); each batch is written
+        with one batched graph upsert per kind under the graph lock and one
+        upsert per vector storage, so embeddings are computed in large batches.
+        Chunks should precede the entities and relationships that reference them.
+
+        Args:
+            records: Sync or async iterable of record dicts
+            full_doc_id: Document ID assigned to imported chunks, defaults to
+                each chunk's source_id
+            batch_size: Number of records staged before a batch is written
+            strict: Raise on the first invalid record instead of skipping it
+
+        Returns:
+            Counts of imported chunks, entities and relationships, the number
+            of failed records and the first errors as {"index", "error"} dicts
+        """
+        batch_size = max(1, batch_size or self.custom_kg_batch_size)
+        result: dict[str, Any] = {
+            "chunks": 0,
+            "entities": 0,
+            "relationships": 0,
+            "failed": 0,
+            "errors": [],
+        }
+        chunk_to_source_map: dict[str, str] = {}
+        chunks: dict[str, dict[str, Any]] = {}
+        entities: dict[str, dict[str, Any]] = {}
+        relationships: dict[tuple[str, str], dict[str, Any]] = {}
         update_storage = False
+
+        async def iter_records():
+            if hasattr(records, "__aiter__"):
+                async for record in records:
+                    yield record
+            else:
+                for record in records:
+                    yield record
+
+        async def flush():
+            nonlocal chunks, entities, relationships, update_storage
+            if not (chunks or entities or relationships):
+                return
+            update_storage = True
+            await self._write_custom_kg_batch(chunks, entities, relationships)
+            result["chunks"] += len(chunks)
+            result["entities"] += len(entities)
+            result["relationships"] += len(relationships)
+            chunks, entities, relationships = {}, {}, {}
+
         try:
-            # Insert chunks into vector storage
-            all_chunks_data: dict[str, dict[str, str]] = {}
-            chunk_to_source_map: dict[str, str] = {}
-            for chunk_data in custom_kg.get("chunks", []):
-                chunk_content = clean_text(chunk_data["content"])
-                source_id = chunk_data["source_id"]
-                file_path = chunk_data.get("file_path", "custom_kg")
-                tokens = len(self.tokenizer.encode(chunk_content))
-                chunk_order_index = (
-                    0
-                    if "chunk_order_index" not in chunk_data.keys()
-                    else chunk_data["chunk_order_index"]
-                )
-                chunk_id = compute_mdhash_id(chunk_content, prefix="chunk-")
+            index = -1
+            async for record in iter_records():
+                index += 1
+                try:
+                    kind, key, data = self._parse_custom_kg_record(
+                        record, chunk_to_source_map, full_doc_id
+                    )
+                except (KeyError, TypeError, ValueError) as e:
+                    if strict:
+                        raise
+                    result["failed"] += 1
+                    if len(result["errors"]) < 100:
+                        result["errors"].append({"index": index, "error": repr(e)})
+                    continue
+
+                if kind == "chunk":
+                    chunks[key] = data
+                elif kind == "entity":
+                    entities[key] = data
+                else:
+                    relationships[key] = data
 
-                chunk_entry = {
+                if len(chunks) + len(entities) + len(relationships) >= batch_size:
+                    await flush()
+            await flush()
+        finally:
+            if update_storage:
+                await self._insert_done()
+
+        logger.info(
+            f"Custom KG import: {result['chunks']} chunks, {result['entities']} entities, "
+            f"{result['relationships']} relationships, {result['failed']} failed"
+        )
+        return result
+
+    def _parse_custom_kg_record(
+        self,
+        record: dict[str, Any],
+        chunk_to_source_map: dict[str, str],
+        full_doc_id: str | None,
+    ) -> tuple[str, Any, dict[str, Any]]:
+        """Validate one custom KG record and build its storage entry
+
+        Returns (kind, key, data) where key is the chunk ID, entity name or
+        (src_id, tgt_id) pair. Registers chunks in `chunk_to_source_map`.
+        """
+        if not isinstance(record, dict):
+            raise TypeError(f"record must be an object, got {type(record).__name__}")
+        kind = record.get("type")
+        if kind is None:
+            if "content" in record:
+                kind = "chunk"
+            elif "entity_name" in record:
+                kind = "entity"
+            elif "src_id" in record:
+                kind = "relationship"
+        elif kind == "relation":
+            kind = "relationship"
+        file_path = record.get("file_path", "custom_kg")
+
+        if kind == "chunk":
+            chunk_content = clean_text(record["content"])
+            source_id = record["source_id"]
+            chunk_id = compute_mdhash_id(chunk_content, prefix="chunk-")
+            chunk_to_source_map[source_id] = chunk_id
+            return (
+                "chunk",
+                chunk_id,
+                {
                     "content": chunk_content,
                     "source_id": source_id,
-                    "tokens": tokens,
-                    "chunk_order_index": chunk_order_index,
+                    "tokens": len(self.tokenizer.encode(chunk_content)),
+                    "chunk_order_index": record.get("chunk_order_index", 0),
                     "full_doc_id": full_doc_id
                     if full_doc_id is not None
                     else source_id,
                     "file_path": file_path,
                     "status": DocStatus.PROCESSED,
-                }
-                all_chunks_data[chunk_id] = chunk_entry
-                chunk_to_source_map[source_id] = chunk_id
-                update_storage = True
-
-            if all_chunks_data:
-                await asyncio.gather(
-                    self.chunks_vdb.upsert(all_chunks_data),
-                    self.text_chunks.upsert(all_chunks_data),
-                )
-
-            # Insert entities into knowledge graph
-            all_entities_data: list[dict[str, str]] = []
-            for entity_data in custom_kg.get("entities", []):
-                entity_name = entity_data["entity_name"]
-                entity_type = entity_data.get("entity_type", "UNKNOWN")
-                description = entity_data.get("description", "No description provided")
-                source_chunk_id = entity_data.get("source_id", "UNKNOWN")
-                source_id = chunk_to_source_map.get(source_chunk_id, "UNKNOWN")
-                file_path = entity_data.get("file_path", "custom_kg")
-
-                # Log if source_id is UNKNOWN
-                if source_id == "UNKNOWN":
-                    logger.warning(
-                        f"Entity '{entity_name}' has an UNKNOWN source_id. Please check the source mapping."
-                    )
+                },
+            )
 
-                # Prepare node data
-                node_data: dict[str, str] = {
+        if kind == "entity":
+            entity_name = record["entity_name"]
+            if not entity_name:
+                raise ValueError("entity_name must not be empty")
+            source_id = chunk_to_source_map.get(
+                record.get("source_id", "UNKNOWN"), "UNKNOWN"
+            )
+            if source_id == "UNKNOWN":
+                logger.debug(
+                    f"Entity '{entity_name}' has an UNKNOWN source_id. Please check the source mapping."
+                )
+            return (
+                "entity",
+                entity_name,
+                {
                     "entity_id": entity_name,
-                    "entity_type": entity_type,
-                    "description": description,
+                    "entity_type": record.get("entity_type", "UNKNOWN"),
+                    "description": record.get("description", "No description provided"),
                     "source_id": source_id,
                     "file_path": file_path,
                     "created_at": int(time.time()),
-                }
-                # Insert node data into the knowledge graph
-                await self.chunk_entity_relation_graph.upsert_node(
-                    entity_name, node_data=node_data
+                },
+            )
+
+        if kind == "relationship":
+            src_id = record["src_id"]
+            tgt_id = record["tgt_id"]
+            if not src_id or not tgt_id:
+                raise ValueError("src_id and tgt_id must not be empty")
+            source_id = chunk_to_source_map.get(
+                record.get("source_id", "UNKNOWN"), "UNKNOWN"
+            )
+            if source_id == "UNKNOWN":
+                logger.debug(
+                    f"Relationship from '{src_id}' to '{tgt_id}' has an UNKNOWN source_id. Please check the source mapping."
                 )
-                node_data["entity_name"] = entity_name
-                all_entities_data.append(node_data)
-                update_storage = True
+            return (
+                "relationship",
+                (src_id, tgt_id),
+                {
+                    "weight": record.get("weight", 1.0),
+                    "description": record["description"],
+                    "keywords": record["keywords"],
+                    "source_id": source_id,
+                    "file_path": file_path,
+                    "created_at": int(time.time()),
+                },
+            )
 
-            # Insert relationships into knowledge graph
-            all_relationships_data: list[dict[str, str]] = []
-            for relationship_data in custom_kg.get("relationships", []):
-                src_id = relationship_data["src_id"]
-                tgt_id = relationship_data["tgt_id"]
-                description = relationship_data["description"]
-                keywords = relationship_data["keywords"]
-                weight = relationship_data.get("weight", 1.0)
-                source_chunk_id = relationship_data.get("source_id", "UNKNOWN")
-                source_id = chunk_to_source_map.get(source_chunk_id, "UNKNOWN")
-                file_path = relationship_data.get("file_path", "custom_kg")
-
-                # Log if source_id is UNKNOWN
-                if source_id == "UNKNOWN":
-                    logger.warning(
-                        f"Relationship from '{src_id}' to '{tgt_id}' has an UNKNOWN source_id. Please check the source mapping."
-                    )
+        raise ValueError(f"unknown record type: {kind!r}")
 
-                # Check if nodes exist in the knowledge graph
-                for need_insert_id in [src_id, tgt_id]:
-                    if not (
-                        await self.chunk_entity_relation_graph.has_node(need_insert_id)
-                    ):
-                        await self.chunk_entity_relation_graph.upsert_node(
-                            need_insert_id,
-                            node_data={
-                                "entity_id": need_insert_id,
-                                "source_id": source_id,
+    async def _write_custom_kg_batch(
+        self,
+        chunks: dict[str, dict[str, Any]],
+        entities: dict[str, dict[str, Any]],
+        relationships: dict[tuple[str, str], dict[str, Any]],
+    ) -> None:
+        """Write one staged batch of custom KG records to all storages"""
+        if chunks:
+            await asyncio.gather(
+                self.chunks_vdb.upsert(chunks),
+                self.text_chunks.upsert(chunks),
+            )
+
+        if entities or relationships:
+            graph = self.chunk_entity_relation_graph
+            graph_db_lock = get_graph_db_lock(enable_logging=False)
+            async with graph_db_lock:
+                nodes = dict(entities)
+                # Relationship endpoints that are neither staged nor stored get placeholder nodes
+                endpoints = {
+                    node_id for pair in relationships for node_id in pair
+                } - nodes.keys()
+                if endpoints:
+                    existing = await graph.get_nodes_batch(list(endpoints))
+                    for (src_id, tgt_id), edge_data in relationships.items():
+                        for node_id in (src_id, tgt_id):
+                            if node_id in existing or node_id in nodes:
+                                continue
+                            nodes[node_id] = {
+                                "entity_id": node_id,
+                                "source_id": edge_data["source_id"],
                                 "description": "UNKNOWN",
                                 "entity_type": "UNKNOWN",
-                                "file_path": file_path,
+                                "file_path": edge_data["file_path"],
                                 "created_at": int(time.time()),
-                            },
-                        )
-
-                # Insert edge into the knowledge graph
-                await self.chunk_entity_relation_graph.upsert_edge(
-                    src_id,
-                    tgt_id,
-                    edge_data={
-                        "weight": weight,
-                        "description": description,
-                        "keywords": keywords,
-                        "source_id": source_id,
-                        "file_path": file_path,
-                        "created_at": int(time.time()),
-                    },
-                )
+                            }
+                if nodes:
+                    await graph.upsert_nodes_batch(nodes)
+                if relationships:
+                    await graph.upsert_edges_batch(
+                        [
+                            (src_id, tgt_id, edge_data)
+                            for (src_id, tgt_id), edge_data in relationships.items()
+                        ]
+                    )
 
-                edge_data: dict[str, str] = {
-                    "src_id": src_id,
-                    "tgt_id": tgt_id,
-                    "description": description,
-                    "keywords": keywords,
-                    "source_id": source_id,
-                    "weight": weight,
-                    "file_path": file_path,
-                    "created_at": int(time.time()),
-                }
-                all_relationships_data.append(edge_data)
-                update_storage = True
-
-            # Insert entities into vector storage with consistent format
-            data_for_vdb = {
-                compute_mdhash_id(dp["entity_name"], prefix="ent-"): {
-                    "content": dp["entity_name"] + "\n" + dp["description"],
-                    "entity_name": dp["entity_name"],
-                    "source_id": dp["source_id"],
-                    "description": dp["description"],
-                    "entity_type": dp["entity_type"],
-                    "file_path": dp.get("file_path", "custom_kg"),
-                }
-                for dp in all_entities_data
+        # Insert entities and relationships into vector storage with consistent format
+        entities_for_vdb = {
+            compute_mdhash_id(entity_name, prefix="ent-"): {
+                "content": entity_name + "\n" + dp["description"],
+                "entity_name": entity_name,
+                "source_id": dp["source_id"],
+                "description": dp["description"],
+                "entity_type": dp["entity_type"],
+                "file_path": dp["file_path"],
             }
-            await self.entities_vdb.upsert(data_for_vdb)
-
-            # Insert relationships into vector storage with consistent format
-            data_for_vdb = {
-                compute_mdhash_id(dp["src_id"] + dp["tgt_id"], prefix="rel-"): {
-                    "src_id": dp["src_id"],
-                    "tgt_id": dp["tgt_id"],
-                    "source_id": dp["source_id"],
-                    "content": f"{dp['keywords']}\t{dp['src_id']}\n{dp['tgt_id']}\n{dp['description']}",
-                    "keywords": dp["keywords"],
-                    "description": dp["description"],
-                    "weight": dp["weight"],
-                    "file_path": dp.get("file_path", "custom_kg"),
-                }
-                for dp in all_relationships_data
+            for entity_name, dp in entities.items()
+        }
+        relationships_for_vdb = {
+            compute_mdhash_id(src_id + tgt_id, prefix="rel-"): {
+                "src_id": src_id,
+                "tgt_id": tgt_id,
+                "source_id": dp["source_id"],
+                "content": f"{dp['keywords']}\t{src_id}\n{tgt_id}\n{dp['description']}",
+                "keywords": dp["keywords"],
+                "description": dp["description"],
+                "weight": dp["weight"],
+                "file_path": dp["file_path"],
             }
-            await self.relationships_vdb.upsert(data_for_vdb)
-
-        except Exception as e:
-            logger.error(f"Error in ainsert_custom_kg: {e}")
-            raise
-        finally:
-            if update_storage:
-                await self._insert_done()
+            for (src_id, tgt_id), dp in relationships.items()
+        }
+        await asyncio.gather(
+            self.entities_vdb.upsert(entities_for_vdb),
+            self.relationships_vdb.upsert(relationships_for_vdb),
+        )
 
     def query(
         self,
@@ -1613,6 +2292,34 @@ class LightRAG:
         """
         return await self.doc_status.get_docs_by_status(status)
 
+    async def get_docs_paginated(
+        self,
+        status: DocStatus | None = None,
+        page: int = 1,
+        page_size: int = 50,
+        sort_field: Literal[
+            "created_at", "updated_at", "id", "file_path"
+        ] = "updated_at",
+        sort_direction: Literal["asc", "desc"] = "desc",
+        file_path_filter: str | None = None,
+        include_content: bool = False,
+    ) -> tuple[list[tuple[str, DocProcessingStatus]], int]:
+        """Get one page of documents with storage-side filtering and sorting
+
+        Returns:
+            Tuple of (list of (doc_id, DocProcessingStatus) for the page, total
+            number of matching documents). Content is "" unless include_content.
+        """
+        return await self.doc_status.get_docs_paginated(
+            status=status,
+            page=page,
+            page_size=page_size,
+            sort_field=sort_field,
+            sort_direction=sort_direction,
+            file_path_filter=file_path_filter,
+            include_content=include_content,
+        )
+
     async def aget_docs_by_ids(
         self, ids: str | list[str]
     ) -> dict[str, DocProcessingStatus]:
@@ -1698,15 +2405,9 @@ class LightRAG:
         deletion_operations_started = False
         original_exception = None
 
-        # Get pipeline status shared data and lock for status updates
-        pipeline_status = await get_namespace_data("pipeline_status")
-        pipeline_status_lock = get_pipeline_status_lock()
-
-        async with pipeline_status_lock:
-            log_message = f"Starting deletion process for document {doc_id}"
-            logger.info(log_message)
-            pipeline_status["latest_message"] = log_message
-            pipeline_status["history_messages"].append(log_message)
+        log_message = f"Starting deletion process for document {doc_id}"
+        logger.info(log_message)
+        add_pipeline_event(log_message, stage="delete", doc_id=doc_id)
 
         try:
             # 1. Get the document status and related data
@@ -1733,11 +2434,9 @@ class LightRAG:
                 }
 
                 # Update pipeline status after getting chunks count
-                async with pipeline_status_lock:
-                    log_message = f"Retrieved {len(related_chunks)} of {len(all_chunks)} related chunks"
-                    logger.info(log_message)
-                    pipeline_status["latest_message"] = log_message
-                    pipeline_status["history_messages"].append(log_message)
+                log_message = f"Retrieved {len(related_chunks)} of {len(all_chunks)} related chunks"
+                logger.info(log_message)
+                add_pipeline_event(log_message, stage="delete", doc_id=doc_id)
 
             except Exception as e:
                 logger.error(f"Failed to retrieve chunks for document {doc_id}: {e}")
@@ -1758,13 +2457,9 @@ class LightRAG:
                     )
                     raise Exception(f"Failed to delete document entry: {e}") from e
 
-                async with pipeline_status_lock:
-                    log_message = (
-                        f"Document {doc_id} is deleted without associated chunks."
-                    )
-                    logger.info(log_message)
-                    pipeline_status["latest_message"] = log_message
-                    pipeline_status["history_messages"].append(log_message)
+                log_message = f"Document {doc_id} is deleted without associated chunks."
+                logger.info(log_message)
+                add_pipeline_event(log_message, stage="delete", doc_id=doc_id)
 
                 return DeletionResult(
                     status="success",
@@ -1799,11 +2494,9 @@ class LightRAG:
                     )
 
                     # Update pipeline status after getting affected_nodes
-                    async with pipeline_status_lock:
-                        log_message = f"Found {len(affected_nodes)} affected entities"
-                        logger.info(log_message)
-                        pipeline_status["latest_message"] = log_message
-                        pipeline_status["history_messages"].append(log_message)
+                    log_message = f"Found {len(affected_nodes)} affected entities"
+                    logger.info(log_message)
+                    add_pipeline_event(log_message, stage="delete", doc_id=doc_id)
 
                     affected_edges = (
                         await self.chunk_entity_relation_graph.get_edges_by_chunk_ids(
@@ -1812,11 +2505,9 @@ class LightRAG:
                     )
 
                     # Update pipeline status after getting affected_edges
-                    async with pipeline_status_lock:
-                        log_message = f"Found {len(affected_edges)} affected relations"
-                        logger.info(log_message)
-                        pipeline_status["latest_message"] = log_message
-                        pipeline_status["history_messages"].append(log_message)
+                    log_message = f"Found {len(affected_edges)} affected relations"
+                    logger.info(log_message)
+                    add_pipeline_event(log_message, stage="delete", doc_id=doc_id)
 
                 except Exception as e:
                     logger.error(f"Failed to analyze affected graph elements: {e}")
@@ -1865,12 +2556,15 @@ class LightRAG:
                     try:
                         await self.chunks_vdb.delete(chunk_ids)
                         await self.text_chunks.delete(chunk_ids)
+                        # Chunks are only counted once their document is processed
+                        if doc_status_data.get("status") == DocStatus.PROCESSED:
+                            self._graph_stats_chunk_delta -= len(chunk_ids)
 
-                        async with pipeline_status_lock:
-                            log_message = f"Successfully deleted {len(chunk_ids)} chunks from storage"
-                            logger.info(log_message)
-                            pipeline_status["latest_message"] = log_message
-                            pipeline_status["history_messages"].append(log_message)
+                        log_message = (
+                            f"Successfully deleted {len(chunk_ids)} chunks from storage"
+                        )
+                        logger.info(log_message)
+                        add_pipeline_event(log_message, stage="delete", doc_id=doc_id)
 
                     except Exception as e:
                         logger.error(f"Failed to delete chunks: {e}")
@@ -1891,11 +2585,11 @@ class LightRAG:
                             list(entities_to_delete)
                         )
 
-                        async with pipeline_status_lock:
-                            log_message = f"Successfully deleted {len(entities_to_delete)} entities"
-                            logger.info(log_message)
-                            pipeline_status["latest_message"] = log_message
-                            pipeline_status["history_messages"].append(log_message)
+                        log_message = (
+                            f"Successfully deleted {len(entities_to_delete)} entities"
+                        )
+                        logger.info(log_message)
+                        add_pipeline_event(log_message, stage="delete", doc_id=doc_id)
 
                     except Exception as e:
                         logger.error(f"Failed to delete entities: {e}")
@@ -1920,11 +2614,9 @@ class LightRAG:
                             list(relationships_to_delete)
                         )
 
-                        async with pipeline_status_lock:
-                            log_message = f"Successfully deleted {len(relationships_to_delete)} relations"
-                            logger.info(log_message)
-                            pipeline_status["latest_message"] = log_message
-                            pipeline_status["history_messages"].append(log_message)
+                        log_message = f"Successfully deleted {len(relationships_to_delete)} relations"
+                        logger.info(log_message)
+                        add_pipeline_event(log_message, stage="delete", doc_id=doc_id)
 
                     except Exception as e:
                         logger.error(f"Failed to delete relationships: {e}")
@@ -1944,11 +2636,9 @@ class LightRAG:
                             global_config=asdict(self),
                         )
 
-                        async with pipeline_status_lock:
-                            log_message = f"Successfully rebuilt {len(entities_to_rebuild)} entities and {len(relationships_to_rebuild)} relations"
-                            logger.info(log_message)
-                            pipeline_status["latest_message"] = log_message
-                            pipeline_status["history_messages"].append(log_message)
+                        log_message = f"Successfully rebuilt {len(entities_to_rebuild)} entities and {len(relationships_to_rebuild)} relations"
+                        logger.info(log_message)
+                        add_pipeline_event(log_message, stage="delete", doc_id=doc_id)
 
                     except Exception as e:
                         logger.error(f"Failed to rebuild knowledge from chunks: {e}")
@@ -1960,6 +2650,7 @@ class LightRAG:
             try:
                 await self.full_docs.delete([doc_id])
                 await self.doc_status.delete([doc_id])
+                await self._drop_extraction_checkpoints(doc_id)
             except Exception as e:
                 logger.error(f"Failed to delete document and status: {e}")
                 raise Exception(f"Failed to delete document and status: {e}") from e
@@ -2302,19 +2993,20 @@ class LightRAG:
     async def aexport_data(
         self,
         output_path: str,
-        file_format: Literal["csv", "excel", "md", "txt"] = "csv",
+        file_format: Literal["csv", "excel", "md", "txt", "ndjson", "parquet"] = "csv",
         include_vector_data: bool = False,
     ) -> None:
         """
         Asynchronously exports all entities, relations, and relationships to various formats.
         Args:
             output_path: The path to the output file (including extension).
-            file_format: Output format - "csv", "excel", "md", "txt".
+            file_format: Output format - "csv", "excel", "md", "txt", "ndjson", "parquet".
                 - csv: Comma-separated values file
                 - excel: Microsoft Excel file with multiple sheets
                 - md: Markdown tables
                 - txt: Plain text formatted output
-                - table: Print formatted tables to console
+                - ndjson: One JSON object per line with a "type" field
+                - parquet: Single Parquet table with a "type" column
             include_vector_data: Whether to include data from the vector database.
         """
         from .utils import aexport_data as utils_aexport_data
@@ -2331,19 +3023,20 @@ class LightRAG:
     def export_data(
         self,
         output_path: str,
-        file_format: Literal["csv", "excel", "md", "txt"] = "csv",
+        file_format: Literal["csv", "excel", "md", "txt", "ndjson", "parquet"] = "csv",
         include_vector_data: bool = False,
     ) -> None:
         """
         Synchronously exports all entities, relations, and relationships to various formats.
         Args:
             output_path: The path to the output file (including extension).
-            file_format: Output format - "csv", "excel", "md", "txt".
+            file_format: Output format - "csv", "excel", "md", "txt", "ndjson", "parquet".
                 - csv: Comma-separated values file
                 - excel: Microsoft Excel file with multiple sheets
                 - md: Markdown tables
                 - txt: Plain text formatted output
-                - table: Print formatted tables to console
+                - ndjson: One JSON object per line with a "type" field
+                - parquet: Single Parquet table with a "type" column
             include_vector_data: Whether to include data from the vector database.
         """
         try:
@@ -32,6 +32,8 @@ class GraphMetadata:
     entity_count: int = 0
     relation_count: int = 0
     document_count: int = 0
+    chunk_count: int = 0
+    bytes_on_disk: int = 0
     metadata: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
@@ -48,6 +50,8 @@ class GraphMetadata:
             "entity_count": self.entity_count,
             "relation_count": self.relation_count,
             "document_count": self.document_count,
+            "chunk_count": self.chunk_count,
+            "bytes_on_disk": self.bytes_on_disk,
             "metadata": self.metadata
         }
 
@@ -66,6 +70,8 @@ class GraphMetadata:
             entity_count=data.get("entity_count", 0),
             relation_count=data.get("relation_count", 0),
             document_count=data.get("document_count", 0),
+            chunk_count=data.get("chunk_count", 0),
+            bytes_on_disk=data.get("bytes_on_disk", 0),
             metadata=data.get("metadata", {})
         )
 
@@ -191,6 +197,8 @@ class GraphMetadataResponse(BaseModel):
     entity_count: int = Field(0, description="实体数量")
     relation_count: int = Field(0, description="关系数量")
     document_count: int = Field(0, description="文档数量")
+    chunk_count: int = Field(0, description="分块数量")
+    bytes_on_disk: int = Field(0, description="磁盘占用（字节）")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="额外元数据")
 
     class Config:
@@ -207,6 +215,8 @@ class GraphMetadataResponse(BaseModel):
                 "entity_count": 1250,
                 "relation_count": 3400,
                 "document_count": 45,
+                "chunk_count": 620,
+                "bytes_on_disk": 52428800,
                 "metadata": {}
             }
         }
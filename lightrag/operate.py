@@ -5,8 +5,9 @@ import asyncio
 import json
 import re
 import os
-from typing import Any, AsyncIterator
+from typing import Any, AsyncIterator, Awaitable, Callable
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from .utils import (
     logger,
@@ -24,7 +25,10 @@ from .utils import (
     save_to_cache,
     CacheData,
     get_conversation_turns,
+    QueryContextCache,
     use_llm_func_with_cache,
+    ChunkTaskScheduler,
+    exists_func,
 )
 from .base import (
     BaseGraphStorage,
@@ -35,6 +39,7 @@ from .base import (
 )
 from .prompt import PROMPTS
 from .constants import GRAPH_FIELD_SEP
+from .kg.shared_storage import add_pipeline_event, get_graph_version
 import time
 from dotenv import load_dotenv
 
@@ -44,6 +49,164 @@ from dotenv import load_dotenv
 load_dotenv(dotenv_path=".env", override=False)
 
 
+# Worker threads used to encode document segments in parallel while chunking
+CHUNKING_ENCODE_THREADS = int(
+    os.getenv("CHUNKING_ENCODE_THREADS", min(8, os.cpu_count() or 1))
+)
+# Approximate number of characters per segment encoded by one worker
+CHUNKING_ENCODE_SEGMENT_SIZE = 100_000
+# A line break followed by visible text, where BPE pre-tokenizers always split
+_ENCODE_SEGMENT_BOUNDARY = re.compile(r"\n(?=\S)")
+# Retrieval contexts kept per process for repeated queries (0 disables the cache)
+QUERY_CONTEXT_CACHE_SIZE = int(os.getenv("QUERY_CONTEXT_CACHE_SIZE", 256))
+_query_context_cache = QueryContextCache(QUERY_CONTEXT_CACHE_SIZE)
+_CONTEXT_MISS = object()
+
+
+class _UncachedQueryContext(Exception):
+    """Raised by a context builder to return a degraded `context` without caching it"""
+
+    def __init__(self, context: Any):
+        super().__init__("query context built from partial results")
+        self.context = context
+
+
+def _split_text_for_encoding(content: str, segment_size: int) -> list[str]:
+    """Split text after line breaks into segments of roughly `segment_size` characters
+
+    Concatenating the segments restores `content`. Segments are only cut after a line
+    break followed by visible text, so tokenization at the seams matches encoding
+    the whole text with tiktoken encodings.
+    """
+    segments = []
+    start = 0
+    while len(content) - start > segment_size:
+        cut = _ENCODE_SEGMENT_BOUNDARY.search(content, start + segment_size)
+        if cut is None:
+            break
+        segments.append(content[start : cut.end()])
+        start = cut.end()
+    segments.append(content[start:])
+    return segments
+
+
+def _encode_pieces(tokenizer: Tokenizer, pieces: list[str]) -> list[list[int]]:
+    """Encode the pieces of a split document, grouped into segments per worker
+
+    Batch encoding costs a pool task per item, which outweighs the encoding of
+    short pieces such as lines. Each task therefore encodes consecutive pieces
+    totalling about `CHUNKING_ENCODE_SEGMENT_SIZE` characters, and a document
+    that fits in one segment is encoded without a pool.
+    """
+    groups: list[list[str]] = [[]]
+    group_size = 0
+    for piece in pieces:
+        if group_size >= CHUNKING_ENCODE_SEGMENT_SIZE:
+            groups.append([])
+            group_size = 0
+        groups[-1].append(piece)
+        group_size += len(piece)
+
+    def encode_group(group: list[str]) -> list[list[int]]:
+        return [tokenizer.encode(piece) for piece in group]
+
+    if len(groups) == 1 or CHUNKING_ENCODE_THREADS <= 1:
+        return encode_group(pieces)
+    with ThreadPoolExecutor(min(CHUNKING_ENCODE_THREADS, len(groups))) as executor:
+        return [
+            tokens for group in executor.map(encode_group, groups) for tokens in group
+        ]
+
+
+def _token_char_offsets(
+    tokenizer: Tokenizer,
+    content: str,
+    tokens: list[int],
+    positions: set[int],
+) -> dict[int, int] | None:
+    """Map token positions of encoded `content` to character offsets in it
+
+    Uses the bytes of the tokens (tiktoken's `decode_bytes`), so every token is
+    converted once. A position inside a multi-byte character is aligned to the
+    start of that character.
+
+    Returns:
+        Dict from token position to character offset, or None when the
+        tokenizer does not expose token bytes or the tokens do not map back onto
+        the exact UTF-8 bytes of `content`
+    """
+    decode_bytes = getattr(tokenizer.tokenizer, "decode_bytes", None)
+    if decode_bytes is None:
+        return None
+
+    data = content.encode("utf-8")
+    byte_offsets = {}
+    prev_pos, byte_pos = 0, 0
+    for pos in sorted(positions):
+        byte_pos += len(decode_bytes(tokens[prev_pos:pos]))
+        byte_offsets[pos] = byte_pos
+        prev_pos = pos
+    if byte_pos + len(decode_bytes(tokens[prev_pos:])) != len(data):
+        return None
+
+    char_offsets = {}
+    prev_byte, char_pos = 0, 0
+    for pos, boundary in byte_offsets.items():
+        while boundary < len(data) and (data[boundary] & 0xC0) == 0x80:
+            boundary -= 1
+        char_pos += len(data[prev_byte:boundary].decode("utf-8"))
+        char_offsets[pos] = char_pos
+        prev_byte = boundary
+    return char_offsets
+
+
+def _split_tokens_into_windows(
+    tokenizer: Tokenizer,
+    content: str,
+    tokens: list[int],
+    overlap_token_size: int,
+    max_token_size: int,
+) -> list[tuple[int, str]]:
+    """Split encoded content into overlapping token windows
+
+    When the tokenizer exposes the bytes of its tokens (tiktoken's `decode_bytes`),
+    the text of each window is sliced from `content` using the character offsets of
+    the window boundaries, so every token is converted once instead of decoding each
+    window separately. Other tokenizers fall back to decoding every window.
+
+    Returns:
+        List of (token_count, window_text) tuples
+    """
+    step = max_token_size - overlap_token_size
+    starts = range(0, len(tokens), step)
+    char_offsets = _token_char_offsets(
+        tokenizer,
+        content,
+        tokens,
+        {p for s in starts for p in (s, min(s + max_token_size, len(tokens)))},
+    )
+    if char_offsets is not None:
+        return [
+            (
+                min(max_token_size, len(tokens) - start),
+                content[
+                    char_offsets[start] : char_offsets[
+                        min(start + max_token_size, len(tokens))
+                    ]
+                ],
+            )
+            for start in starts
+        ]
+
+    return [
+        (
+            min(max_token_size, len(tokens) - start),
+            tokenizer.decode(tokens[start : start + max_token_size]),
+        )
+        for start in starts
+    ]
+
+
 def chunking_by_token_size(
     tokenizer: Tokenizer,
     content: str,
@@ -52,51 +215,127 @@ def chunking_by_token_size(
     overlap_token_size: int = 128,
     max_token_size: int = 1024,
 ) -> list[dict[str, Any]]:
-    tokens = tokenizer.encode(content)
     results: list[dict[str, Any]] = []
     if split_by_character:
         raw_chunks = content.split(split_by_character)
+        raw_tokens = _encode_pieces(tokenizer, raw_chunks)
         new_chunks = []
-        if split_by_character_only:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
+        for chunk, _tokens in zip(raw_chunks, raw_tokens):
+            if split_by_character_only or len(_tokens) <= max_token_size:
                 new_chunks.append((len(_tokens), chunk))
-        else:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                if len(_tokens) > max_token_size:
-                    for start in range(
-                        0, len(_tokens), max_token_size - overlap_token_size
-                    ):
-                        chunk_content = tokenizer.decode(
-                            _tokens[start : start + max_token_size]
-                        )
-                        new_chunks.append(
-                            (min(max_token_size, len(_tokens) - start), chunk_content)
-                        )
-                else:
-                    new_chunks.append((len(_tokens), chunk))
-        for index, (_len, chunk) in enumerate(new_chunks):
-            results.append(
-                {
-                    "tokens": _len,
-                    "content": chunk.strip(),
-                    "chunk_order_index": index,
-                }
-            )
+            else:
+                new_chunks.extend(
+                    _split_tokens_into_windows(
+                        tokenizer, chunk, _tokens, overlap_token_size, max_token_size
+                    )
+                )
     else:
-        for index, start in enumerate(
-            range(0, len(tokens), max_token_size - overlap_token_size)
-        ):
-            chunk_content = tokenizer.decode(tokens[start : start + max_token_size])
-            results.append(
+        segments = _split_text_for_encoding(content, CHUNKING_ENCODE_SEGMENT_SIZE)
+        tokens = [
+            token
+            for segment_tokens in tokenizer.encode_batch(
+                segments, num_threads=CHUNKING_ENCODE_THREADS
+            )
+            for token in segment_tokens
+        ]
+        new_chunks = _split_tokens_into_windows(
+            tokenizer, content, tokens, overlap_token_size, max_token_size
+        )
+    for index, (_len, chunk) in enumerate(new_chunks):
+        results.append(
+            {
+                "tokens": _len,
+                "content": chunk.strip(),
+                "chunk_order_index": index,
+            }
+        )
+    return results
+
+
+async def chunking_by_token_size_stream(
+    tokenizer: Tokenizer,
+    blocks: AsyncIterator[str],
+    overlap_token_size: int = 128,
+    max_token_size: int = 1024,
+    holdback_token_size: int = 64,
+) -> AsyncIterator[dict[str, Any]]:
+    """Incrementally split a stream of text blocks into token windows
+
+    Produces the same windows as `chunking_by_token_size` without holding the
+    whole document in memory. Only the text that has not been fully emitted yet
+    (at most one window plus `holdback_token_size` tokens) is carried over to the
+    next block, so overlaps span read boundaries. The trailing tokens of every
+    block are held back because their tokenization may change once the rest of
+    the word arrives with the next block.
+
+    Args:
+        tokenizer: Tokenizer used for encoding and decoding
+        blocks: Async iterator yielding consecutive pieces of the document
+        overlap_token_size: Number of overlapping tokens between windows
+        max_token_size: Maximum number of tokens per window
+        holdback_token_size: Tokens kept back at the end of each block
+
+    Yields:
+        Chunk dicts with `tokens`, `content`, `chunk_order_index` and the
+        character offsets `char_start`/`char_end` of the window in the stream
+    """
+    step = max_token_size - overlap_token_size
+    carry = ""
+    carry_offset = 0
+    index = 0
+
+    def _windows(text: str, tokens: list[int], starts: list[int], offset: int):
+        """Windows at `starts` plus the character offset of the first unused token"""
+        next_start = starts[-1] + step if starts else 0
+        ends = [min(start + max_token_size, len(tokens)) for start in starts]
+        char_offsets = _token_char_offsets(
+            tokenizer, text, tokens, {*starts, *ends, min(next_start, len(tokens))}
+        )
+        windows = []
+        for start, end in zip(starts, ends):
+            if char_offsets is not None:
+                window_content = text[char_offsets[start] : char_offsets[end]]
+                char_start = offset + char_offsets[start]
+            else:
+                window_content = tokenizer.decode(tokens[start:end])
+                char_start = offset + len(tokenizer.decode(tokens[:start]))
+            windows.append(
                 {
-                    "tokens": min(max_token_size, len(tokens) - start),
-                    "content": chunk_content.strip(),
-                    "chunk_order_index": index,
+                    "tokens": end - start,
+                    "content": window_content.strip(),
+                    "char_start": char_start,
+                    "char_end": char_start + len(window_content),
                 }
             )
-    return results
+        if char_offsets is not None:
+            used = char_offsets[min(next_start, len(tokens))]
+        else:
+            used = len(tokenizer.decode(tokens[:next_start]))
+        return windows, used
+
+    async for block in blocks:
+        if not block:
+            continue
+        text = carry + block
+        tokens = tokenizer.encode(text)
+        limit = len(tokens) - holdback_token_size
+        starts = list(range(0, max(limit - max_token_size + 1, 0), step))
+        windows, used = _windows(text, tokens, starts, carry_offset)
+        for window in windows:
+            yield {**window, "chunk_order_index": index}
+            index += 1
+        # Carry the exact unused text, so offsets stay aligned with the stream
+        carry = text[used:]
+        carry_offset += used
+
+    # Flush the remaining text exactly like the in-memory chunker does
+    tokens = tokenizer.encode(carry)
+    windows, _ = _windows(
+        carry, tokens, list(range(0, len(tokens), step)), carry_offset
+    )
+    for window in windows:
+        yield {**window, "chunk_order_index": index}
+        index += 1
 
 
 async def _handle_entity_relation_summary(
@@ -355,6 +594,19 @@ async def _get_cached_extraction_results(
     """
     cached_results = {}
 
+    if exists_func(llm_response_cache, "get_by_chunk_ids"):
+        # Storages with a chunk id index only read the requested entries
+        entries_by_chunk = await llm_response_cache.get_by_chunk_ids(
+            list(chunk_ids), cache_type="extract"
+        )
+        # Entries come oldest first, the most recent extraction of a chunk wins
+        for chunk_id, entries in entries_by_chunk.items():
+            cached_results[chunk_id] = entries[-1]["return"]
+        logger.debug(
+            f"Found {len(cached_results)} cached extraction results for {len(chunk_ids)} chunk IDs"
+        )
+        return cached_results
+
     # Get all cached data for "default" mode (entity extraction cache)
     default_cache = await llm_response_cache.get_by_id("default") or {}
 
@@ -753,10 +1005,10 @@ async def _merge_nodes_then_upsert(
         if num_fragment >= force_llm_summary_on_merge:
             status_message = f"LLM merge N: {entity_name} | {num_new_fragment}+{num_fragment-num_new_fragment}"
             logger.info(status_message)
-            if pipeline_status is not None and pipeline_status_lock is not None:
-                async with pipeline_status_lock:
-                    pipeline_status["latest_message"] = status_message
-                    pipeline_status["history_messages"].append(status_message)
+            if pipeline_status is not None:
+                add_pipeline_event(
+                    status_message, stage="merge", entity_name=entity_name
+                )
             description = await _handle_entity_relation_summary(
                 entity_name,
                 description,
@@ -768,10 +1020,10 @@ async def _merge_nodes_then_upsert(
         else:
             status_message = f"Merge N: {entity_name} | {num_new_fragment}+{num_fragment-num_new_fragment}"
             logger.info(status_message)
-            if pipeline_status is not None and pipeline_status_lock is not None:
-                async with pipeline_status_lock:
-                    pipeline_status["latest_message"] = status_message
-                    pipeline_status["history_messages"].append(status_message)
+            if pipeline_status is not None:
+                add_pipeline_event(
+                    status_message, stage="merge", entity_name=entity_name
+                )
 
     node_data = dict(
         entity_id=entity_name,
@@ -917,10 +1169,10 @@ async def _merge_edges_then_upsert(
         if num_fragment >= force_llm_summary_on_merge:
             status_message = f"LLM merge E: {src_id} - {tgt_id} | {num_new_fragment}+{num_fragment-num_new_fragment}"
             logger.info(status_message)
-            if pipeline_status is not None and pipeline_status_lock is not None:
-                async with pipeline_status_lock:
-                    pipeline_status["latest_message"] = status_message
-                    pipeline_status["history_messages"].append(status_message)
+            if pipeline_status is not None:
+                add_pipeline_event(
+                    status_message, stage="merge", src_id=src_id, tgt_id=tgt_id
+                )
             description = await _handle_entity_relation_summary(
                 f"({src_id}, {tgt_id})",
                 description,
@@ -932,10 +1184,10 @@ async def _merge_edges_then_upsert(
         else:
             status_message = f"Merge E: {src_id} - {tgt_id} | {num_new_fragment}+{num_fragment-num_new_fragment}"
             logger.info(status_message)
-            if pipeline_status is not None and pipeline_status_lock is not None:
-                async with pipeline_status_lock:
-                    pipeline_status["latest_message"] = status_message
-                    pipeline_status["history_messages"].append(status_message)
+            if pipeline_status is not None:
+                add_pipeline_event(
+                    status_message, stage="merge", src_id=src_id, tgt_id=tgt_id
+                )
 
     await knowledge_graph_inst.upsert_edge(
         src_id,
@@ -1013,13 +1265,10 @@ async def merge_nodes_and_edges(
     # Use graph database lock to ensure atomic merges and updates
     graph_db_lock = get_graph_db_lock(enable_logging=False)
     async with graph_db_lock:
-        async with pipeline_status_lock:
-            log_message = (
-                f"Merging stage {current_file_number}/{total_files}: {file_path}"
-            )
-            logger.info(log_message)
-            pipeline_status["latest_message"] = log_message
-            pipeline_status["history_messages"].append(log_message)
+        log_message = f"Merging stage {current_file_number}/{total_files}: {file_path}"
+        logger.info(log_message)
+        if pipeline_status is not None:
+            add_pipeline_event(log_message, stage="merge", file_path=file_path)
 
         # Process and update all entities at once
         for entity_name, entities in all_nodes.items():
@@ -1056,9 +1305,7 @@ async def merge_nodes_and_edges(
         log_message = f"Updating {total_entities_count} entities  {current_file_number}/{total_files}: {file_path}"
         logger.info(log_message)
         if pipeline_status is not None:
-            async with pipeline_status_lock:
-                pipeline_status["latest_message"] = log_message
-                pipeline_status["history_messages"].append(log_message)
+            add_pipeline_event(log_message, stage="merge", file_path=file_path)
 
         # Update vector databases with all collected data
         if entity_vdb is not None and entities_data:
@@ -1077,9 +1324,7 @@ async def merge_nodes_and_edges(
         log_message = f"Updating {total_relations_count} relations {current_file_number}/{total_files}: {file_path}"
         logger.info(log_message)
         if pipeline_status is not None:
-            async with pipeline_status_lock:
-                pipeline_status["latest_message"] = log_message
-                pipeline_status["history_messages"].append(log_message)
+            add_pipeline_event(log_message, stage="merge", file_path=file_path)
 
         if relationships_vdb is not None and relationships_data:
             data_for_vdb = {
@@ -1102,6 +1347,8 @@ async def extract_entities(
     pipeline_status: dict = None,
     pipeline_status_lock=None,
     llm_response_cache: BaseKVStorage | None = None,
+    chunk_scheduler: ChunkTaskScheduler | None = None,
+    chunk_done_callback: Callable[[str, dict, dict], Awaitable[None]] | None = None,
 ) -> list:
     use_llm_func: callable = global_config["llm_model_func"]
     entity_extract_max_gleaning = global_config["entity_extract_max_gleaning"]
@@ -1277,20 +1524,28 @@ async def extract_entities(
         log_message = f"Chunk {processed_chunks} of {total_chunks} extracted {entities_count} Ent + {relations_count} Rel"
         logger.info(log_message)
         if pipeline_status is not None:
-            async with pipeline_status_lock:
-                pipeline_status["latest_message"] = log_message
-                pipeline_status["history_messages"].append(log_message)
+            add_pipeline_event(log_message, stage="extract", chunk_id=chunk_key)
+
+        if chunk_done_callback is not None:
+            await chunk_done_callback(chunk_key, maybe_nodes, maybe_edges)
 
         # Return the extracted nodes and edges for centralized processing
         return maybe_nodes, maybe_edges
 
-    # Get max async tasks limit from global_config
-    llm_model_max_async = global_config.get("llm_model_max_async", 4)
-    semaphore = asyncio.Semaphore(llm_model_max_async)
+    if chunk_scheduler is not None:
+        # Share the LLM slots with the chunks of other documents in the pipeline
+        async def _process_with_semaphore(chunk):
+            return await chunk_scheduler.run(
+                chunk[1].get("full_doc_id", ""), _process_single_content, chunk
+            )
+    else:
+        # Get max async tasks limit from global_config
+        llm_model_max_async = global_config.get("llm_model_max_async", 4)
+        semaphore = asyncio.Semaphore(llm_model_max_async)
 
-    async def _process_with_semaphore(chunk):
-        async with semaphore:
-            return await _process_single_content(chunk)
+        async def _process_with_semaphore(chunk):
+            async with semaphore:
+                return await _process_single_content(chunk)
 
     tasks = []
     for c in ordered_chunks:
@@ -1378,15 +1633,20 @@ async def kg_query(
     hl_keywords_str = ", ".join(hl_keywords) if hl_keywords else ""
 
     # Build context
-    context = await _build_query_context(
-        ll_keywords_str,
-        hl_keywords_str,
-        knowledge_graph_inst,
-        entities_vdb,
-        relationships_vdb,
-        text_chunks_db,
+    context = await _get_query_context(
+        global_config,
         query_param,
-        chunks_vdb,
+        _kg_context_key(ll_keywords_str, hl_keywords_str, query_param),
+        lambda: _build_query_context(
+            ll_keywords_str,
+            hl_keywords_str,
+            knowledge_graph_inst,
+            entities_vdb,
+            relationships_vdb,
+            text_chunks_db,
+            query_param,
+            chunks_vdb,
+        ),
     )
 
     if query_param.only_need_context:
@@ -1598,6 +1858,7 @@ async def _get_vector_context(
     chunks_vdb: BaseVectorStorage,
     query_param: QueryParam,
     tokenizer: Tokenizer,
+    raise_errors: bool = False,
 ) -> tuple[list, list, list] | None:
     """
     Retrieve vector context from the vector database.
@@ -1610,6 +1871,8 @@ async def _get_vector_context(
         chunks_vdb: Vector database containing document chunks
         query_param: Query parameters including top_k and ids
         tokenizer: Tokenizer for counting tokens
+        raise_errors: Raise search errors instead of returning an empty context,
+            so a cached caller does not keep the failure
 
     Returns:
         Tuple (empty_entities, empty_relations, text_units) for combine_contexts,
@@ -1671,9 +1934,69 @@ async def _get_vector_context(
         return entities_context, relations_context, text_units_context
     except Exception as e:
         logger.error(f"Error in _get_vector_context: {e}")
+        if raise_errors:
+            raise
         return [], [], []
 
 
+async def _get_query_context(
+    global_config: dict[str, str],
+    query_param: QueryParam,
+    key: tuple,
+    build: Callable[[], Awaitable[Any]],
+) -> Any:
+    """Return the retrieval context identified by `key`, calling `build` on a miss
+
+    The cache key adds the retrieval parameters of `query_param` and the graph
+    version, so requests differing only in how the answer is generated (response
+    type, user prompt, history, streaming, only_need_context) share one context
+    until the graph is written. Empty contexts and contexts built from partial
+    results are returned without being cached, so a transient retrieval error
+    is retried by the next query.
+    """
+    if _query_context_cache.max_size <= 0:
+        try:
+            return await build()
+        except _UncachedQueryContext as e:
+            return e.context
+
+    working_dir = global_config["working_dir"]
+    version = await get_graph_version(working_dir)
+    cache_key = (
+        working_dir,
+        version,
+        query_param.mode,
+        *key,
+        query_param.top_k,
+        query_param.max_token_for_text_unit,
+        query_param.max_token_for_global_context,
+        query_param.max_token_for_local_context,
+        None if query_param.ids is None else tuple(sorted(query_param.ids)),
+    )
+    context = _query_context_cache.get(cache_key, _CONTEXT_MISS)
+    if context is not _CONTEXT_MISS:
+        logger.debug(f"Query context cache hit (mode:{query_param.mode})")
+        return context
+
+    try:
+        context = await build()
+    except _UncachedQueryContext as e:
+        return e.context
+    # A context built while the graph was written may mix both states
+    if context and await get_graph_version(working_dir) == version:
+        _query_context_cache.put(cache_key, context)
+    return context
+
+
+def _kg_context_key(
+    ll_keywords: str, hl_keywords: str, query_param: QueryParam
+) -> tuple:
+    # Mix mode also runs a vector search on the original query
+    if query_param.mode == "mix":
+        return ll_keywords, hl_keywords, getattr(query_param, "original_query", None)
+    return ll_keywords, hl_keywords
+
+
 async def _build_query_context(
     ll_keywords: str,
     hl_keywords: str,
@@ -1685,6 +2008,7 @@ async def _build_query_context(
     chunks_vdb: BaseVectorStorage = None,  # Add chunks_vdb parameter for mix mode
 ):
     logger.info(f"Process {os.getpid()} building query context...")
+    vector_failed = False
 
     # Handle local and global modes as before
     if query_param.mode == "local":
@@ -1744,12 +2068,18 @@ async def _build_query_context(
             tokenizer = text_chunks_db.global_config.get("tokenizer")
 
             # Get vector context in triple format
-            vector_data = await _get_vector_context(
-                query_param.original_query,  # We need to pass the original query
-                chunks_vdb,
-                query_param,
-                tokenizer,
-            )
+            try:
+                vector_data = await _get_vector_context(
+                    query_param.original_query,  # We need to pass the original query
+                    chunks_vdb,
+                    query_param,
+                    tokenizer,
+                    raise_errors=True,
+                )
+            except Exception:
+                # Answer from the graph alone, but do not cache that context
+                vector_data = None
+                vector_failed = True
 
             # If vector_data is not None, unpack it
             if vector_data is not None:
@@ -1797,6 +2127,8 @@ async def _build_query_context(
 ```
 
 """
+    if vector_failed:
+        raise _UncachedQueryContext(result)
     return result
 
 
@@ -2378,9 +2710,19 @@ async def naive_query(
 
     tokenizer: Tokenizer = global_config["tokenizer"]
 
-    _, _, text_units_context = await _get_vector_context(
-        query, chunks_vdb, query_param, tokenizer
-    )
+    async def build_text_units_context():
+        _, _, text_units = await _get_vector_context(
+            query, chunks_vdb, query_param, tokenizer, raise_errors=True
+        )
+        return text_units
+
+    try:
+        text_units_context = await _get_query_context(
+            global_config, query_param, (query,), build_text_units_context
+        )
+    except Exception:
+        # Already logged by _get_vector_context
+        return PROMPTS["fail_response"]
 
     if text_units_context is None or len(text_units_context) == 0:
         return PROMPTS["fail_response"]
@@ -2508,15 +2850,20 @@ async def kg_query_with_keywords(
     ll_keywords_str = ", ".join(ll_keywords) if ll_keywords else ""
     hl_keywords_str = ", ".join(hl_keywords) if hl_keywords else ""
 
-    context = await _build_query_context(
-        ll_keywords_str,
-        hl_keywords_str,
-        knowledge_graph_inst,
-        entities_vdb,
-        relationships_vdb,
-        text_chunks_db,
+    context = await _get_query_context(
+        global_config,
         query_param,
-        chunks_vdb=chunks_vdb,
+        _kg_context_key(ll_keywords_str, hl_keywords_str, query_param),
+        lambda: _build_query_context(
+            ll_keywords_str,
+            hl_keywords_str,
+            knowledge_graph_inst,
+            entities_vdb,
+            relationships_vdb,
+            text_chunks_db,
+            query_param,
+            chunks_vdb=chunks_vdb,
+        ),
     )
     if not context:
         return PROMPTS["fail_response"]
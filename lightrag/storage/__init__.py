@@ -7,9 +7,12 @@ from .multi_graph_storage import (
     get_storage_manager,
     initialize_multi_graph_storage
 )
+from .graph_registry import GraphRegistry, get_graph_registry
 
 __all__ = [
     "MultiGraphStorageManager",
     "get_storage_manager", 
-    "initialize_multi_graph_storage"
+    "initialize_multi_graph_storage",
+    "GraphRegistry",
+    "get_graph_registry"
 ]
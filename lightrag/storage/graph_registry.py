@@ -0,0 +1,147 @@
+"""
+图谱注册表
+统一管理 graphs_config.json 的读写：内存缓存、加锁更新、原子落盘
+"""
+
+import asyncio
+import copy
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from ..kg.shared_storage import (
+    get_graph_registry_lock,
+    get_update_flag,
+    is_share_data_initialized,
+    set_all_update_flags,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+GRAPHS_CONFIG_FILE = "graphs_config.json"
+
+
+class GraphRegistry:
+    """图谱注册表
+
+    读操作直接命中内存中的配置副本，不访问磁盘；写操作在注册表锁内完成
+    读取-修改-写回，并通过临时文件加 os.replace 原子替换配置文件。
+    多进程（gunicorn）模式下锁和更新标志来自 shared_storage，其他 worker
+    写入后本进程会在下次读取时重新加载。
+    """
+
+    def __init__(self, graphs_dir: str = "./graphs"):
+        self.graphs_dir = Path(graphs_dir)
+        self.config_file = self.graphs_dir / GRAPHS_CONFIG_FILE
+        self._config: Optional[Dict[str, Any]] = None
+        self._update_flag = None
+        # 未初始化共享数据时（如脚本直接使用）退化为进程内锁
+        self._local_lock = asyncio.Lock()
+
+    def _lock(self):
+        if is_share_data_initialized():
+            return get_graph_registry_lock()
+        return self._local_lock
+
+    async def _get_update_flag(self):
+        if self._update_flag is None and is_share_data_initialized():
+            self._update_flag = await get_update_flag(
+                f"graph_registry:{self.config_file.resolve()}"
+            )
+        return self._update_flag
+
+    def _read_file(self) -> Dict[str, Any]:
+        if not self.config_file.exists():
+            return {}
+        try:
+            with open(self.config_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"加载图谱配置失败: {e}")
+            return {}
+
+    def _write_file(self, config: Dict[str, Any]) -> None:
+        self.graphs_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.config_file.with_name(
+            f"{self.config_file.name}.{os.getpid()}.tmp"
+        )
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(config, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.config_file)
+
+    async def _ensure_loaded(self) -> Dict[str, Any]:
+        update_flag = await self._get_update_flag()
+        if self._config is None or (update_flag is not None and update_flag.value):
+            self._config = await asyncio.to_thread(self._read_file)
+            if update_flag is not None:
+                update_flag.value = False
+        return self._config
+
+    async def get_all(self) -> Dict[str, Any]:
+        """返回全部图谱配置的副本"""
+        return copy.deepcopy(await self._ensure_loaded())
+
+    async def get(self, graph_id: str) -> Optional[Dict[str, Any]]:
+        """返回单个图谱配置的副本，不存在时返回 None"""
+        info = (await self._ensure_loaded()).get(graph_id)
+        return copy.deepcopy(info) if info is not None else None
+
+    async def contains(self, graph_id: str) -> bool:
+        return graph_id in await self._ensure_loaded()
+
+    async def get_active_graph_id(self) -> Optional[str]:
+        """返回当前活跃图谱的ID"""
+        for graph_id, info in (await self._ensure_loaded()).items():
+            if info.get("is_active", False):
+                return graph_id
+        return None
+
+    async def update(self, mutator: Callable[[Dict[str, Any]], T]) -> T:
+        """在锁内对配置执行 mutator 并原子落盘，返回 mutator 的返回值
+
+        mutator 抛出异常时不写盘，内存中的配置保持不变。
+        """
+        async with self._lock():
+            # 写之前总是从磁盘重新加载，避免覆盖其他进程的修改
+            config = await asyncio.to_thread(self._read_file)
+            result = mutator(config)
+            try:
+                await asyncio.to_thread(self._write_file, config)
+            except Exception as e:
+                logger.error(f"保存图谱配置失败: {e}")
+                raise
+            self._config = config
+            if await self._get_update_flag() is not None:
+                await set_all_update_flags(
+                    f"graph_registry:{self.config_file.resolve()}"
+                )
+                self._update_flag.value = False
+        return result
+
+    async def replace(self, config: Dict[str, Any]) -> None:
+        """整体替换配置（仅用于兼容旧的 save_config 接口）"""
+
+        def _replace(current: Dict[str, Any]) -> None:
+            current.clear()
+            current.update(copy.deepcopy(config))
+
+        await self.update(_replace)
+
+
+_registries: Dict[Path, GraphRegistry] = {}
+
+
+def get_graph_registry(graphs_dir: str = "./graphs") -> GraphRegistry:
+    """获取指定图谱目录的注册表（每个进程每个目录一个实例）"""
+    key = Path(graphs_dir).resolve()
+    registry = _registries.get(key)
+    if registry is None:
+        registry = GraphRegistry(graphs_dir)
+        _registries[key] = registry
+    return registry
@@ -11,6 +11,8 @@ from datetime import datetime
 
 from ..models.multi_graph import GraphMetadata, GraphStatus, ExtendedDocProcessingStatus
 from ..base import DocProcessingStatus, DocStatus
+from ..utils import load_graph_stats
+from .graph_registry import get_graph_registry
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +23,8 @@ class MultiGraphStorageManager:
     def __init__(self, graphs_dir: str = "./graphs"):
         self.graphs_dir = Path(graphs_dir)
         self.graphs_dir.mkdir(parents=True, exist_ok=True)
-        self.config_file = self.graphs_dir / "graphs_config.json"
+        self.registry = get_graph_registry(graphs_dir)
+        self.config_file = self.registry.config_file
         
     async def initialize_default_graph(self) -> GraphMetadata:
         """初始化默认图谱"""
@@ -50,37 +53,24 @@ class MultiGraphStorageManager:
         graph_dir.mkdir(parents=True, exist_ok=True)
         
         # 保存配置
-        config["default"] = default_graph.to_dict()
-        await self.save_config(config)
+        await self.registry.update(
+            lambda config: config.setdefault("default", default_graph.to_dict())
+        )
         
         logger.info(f"创建默认图谱: {default_graph.name}")
         return default_graph
     
     async def load_config(self) -> Dict[str, Any]:
-        """加载图谱配置"""
-        if not self.config_file.exists():
-            return {}
-        
-        try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"加载图谱配置失败: {e}")
-            return {}
+        """加载图谱配置（注册表内存副本）"""
+        return await self.registry.get_all()
     
     async def save_config(self, config: Dict[str, Any]):
-        """保存图谱配置"""
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"保存图谱配置失败: {e}")
-            raise
+        """整体保存图谱配置，增量修改请使用 registry.update"""
+        await self.registry.replace(config)
     
     async def get_graph_working_dir(self, graph_id: str) -> Optional[Path]:
         """获取图谱工作目录"""
-        config = await self.load_config()
-        graph_info = config.get(graph_id)
+        graph_info = await self.registry.get(graph_id)
         
         if not graph_info:
             return None
@@ -196,10 +186,7 @@ class MultiGraphStorageManager:
     
     async def update_graph_stats(self, graph_id: str):
         """更新图谱统计信息"""
-        config = await self.load_config()
-        graph_info = config.get(graph_id)
-        
-        if not graph_info:
+        if not await self.registry.contains(graph_id):
             return
         
         # 统计文档数量
@@ -210,26 +197,31 @@ class MultiGraphStorageManager:
         entity_count = await self._count_entities(graph_id)
         relation_count = await self._count_relations(graph_id)
         
-        # 更新配置
-        graph_info["document_count"] = document_count
-        graph_info["entity_count"] = entity_count
-        graph_info["relation_count"] = relation_count
-        graph_info["updated_at"] = datetime.now().isoformat()
+        def _update_stats(config: Dict[str, Any]) -> None:
+            graph_info = config.get(graph_id)
+            if graph_info is None:
+                return
+            graph_info["document_count"] = document_count
+            graph_info["entity_count"] = entity_count
+            graph_info["relation_count"] = relation_count
+            graph_info["updated_at"] = datetime.now().isoformat()
         
         # 保存配置
-        await self.save_config(config)
+        await self.registry.update(_update_stats)
     
     async def _count_entities(self, graph_id: str) -> int:
-        """统计图谱中的实体数量"""
-        # 简化实现，返回0
-        # 实际实现应该读取向量数据库或图数据库
-        return 0
+        """统计图谱中的实体数量（读取存储层维护的统计信息）"""
+        return (await self._load_graph_stats(graph_id)).get("entity_count", 0)
     
     async def _count_relations(self, graph_id: str) -> int:
-        """统计图谱中的关系数量"""
-        # 简化实现，返回0
-        # 实际实现应该读取图数据库
-        return 0
+        """统计图谱中的关系数量（读取存储层维护的统计信息）"""
+        return (await self._load_graph_stats(graph_id)).get("relation_count", 0)
+    
+    async def _load_graph_stats(self, graph_id: str) -> Dict[str, Any]:
+        graph_dir = await self.get_graph_working_dir(graph_id)
+        if not graph_dir:
+            return {}
+        return load_graph_stats(str(graph_dir))
     
     async def delete_graph_storage(self, graph_id: str) -> bool:
         """删除图谱存储"""
@@ -242,10 +234,7 @@ class MultiGraphStorageManager:
             shutil.rmtree(graph_dir)
             
             # 从配置中移除
-            config = await self.load_config()
-            if graph_id in config:
-                del config[graph_id]
-                await self.save_config(config)
+            await self.registry.update(lambda config: config.pop(graph_id, None))
             
             logger.info(f"删除图谱 {graph_id} 的存储")
             return True
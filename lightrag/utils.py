@@ -9,8 +9,12 @@ import logging
 import logging.handlers
 import os
 import re
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
 from hashlib import md5
 from typing import Any, Protocol, Callable, TYPE_CHECKING, List
 import numpy as np
@@ -20,6 +24,7 @@ from lightrag.constants import (
     DEFAULT_LOG_MAX_BYTES,
     DEFAULT_LOG_BACKUP_COUNT,
     DEFAULT_LOG_FILENAME,
+    GRAPH_STATS_FILE,
 )
 
 
@@ -230,6 +235,142 @@ class UnlimitedSemaphore:
         pass
 
 
+class BlockingIOExecutor:
+    """Bounded thread pool for client libraries that only offer blocking calls.
+
+    Storage backends await `run` instead of calling their client directly, so a
+    slow request occupies a worker thread rather than the event loop. A call
+    that exceeds the timeout raises `asyncio.TimeoutError` to the caller, while
+    the worker thread finishes the call in the background.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        timeout: float | None = None,
+        thread_name_prefix: str = "",
+    ):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix=thread_name_prefix
+        )
+        self._timeout = timeout if timeout and timeout > 0 else None
+
+    async def run(
+        self, func: Callable, *args, timeout: float | None = None, **kwargs
+    ) -> Any:
+        """Run `func(*args, **kwargs)` in the pool, `timeout` overrides the default"""
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+        timeout = timeout if timeout is not None else self._timeout
+        if timeout is None:
+            return await future
+        return await asyncio.wait_for(future, timeout)
+
+
+class ChunkTaskScheduler:
+    """Shared LLM concurrency pool for chunk extraction across documents.
+
+    Chunk jobs wait in one queue per document and free slots are handed out
+    round-robin between documents, so a huge document cannot starve the small
+    ones queued behind it. Documents are admitted to the extraction stage while
+    fewer than ``max_parallel_documents`` are active, or while the chunk backlog
+    is too short to keep every LLM slot busy.
+    """
+
+    def __init__(self, max_concurrency: int, max_parallel_documents: int = 1):
+        self._max_concurrency = max(1, int(max_concurrency))
+        self._max_parallel_documents = max(1, int(max_parallel_documents))
+        self._running = 0
+        self._waiting = 0
+        self._queues: dict[str, deque[asyncio.Future]] = {}
+        self._order: deque[str] = deque()  # documents with waiting chunk jobs
+        self._active_documents = 0
+        # Admitted documents that have not submitted any chunk job yet
+        self._warming: set[str] = set()
+        self._state_changed = asyncio.Event()
+
+    @property
+    def pending(self) -> int:
+        """Number of chunk jobs waiting for an LLM slot"""
+        return self._waiting
+
+    def _can_admit(self) -> bool:
+        if self._active_documents < self._max_parallel_documents:
+            return True
+        return self._waiting + len(self._warming) < self._max_concurrency
+
+    @asynccontextmanager
+    async def document_slot(self, doc_id: str):
+        """Hold an extraction slot for one document"""
+        while not self._can_admit():
+            self._state_changed.clear()
+            await self._state_changed.wait()
+        self._active_documents += 1
+        self._warming.add(doc_id)
+        try:
+            yield
+        finally:
+            self._active_documents -= 1
+            self._warming.discard(doc_id)
+            self._state_changed.set()
+
+    async def run(self, doc_id: str, func: Callable, *args, **kwargs) -> Any:
+        """Run one chunk job of ``doc_id`` once an LLM slot is free"""
+        self._warming.discard(doc_id)
+        if self._running < self._max_concurrency and not self._order:
+            self._running += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            queue = self._queues.get(doc_id)
+            if queue is None:
+                queue = self._queues[doc_id] = deque()
+                self._order.append(doc_id)
+            queue.append(waiter)
+            self._waiting += 1
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # The slot was handed over right before cancellation
+                    self._release()
+                else:
+                    self._discard_waiter(doc_id, waiter)
+                raise
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            self._release()
+
+    def _discard_waiter(self, doc_id: str, waiter: asyncio.Future) -> None:
+        queue = self._queues.get(doc_id)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        self._waiting -= 1
+        if not queue:
+            del self._queues[doc_id]
+            self._order.remove(doc_id)
+        self._state_changed.set()
+
+    def _release(self) -> None:
+        # Hand the slot straight to the next document in round-robin order
+        while self._order:
+            doc_id = self._order.popleft()
+            queue = self._queues[doc_id]
+            waiter = queue.popleft()
+            self._waiting -= 1
+            if queue:
+                self._order.append(doc_id)
+            else:
+                del self._queues[doc_id]
+            if not waiter.done():
+                waiter.set_result(None)
+                self._state_changed.set()
+                return
+        self._running -= 1
+        self._state_changed.set()
+
+
 @dataclass
 class EmbeddingFunc:
     embedding_dim: int
@@ -617,6 +758,38 @@ def write_json(json_obj, file_name):
         json.dump(json_obj, f, indent=2, ensure_ascii=False)
 
 
+def load_graph_stats(working_dir: str) -> dict[str, Any]:
+    """Read the counters of the graph stored in `working_dir`, empty if none yet"""
+    try:
+        return load_json(os.path.join(working_dir, GRAPH_STATS_FILE)) or {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to read graph stats in {working_dir}: {e}")
+        return {}
+
+
+def save_graph_stats(working_dir: str, stats: dict[str, Any]) -> None:
+    """Atomically replace the counters of the graph stored in `working_dir`"""
+    file_name = os.path.join(working_dir, GRAPH_STATS_FILE)
+    tmp_file = f"{file_name}.tmp"
+    write_json(stats, tmp_file)
+    os.replace(tmp_file, file_name)
+
+
+def get_dir_size(path: str) -> int:
+    """Total size in bytes of the files under `path`, from directory entries only"""
+    total = 0
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
+                elif entry.is_dir(follow_symlinks=False):
+                    total += get_dir_size(entry.path)
+    except OSError:
+        pass
+    return total
+
+
 class TokenizerInterface(Protocol):
     """
     Defines the interface for a tokenizer, requiring encode and decode methods.
@@ -659,6 +832,24 @@ class Tokenizer:
         """
         return self.tokenizer.encode(content)
 
+    def encode_batch(
+        self, contents: List[str], num_threads: int = 8
+    ) -> List[List[int]]:
+        """
+        Encodes multiple strings, in parallel if the underlying tokenizer supports it.
+
+        Args:
+            contents: The strings to encode.
+            num_threads: Number of worker threads for tokenizers with batch support.
+
+        Returns:
+            A list of token lists, in the same order as `contents`.
+        """
+        encode_batch = getattr(self.tokenizer, "encode_batch", None)
+        if encode_batch is not None and len(contents) > 1:
+            return encode_batch(contents, num_threads=num_threads)
+        return [self.tokenizer.encode(content) for content in contents]
+
     def decode(self, tokens: List[int]) -> str:
         """
         Decodes a list of tokens into a string using the underlying tokenizer.
@@ -980,6 +1171,39 @@ async def handle_cache(
     return None, None, None, None
 
 
+class QueryContextCache:
+    """Bounded LRU of the retrieval contexts built for queries
+
+    Callers put the graph version in the key, so an entry built before a write
+    to the graph is never returned again and simply ages out.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple, default: Any = None) -> Any:
+        try:
+            self._entries.move_to_end(key)
+        except KeyError:
+            return default
+        return self._entries[key]
+
+    def put(self, key: tuple, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
 @dataclass
 class CacheData:
     args_hash: str
@@ -1041,6 +1265,7 @@ async def save_to_cache(hashing_kv, cache_data: CacheData):
         "embedding_min": cache_data.min_val,
         "embedding_max": cache_data.max_val,
         "original_prompt": cache_data.prompt,
+        "create_time": time.time(),
     }
 
     logger.info(f" == LLM cache == saving {cache_data.mode}: {cache_data.args_hash}")
@@ -1165,6 +1390,87 @@ def always_get_an_event_loop() -> asyncio.AbstractEventLoop:
         return new_loop
 
 
+EXPORT_BATCH_SIZE = 1000
+
+
+async def _iter_export_entities(
+    chunk_entity_relation_graph, entities_vdb, include_vector_data: bool
+):
+    """Yield batches of entity rows, fetching vector data one batch at a time"""
+    async for batch in chunk_entity_relation_graph.iter_nodes(EXPORT_BATCH_SIZE):
+        vector_data = {}
+        if include_vector_data:
+            ids = [compute_mdhash_id(name, prefix="ent-") for name, _ in batch]
+            vector_data = {
+                dp.get("id"): dp for dp in await entities_vdb.get_by_ids(ids) if dp
+            }
+        rows = []
+        for entity_name, node_data in batch:
+            row = {
+                "entity_name": entity_name,
+                "source_id": node_data.get("source_id"),
+                "graph_data": node_data,
+            }
+            if include_vector_data:
+                row["vector_data"] = vector_data.get(
+                    compute_mdhash_id(entity_name, prefix="ent-")
+                )
+            rows.append(row)
+        yield rows
+
+
+async def _iter_export_relations(
+    chunk_entity_relation_graph, relationships_vdb, include_vector_data: bool
+):
+    """Yield batches of relation rows, each undirected edge once"""
+    async for batch in chunk_entity_relation_graph.iter_edges(EXPORT_BATCH_SIZE):
+        vector_data = {}
+        if include_vector_data:
+            # Relation vectors are keyed by the insertion direction, look up both
+            ids = []
+            for src_entity, tgt_entity, _ in batch:
+                ids.append(compute_mdhash_id(src_entity + tgt_entity, prefix="rel-"))
+                ids.append(compute_mdhash_id(tgt_entity + src_entity, prefix="rel-"))
+            vector_data = {
+                dp.get("id"): dp for dp in await relationships_vdb.get_by_ids(ids) if dp
+            }
+        rows = []
+        for src_entity, tgt_entity, edge_data in batch:
+            row = {
+                "src_entity": src_entity,
+                "tgt_entity": tgt_entity,
+                "source_id": edge_data.get("source_id") if edge_data else None,
+                "graph_data": edge_data,
+            }
+            if include_vector_data:
+                row["vector_data"] = vector_data.get(
+                    compute_mdhash_id(src_entity + tgt_entity, prefix="rel-")
+                ) or vector_data.get(
+                    compute_mdhash_id(tgt_entity + src_entity, prefix="rel-")
+                )
+            rows.append(row)
+        yield rows
+
+
+async def _iter_export_relationships(relationships_vdb):
+    """Yield batches of relationship rows straight from the vector storage"""
+    all_relationships = await relationships_vdb.client_storage
+    data = all_relationships["data"]
+    for start in range(0, len(data), EXPORT_BATCH_SIZE):
+        yield [
+            {"relationship_id": rel["__id__"], "data": rel}
+            for rel in data[start : start + EXPORT_BATCH_SIZE]
+        ]
+
+
+def _export_row_to_text(row: dict[str, Any]) -> dict[str, str]:
+    """Stringify nested values the way the tabular export formats expect"""
+    return {
+        key: value if isinstance(value, str) or value is None else str(value)
+        for key, value in row.items()
+    }
+
+
 async def aexport_data(
     chunk_entity_relation_graph,
     entities_vdb,
@@ -1176,297 +1482,200 @@ async def aexport_data(
     """
     Asynchronously exports all entities, relations, and relationships to various formats.
 
+    Nodes and edges are streamed from the graph storage via iter_nodes/iter_edges
+    and vector data is fetched per batch, so the export runs in O(V + E) storage
+    work. csv, md, ndjson and parquet are written incrementally with bounded
+    memory; excel and txt need the whole table for their layout and buffer rows.
+
     Args:
         chunk_entity_relation_graph: Graph storage instance for entities and relations
         entities_vdb: Vector database storage for entities
         relationships_vdb: Vector database storage for relationships
         output_path: The path to the output file (including extension).
-        file_format: Output format - "csv", "excel", "md", "txt".
+        file_format: Output format - "csv", "excel", "md", "txt", "ndjson", "parquet".
             - csv: Comma-separated values file
             - excel: Microsoft Excel file with multiple sheets
             - md: Markdown tables
             - txt: Plain text formatted output
+            - ndjson: One JSON object per line with a "type" field
+            - parquet: Single Parquet table with a "type" column
         include_vector_data: Whether to include data from the vector database.
     """
-    # Collect data
-    entities_data = []
-    relations_data = []
-    relationships_data = []
-
-    # --- Entities ---
-    all_entities = await chunk_entity_relation_graph.get_all_labels()
-    for entity_name in all_entities:
-        # Get entity information from graph
-        node_data = await chunk_entity_relation_graph.get_node(entity_name)
-        source_id = node_data.get("source_id") if node_data else None
-
-        entity_info = {
-            "graph_data": node_data,
-            "source_id": source_id,
-        }
-
-        # Optional: Get vector database information
-        if include_vector_data:
-            entity_id = compute_mdhash_id(entity_name, prefix="ent-")
-            vector_data = await entities_vdb.get_by_id(entity_id)
-            entity_info["vector_data"] = vector_data
-
-        entity_row = {
-            "entity_name": entity_name,
-            "source_id": source_id,
-            "graph_data": str(
-                entity_info["graph_data"]
-            ),  # Convert to string to ensure compatibility
-        }
-        if include_vector_data and "vector_data" in entity_info:
-            entity_row["vector_data"] = str(entity_info["vector_data"])
-        entities_data.append(entity_row)
-
-    # --- Relations ---
-    for src_entity in all_entities:
-        for tgt_entity in all_entities:
-            if src_entity == tgt_entity:
-                continue
-
-            edge_exists = await chunk_entity_relation_graph.has_edge(
-                src_entity, tgt_entity
-            )
-            if edge_exists:
-                # Get edge information from graph
-                edge_data = await chunk_entity_relation_graph.get_edge(
-                    src_entity, tgt_entity
-                )
-                source_id = edge_data.get("source_id") if edge_data else None
-
-                relation_info = {
-                    "graph_data": edge_data,
-                    "source_id": source_id,
-                }
-
-                # Optional: Get vector database information
-                if include_vector_data:
-                    rel_id = compute_mdhash_id(src_entity + tgt_entity, prefix="rel-")
-                    vector_data = await relationships_vdb.get_by_id(rel_id)
-                    relation_info["vector_data"] = vector_data
-
-                relation_row = {
-                    "src_entity": src_entity,
-                    "tgt_entity": tgt_entity,
-                    "source_id": relation_info["source_id"],
-                    "graph_data": str(relation_info["graph_data"]),  # Convert to string
-                }
-                if include_vector_data and "vector_data" in relation_info:
-                    relation_row["vector_data"] = str(relation_info["vector_data"])
-                relations_data.append(relation_row)
-
-    # --- Relationships (from VectorDB) ---
-    all_relationships = await relationships_vdb.client_storage
-    for rel in all_relationships["data"]:
-        relationships_data.append(
-            {
-                "relationship_id": rel["__id__"],
-                "data": str(rel),  # Convert to string for compatibility
-            }
+    if file_format not in ("csv", "excel", "md", "txt", "ndjson", "parquet"):
+        raise ValueError(
+            f"Unsupported file format: {file_format}. "
+            f"Choose from: csv, excel, md, txt, ndjson, parquet"
         )
 
-    # Export based on format
+    # (type, section title, row batch iterator factory)
+    sections = [
+        (
+            "entity",
+            "Entities",
+            lambda: _iter_export_entities(
+                chunk_entity_relation_graph, entities_vdb, include_vector_data
+            ),
+        ),
+        (
+            "relation",
+            "Relations",
+            lambda: _iter_export_relations(
+                chunk_entity_relation_graph, relationships_vdb, include_vector_data
+            ),
+        ),
+        (
+            "relationship",
+            "Relationships",
+            lambda: _iter_export_relationships(relationships_vdb),
+        ),
+    ]
+
     if file_format == "csv":
         # CSV export
         with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
-            # Entities
-            if entities_data:
-                csvfile.write("# ENTITIES\n")
-                writer = csv.DictWriter(csvfile, fieldnames=entities_data[0].keys())
-                writer.writeheader()
-                writer.writerows(entities_data)
-                csvfile.write("\n\n")
-
-            # Relations
-            if relations_data:
-                csvfile.write("# RELATIONS\n")
-                writer = csv.DictWriter(csvfile, fieldnames=relations_data[0].keys())
-                writer.writeheader()
-                writer.writerows(relations_data)
-                csvfile.write("\n\n")
-
-            # Relationships
-            if relationships_data:
-                csvfile.write("# RELATIONSHIPS\n")
-                writer = csv.DictWriter(
-                    csvfile, fieldnames=relationships_data[0].keys()
-                )
-                writer.writeheader()
-                writer.writerows(relationships_data)
-
-    elif file_format == "excel":
-        # Excel export
-        import pandas as pd
-
-        entities_df = pd.DataFrame(entities_data) if entities_data else pd.DataFrame()
-        relations_df = (
-            pd.DataFrame(relations_data) if relations_data else pd.DataFrame()
-        )
-        relationships_df = (
-            pd.DataFrame(relationships_data) if relationships_data else pd.DataFrame()
-        )
+            for index, (_, title, iter_rows) in enumerate(sections):
+                writer = None
+                async for rows in iter_rows():
+                    rows = [_export_row_to_text(row) for row in rows]
+                    if writer is None:
+                        csvfile.write(f"# {title.upper()}\n")
+                        writer = csv.DictWriter(csvfile, fieldnames=rows[0].keys())
+                        writer.writeheader()
+                    writer.writerows(rows)
+                if writer is not None and index < len(sections) - 1:
+                    csvfile.write("\n\n")
+
+    elif file_format == "ndjson":
+        # Newline-delimited JSON export
+        with open(output_path, "w", encoding="utf-8") as jsonfile:
+            for record_type, _, iter_rows in sections:
+                async for rows in iter_rows():
+                    for row in rows:
+                        jsonfile.write(
+                            json.dumps(
+                                {"type": record_type, **row},
+                                ensure_ascii=False,
+                                default=str,
+                            )
+                            + "\n"
+                        )
 
-        with pd.ExcelWriter(output_path, engine="xlsxwriter") as writer:
-            if not entities_df.empty:
-                entities_df.to_excel(writer, sheet_name="Entities", index=False)
-            if not relations_df.empty:
-                relations_df.to_excel(writer, sheet_name="Relations", index=False)
-            if not relationships_df.empty:
-                relationships_df.to_excel(
-                    writer, sheet_name="Relationships", index=False
-                )
+    elif file_format == "parquet":
+        # Parquet export, one row group per batch
+        import pipmaster as pm
+
+        if not pm.is_installed("pyarrow"):
+            pm.install("pyarrow")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        columns = [
+            "type",
+            "entity_name",
+            "src_entity",
+            "tgt_entity",
+            "relationship_id",
+            "source_id",
+            "graph_data",
+            "vector_data",
+            "data",
+        ]
+        schema = pa.schema([(column, pa.string()) for column in columns])
+
+        def to_cell(value):
+            if value is None or isinstance(value, str):
+                return value
+            return json.dumps(value, ensure_ascii=False, default=str)
+
+        with pq.ParquetWriter(output_path, schema) as writer:
+            for record_type, _, iter_rows in sections:
+                async for rows in iter_rows():
+                    table = {column: [] for column in columns}
+                    for row in rows:
+                        table["type"].append(record_type)
+                        for column in columns[1:]:
+                            table[column].append(to_cell(row.get(column)))
+                    writer.write_table(pa.table(table, schema=schema))
 
     elif file_format == "md":
         # Markdown export
         with open(output_path, "w", encoding="utf-8") as mdfile:
             mdfile.write("# LightRAG Data Export\n\n")
+            for index, (record_type, title, iter_rows) in enumerate(sections):
+                mdfile.write(f"## {title}\n\n")
+                has_rows = False
+                async for rows in iter_rows():
+                    rows = [_export_row_to_text(row) for row in rows]
+                    if not has_rows:
+                        has_rows = True
+                        # Write header
+                        mdfile.write("| " + " | ".join(rows[0].keys()) + " |\n")
+                        mdfile.write(
+                            "| " + " | ".join(["---"] * len(rows[0].keys())) + " |\n"
+                        )
+                    # Write rows
+                    for row in rows:
+                        mdfile.write(
+                            "| " + " | ".join(str(v) for v in row.values()) + " |\n"
+                        )
+                if not has_rows:
+                    mdfile.write(f"*No {record_type} data available*\n\n")
+                elif index < len(sections) - 1:
+                    mdfile.write("\n\n")
 
-            # Entities
-            mdfile.write("## Entities\n\n")
-            if entities_data:
-                # Write header
-                mdfile.write("| " + " | ".join(entities_data[0].keys()) + " |\n")
-                mdfile.write(
-                    "| " + " | ".join(["---"] * len(entities_data[0].keys())) + " |\n"
-                )
-
-                # Write rows
-                for entity in entities_data:
-                    mdfile.write(
-                        "| " + " | ".join(str(v) for v in entity.values()) + " |\n"
-                    )
-                mdfile.write("\n\n")
-            else:
-                mdfile.write("*No entity data available*\n\n")
-
-            # Relations
-            mdfile.write("## Relations\n\n")
-            if relations_data:
-                # Write header
-                mdfile.write("| " + " | ".join(relations_data[0].keys()) + " |\n")
-                mdfile.write(
-                    "| " + " | ".join(["---"] * len(relations_data[0].keys())) + " |\n"
-                )
-
-                # Write rows
-                for relation in relations_data:
-                    mdfile.write(
-                        "| " + " | ".join(str(v) for v in relation.values()) + " |\n"
-                    )
-                mdfile.write("\n\n")
-            else:
-                mdfile.write("*No relation data available*\n\n")
-
-            # Relationships
-            mdfile.write("## Relationships\n\n")
-            if relationships_data:
-                # Write header
-                mdfile.write("| " + " | ".join(relationships_data[0].keys()) + " |\n")
-                mdfile.write(
-                    "| "
-                    + " | ".join(["---"] * len(relationships_data[0].keys()))
-                    + " |\n"
-                )
-
-                # Write rows
-                for relationship in relationships_data:
-                    mdfile.write(
-                        "| "
-                        + " | ".join(str(v) for v in relationship.values())
-                        + " |\n"
-                    )
-            else:
-                mdfile.write("*No relationship data available*\n\n")
-
-    elif file_format == "txt":
-        # Plain text export
-        with open(output_path, "w", encoding="utf-8") as txtfile:
-            txtfile.write("LIGHTRAG DATA EXPORT\n")
-            txtfile.write("=" * 80 + "\n\n")
-
-            # Entities
-            txtfile.write("ENTITIES\n")
-            txtfile.write("-" * 80 + "\n")
-            if entities_data:
-                # Create fixed width columns
-                col_widths = {
-                    k: max(len(k), max(len(str(e[k])) for e in entities_data))
-                    for k in entities_data[0]
-                }
-                header = "  ".join(k.ljust(col_widths[k]) for k in entities_data[0])
-                txtfile.write(header + "\n")
-                txtfile.write("-" * len(header) + "\n")
-
-                # Write rows
-                for entity in entities_data:
-                    row = "  ".join(
-                        str(v).ljust(col_widths[k]) for k, v in entity.items()
-                    )
-                    txtfile.write(row + "\n")
-                txtfile.write("\n\n")
-            else:
-                txtfile.write("No entity data available\n\n")
-
-            # Relations
-            txtfile.write("RELATIONS\n")
-            txtfile.write("-" * 80 + "\n")
-            if relations_data:
-                # Create fixed width columns
-                col_widths = {
-                    k: max(len(k), max(len(str(r[k])) for r in relations_data))
-                    for k in relations_data[0]
-                }
-                header = "  ".join(k.ljust(col_widths[k]) for k in relations_data[0])
-                txtfile.write(header + "\n")
-                txtfile.write("-" * len(header) + "\n")
-
-                # Write rows
-                for relation in relations_data:
-                    row = "  ".join(
-                        str(v).ljust(col_widths[k]) for k, v in relation.items()
-                    )
-                    txtfile.write(row + "\n")
-                txtfile.write("\n\n")
-            else:
-                txtfile.write("No relation data available\n\n")
-
-            # Relationships
-            txtfile.write("RELATIONSHIPS\n")
-            txtfile.write("-" * 80 + "\n")
-            if relationships_data:
-                # Create fixed width columns
-                col_widths = {
-                    k: max(len(k), max(len(str(r[k])) for r in relationships_data))
-                    for k in relationships_data[0]
-                }
-                header = "  ".join(
-                    k.ljust(col_widths[k]) for k in relationships_data[0]
-                )
-                txtfile.write(header + "\n")
-                txtfile.write("-" * len(header) + "\n")
+    else:
+        # excel and txt lay out whole tables, so rows are collected first
+        section_rows = []
+        for record_type, title, iter_rows in sections:
+            collected = []
+            async for rows in iter_rows():
+                collected.extend(_export_row_to_text(row) for row in rows)
+            section_rows.append((record_type, title, collected))
+
+        if file_format == "excel":
+            # Excel export
+            import pandas as pd
+
+            with pd.ExcelWriter(output_path, engine="xlsxwriter") as writer:
+                for _, title, rows in section_rows:
+                    if rows:
+                        pd.DataFrame(rows).to_excel(
+                            writer, sheet_name=title, index=False
+                        )
 
-                # Write rows
-                for relationship in relationships_data:
-                    row = "  ".join(
-                        str(v).ljust(col_widths[k]) for k, v in relationship.items()
-                    )
-                    txtfile.write(row + "\n")
-            else:
-                txtfile.write("No relationship data available\n\n")
+        else:
+            # Plain text export
+            with open(output_path, "w", encoding="utf-8") as txtfile:
+                txtfile.write("LIGHTRAG DATA EXPORT\n")
+                txtfile.write("=" * 80 + "\n\n")
+
+                for index, (record_type, title, rows) in enumerate(section_rows):
+                    txtfile.write(title.upper() + "\n")
+                    txtfile.write("-" * 80 + "\n")
+                    if rows:
+                        # Create fixed width columns
+                        col_widths = {
+                            k: max(len(k), max(len(str(r[k])) for r in rows))
+                            for k in rows[0]
+                        }
+                        header = "  ".join(k.ljust(col_widths[k]) for k in rows[0])
+                        txtfile.write(header + "\n")
+                        txtfile.write("-" * len(header) + "\n")
+
+                        # Write rows
+                        for row in rows:
+                            txtfile.write(
+                                "  ".join(
+                                    str(v).ljust(col_widths[k]) for k, v in row.items()
+                                )
+                                + "\n"
+                            )
+                        if index < len(section_rows) - 1:
+                            txtfile.write("\n\n")
+                    else:
+                        txtfile.write(f"No {record_type} data available\n\n")
 
-    else:
-        raise ValueError(
-            f"Unsupported file format: {file_format}. "
-            f"Choose from: csv, excel, md, txt"
-        )
-    if file_format is not None:
-        print(f"Data exported to: {output_path} with format: {file_format}")
-    else:
-        print("Data displayed as table format")
+    print(f"Data exported to: {output_path} with format: {file_format}")
 
 
 def export_data(
@@ -1485,11 +1694,13 @@ def export_data(
         entities_vdb: Vector database storage for entities
         relationships_vdb: Vector database storage for relationships
         output_path: The path to the output file (including extension).
-        file_format: Output format - "csv", "excel", "md", "txt".
+        file_format: Output format - "csv", "excel", "md", "txt", "ndjson", "parquet".
             - csv: Comma-separated values file
             - excel: Microsoft Excel file with multiple sheets
             - md: Markdown tables
             - txt: Plain text formatted output
+            - ndjson: One JSON object per line with a "type" field
+            - parquet: Single Parquet table with a "type" column
         include_vector_data: Whether to include data from the vector database.
     """
     try:
@@ -2,13 +2,101 @@ from __future__ import annotations
 
 import time
 import asyncio
+from datetime import datetime, timezone
 from typing import Any, cast
 
 from .base import DeletionResult
-from .kg.shared_storage import get_graph_db_lock
+from .kg.shared_storage import (
+    bump_graph_version,
+    get_graph_db_lock,
+    get_graph_registry_lock,
+)
 from .constants import GRAPH_FIELD_SEP
-from .utils import compute_mdhash_id, logger
-from .base import StorageNameSpace
+from .utils import (
+    compute_mdhash_id,
+    get_dir_size,
+    load_graph_stats,
+    logger,
+    save_graph_stats,
+)
+from .base import StorageNameSpace, DocStatus
+
+
+async def count_graph_elements(chunk_entity_relation_graph) -> tuple[int, int]:
+    """Count the nodes and edges of a graph
+
+    Uses get_graph_counts, and scans the labels and edges of backends that
+    cannot count them natively.
+    """
+    graph_counts = await chunk_entity_relation_graph.get_graph_counts()
+    if graph_counts is not None:
+        return graph_counts
+    node_count = len(await chunk_entity_relation_graph.get_all_labels())
+    edge_count = 0
+    async for batch in chunk_entity_relation_graph.iter_edges():
+        edge_count += len(batch)
+    return node_count, edge_count
+
+
+async def update_graph_stats(
+    chunk_entity_relation_graph,
+    doc_status=None,
+    chunk_delta: int = 0,
+    refresh: bool = False,
+) -> bool:
+    """Apply pending changes to the counters of a graph saved in its working directory
+
+    Entity and relation counts are adjusted by the count changes the graph
+    storage recorded in its upserts and deletes, and the chunk count by
+    `chunk_delta`. The graph is only counted in full on `refresh`, when the
+    saved stats have no counts yet, after a drop, or for backends that do not
+    record their changes. Document counts and the size on disk are read when
+    `doc_status` is given or on `refresh`. The file is read and rewritten under
+    the graph registry lock, so concurrent updates from other workers are kept.
+
+    Returns:
+        False if the counters could not be updated
+    """
+    working_dir = chunk_entity_relation_graph.global_config["working_dir"]
+    count_changes = chunk_entity_relation_graph.pop_count_changes()
+    try:
+        saved_stats = await asyncio.to_thread(load_graph_stats, working_dir)
+        graph_counts = None
+        if refresh or count_changes is None or "entity_count" not in saved_stats:
+            graph_counts = await count_graph_elements(chunk_entity_relation_graph)
+        status_counts = (
+            await doc_status.get_status_counts() if doc_status is not None else None
+        )
+        bytes_on_disk = None
+        if doc_status is not None or refresh:
+            bytes_on_disk = await asyncio.to_thread(get_dir_size, working_dir)
+
+        async with get_graph_registry_lock():
+            stats = await asyncio.to_thread(load_graph_stats, working_dir)
+            stats["chunk_count"] = max(0, stats.get("chunk_count", 0) + chunk_delta)
+            if graph_counts is not None:
+                stats["entity_count"], stats["relation_count"] = graph_counts
+            else:
+                for key, delta in zip(
+                    ("entity_count", "relation_count"), count_changes
+                ):
+                    stats[key] = max(0, stats.get(key, 0) + delta)
+            if status_counts is not None:
+                stats["document_count"] = sum(status_counts.values())
+                stats["processed_document_count"] = status_counts.get(
+                    DocStatus.PROCESSED.value, 0
+                )
+            if bytes_on_disk is not None:
+                stats["bytes_on_disk"] = bytes_on_disk
+            stats["updated_at"] = datetime.now(timezone.utc).isoformat()
+            await asyncio.to_thread(save_graph_stats, working_dir, stats)
+        return True
+    except Exception as e:
+        if count_changes is not None:
+            # Keep the changes for the next update
+            chunk_entity_relation_graph.record_count_changes(*count_changes)
+        logger.warning(f"Failed to update graph stats in {working_dir}: {e}")
+        return False
 
 
 async def adelete_by_entity(
@@ -79,6 +167,8 @@ async def _delete_by_entity_done(
             ]
         ]
     )
+    await bump_graph_version(chunk_entity_relation_graph.global_config["working_dir"])
+    await update_graph_stats(chunk_entity_relation_graph)
 
 
 async def adelete_by_relation(
@@ -158,6 +248,8 @@ async def _delete_relation_done(relationships_vdb, chunk_entity_relation_graph)
             ]
         ]
     )
+    await bump_graph_version(chunk_entity_relation_graph.global_config["working_dir"])
+    await update_graph_stats(chunk_entity_relation_graph)
 
 
 async def aedit_entity(
@@ -370,6 +462,8 @@ async def _edit_entity_done(
             ]
         ]
     )
+    await bump_graph_version(chunk_entity_relation_graph.global_config["working_dir"])
+    await update_graph_stats(chunk_entity_relation_graph)
 
 
 async def aedit_relation(
@@ -486,6 +580,8 @@ async def _edit_relation_done(relationships_vdb, chunk_entity_relation_graph) ->
             ]
         ]
     )
+    await bump_graph_version(chunk_entity_relation_graph.global_config["working_dir"])
+    await update_graph_stats(chunk_entity_relation_graph)
 
 
 async def acreate_entity(
@@ -1058,6 +1154,8 @@ async def _merge_entities_done(
             ]
         ]
     )
+    await bump_graph_version(chunk_entity_relation_graph.global_config["working_dir"])
+    await update_graph_stats(chunk_entity_relation_graph)
 
 
 async def get_entity_info(